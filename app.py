@@ -15,20 +15,112 @@ Routes:
 - '/api/record-against-each-team': Takes a team name as a parameter
     and returns its record against each team.
 - '/api/batsman-record': Takes a batsman name as a parameter and returns
-    the complete batting record of the batsman.
+    the complete batting record of the batsman, with their recent form and, on request,
+    their percentile ranks among qualified peers.
 - '/api/bowling-record': Takes a bowler name as a parameter and
-    returns the complete bowling record of the bowler.
+    returns the complete bowling record of the bowler, with their recent form and, on
+    request, their percentile ranks among qualified peers.
 - '/api/player-suggestions': Takes a search query and returns matching player names.
+- '/api/venues': Returns the venues that have hosted IPL matches.
+- '/api/venue-record': Takes a venue name as a parameter and returns its ground-level
+    statistics (innings scores, chasing record, toss outcomes, top batters and bowlers).
+- '/api/city-record': Takes a city name as a parameter and returns the same statistics
+    over all venues of the city.
+- '/api/matchup': Takes a batter and a bowler name as parameters and returns the
+    batter's record against the bowler.
+- '/api/batter-matchups': Takes a batter name (and optional `n` and `min_balls`) and returns
+    the bowlers the batter has scored fastest and slowest against.
+- '/api/bowler-bunnies': Takes a bowler name (and optional `n`) and returns the batters
+    the bowler has dismissed most often.
+- '/api/partnership': Takes two batter names as parameters and returns every
+    partnership of the pair.
+- '/api/top-partnerships': Takes an optional `wicket` (and `n`) and returns the highest
+    partnerships for that wicket, or for every wicket.
+- '/api/partners': Takes a batter name (and optional `n`) and returns the batters the
+    player has added the most partnership runs with.
+- '/api/player-appearances': Takes a player name as a parameter and returns the matches
+    the player appeared in and the teams the player represented.
+- '/api/teammates': Takes a player name (and optional `n`) and returns the players the
+    player has shared the most XIs with.
+- '/api/fielding-record': Takes a player name as a parameter and returns the player's
+    catches, stumpings and run-outs.
+- '/api/form-leaderboard': Takes a `role` (batting or bowling), an optional `last` number
+    of innings, `days` (default 365), `sort`, `n` and `min_innings`, and returns the players
+    in the best form over the window.
+- '/api/toss-impact': Takes an optional venue, team and `by` breakdown (season, venue or
+    team) and returns how often the toss winners won, overall and per toss decision.
+- '/api/team-scores': Takes a team name as a parameter and returns the team's scoring
+    record: average first- and second-innings scores, and highest and lowest totals made
+    and conceded.
+- '/api/chase-by-target': Takes an optional `band` (runs, default 20) and `team` and returns
+    the chase success rate for every band of targets.
+- '/api/points-table': Returns the league-stage points table of every season: played, won,
+    lost, no result, points and net run rate.
+- '/api/match/<id>': Returns the full scorecard of a match: batting card, bowling figures,
+    fall of wickets and extras of every innings, and the result.
+- '/api/match/<id>/progression': Returns the over-by-over progression of a match: runs,
+    wickets, cumulative runs and run rates of every over, for worm and manhattan charts.
+- '/api/match-search': Takes any combination of season (or from/to), team, opponent, venue,
+    city, toss_winner, toss_decision, won_by, stage, super_over, umpire and winner (repeat
+    a parameter to select several values), with `page` and `per_page`, and returns the
+    matches found and the facet counts of every field.
+- '/api/live/deliveries': Admin only, POST. Ingests live deliveries (a JSON object or
+    list, or NDJSON) and pushes the updates to the live stream.
+- '/api/live/scorecard': Takes a match ID as a parameter and returns its live scorecard.
+- '/api/live/stream': Server-Sent Events stream of live scorecard deltas and updated
+    player records, optionally for one `match_id`.
+- '/api/admin/slow-requests': Admin only. Returns the slowest requests seen so far
+    with their parameters and, when profiled, their profile report.
+- '/api/admin/slow-requests/<id>/collapsed': Admin only. Returns the collapsed-stack
+    (flamegraph) file of a profiled request.
+
+Season filters:
+---------------
+The team, head-to-head, batting, bowling, appearance, fielding, toss, team scores, chase,
+points table and match search routes accept an optional `season` (e.g. 2016) or
+`from`/`to` (inclusive) parameters that restrict the records to those seasons. A season
+is the year the match was played.
+
+Phase splits:
+-------------
+The batting and bowling routes accept an optional `phase` parameter (`all`, `powerplay`,
+`middle` or `death`) that adds the player's numbers in those phases of the innings
+(powerplay overs 1-6, middle overs 7-15, death overs 16-20) under a `phases` key.
+
+Percentile ranks:
+-----------------
+The batting and bowling routes accept `percentiles=1` to add, under a `percentiles` key,
+the percentage of qualified players (`min_balls` balls faced or bowled and `min_innings`
+innings within the season filter) each statistic of the overall record is better than.
+
+Profiling:
+----------
+Admins can profile any analytics route by adding `profile=1` to the query string or by
+sending the `X-IPL-Profile: 1` header. The response then carries a `profile` block with a
+top-N cumulative-time report, and the collapsed stacks are kept in the slow request registry.
 """
 
-from flask import Flask, jsonify, request, render_template, redirect, url_for, session
+from flask import Flask, Response, jsonify, request, render_template, redirect, url_for, session
 from flask_sqlalchemy import SQLAlchemy
 from passlib.hash import sha256_crypt
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.schema import CreateIndex
+import click
+import csv
+import form
 import ipl
+import live
+import match_search
+import percentiles
+import phases
 import config
 import utils
+import profiler
 import os
 import json
+import time
 
 # ***************************************************************
 
@@ -38,19 +130,62 @@ app = Flask(__name__)
 # Set the secret key for the application
 app.secret_key = config.SECRET_KEY
 
-# Configure the SQLite database
-app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{config.SQLITE_DB_PATH}'
+# Configure the SQLite database (overridable, e.g. for a throwaway database in load tests)
+SQLITE_DB_PATH = os.environ.get('IPL_SQLITE_DB_PATH', config.SQLITE_DB_PATH)
+app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{SQLITE_DB_PATH}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# SQLite concurrency settings: WAL lets readers proceed while a writer commits,
+# synchronous=NORMAL is durable in WAL mode with far fewer fsyncs, and the busy timeout
+# makes a writer wait for the lock instead of failing with "database is locked"
+SQLITE_BUSY_TIMEOUT_MS = getattr(config, 'SQLITE_BUSY_TIMEOUT_MS', 5000)
+SQLITE_SYNCHRONOUS = getattr(config, 'SQLITE_SYNCHRONOUS', 'NORMAL')
+if SQLITE_DB_PATH not in ('', ':memory:'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'poolclass': QueuePool,
+        'pool_size': getattr(config, 'SQLITE_POOL_SIZE', 10),
+        'max_overflow': getattr(config, 'SQLITE_MAX_OVERFLOW', 20),
+        'pool_timeout': getattr(config, 'SQLITE_POOL_TIMEOUT', 30),
+        'connect_args': {'timeout': SQLITE_BUSY_TIMEOUT_MS / 1000,
+                         'check_same_thread': False}
+    }
+
 # Add template context processor for current year
 @app.context_processor
 def inject_current_year():
     from datetime import datetime
     return {'current_year': datetime.now().year}
 
+
+# Rolling registry of the slowest API requests and of the most recent profiled ones
+slow_requests = profiler.SlowRequestRegistry(getattr(config, 'SLOW_REQUEST_REGISTRY_SIZE', 20),
+                                             getattr(config, 'PROFILED_REQUEST_REGISTRY_SIZE', 20))
+
+# Live ball-by-ball feed: POSTed deliveries, or an NDJSON file followed in the background
+live_feed = live.LiveFeed(live.Broadcaster(getattr(config, 'LIVE_QUEUE_SIZE', 256)))
+LIVE_HEARTBEAT_SECONDS = getattr(config, 'LIVE_HEARTBEAT_SECONDS', 15)
+LIVE_FEED_PATH = os.environ.get('IPL_LIVE_FEED_PATH', getattr(config, 'LIVE_FEED_PATH', None))
+if LIVE_FEED_PATH:
+    live.NDJSONTail(LIVE_FEED_PATH, live_feed, getattr(config, 'LIVE_POLL_INTERVAL', 1.0)).start()
+
 # Initialize the SQLAlchemy instance
 db = SQLAlchemy(app)
 
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Applies the SQLite concurrency settings to every new pooled connection.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute(f'PRAGMA synchronous={SQLITE_SYNCHRONOUS}')
+    cursor.execute(f'PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT_MS)}')
+    cursor.close()
+
+
+with app.app_context():
+    event.listen(db.engine, 'connect', set_sqlite_pragmas)
+
 # Define the User model
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -58,11 +193,93 @@ class User(db.Model):
     email = db.Column(db.String(100), unique=True, nullable=False)
     password = db.Column(db.String(255), nullable=False)
 
-# Create the database tables
+
+# Expression index backing the case-insensitive email lookup
+user_email_index = db.Index('ix_user_email_lower', db.func.lower(User.email))
+
+
+def find_user_by_email(email):
+    """
+    Looks up a user by email, ignoring case and surrounding whitespace.
+
+    The lookup compares `lower(email)`, so it is answered by the `ix_user_email_lower`
+    expression index instead of a table scan.
+
+    Args:
+        email (str): The email address.
+
+    Returns:
+        User: The matching user, or None.
+    """
+    return User.query.filter(
+        db.func.lower(User.email) == utils.normalize_email(email)).first()
+
+
+def import_users(rows, hashed=False, batch_size=500):
+    """
+    Bulk imports users in a single transaction.
+
+    Emails are normalized, rows whose email is invalid, duplicated within the input or
+    already registered are skipped, and the remaining users are inserted with one
+    executemany per batch instead of one ORM flush per user.
+
+    Args:
+        rows (iterable): Dictionaries with 'name', 'email' and 'password' keys.
+        hashed (bool): Whether the passwords are already sha256_crypt hashes.
+        batch_size (int): Number of rows per existence query and insert batch.
+
+    Returns:
+        dict: The number of 'inserted' and 'skipped' rows.
+    """
+    records = {}
+    skipped = 0
+    for row in rows:
+        email = utils.normalize_email(row.get('email') or '')
+        if (not row.get('name') or not row.get('password') or email in records or
+                not utils.check_correct_email_format(email)):
+            skipped += 1
+            continue
+        records[email] = row
+
+    emails = list(records)
+    for start in range(0, len(emails), batch_size):
+        batch = emails[start:start + batch_size]
+        existing = db.session.query(db.func.lower(User.email)).filter(
+            db.func.lower(User.email).in_(batch)).all()
+        for (email,) in existing:
+            del records[email]
+            skipped += 1
+
+    values = [{'name': row['name'], 'email': email,
+               'password': row['password'] if hashed else sha256_crypt.hash(row['password'])}
+              for email, row in records.items()]
+    try:
+        for start in range(0, len(values), batch_size):
+            db.session.execute(db.insert(User), values[start:start + batch_size])
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return {'inserted': len(values), 'skipped': skipped}
+
+
+@app.cli.command('import-users')
+@click.argument('csv_path')
+@click.option('--hashed', is_flag=True, help='Passwords in the file are already hashed.')
+def import_users_command(csv_path, hashed):
+    """
+    Imports users from a CSV file with name, email and password columns.
+    """
+    with open(csv_path, newline='', encoding='utf-8') as file:
+        result = import_users(csv.DictReader(file), hashed=hashed)
+    click.echo(f"Imported {result['inserted']} users, skipped {result['skipped']}")
+
+
+# Create the database tables (and the email index on databases created before it existed)
 with app.app_context():
-    # Check if the database file exists
-    if not os.path.exists(config.SQLITE_DB_PATH):
-        db.create_all()
+    db.create_all()
+    with db.engine.begin() as connection:
+        connection.execute(CreateIndex(user_email_index, if_not_exists=True))
 
 # ***************************************************************
 
@@ -105,6 +322,12 @@ class MissingBackendError(Exception):
     """
 
 
+class PermissionException(Exception):
+    """
+    Handles Permission Exception
+    """
+
+
 # Exception handling routes
 @app.errorhandler(MySQLException)
 def handle_mysql_exception(error):
@@ -190,6 +413,120 @@ def handle_missing_backend_error(error):
     return jsonify(error=str(error)), 500
 
 
+@app.errorhandler(PermissionException)
+def handle_permission_exception(error):
+    """
+    Error handler for handling Permission exceptions.
+
+    Args:
+        error: The PermissionException object representing the error.
+
+    Returns:
+        A JSON response with the error message and a status code of 403 (Forbidden).
+    """
+    return jsonify(error=str(error)), 403
+
+
+def is_admin():
+    """
+    Checks whether the logged-in user is an admin.
+
+    Admins are listed by email in `config.ADMIN_EMAILS`.
+
+    Returns:
+        bool: True if the logged-in user is an admin, False otherwise.
+    """
+    admin_emails = getattr(config, 'ADMIN_EMAILS', ())
+    return session.get('logged_in', False) and session.get('email') in admin_emails
+
+
+def profiling_requested():
+    """
+    Checks whether the current request asks to be profiled and is allowed to be.
+
+    Profiling is requested with the `profile` query parameter or the `X-IPL-Profile`
+    header and is only honoured for admins.
+
+    Returns:
+        bool: True if the request should be profiled, False otherwise.
+    """
+    flag = request.args.get('profile') or request.headers.get('X-IPL-Profile')
+    return flag in ('1', 'true', 'yes') and is_admin()
+
+
+def requested_seasons():
+    """
+    Returns the season range requested with the `season`, `from` and `to` parameters.
+
+    Returns:
+        tuple: The inclusive (first, last) seasons, or None when no filter is requested.
+
+    Raises:
+        ValueErrorException: If a season parameter is invalid.
+    """
+    try:
+        return ipl.season_range(request.args.get('season'), request.args.get('from'),
+                                request.args.get('to'))
+    except ValueError as exception:
+        raise ValueErrorException(str(exception)) from exception
+
+
+def requested_phases():
+    """
+    Returns the innings phases requested with the `phase` parameter.
+
+    Returns:
+        tuple: The selected phase names, or None when no phase split is requested.
+
+    Raises:
+        ValueErrorException: If the phase parameter is invalid.
+    """
+    try:
+        return phases.select_phases(request.args.get('phase'))
+    except ValueError as exception:
+        raise ValueErrorException(str(exception)) from exception
+
+
+def requested_count(name, default):
+    """
+    Returns a non-negative integer query parameter.
+
+    Args:
+        name (str): The parameter name.
+        default (int): The value used when the parameter is missing (may be None).
+
+    Returns:
+        int: The parameter value.
+
+    Raises:
+        ValueErrorException: If the parameter is not a non-negative integer.
+    """
+    value = request.args.get(name)
+    if value is None or value == '':
+        return default
+    if not value.isdigit():
+        raise ValueErrorException(f"Invalid {name} '{value}', expected a non-negative integer")
+    return int(value)
+
+
+def requested_percentiles():
+    """
+    Returns the peer qualification of the percentile ranks requested with the
+    `percentiles`, `min_balls` and `min_innings` parameters.
+
+    Returns:
+        dict: The `min_balls` (None for the role's default) and `min_innings`, or None
+              when no percentile ranks are requested.
+
+    Raises:
+        ValueErrorException: If a qualification parameter is invalid.
+    """
+    if request.args.get('percentiles') not in ('1', 'true', 'yes'):
+        return None
+    return {'min_balls': requested_count('min_balls', None),
+            'min_innings': requested_count('min_innings', percentiles.MIN_INNINGS)}
+
+
 def handle_exceptions(function):
     """
     Decorator function for handling exceptions.
@@ -210,10 +547,19 @@ def handle_exceptions(function):
     def wrapper(*args, **kwargs):
         result = None  # Initialize result to avoid UnboundLocalError
         error = None   # Initialize error to avoid UnboundLocalError
+        profile = None
         status_code = 200
-        
+        start_time = time.perf_counter()
+
         try:
-            result = function(*args, **kwargs)
+            if profiling_requested():
+                result, profile = profiler.profile_call(
+                    function, *args, top_n=getattr(config, 'PROFILE_TOP_N', 25), **kwargs)
+            else:
+                result = function(*args, **kwargs)
+        except PermissionException as exception:
+            status_code = 403
+            error = str(exception)
         except MySQLException as exception:
             status_code = 500
             error = str(exception)
@@ -227,6 +573,24 @@ def handle_exceptions(function):
             status_code = 500
             error = str(exception)
 
+        # Offer the request to the slow request registry
+        duration = time.perf_counter() - start_time
+        params = {key: value for key, value in request.args.items() if key != 'profile'}
+        entry_id = slow_requests.record(request.path, params, duration, profile)
+
+        if profile is not None:
+            profile_dir = getattr(config, 'PROFILE_DIR', None)
+            if profile_dir:
+                profiler.save_profile(profile, profile_dir,
+                                      f'request-{entry_id or int(time.time())}')
+            profile_info = {
+                'id': entry_id,
+                'profiler': profile['profiler'],
+                'duration': profile['duration'],
+                'report': profile['report']
+            }
+            return jsonify(result=result, error=error, profile=profile_info), status_code
+
         return jsonify(result=result, error=error), status_code
 
     wrapper.__name__ = function.__name__
@@ -257,7 +621,7 @@ def login():
         password = request.form['password']
         try:
             # Get the user from the database
-            user = User.query.filter_by(email=email).first()
+            user = find_user_by_email(email)
 
             # If a user is found and the password matches
             if user and sha256_crypt.verify(password, user.password):
@@ -311,39 +675,43 @@ def register():
 
         user_name = request.form['name']
         password = request.form['password']
-        email = request.form['email']
+        email = utils.normalize_email(request.form['email'])
+
+        # Validate the form before touching the database
+        # If the email is not in the correct format, display an error message
+        if not utils.check_correct_email_format(email):
+            invalid_email = True
+            return render_template('register.html', invalid_email=invalid_email)
+
+        # If the registration form is incomplete, display an error message
+        if not user_name or not password or not email:
+            incomplete_form = True
+            return render_template('register.html', incomplete_form=incomplete_form)
 
         try:
-            # Check if email already exists
-            existing_user = User.query.filter_by(email=email).first()
-            
+            # Check if email already exists (a single indexed lookup)
             # If the email is already registered, display an error message on the registration page
-            if existing_user:
+            if find_user_by_email(email):
                 account_already_exist = True
                 return render_template('register.html', account_already_exist=account_already_exist)
 
-            # If the email is not in the correct format, display an error message
-            if not utils.check_correct_email_format(email):
-                invalid_email = True
-                return render_template('register.html', invalid_email=invalid_email)
-
-            # If the registration form is incomplete, display an error message
-            if not user_name or not password or not email:
-                incomplete_form = True
-                return render_template('register.html', incomplete_form=incomplete_form)
-
             # Hash the password
             hashed_password = sha256_crypt.hash(password)
-            
+
             # Create a new user
             new_user = User(name=user_name, email=email, password=hashed_password)
             db.session.add(new_user)
             db.session.commit()
-            
+
             # Registration successful
             register_success = True
             return render_template('login.html', register_success=register_success)
 
+        except IntegrityError:
+            # A concurrent registration inserted the same email first
+            db.session.rollback()
+            account_already_exist = True
+            return render_template('register.html', account_already_exist=account_already_exist)
         except Exception as e:
             db.session.rollback()
             return render_template('register.html', error=str(e))
@@ -383,7 +751,7 @@ def team1_vs_team2():
     if 'user_id' in session:
         team1 = request.args.get('team1')
         team2 = request.args.get('team2')
-        response = ipl.team1_vs_team2(team1, team2)
+        response = ipl.team1_vs_team2(team1, team2, requested_seasons())
         return response
     # Redirect to the login page if the user is not logged in
     return redirect(url_for('login'))
@@ -399,7 +767,7 @@ def team_all_records():
     # Check if the user is logged in
     if 'user_id' in session:
         team = request.args.get('team')
-        response = ipl.all_record(team)
+        response = ipl.all_record(team, requested_seasons())
         return response
     # Redirect to the login page if the user is not logged in
     return redirect(url_for('login'))
@@ -415,7 +783,7 @@ def team_api():
     """
     if 'user_id' in session:
         team = request.args.get('team')
-        json_response = ipl.team_api(team)
+        json_response = ipl.team_api(team, seasons=requested_seasons())
         # Parse the JSON string to a Python dictionary before returning
         parsed_response = json.loads(json_response)
         return parsed_response
@@ -432,7 +800,9 @@ def batsman_record():
     """
     if 'user_id' in session:
         batsman = request.args.get('batsman')
-        response = ipl.batsman_api(batsman)
+        response = ipl.batsman_api(batsman, seasons=requested_seasons(),
+                                   phase=requested_phases(),
+                                   percentile=requested_percentiles())
         return response
     # Redirect to the login page if the user is not logged in
     return redirect(url_for('login'))
@@ -448,12 +818,425 @@ def bowling_record():
     """
     if 'user_id' in session:
         bowler = request.args.get('bowler')
-        response = ipl.bowler_api(bowler)
+        response = ipl.bowler_api(bowler, seasons=requested_seasons(),
+                                  phase=requested_phases(),
+                                  percentile=requested_percentiles())
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Route for venues that have hosted IPL matches
+@app.route('/api/venues')
+@handle_exceptions
+def venues_played():
+    """
+    This function returns the venues that have hosted IPL matches.
+    """
+    if 'user_id' in session:
+        response = ipl.venues_played()
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the ground-level statistics of a venue
+@app.route('/api/venue-record')
+@handle_exceptions
+def venue_record():
+    """
+    This function takes a venue name as parameter and
+    returns the ground-level statistics of the venue.
+    """
+    if 'user_id' in session:
+        venue = request.args.get('venue')
+        response = ipl.venue_api(venue)
         return response
     # Redirect to the login page if the user is not logged in
     return redirect(url_for('login'))
 
 
+# Returns the ground-level statistics of all venues of a city
+@app.route('/api/city-record')
+@handle_exceptions
+def city_record():
+    """
+    This function takes a city name as parameter and
+    returns the ground-level statistics of its venues.
+    """
+    if 'user_id' in session:
+        city = request.args.get('city')
+        response = ipl.city_api(city)
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the record of a batter against a bowler
+@app.route('/api/matchup')
+@handle_exceptions
+def matchup():
+    """
+    This function takes a batter and a bowler name as parameters and
+    returns the batter's record against the bowler.
+    """
+    if 'user_id' in session:
+        batter = request.args.get('batter')
+        bowler = request.args.get('bowler')
+        response = ipl.matchup_api(batter, bowler)
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the best and worst matchups of a batter
+@app.route('/api/batter-matchups')
+@handle_exceptions
+def batter_matchups():
+    """
+    This function takes a batter name as parameter and returns the
+    bowlers the batter has scored fastest and slowest against.
+    """
+    if 'user_id' in session:
+        batter = request.args.get('batter')
+        response = ipl.batter_matchups_api(batter, requested_count('n', 5),
+                                           requested_count('min_balls', 12))
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the batters a bowler has dismissed most often
+@app.route('/api/bowler-bunnies')
+@handle_exceptions
+def bowler_bunnies():
+    """
+    This function takes a bowler name as parameter and returns the
+    batters the bowler has dismissed most often.
+    """
+    if 'user_id' in session:
+        bowler = request.args.get('bowler')
+        response = ipl.bowler_bunnies_api(bowler, requested_count('n', 5))
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns every partnership of two batters
+@app.route('/api/partnership')
+@handle_exceptions
+def partnership():
+    """
+    This function takes two batter names as parameters and
+    returns every partnership of the pair.
+    """
+    if 'user_id' in session:
+        player1 = request.args.get('player1')
+        player2 = request.args.get('player2')
+        response = ipl.partnership_api(player1, player2)
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the highest partnerships for each wicket
+@app.route('/api/top-partnerships')
+@handle_exceptions
+def top_partnerships():
+    """
+    This function takes an optional wicket as parameter and returns
+    the highest partnerships for that wicket, or for every wicket.
+    """
+    if 'user_id' in session:
+        response = ipl.top_partnerships_api(requested_count('wicket', None),
+                                            requested_count('n', 10))
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the most productive partners of a batter
+@app.route('/api/partners')
+@handle_exceptions
+def partners():
+    """
+    This function takes a batter name as parameter and returns the
+    batters the player has added the most partnership runs with.
+    """
+    if 'user_id' in session:
+        player = request.args.get('player')
+        response = ipl.partners_api(player, requested_count('n', 5))
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the matches a player appeared in and the teams represented
+@app.route('/api/player-appearances')
+@handle_exceptions
+def player_appearances():
+    """
+    This function takes a player name as parameter and returns the matches
+    the player appeared in and the teams the player represented.
+    """
+    if 'user_id' in session:
+        player = request.args.get('player')
+        response = ipl.appearances_api(player, requested_seasons())
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the players a player has shared the most XIs with
+@app.route('/api/teammates')
+@handle_exceptions
+def teammates():
+    """
+    This function takes a player name as parameter and returns the
+    players the player has shared the most XIs with.
+    """
+    if 'user_id' in session:
+        player = request.args.get('player')
+        response = ipl.teammates_api(player, requested_count('n', 10), requested_seasons())
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the fielding record of a player
+@app.route('/api/fielding-record')
+@handle_exceptions
+def fielding_record():
+    """
+    This function takes a player name as parameter and returns the
+    player's catches, stumpings and run-outs.
+    """
+    if 'user_id' in session:
+        player = request.args.get('player')
+        response = ipl.fielding_api(player, requested_seasons())
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the toss impact analytics
+@app.route('/api/toss-impact')
+@handle_exceptions
+def toss_impact():
+    """
+    This function takes an optional venue, team and breakdown (`by`) and returns
+    how often the toss winners, and each toss decision, won the match.
+    """
+    if 'user_id' in session:
+        venue = request.args.get('venue')
+        team = request.args.get('team')
+        try:
+            response = ipl.toss_api(venue, team, requested_seasons(), request.args.get('by'))
+        except ValueError as exception:
+            raise ValueErrorException(str(exception)) from exception
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the scoring record of a team
+@app.route('/api/team-scores')
+@handle_exceptions
+def team_scores():
+    """
+    This function takes a team name as parameter and returns the team's
+    scoring record: average, highest and lowest totals made and conceded.
+    """
+    if 'user_id' in session:
+        team = request.args.get('team')
+        response = ipl.team_scores_api(team, requested_seasons())
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the chase success rate by band of targets
+@app.route('/api/chase-by-target')
+@handle_exceptions
+def chase_by_target():
+    """
+    This function takes an optional band width and chasing team and returns
+    the chase success rate for every band of targets.
+    """
+    if 'user_id' in session:
+        team = request.args.get('team')
+        try:
+            response = ipl.chase_api(requested_count('band', 20), team, requested_seasons())
+        except ValueError as exception:
+            raise ValueErrorException(str(exception)) from exception
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the league-stage points tables
+@app.route('/api/points-table')
+@handle_exceptions
+def points_table():
+    """
+    This function returns the league-stage points table (played, won, lost,
+    no result, points and net run rate) of every season.
+    """
+    if 'user_id' in session:
+        response = ipl.points_table_api(requested_seasons())
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the players in the best form
+@app.route('/api/form-leaderboard')
+@handle_exceptions
+def form_leaderboard():
+    """
+    This function takes a role (batting or bowling), a window of innings (`last`)
+    and/or days, and returns the players in the best form over the window.
+    """
+    if 'user_id' in session:
+        try:
+            response = ipl.form_leaderboard_api(request.args.get('role', 'batting'),
+                                                requested_count('last', None),
+                                                requested_count('days', form.FORM_DAYS),
+                                                requested_count('n', 10),
+                                                request.args.get('sort'),
+                                                requested_count('min_innings', 1))
+        except ValueError as exception:
+            raise ValueErrorException(str(exception)) from exception
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the scorecard of a match
+@app.route('/api/match/<int:match_id>')
+@handle_exceptions
+def match_scorecard(match_id):
+    """
+    This function takes a match ID and returns the full scorecard of the match.
+    """
+    if 'user_id' in session:
+        response = ipl.match_api(match_id)
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the over-by-over progression of a match
+@app.route('/api/match/<int:match_id>/progression')
+@handle_exceptions
+def match_progression(match_id):
+    """
+    This function takes a match ID and returns the over-by-over progression of the match
+    (the worm and manhattan chart series).
+    """
+    if 'user_id' in session:
+        response = ipl.progression_api(match_id)
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Searches the matches
+@app.route('/api/match-search')
+@handle_exceptions
+def search_matches():
+    """
+    This function takes any combination of search criteria (each of which may be repeated
+    to select several values), a season filter and paging parameters, and returns the
+    matching matches with facet counts.
+    """
+    if 'user_id' in session:
+        criteria = {name: request.args.getlist(name)
+                    for name in match_search.CRITERIA if request.args.getlist(name)}
+        try:
+            response = ipl.match_search_api(criteria, requested_seasons(),
+                                            requested_count('page', 1),
+                                            requested_count('per_page', 20))
+        except ValueError as exception:
+            raise ValueErrorException(str(exception)) from exception
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Ingests live deliveries
+@app.route('/api/live/deliveries', methods=['POST'])
+@handle_exceptions
+def live_deliveries():
+    """
+    This function ingests live deliveries, sent as a JSON object or list
+    or as NDJSON, and pushes the updates to the live stream. Admins only.
+    """
+    if 'user_id' in session:
+        if not is_admin():
+            raise PermissionException('Admin access required')
+        try:
+            if request.is_json:
+                records = request.get_json()
+                records = records if isinstance(records, list) else [records]
+            else:
+                records = [json.loads(line) for line in
+                           request.get_data(as_text=True).splitlines() if line.strip()]
+            response = live_feed.ingest(records)
+        except ValueError as exception:
+            raise ValueErrorException(str(exception)) from exception
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the live scorecard of a match
+@app.route('/api/live/scorecard')
+@handle_exceptions
+def live_scorecard():
+    """
+    This function takes a match ID as parameter and
+    returns the live scorecard of the match.
+    """
+    if 'user_id' in session:
+        response = live_feed.scoreboard.scorecard(requested_count('match_id', None))
+        if response is None:
+            return {'response': 'No live data for this match'}
+        return response
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Streams live updates as Server-Sent Events
+@app.route('/api/live/stream')
+def live_stream():
+    """
+    This function streams the live scorecard deltas and updated player
+    records as Server-Sent Events, optionally for one match.
+    """
+    if 'user_id' in session:
+        match_id = request.args.get('match_id')
+        if match_id is not None and not match_id.isdigit():
+            return jsonify(result=None, error=f"Invalid match_id '{match_id}'"), 400
+        match_id = int(match_id) if match_id is not None else None
+        subscription = live_feed.broadcaster.subscribe(match_id)
+
+        def stream():
+            try:
+                yield live.format_event('subscribed', {'match_id': match_id})
+                while True:
+                    message = subscription.get(timeout=LIVE_HEARTBEAT_SECONDS)
+                    # A comment line keeps idle connections open through proxies
+                    yield message if message is not None else ': keep-alive\n\n'
+            finally:
+                live_feed.broadcaster.unsubscribe(subscription)
+
+        return Response(stream(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
 # Returns player suggestions based on search query
 @app.route('/api/player-suggestions')
 def player_suggestions():
@@ -479,6 +1262,53 @@ def player_suggestions():
     return redirect(url_for('login'))
 
 
+# Returns the slowest requests seen so far
+@app.route('/api/admin/slow-requests')
+@handle_exceptions
+def slow_request_list():
+    """
+    This function returns the slowest requests seen so far with their
+    parameters, duration and profile report. Admins only.
+    """
+    if 'user_id' in session:
+        if not is_admin():
+            raise PermissionException('Admin access required')
+        entries = []
+        for entry in slow_requests.entries():
+            profile = entry['profile']
+            entries.append({
+                'id': entry['id'],
+                'endpoint': entry['endpoint'],
+                'params': entry['params'],
+                'duration': entry['duration'],
+                'timestamp': entry['timestamp'],
+                'profiler': profile['profiler'] if profile else None,
+                'report': profile['report'] if profile else None
+            })
+        return entries
+    # Redirect to the login page if the user is not logged in
+    return redirect(url_for('login'))
+
+
+# Returns the collapsed stacks of a profiled request
+@app.route('/api/admin/slow-requests/<int:entry_id>/collapsed')
+def slow_request_collapsed(entry_id):
+    """
+    This function returns the flamegraph-compatible collapsed-stack
+    file of a profiled request. Admins only.
+    """
+    if 'user_id' in session:
+        if not is_admin():
+            return jsonify(result=None, error='Admin access required'), 403
+        entry = slow_requests.get(entry_id)
+        if entry is None or entry['profile'] is None:
+            return jsonify(result=None, error='Profile not found'), 404
+        return Response(entry['profile']['collapsed'], mimetype='text/plain',
+                        headers={'Content-Disposition':
+                                 f'attachment; filename=request-{entry_id}.collapsed'})
+    return redirect(url_for('login'))
+
+
 # Define the 404 error handler
 @app.errorhandler(404)
 def page_not_found(error):
@@ -0,0 +1,233 @@
+"""
+Player Appearances Module
+
+This module turns the playing XIs of the matches into a normalized appearance table.
+
+The matches data stores each XI as a stringified Python list in `Team1Players` and
+`Team2Players`. The lists are parsed once at load and exploded into one row per
+(match, team, player) appearance, with integer team and player codes. The table is
+stored sorted by player with CSR offsets, so a player's appearances are one slice, and
+the rows of every lineup (match and side) are indexed as well for teammate queries.
+Unlike the ball-by-ball data, the table also covers players who neither batted nor bowled
+in a match, so it is the source of "matches played".
+
+Classes:
+    AppearanceIndex: The appearance table with its player and lineup indexes.
+
+Functions:
+    parse_players: Parses a stringified list of players.
+
+Usage Example:
+
+    import ipl
+    from appearances import AppearanceIndex
+
+    index = AppearanceIndex(ipl.matches)
+    print(index.matches_played('MS Dhoni'))
+    print(index.player_record('MS Dhoni'))
+    print(index.teammates('MS Dhoni', n=5))
+"""
+
+import ast
+
+import numpy as np
+
+import kernels
+
+# Columns of the matches data holding the playing XIs, in side order
+PLAYER_LIST_COLUMNS = ['Team1Players', 'Team2Players']
+
+
+def parse_players(value):
+    """
+    Parses a stringified list of players (e.g. "['YBK Jaiswal', 'JC Buttler']").
+
+    Args:
+        value (str): The stringified list, or a missing value.
+
+    Returns:
+        list: The player names (empty for a missing or malformed value).
+    """
+    if not isinstance(value, str):
+        return []
+    try:
+        players = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return []
+    return [str(player) for player in players] if isinstance(players, (list, tuple)) else []
+
+
+class AppearanceIndex:
+    """
+    The (match, team, player) appearance table, sorted by player with CSR offsets, and
+    the CSR index of the lineup (match and side) rows.
+    """
+
+    def __init__(self, match_df):
+        """
+        Args:
+            match_df (pd.DataFrame): The matches data (with 'SeasonYear').
+        """
+        match_ids, sides, names = [], [], []
+        for side, column in enumerate(PLAYER_LIST_COLUMNS):
+            lineups = [parse_players(value) for value in match_df[column]]
+            sizes = [len(lineup) for lineup in lineups]
+            match_ids.append(np.repeat(np.arange(len(match_df)), sizes))
+            sides.append(np.full(sum(sizes), side))
+            names.append(np.array([name for lineup in lineups for name in lineup], dtype=object))
+        match_row = np.concatenate(match_ids)
+        side = np.concatenate(sides)
+        names = np.concatenate(names)
+
+        self.players = np.unique(names)
+        teams = match_df[['Team1', 'Team2']].to_numpy()
+        self.teams = np.unique(teams)
+        team_codes = kernels.encode(teams.ravel(), self.teams)[0].reshape(teams.shape)
+        self.lineup_team = team_codes.ravel()
+        player = kernels.encode(names, self.players)[0]
+
+        # Lineup index: the players of match row m and side s are the rows of key 2m + s
+        lineup = match_row * 2 + side
+        order = np.argsort(lineup, kind='stable')
+        self.lineup_players = player[order]
+        self.lineup_offsets = kernels.csr_offsets(lineup, len(match_df) * 2)
+
+        self.table = kernels.SortedColumns(player, {
+            'ID': match_df['ID'].to_numpy()[match_row],
+            'season': match_df['SeasonYear'].to_numpy()[match_row],
+            'team': team_codes[match_row, side],
+            'opponent': team_codes[match_row, 1 - side],
+            'lineup': lineup
+        }, len(self.players))
+
+    def __len__(self):
+        return len(self.table)
+
+    def player_code(self, player):
+        """
+        Returns the code of a player, or -1 if the player never appeared in an XI.
+
+        Args:
+            player (str): The player name.
+
+        Returns:
+            int: The player code.
+        """
+        if player is None:
+            return -1
+        return kernels.lookup(self.players, player)
+
+    def appearances(self, player, seasons=None):
+        """
+        Returns the appearances of a player, optionally within a season range.
+
+        Args:
+            player (str): The player name.
+            seasons (tuple): Optional inclusive (first, last) season range, either end of
+                which may be None.
+
+        Returns:
+            dict: Column name mapped to the player's values (match ID, season, team,
+                opponent and lineup), in match order.
+        """
+        rows = self.table.slice(self.player_code(player))
+        if seasons is not None:
+            first, last = seasons
+            mask = np.ones(len(rows['season']), dtype=bool)
+            if first is not None:
+                mask &= rows['season'] >= first
+            if last is not None:
+                mask &= rows['season'] <= last
+            rows = {name: values[mask] for name, values in rows.items()}
+        return rows
+
+    def matches_played(self, player, team=None, seasons=None):
+        """
+        Returns the number of matches a player appeared in.
+
+        Args:
+            player (str): The player name.
+            team (str): Only count matches against this team.
+            seasons (tuple): Optional inclusive (first, last) season range.
+
+        Returns:
+            int: The number of matches.
+        """
+        rows = self.appearances(player, seasons)
+        if team is None:
+            return len(rows['ID'])
+        return int(np.count_nonzero(rows['opponent'] == kernels.lookup(self.teams, team)))
+
+    def matches_against(self, player, seasons=None):
+        """
+        Returns the number of matches a player appeared in against every team.
+
+        Args:
+            player (str): The player name.
+            seasons (tuple): Optional inclusive (first, last) season range.
+
+        Returns:
+            dict: Team name mapped to the number of matches against it.
+        """
+        counts = kernels.group_count(self.appearances(player, seasons)['opponent'],
+                                     len(self.teams))
+        return {str(team): int(count) for team, count in zip(self.teams, counts)}
+
+    def player_record(self, player, seasons=None):
+        """
+        Returns the matches a player appeared in and the teams the player represented.
+
+        Args:
+            player (str): The player name.
+            seasons (tuple): Optional inclusive (first, last) season range.
+
+        Returns:
+            dict: The number of matches and, per team represented, its matches and first
+                and last seasons, or None if the player is unknown.
+        """
+        if self.player_code(player) < 0:
+            return None
+        rows = self.appearances(player, seasons)
+        teams = []
+        for code in np.unique(rows['team']):
+            seasons_played = rows['season'][rows['team'] == code]
+            teams.append({'team': str(self.teams[code]),
+                          'matches': len(seasons_played),
+                          'first_season': int(seasons_played.min()),
+                          'last_season': int(seasons_played.max())})
+        return {
+            'player': str(player),
+            'matches': len(rows['ID']),
+            'seasons': len(np.unique(rows['season'])),
+            'teams': teams
+        }
+
+    def teammates(self, player, n=10, seasons=None):
+        """
+        Returns the players a player has shared the most XIs with.
+
+        Args:
+            player (str): The player name.
+            n (int): Number of teammates returned.
+            seasons (tuple): Optional inclusive (first, last) season range.
+
+        Returns:
+            dict: The teammates with the number of matches played together, or None if
+                the player is unknown.
+        """
+        code = self.player_code(player)
+        if code < 0:
+            return None
+        lineups = self.appearances(player, seasons)['lineup']
+        # Gather the rows of all the player's lineups in one vectorized pass
+        starts = self.lineup_offsets[lineups]
+        sizes = self.lineup_offsets[lineups + 1] - starts
+        rows = np.repeat(starts - np.cumsum(sizes) + sizes, sizes) + np.arange(sizes.sum())
+        together = kernels.group_count(self.lineup_players[rows], len(self.players))
+        together[code] = 0
+        best = np.lexsort((np.arange(len(together)), -together))[:n]
+        return {
+            'player': str(player),
+            'teammates': [{'player': str(self.players[mate]), 'matches': int(together[mate])}
+                          for mate in best if together[mate] > 0]
+        }
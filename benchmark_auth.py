@@ -0,0 +1,148 @@
+"""
+Concurrency benchmark for the user store
+
+This script measures `/register` and `/login` throughput under concurrency, in-process
+through the Flask test client against a throwaway SQLite database, and times the bulk
+user import path. It reports throughput, median/p95/p99 latency and the number of
+"database is locked" failures per phase.
+
+Note that both routes hash or verify a sha256_crypt password, which is deliberately
+expensive; the numbers therefore mostly show whether the database adds stalls on top of
+the hashing cost, which is what the WAL/pool/busy-timeout settings address.
+
+Usage:
+    python benchmark_auth.py -u 200 -c 8
+    python benchmark_auth.py -u 200 -c 8 --bulk 10000 --json-out auth_bench.json
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import tempfile
+import threading
+import time
+
+from benchmark_ipl import percentile
+
+
+def run_phase(flask_app, name, requests_to_send, concurrency):
+    """
+    Sends form posts concurrently, one test client per worker thread.
+
+    Args:
+        flask_app (Flask): The application.
+        name (str): Phase name, for the report.
+        requests_to_send (list): (path, form data, expected status) tuples.
+        concurrency (int): Number of worker threads.
+
+    Returns:
+        dict: Throughput, latency percentiles and error counts of the phase.
+    """
+    local = threading.local()
+
+    def send(path, data, expected_status):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = flask_app.test_client()
+        start = time.perf_counter()
+        response = client.post(path, data=data)
+        elapsed = time.perf_counter() - start
+        body = response.get_data(as_text=True)
+        if path == '/login':
+            # Stay logged out so every request goes through the full login path
+            client.get('/logout')
+        return elapsed, response.status_code == expected_status, 'database is locked' in body
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda args: send(*args), requests_to_send))
+    total_time = time.perf_counter() - start
+
+    times = [elapsed for elapsed, _, _ in results]
+    return {
+        'phase': name,
+        'requests': len(results),
+        'concurrency': concurrency,
+        'total_time': total_time,
+        'throughput': len(results) / total_time if total_time else 0,
+        'p50': percentile(times, 50),
+        'p95': percentile(times, 95),
+        'p99': percentile(times, 99),
+        'failures': sum(1 for _, ok, _ in results if not ok),
+        'database_locked': sum(1 for _, _, locked in results if locked)
+    }
+
+
+def run_benchmark(users, concurrency, bulk):
+    """
+    Runs the register, login and bulk import phases against a throwaway database.
+
+    Args:
+        users (int): Number of users registered and logged in.
+        concurrency (int): Number of concurrent clients.
+        bulk (int): Number of users imported by the bulk import phase (0 to skip).
+
+    Returns:
+        list: One result dictionary per phase.
+    """
+    # app.py reads the database location at import time
+    os.environ['IPL_SQLITE_DB_PATH'] = os.path.join(tempfile.mkdtemp(prefix='ipl_auth_'),
+                                                    'users.db')
+    import app
+    from passlib.hash import sha256_crypt
+
+    credentials = [{'name': f'User {i}', 'email': f'User{i}@Example.com', 'password': f'pw-{i}'}
+                   for i in range(users)]
+    phases = []
+    print(f'Registering {users} users with {concurrency} clients ...', flush=True)
+    phases.append(run_phase(app.app, 'register',
+                            [('/register', data, 200) for data in credentials], concurrency))
+    print(f'Logging in {users} users with {concurrency} clients ...', flush=True)
+    logins = [('/login', {'email': data['email'].lower(), 'password': data['password']}, 302)
+              for data in credentials]
+    phases.append(run_phase(app.app, 'login', logins, concurrency))
+
+    if bulk:
+        print(f'Bulk importing {bulk} users ...', flush=True)
+        hashed = sha256_crypt.hash('bulk-password')
+        rows = [{'name': f'Bulk {i}', 'email': f'bulk{i}@example.com', 'password': hashed}
+                for i in range(bulk)]
+        with app.app.app_context():
+            start = time.perf_counter()
+            result = app.import_users(rows, hashed=True)
+            total_time = time.perf_counter() - start
+        phases.append({
+            'phase': 'bulk_import',
+            'requests': result['inserted'],
+            'concurrency': 1,
+            'total_time': total_time,
+            'throughput': result['inserted'] / total_time if total_time else 0,
+            'failures': result['skipped'],
+            'database_locked': 0
+        })
+    return phases
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark login and register throughput')
+    parser.add_argument('-u', '--users', type=int, default=100, help='Users to register and log in')
+    parser.add_argument('-c', '--concurrency', type=int, default=8, help='Concurrent clients')
+    parser.add_argument('--bulk', type=int, default=5000, help='Users to bulk import (0 to skip)')
+    parser.add_argument('--json-out', help='Write the results as JSON to this file')
+    args = parser.parse_args()
+
+    report = run_benchmark(args.users, args.concurrency, args.bulk)
+
+    print('\n===== User Store Benchmark =====')
+    print(f"{'phase':<12} {'requests':>8} {'req/s':>9} {'p50(ms)':>9} {'p99(ms)':>9} "
+          f"{'failed':>7} {'locked':>7}")
+    for phase in report:
+        print(f"{phase['phase']:<12} {phase['requests']:>8} {phase['throughput']:>9.1f} "
+              f"{phase.get('p50', 0) * 1000:>9.1f} {phase.get('p99', 0) * 1000:>9.1f} "
+              f"{phase['failures']:>7} {phase['database_locked']:>7}")
+
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=4)
+        print(f'\nResults saved to {args.json_out}')
@@ -0,0 +1,371 @@
+"""
+Microbenchmark suite for the IPL analytics functions
+
+This script times every analytics function in `ipl.py` in isolation (no HTTP, no Flask),
+together with the import-time data preparation. Player functions are timed for a light and a
+heavy player, team functions over every team, and the NumPy kernel implementations of the
+record functions next to their pandas reference versions. For each case it reports the
+median and p95 latency, operations per second and the peak Python memory allocated by one
+call, saves the results as JSON and compares them with a stored baseline, exiting with
+status 1 when a case regressed beyond the allowed threshold. Without a baseline the
+comparison is skipped, unless `--require-baseline` is given, which exits with
+status 2 instead.
+
+Usage:
+    python benchmark_ipl.py                       # run, save results, compare with baseline
+    python benchmark_ipl.py --save-baseline       # run and store the results as the baseline
+    python benchmark_ipl.py --require-baseline    # fail when there is no baseline to compare
+    python benchmark_ipl.py -f batsman_api -r 50  # only benchmark batsman_api, 50 repeats
+    python benchmark_ipl.py -f batsman_record batsman_record_pandas  # kernels vs pandas
+    python benchmark_ipl.py --matches datasets/synthetic/x10/ipl.csv \
+        --balls datasets/synthetic/x10/IPL_bowling_stats.csv  # run on a scaled dataset
+    python benchmark_ipl.py --backend sqlite -o bench_sqlite.json  # benchmark the SQL backend
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_OUTPUT = 'bench_results.json'
+DEFAULT_BASELINE = 'bench_baseline.json'
+
+
+def percentile(values, q):
+    """
+    Returns the q-th percentile of a list of values using linear interpolation.
+
+    Args:
+        values (list): The sample values.
+        q (float): The percentile, between 0 and 100.
+
+    Returns:
+        float: The percentile value, or 0 for an empty sample.
+    """
+    if not values:
+        return 0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(times, peak_memory, label):
+    """
+    Summarizes the timings of one benchmark case.
+
+    Args:
+        times (list): Per-call durations in seconds.
+        peak_memory (int): Peak memory allocated by one call, in bytes.
+        label (str): Description of the input used.
+
+    Returns:
+        dict: The case statistics.
+    """
+    median = statistics.median(times)
+    return {
+        'input': label,
+        'samples': len(times),
+        'median': median,
+        'p95': percentile(times, 95),
+        'min': min(times),
+        'max': max(times),
+        'ops_per_sec': 1 / median if median else None,
+        'peak_memory_bytes': peak_memory
+    }
+
+
+def measure(function, inputs, repeat):
+    """
+    Times a function over a list of inputs and measures its peak memory.
+
+    Every input is called `repeat` times. Peak memory is measured separately with
+    tracemalloc on a single call per input so that tracing does not skew the timings.
+
+    Args:
+        function (callable): The function to benchmark.
+        inputs (list): Argument tuples passed to the function.
+        repeat (int): Number of timed calls per input.
+
+    Returns:
+        tuple: The list of per-call durations and the peak memory in bytes.
+    """
+    # Warm-up call so lazy initialisation is not counted
+    function(*inputs[0])
+
+    times = []
+    for _ in range(repeat):
+        for args in inputs:
+            start = time.perf_counter()
+            function(*args)
+            times.append(time.perf_counter() - start)
+
+    peak_memory = 0
+    for args in inputs:
+        tracemalloc.start()
+        function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_memory = max(peak_memory, peak)
+    return times, peak_memory
+
+
+def pick_players(frame, column):
+    """
+    Picks a light and a heavy player from a ball-by-ball frame.
+
+    The heavy player is the one with the most deliveries; the light player sits at the
+    25th percentile of deliveries among all players in the column.
+
+    Args:
+        frame (DataFrame): Ball-by-ball data.
+        column (str): 'batter' or 'bowler'.
+
+    Returns:
+        dict: The 'light' and 'heavy' player names.
+    """
+    counts = frame[column].value_counts()
+    counts = counts.sort_index().sort_values(kind='stable')
+    return {
+        'light': counts.index[int((len(counts) - 1) * 0.25)],
+        'heavy': counts.index[-1]
+    }
+
+
+def build_cases(ipl):
+    """
+    Builds the benchmark cases for every analytics function.
+
+    Args:
+        ipl (module): The imported ipl module.
+
+    Returns:
+        dict: Case name mapped to a (function, inputs, label) tuple.
+    """
+    teams = list(ipl.teams)
+    batters = pick_players(ipl.batter_data, 'batter')
+    bowlers = pick_players(ipl.bowler_data, 'bowler')
+    opponent = 'Mumbai Indians' if 'Mumbai Indians' in teams else teams[0]
+
+    cases = {
+        'teams_played_ipl': (ipl.teams_played_ipl, [()], '-'),
+        'team1_vs_team2': (ipl.team1_vs_team2,
+                           [(team, opponent) for team in teams], f'every team vs {opponent}'),
+        'all_record': (ipl.all_record, [(team,) for team in teams], 'every team'),
+        'team_api': (ipl.team_api, [(team,) for team in teams], 'every team'),
+    }
+    for weight in ('light', 'heavy'):
+        batsman = batters[weight]
+        bowler = bowlers[weight]
+        cases[f'batsman_record[{weight}]'] = (
+            lambda name: ipl.batsman_record(name, ipl.batter_data), [(batsman,)], batsman)
+        cases[f'batsman_record_pandas[{weight}]'] = (
+            lambda name: ipl.batsman_record_pandas(name, ipl.batter_data), [(batsman,)], batsman)
+        cases[f'batsman_api[{weight}]'] = (ipl.batsman_api, [(batsman,)], batsman)
+        cases[f'bowler_record[{weight}]'] = (
+            lambda name: ipl.bowler_record(name, ipl.bowler_data), [(bowler,)], bowler)
+        cases[f'bowler_record_pandas[{weight}]'] = (
+            lambda name: ipl.bowler_record_pandas(name, ipl.bowler_data), [(bowler,)], bowler)
+        cases[f'bowler_api[{weight}]'] = (ipl.bowler_api, [(bowler,)], bowler)
+
+    # Season-filtered queries, which only touch the selected season's partition
+    season = int(ipl.season_years[-1])
+    seasons = (season, season)
+    cases['team_api[season]'] = (lambda name: ipl.team_api(name, seasons=seasons),
+                                 [(team,) for team in teams], f'every team, {season}')
+    cases['batsman_api[season]'] = (lambda name: ipl.batsman_api(name, seasons=seasons),
+                                    [(batters['heavy'],)], f"{batters['heavy']}, {season}")
+    cases['bowler_api[season]'] = (lambda name: ipl.bowler_api(name, seasons=seasons),
+                                   [(bowlers['heavy'],)], f"{bowlers['heavy']}, {season}")
+    return cases
+
+
+def run_benchmarks(repeat, functions=None, prepare_repeat=3):
+    """
+    Runs the benchmark suite.
+
+    Args:
+        repeat (int): Number of timed calls per input.
+        functions (list): Optional function names to restrict the run to.
+        prepare_repeat (int): Number of timed import-time preparations.
+
+    Returns:
+        dict: The benchmark report with 'meta' and 'results' sections.
+    """
+    results = {}
+
+    # Import-time preparation: loading the CSVs and building the derived frames
+    if not functions or 'prepare' in functions:
+        start = time.perf_counter()
+        ipl = importlib.import_module('ipl')
+        first_import = time.perf_counter() - start
+        times, peak = measure(lambda: importlib.reload(ipl), [()], prepare_repeat)
+        results['prepare'] = summarize([first_import] + times, peak, 'import ipl')
+    ipl = importlib.import_module('ipl')
+
+    for name, (function, inputs, label) in build_cases(ipl).items():
+        base_name = name.split('[')[0]
+        if functions and base_name not in functions:
+            continue
+        print(f'Benchmarking {name} ({label}) ...', flush=True)
+        times, peak = measure(function, inputs, repeat)
+        results[name] = summarize(times, peak, label)
+
+    meta = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'matches': len(ipl.matches),
+        'deliveries': len(ipl.balls),
+        'backend': ipl.backend.name,
+        # ru_maxrss is in KiB on Linux
+        'max_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    }
+    return {'meta': meta, 'results': results}
+
+
+def compare(current, baseline, threshold, memory_threshold):
+    """
+    Compares a benchmark report against a baseline report.
+
+    A case regresses when its median latency grows by more than `threshold`
+    or its peak memory by more than `memory_threshold` (both fractions).
+
+    Args:
+        current (dict): The current report.
+        baseline (dict): The baseline report.
+        threshold (float): Allowed relative growth of the median latency.
+        memory_threshold (float): Allowed relative growth of the peak memory.
+
+    Returns:
+        list: Descriptions of the regressions found.
+    """
+    regressions = []
+    for name, base in baseline['results'].items():
+        result = current['results'].get(name)
+        if result is None:
+            continue
+        if base['median'] and result['median'] > base['median'] * (1 + threshold):
+            regressions.append(f"{name}: median {result['median'] * 1000:.2f}ms vs "
+                               f"baseline {base['median'] * 1000:.2f}ms")
+        if (base['peak_memory_bytes'] and
+                result['peak_memory_bytes'] > base['peak_memory_bytes'] * (1 + memory_threshold)):
+            regressions.append(f"{name}: peak memory {result['peak_memory_bytes']} B vs "
+                               f"baseline {base['peak_memory_bytes']} B")
+    return regressions
+
+
+def print_report(report, baseline=None):
+    """
+    Prints a benchmark report as a table.
+
+    Args:
+        report (dict): The benchmark report.
+        baseline (dict): Optional baseline report, shown as a relative change.
+    """
+    print('\n===== Benchmark Results =====')
+    print(f"{'case':<28} {'median(ms)':>11} {'p95(ms)':>10} {'ops/s':>9} "
+          f"{'peak MiB':>9} {'vs base':>8}")
+    for name, result in report['results'].items():
+        change = ''
+        if baseline and name in baseline['results'] and baseline['results'][name]['median']:
+            ratio = result['median'] / baseline['results'][name]['median'] - 1
+            change = f'{ratio * 100:+.1f}%'
+        print(f"{name:<28} {result['median'] * 1000:>11.2f} {result['p95'] * 1000:>10.2f} "
+              f"{result['ops_per_sec'] or 0:>9.1f} "
+              f"{result['peak_memory_bytes'] / 2 ** 20:>9.2f} {change:>8}")
+
+    # NumPy kernel implementations against their pandas reference versions
+    speedups = []
+    for name, result in report['results'].items():
+        base_name, _, weight = name.partition('[')
+        reference = report['results'].get(f'{base_name}_pandas[{weight}')
+        if not base_name.endswith('_pandas') and reference and result['median']:
+            speedups.append(f"  {name}: {reference['median'] / result['median']:.1f}x faster "
+                            f"than pandas")
+    if speedups:
+        print('\nKernels vs pandas:')
+        print('\n'.join(speedups))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the IPL analytics functions')
+    parser.add_argument('-r', '--repeat', type=int, default=10,
+                        help='Timed calls per input')
+    parser.add_argument('-f', '--functions', nargs='*',
+                        help='Only benchmark these functions (e.g. prepare batsman_api)')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT,
+                        help='Where to save the JSON results')
+    parser.add_argument('-b', '--baseline', default=DEFAULT_BASELINE,
+                        help='Baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store the results as the new baseline')
+    parser.add_argument('--require-baseline', action='store_true',
+                        help='Exit with status 2 when the baseline is missing')
+    parser.add_argument('-t', '--threshold', type=float, default=0.25,
+                        help='Allowed relative median slowdown before failing')
+    parser.add_argument('--memory-threshold', type=float, default=0.25,
+                        help='Allowed relative peak memory growth before failing')
+    parser.add_argument('--matches', help='Matches CSV to load instead of the bundled one')
+    parser.add_argument('--balls', help='Ball-by-ball CSV to load instead of the bundled one')
+    parser.add_argument('--backend', choices=['numpy', 'pandas', 'sqlite', 'duckdb'],
+                        help='Analytics backend to benchmark (default: IPL_BACKEND or numpy)')
+    args = parser.parse_args()
+
+    # ipl.py reads its dataset locations from the environment at import time
+    if args.matches:
+        os.environ['IPL_MATCHES_PATH'] = args.matches
+    if args.balls:
+        os.environ['IPL_BALLS_PATH'] = args.balls
+    if args.backend:
+        os.environ['IPL_BACKEND'] = args.backend
+
+    # Fail before the (long) run when the comparison cannot happen
+    if args.require_baseline and not args.save_baseline and not os.path.exists(args.baseline):
+        print(f'No baseline found at {args.baseline}; run with --save-baseline to create one')
+        sys.exit(2)
+
+    bench_report = run_benchmarks(args.repeat, args.functions)
+
+    baseline_report = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline_report = json.load(file)
+
+    print_report(bench_report, baseline_report)
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(bench_report, file, indent=4)
+    print(f'\nResults saved to {args.output}')
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(bench_report, file, indent=4)
+        print(f'Baseline saved to {args.baseline}')
+        sys.exit(0)
+
+    if baseline_report is None:
+        print(f'No baseline found at {args.baseline}; run with --save-baseline to create one')
+        sys.exit(0)
+
+    found = compare(bench_report, baseline_report, args.threshold, args.memory_threshold)
+    if found:
+        print('\nREGRESSIONS:')
+        for line in found:
+            print(f'  {line}')
+        sys.exit(1)
+    print('\nNo regressions against the baseline')
+    sys.exit(0)
@@ -0,0 +1,202 @@
+"""
+Fielding and Dismissals Module
+
+This module credits fielders with their catches, stumpings and run-outs and breaks down
+how batters got out and how bowlers took their wickets, from the `kind` and
+`fielders_involved` columns of the ball-by-ball data.
+
+The wicket deliveries are extracted in one vectorized pass and the dismissal kinds are
+encoded as small integer codes. Three event tables are kept sorted by player with CSR
+offsets: dismissals by the batter dismissed, wickets by the bowler credited, and fielding
+credits by fielder (a run-out involving two fielders credits both). A breakdown is then a
+`np.bincount` over the kind codes of one player's slice, optionally restricted to a
+season range.
+
+Classes:
+    FieldingIndex: The dismissal and fielding event tables with their player indexes.
+
+Functions:
+    split_fielders: Splits a `fielders_involved` value into the fielders credited.
+
+Usage Example:
+
+    import ipl
+    from fielding import FieldingIndex
+
+    index = FieldingIndex(ipl.matches, ipl.bowler_data)
+    print(index.fielding_record('MS Dhoni'))
+    print(index.batter_dismissals('V Kohli'))
+    print(index.bowler_dismissals('JJ Bumrah', seasons=(2018, None)))
+"""
+
+import numpy as np
+
+import kernels
+
+# Fielding credit of each dismissal kind; 'caught and bowled' credits the bowler
+CATCH_KINDS = ('caught', 'caught and bowled')
+STUMPING_KINDS = ('stumped',)
+RUN_OUT_KINDS = ('run out',)
+
+# Suffix marking a substitute fielder in `fielders_involved`
+SUBSTITUTE_SUFFIX = ' (sub)'
+
+
+def split_fielders(value):
+    """
+    Splits a `fielders_involved` value into the fielders credited.
+
+    Args:
+        value (str): Comma-separated fielder names, or a missing value.
+
+    Returns:
+        list: The fielder names, with the substitute marker removed.
+    """
+    if not isinstance(value, str):
+        return []
+    return [name.strip().removesuffix(SUBSTITUTE_SUFFIX)
+            for name in value.split(',') if name.strip()]
+
+
+class FieldingIndex:
+    """
+    Dismissal and fielding events sorted by batter, bowler and fielder, with CSR offsets
+    over the player codes.
+    """
+
+    def __init__(self, match_df, ball_df):
+        """
+        Args:
+            match_df (pd.DataFrame): The matches data (with 'SeasonYear').
+            ball_df (pd.DataFrame): Ball-by-ball data with the bowling columns
+                (`ipl.bowler_data`).
+        """
+        balls = ball_df[ball_df.innings.isin([1, 2])]  # Excluding Super overs
+        wickets = balls[(balls['isWicketDelivery'] == 1) & balls['kind'].notna()]
+        season = match_df.set_index('ID')['SeasonYear'].reindex(wickets['ID']).to_numpy()
+        kind = wickets['kind'].to_numpy()
+        codes, self.kinds = kernels.encode(kind)
+
+        # Fielding credits: the fielders of catches, stumpings and run-outs, and the
+        # bowler of a caught and bowled
+        credits = wickets['fielders_involved'].map(split_fielders)
+        credits = credits.where(wickets['kind'] != 'caught and bowled',
+                                wickets['bowler'].map(lambda bowler: [bowler]))
+        credited = np.array([len(names) for names in credits])
+        fielders = np.array([name for names in credits for name in names], dtype=object)
+
+        self.players = np.unique(np.concatenate((
+            wickets['player_out'].dropna().to_numpy(), wickets['bowler'].to_numpy(),
+            fielders)).astype(str))
+        size = len(self.players)
+
+        def player_codes(values):
+            return kernels.encode(np.asarray(values, dtype=str), self.players)[0]
+
+        dismissed = wickets['player_out'].notna().to_numpy()
+        self.by_batter = kernels.SortedColumns(
+            player_codes(wickets['player_out'].to_numpy()[dismissed]),
+            {'kind': codes[dismissed], 'season': season[dismissed]}, size)
+        bowled = wickets['isBowlerWicket'].to_numpy() == 1
+        self.by_bowler = kernels.SortedColumns(
+            player_codes(wickets['bowler'].to_numpy()[bowled]),
+            {'kind': codes[bowled], 'season': season[bowled]}, size)
+        self.bowler_kinds = set(self.kinds[codes[bowled]])
+        self.by_fielder = kernels.SortedColumns(
+            player_codes(fielders),
+            {'kind': np.repeat(codes, credited), 'season': np.repeat(season, credited)}, size)
+
+    def player_code(self, player):
+        """
+        Returns the code of a player, or -1 if the player is in no dismissal.
+
+        Args:
+            player (str): The player name.
+
+        Returns:
+            int: The player code.
+        """
+        if player is None:
+            return -1
+        return kernels.lookup(self.players, player)
+
+    def _kind_counts(self, layout, player, seasons):
+        """
+        Returns the number of events of every kind in a player's slice of a layout.
+        """
+        rows = layout.slice(self.player_code(player))
+        kind = rows['kind']
+        if seasons is not None:
+            first, last = seasons
+            mask = np.ones(len(kind), dtype=bool)
+            if first is not None:
+                mask &= rows['season'] >= first
+            if last is not None:
+                mask &= rows['season'] <= last
+            kind = kind[mask]
+        return kernels.group_count(kind, len(self.kinds))
+
+    def _breakdown(self, counts, kinds):
+        """
+        Returns the counts of a set of kinds by name.
+        """
+        return {str(kind): int(counts[code])
+                for code, kind in enumerate(self.kinds) if kind in kinds}
+
+    def batter_dismissals(self, batter, seasons=None):
+        """
+        Returns how a batter got out, by dismissal kind.
+
+        Args:
+            batter (str): The batter name.
+            seasons (tuple): Optional inclusive (first, last) season range.
+
+        Returns:
+            dict: Dismissal kind mapped to the number of dismissals.
+        """
+        counts = self._kind_counts(self.by_batter, batter, seasons)
+        return self._breakdown(counts, self.kinds)
+
+    def bowler_dismissals(self, bowler, seasons=None):
+        """
+        Returns how a bowler took their wickets, by dismissal kind.
+
+        Args:
+            bowler (str): The bowler name.
+            seasons (tuple): Optional inclusive (first, last) season range.
+
+        Returns:
+            dict: Dismissal kind credited to bowlers mapped to the number of wickets.
+        """
+        counts = self._kind_counts(self.by_bowler, bowler, seasons)
+        return self._breakdown(counts, self.bowler_kinds)
+
+    def fielding_record(self, player, seasons=None):
+        """
+        Returns the catches, stumpings and run-outs of a player.
+
+        Args:
+            player (str): The player name.
+            seasons (tuple): Optional inclusive (first, last) season range.
+
+        Returns:
+            dict: The player's catches (including caught and bowled), stumpings,
+                run-outs and total dismissals as a fielder, or None if the player is
+                in no dismissal.
+        """
+        if self.player_code(player) < 0:
+            return None
+        counts = dict(zip(self.kinds, self._kind_counts(self.by_fielder, player, seasons)))
+
+        def total(kinds):
+            return int(sum(counts.get(kind, 0) for kind in kinds))
+
+        record = {
+            'player': str(player),
+            'catches': total(CATCH_KINDS),
+            'caught_and_bowled': total(['caught and bowled']),
+            'stumpings': total(STUMPING_KINDS),
+            'run_outs': total(RUN_OUT_KINDS)
+        }
+        record['dismissals'] = record['catches'] + record['stumpings'] + record['run_outs']
+        return record
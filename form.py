@@ -0,0 +1,361 @@
+"""
+Player Form Module
+
+This module answers form queries: a player's batting or bowling over the last N innings,
+or within a date window such as the last 12 months, and form leaderboards over the same
+windows.
+
+The ball-by-ball data (super overs excluded, as in the player records) is reduced once at
+load to one summary per (player, match) innings (runs, balls, dismissals, boundaries for
+batters; runs conceded, balls and wickets for bowlers), stored sorted by player and match
+date with CSR offsets over the players.
+Every summary column is kept as a prefix sum, so the totals of any window of a player's
+innings are one subtraction. A last-N window is an offset computation and a date window
+is a binary search over the (player, day) keys, vectorized across all players for the
+leaderboards.
+
+Classes:
+    FormIndex: The batting and bowling innings timelines of every player.
+
+Usage Example:
+
+    import ipl
+    from form import FormIndex
+
+    index = FormIndex(ipl.matches, ipl.bowler_data)
+    print(index.form('V Kohli', 'batting', last=10))
+    print(index.form('JJ Bumrah', 'bowling', days=365))
+    print(index.leaderboard('batting', last=10, n=5))
+"""
+
+import numpy as np
+import pandas as pd
+
+import kernels
+
+# Default windows of the `form` block of the player endpoints
+FORM_INNINGS = (5, 10)
+FORM_DAYS = 365
+
+ROLES = ('batting', 'bowling')
+
+# Leaderboard orderings of each role: metric name mapped to whether higher is better
+SORT_METRICS = {
+    'batting': {'runs': True, 'average': True, 'strike_rate': True},
+    'bowling': {'wickets': True, 'economy': False, 'average': False}
+}
+
+
+class _Timeline:
+    """
+    Per-innings summaries sorted by player and date, with CSR offsets over the players
+    and prefix sums of every summary column.
+    """
+
+    def __init__(self, player, match, day, match_id, columns, size):
+        order = np.lexsort((match, player))
+        self.offsets = kernels.csr_offsets(player, size)
+        self.day = day[order]
+        self.match_id = match_id[order]
+        self.values = {name: values[order] for name, values in columns.items()}
+        self.prefix = {name: np.concatenate(([0], np.cumsum(values)))
+                       for name, values in self.values.items()}
+        # (player, day) keys, sorted, for date windows
+        self.span = int(day.max(initial=0)) + 1
+        self.keys = player[order].astype(np.int64) * self.span + self.day
+
+    def bounds(self, players, last=None, since=None, until=None):
+        """
+        Returns the [start, end) innings rows of the window of every player.
+        """
+        players = np.asarray(players, dtype=np.int64)
+        start, end = self.offsets[players], self.offsets[players + 1]
+        if until is not None:
+            end = np.minimum(end, np.searchsorted(self.keys, players * self.span + until + 1))
+        if since is not None:
+            start = np.maximum(start, np.searchsorted(self.keys, players * self.span + since))
+        if last is not None:
+            start = np.maximum(start, end - last)
+        return start, np.maximum(start, end)
+
+    def totals(self, start, end):
+        """
+        Returns the sums of every summary column over [start, end) row ranges.
+        """
+        return {name: prefix[end] - prefix[start] for name, prefix in self.prefix.items()}
+
+
+class FormIndex:
+    """
+    Batting and bowling innings timelines of every player, ordered by match date.
+    """
+
+    def __init__(self, match_df, ball_df):
+        """
+        Args:
+            match_df (pd.DataFrame): The matches data.
+            ball_df (pd.DataFrame): Ball-by-ball data with the bowling columns
+                (`ipl.bowler_data`).
+        """
+        # Matches ranked by date, and their day numbers
+        dates = pd.to_datetime(match_df['Date']).to_numpy().astype('datetime64[D]')
+        order = np.lexsort((match_df['ID'].to_numpy(), dates))
+        self.match_ids = match_df['ID'].to_numpy()[order]
+        self.epoch = dates.min()
+        self.match_days = (dates[order] - self.epoch).astype(np.int64)
+        self.latest = dates.max()
+        id_order = np.argsort(self.match_ids)
+        sorted_ids = self.match_ids[id_order]
+
+        def match_rank(ids):
+            return id_order[np.searchsorted(sorted_ids, ids)]
+
+        balls = ball_df[ball_df['ID'].isin(self.match_ids) &
+                        ball_df['innings'].isin([1, 2])]  # Excluding Super overs
+        self.players = np.unique(np.concatenate((
+            balls['batter'].to_numpy(), balls['bowler'].to_numpy(),
+            balls['player_out'].dropna().to_numpy())).astype(str))
+        size = len(self.players)
+        rank = match_rank(balls['ID'].to_numpy())
+        extra_type = balls['extra_type'].astype(str).to_numpy()
+        legal = ~np.isin(extra_type, ('wides', 'noballs'))
+        runs = balls['batsman_run'].to_numpy()
+        boundary = balls['non_boundary'].to_numpy() == 0
+
+        def innings(player_codes, ranks, columns):
+            # Innings keys (player, match rank) and the column sums of every innings
+            keys = player_codes.astype(np.int64) * len(self.match_ids) + ranks
+            unique, inverse = np.unique(keys, return_inverse=True)
+            sums = {name: kernels.group_sum(inverse, values, len(unique)).astype(np.int64)
+                    for name, values in columns.items()}
+            player, match = np.divmod(unique, len(self.match_ids))
+            return player, match, sums
+
+        # Batting: the innings of every batter, including dismissals as non-striker. The
+        # player records only count the innings with a delivery on strike ('batted') and
+        # the dismissals on strike ('striker_outs')
+        batter = kernels.encode(balls['batter'].to_numpy().astype(str), self.players)[0]
+        out = balls['player_out'].notna().to_numpy()
+        out_player = kernels.encode(balls['player_out'].to_numpy()[out].astype(str),
+                                    self.players)[0]
+        zeros = np.zeros(np.count_nonzero(out), dtype=np.int64)
+        player, match, sums = innings(
+            np.concatenate((batter, out_player)), np.concatenate((rank, rank[out])), {
+                'runs': np.concatenate((runs, zeros)),
+                'balls': np.concatenate((legal.astype(np.int64), zeros)),
+                'outs': np.concatenate((np.zeros(len(runs), dtype=np.int64), zeros + 1)),
+                'fours': np.concatenate(((boundary & (runs == 4)).astype(np.int64), zeros)),
+                'sixes': np.concatenate(((boundary & (runs == 6)).astype(np.int64), zeros)),
+                'batted': np.concatenate((np.ones(len(runs), dtype=np.int64), zeros)),
+                'striker_outs': np.concatenate((
+                    (balls['player_out'].to_numpy() == balls['batter'].to_numpy())
+                    .astype(np.int64), zeros))
+            })
+        sums['innings'] = np.ones(len(player), dtype=np.int64)
+        sums['batted'] = (sums['batted'] > 0).astype(np.int64)
+        sums['fifties'] = ((sums['runs'] >= 50) & (sums['runs'] < 100)).astype(np.int64)
+        sums['hundreds'] = (sums['runs'] >= 100).astype(np.int64)
+        self.batting = _Timeline(player, match, self.match_days[match], self.match_ids[match],
+                                 sums, size)
+
+        # Bowling: the innings of every bowler
+        bowler = kernels.encode(balls['bowler'].to_numpy().astype(str), self.players)[0]
+        player, match, sums = innings(bowler, rank, {
+            'runs': balls['bowler_run'].to_numpy(),
+            'balls': legal.astype(np.int64),
+            'wickets': balls['isBowlerWicket'].to_numpy()
+        })
+        sums['innings'] = np.ones(len(player), dtype=np.int64)
+        sums['three_wickets'] = (sums['wickets'] >= 3).astype(np.int64)
+        self.bowling = _Timeline(player, match, self.match_days[match], self.match_ids[match],
+                                 sums, size)
+
+    def player_code(self, player):
+        """
+        Returns the code of a player, or -1 if the player never batted or bowled.
+
+        Args:
+            player (str): The player name.
+
+        Returns:
+            int: The player code.
+        """
+        if player is None:
+            return -1
+        return kernels.lookup(self.players, player)
+
+    def _window(self, days, as_of):
+        """
+        Returns the (since, until) day numbers of a window of days ending on a date (the
+        latest match date by default).
+        """
+        until = np.datetime64(as_of, 'D') if as_of is not None else self.latest
+        until = int((until - self.epoch).astype(np.int64))
+        return (until - days + 1 if days is not None else None), until
+
+    @staticmethod
+    def _stats(role, totals):
+        """
+        Returns the statistics of a role from the totals of a window (scalars or arrays).
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if role == 'batting':
+                return {
+                    'innings': totals['innings'], 'runs': totals['runs'],
+                    'balls': totals['balls'], 'not_out': totals['innings'] - totals['outs'],
+                    'average': totals['runs'] / totals['outs'],
+                    'strike_rate': totals['runs'] / totals['balls'] * 100,
+                    'fours': totals['fours'], 'sixes': totals['sixes'],
+                    'fifties': totals['fifties'], 'hundreds': totals['hundreds']
+                }
+            return {
+                'innings': totals['innings'], 'wickets': totals['wickets'],
+                'runs': totals['runs'], 'balls': totals['balls'],
+                'economy': totals['runs'] / totals['balls'] * 6,
+                'average': totals['runs'] / totals['wickets'],
+                'strike_rate': totals['balls'] / totals['wickets'],
+                '3+W': totals['three_wickets']
+            }
+
+    def player_stats(self, role, seasons=None):
+        """
+        Returns the statistics of every player over a season range, with the innings and
+        dismissals counted as in the player records (`ipl.batting_stats`): only innings
+        with a delivery on strike, and only dismissals on strike.
+
+        Args:
+            role (str): 'batting' or 'bowling'.
+            seasons (tuple): Optional inclusive (first, last) season range (the seasons are
+                the years the matches were played).
+
+        Returns:
+            dict: Statistic name mapped to an array aligned with `players` (NaN for
+                undefined rates).
+        """
+        first, last = seasons or (None, None)
+
+        def day(year, month_day):
+            if year is None:
+                return None
+            return int((np.datetime64(f'{int(year):04d}-{month_day}') - self.epoch)
+                       .astype(np.int64))
+
+        timeline = getattr(self, role)
+        start, end = timeline.bounds(np.arange(len(self.players)), None,
+                                     day(first, '01-01'), day(last, '12-31'))
+        totals = timeline.totals(start, end)
+        if role == 'batting':
+            totals = dict(totals, innings=totals['batted'], outs=totals['striker_outs'])
+        stats = self._stats(role, totals)
+        return {name: np.where(np.isfinite(values), values, np.nan)
+                if values.dtype.kind == 'f' else values for name, values in stats.items()}
+
+    def form(self, player, role, last=None, days=None, as_of=None):
+        """
+        Returns the form of a player over their last innings or a window of days.
+
+        Args:
+            player (str): The player name.
+            role (str): 'batting' or 'bowling'.
+            last (int): Only the last `last` innings (within the date window, if any).
+            days (int): Only the innings of the `days` days up to `as_of`.
+            as_of (str): The last date of the window (default: the latest match date).
+
+        Returns:
+            dict: The statistics of the window, its first and last match dates and the
+                scores (batting, '*' for not out) or figures (bowling) of its innings,
+                most recent first, or None if the player is unknown.
+
+        Raises:
+            ValueError: If the role is not supported.
+        """
+        if role not in ROLES:
+            raise ValueError(f"Invalid role '{role}', expected batting or bowling")
+        code = self.player_code(player)
+        if code < 0:
+            return None
+        timeline = getattr(self, role)
+        since, until = self._window(days, as_of)
+        start, end = timeline.bounds([code], last, since, until if days or as_of else None)
+        start, end = int(start[0]), int(end[0])
+        stats = {name: None if isinstance(value, float) and not np.isfinite(value) else value
+                 for name, value in self._stats(role, timeline.totals(start, end)).items()}
+        values = {name: column[start:end][::-1] for name, column in timeline.values.items()}
+        if role == 'batting':
+            innings = [f'{runs}' if outs else f'{runs}*'
+                       for runs, outs in zip(values['runs'], values['outs'])]
+        else:
+            innings = [f'{wickets}/{runs}'
+                       for wickets, runs in zip(values['wickets'], values['runs'])]
+        return {
+            **{name: value.item() if isinstance(value, np.generic) else value
+               for name, value in stats.items()},
+            'from': str(self.epoch + timeline.day[start]) if end > start else None,
+            'to': str(self.epoch + timeline.day[end - 1]) if end > start else None,
+            'scores' if role == 'batting' else 'figures': innings
+        }
+
+    def form_block(self, player, role):
+        """
+        Returns the default form windows of a player: the last 5 and 10 innings and the
+        last 12 months up to the latest match.
+
+        Args:
+            player (str): The player name.
+            role (str): 'batting' or 'bowling'.
+
+        Returns:
+            dict: Window name mapped to its form, or None if the player is unknown.
+        """
+        if self.player_code(player) < 0:
+            return None
+        block = {f'last_{count}': self.form(player, role, last=count) for count in FORM_INNINGS}
+        block['last_12_months'] = self.form(player, role, days=FORM_DAYS)
+        return block
+
+    def leaderboard(self, role, last=None, days=FORM_DAYS, n=10, sort=None, min_innings=1):
+        """
+        Returns the players in the best form over a window.
+
+        Args:
+            role (str): 'batting' or 'bowling'.
+            last (int): Only every player's last `last` innings within the date window.
+            days (int): Window of the `days` days up to the latest match (None for the
+                whole history).
+            n (int): Number of players returned.
+            sort (str): The metric ranked ('runs', 'average' or 'strike_rate' for batting,
+                'wickets', 'economy' or 'average' for bowling; the first by default).
+            min_innings (int): Minimum number of innings in the window.
+
+        Returns:
+            dict: The window and the top players with their statistics.
+
+        Raises:
+            ValueError: If the role or metric is not supported.
+        """
+        if role not in ROLES:
+            raise ValueError(f"Invalid role '{role}', expected batting or bowling")
+        metrics = SORT_METRICS[role]
+        sort = sort or next(iter(metrics))
+        if sort not in metrics:
+            raise ValueError(f"Invalid sort '{sort}', expected one of {', '.join(metrics)}")
+        timeline = getattr(self, role)
+        since, until = self._window(days, None)
+        start, end = timeline.bounds(np.arange(len(self.players)), last, since,
+                                     until if days else None)
+        stats = self._stats(role, timeline.totals(start, end))
+        metric = np.where(np.isfinite(stats[sort]), stats[sort], np.nan)
+        eligible = np.flatnonzero((stats['innings'] >= max(min_innings, 1)) & ~np.isnan(metric))
+        key = -metric[eligible] if metrics[sort] else metric[eligible]
+        best = eligible[np.lexsort((eligible, key))][:n]
+        return {
+            'role': role,
+            'last': last,
+            'days': days,
+            'sort': sort,
+            'players': [{'player': str(self.players[code]),
+                         **{name: (None if not np.isfinite(values[code]) else
+                                   float(values[code])) if values.dtype.kind == 'f'
+                            else int(values[code]) for name, values in stats.items()}}
+                        for code in best]
+        }
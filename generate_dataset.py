@@ -0,0 +1,263 @@
+"""
+Synthetic scaled dataset generator
+
+This script produces scaled-up copies of the IPL datasets (`ipl.csv` and the ball-by-ball
+file) with the same schemas, for scaling tests of `ipl.py`. The output holds `scale`
+"leagues": the first is the real data, and every further league is a seeded bootstrap
+sample of real matches (with their complete ball-by-ball records). Each league has its own
+team names and a configurable share of its own player names. Match IDs are renumbered
+uniquely. Team and player names are renamed consistently across `Team1`/`Team2`,
+`TossWinner`, `WinningTeam`, `Player_of_Match`, the `Team1Players`/`Team2Players` lists and
+every name column of the ball data, so referential integrity is preserved.
+
+Usage:
+    python generate_dataset.py --scale 10 --seed 42 -o datasets/synthetic/x10
+
+    # Point the analysis (benchmarks, load tests, the app) at the generated files
+    IPL_MATCHES_PATH=datasets/synthetic/x10/ipl.csv \\
+    IPL_BALLS_PATH=datasets/synthetic/x10/IPL_bowling_stats.csv python benchmark_ipl.py
+"""
+
+import argparse
+import ast
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+MATCH_TEAM_COLUMNS = ['Team1', 'Team2', 'TossWinner', 'WinningTeam']
+MATCH_PLAYER_LIST_COLUMNS = ['Team1Players', 'Team2Players']
+BALL_PLAYER_COLUMNS = ['batter', 'bowler', 'non-striker', 'player_out']
+MISSING = 'NA'
+
+
+def read_source(matches_path, balls_path):
+    """
+    Reads the source datasets as strings so that they round-trip unchanged.
+
+    Args:
+        matches_path (str): Path of the matches CSV.
+        balls_path (str): Path of the ball-by-ball CSV.
+
+    Returns:
+        tuple: The matches and balls DataFrames.
+    """
+    matches = pd.read_csv(matches_path, dtype=str, keep_default_na=False)
+    balls = pd.read_csv(balls_path, dtype=str, keep_default_na=False)
+    return matches, balls
+
+
+def league_mapping(names, tag, keep_fraction, rng):
+    """
+    Builds the renaming of a set of names for one synthetic league.
+
+    Args:
+        names (iterable): The original names.
+        tag (str): The league tag appended to renamed names.
+        keep_fraction (float): Share of names kept unchanged (e.g. overseas players
+            who play in several leagues).
+        rng (np.random.Generator): Random generator.
+
+    Returns:
+        dict: Original name mapped to its name in the league. 'NA' maps to itself.
+    """
+    names = sorted(set(names) - {MISSING, ''})
+    keep = rng.random(len(names)) < keep_fraction
+    mapping = {name: name if kept else f'{name} [{tag}]' for name, kept in zip(names, keep)}
+    mapping[MISSING] = MISSING
+    mapping[''] = ''
+    return mapping
+
+
+def rename_players_list(value, mapping):
+    """
+    Renames the players of a stringified list such as "['A', 'B']".
+
+    Args:
+        value (str): The stringified player list.
+        mapping (dict): The player renaming.
+
+    Returns:
+        str: The stringified list with renamed players.
+    """
+    if not value or value == MISSING:
+        return value
+    return str([mapping.get(name, name) for name in ast.literal_eval(value)])
+
+
+def rename_fielders(value, mapping):
+    """
+    Renames a `fielders_involved` value, which may list several comma-separated fielders.
+
+    Args:
+        value (str): The fielders value.
+        mapping (dict): The player renaming.
+
+    Returns:
+        str: The renamed fielders value.
+    """
+    if value in mapping:
+        return mapping[value]
+    return ', '.join(mapping.get(name, name) for name in value.split(', '))
+
+
+def match_row_ranges(balls):
+    """
+    Sorts the balls by match and indexes the row range of every match.
+
+    Args:
+        balls (DataFrame): The ball-by-ball data.
+
+    Returns:
+        tuple: The sorted balls, the sorted unique match IDs and the start offsets
+            (one more than the number of matches) of each match's rows.
+    """
+    ids = balls['ID'].astype(np.int64).to_numpy()
+    order = np.argsort(ids, kind='stable')
+    balls = balls.iloc[order].reset_index(drop=True)
+    ids = ids[order]
+    unique_ids, starts = np.unique(ids, return_index=True)
+    offsets = np.append(starts, len(ids))
+    return balls, unique_ids, offsets
+
+
+def generate(matches, balls, scale, seed=0, player_keep_fraction=0.3):
+    """
+    Generates the scaled dataset one league at a time.
+
+    Args:
+        matches (DataFrame): The source matches (read with `read_source`).
+        balls (DataFrame): The source ball-by-ball data (read with `read_source`).
+        scale (int): Multiple of the source data to generate.
+        seed (int): Seed of the random generator, for reproducibility.
+        player_keep_fraction (float): Share of players keeping their real names in
+            each synthetic league.
+
+    Yields:
+        tuple: The matches and balls DataFrames of each league. The first league is
+            the source data itself.
+    """
+    rng = np.random.default_rng(seed)
+    sorted_balls, ball_ids, offsets = match_row_ranges(balls)
+    match_ids = matches['ID'].astype(np.int64).to_numpy()
+    position = np.searchsorted(ball_ids, match_ids)
+    position = np.minimum(position, len(ball_ids) - 1)
+    has_balls = ball_ids[position] == match_ids
+    starts = np.where(has_balls, offsets[position], 0)
+    lengths = np.where(has_balls, offsets[np.minimum(position + 1, len(offsets) - 1)] - starts, 0)
+
+    teams = pd.unique(matches[['Team1', 'Team2']].to_numpy().ravel())
+    players = set()
+    for column in MATCH_PLAYER_LIST_COLUMNS:
+        for value in matches[column].unique():
+            if value and value != MISSING:
+                players.update(ast.literal_eval(value))
+    for column in BALL_PLAYER_COLUMNS:
+        players.update(sorted_balls[column].unique())
+    players.update(matches['Player_of_Match'].unique())
+
+    next_id = int(match_ids.max()) + 1
+    yield matches, balls
+
+    for league in range(1, scale):
+        tag = f'L{league}'
+        team_map = league_mapping(teams, tag, 0.0, rng)
+        player_map = league_mapping(players, tag, player_keep_fraction, rng)
+
+        # Bootstrap sample of real matches with fresh IDs
+        sample = rng.integers(0, len(matches), len(matches))
+        new_ids = np.arange(next_id, next_id + len(sample))
+        next_id += len(sample)
+
+        league_matches = matches.iloc[sample].copy()
+        league_matches['ID'] = new_ids.astype(str)
+        for column in MATCH_TEAM_COLUMNS:
+            league_matches[column] = league_matches[column].map(team_map)
+        league_matches['Player_of_Match'] = league_matches['Player_of_Match'].map(player_map)
+        for column in MATCH_PLAYER_LIST_COLUMNS:
+            league_matches[column] = [rename_players_list(value, player_map)
+                                      for value in league_matches[column]]
+
+        # Gather the sampled matches' contiguous ball ranges in one vectorized pass
+        sample_lengths = lengths[sample]
+        run_starts = np.repeat(starts[sample] - np.cumsum(sample_lengths) + sample_lengths,
+                               sample_lengths)
+        rows = run_starts + np.arange(sample_lengths.sum())
+        league_balls = sorted_balls.iloc[rows].copy()
+        league_balls['ID'] = np.repeat(new_ids, sample_lengths).astype(str)
+        league_balls['BattingTeam'] = league_balls['BattingTeam'].map(team_map)
+        for column in BALL_PLAYER_COLUMNS:
+            league_balls[column] = league_balls[column].map(player_map)
+        fielders = {value: rename_fielders(value, player_map)
+                    for value in league_balls['fielders_involved'].unique()}
+        league_balls['fielders_involved'] = league_balls['fielders_involved'].map(fielders)
+
+        yield league_matches, league_balls
+
+
+def write_dataset(matches, balls, output_dir, scale, seed=0, player_keep_fraction=0.3):
+    """
+    Generates a scaled dataset and writes it to a directory, one league at a time.
+
+    Args:
+        matches (DataFrame): The source matches.
+        balls (DataFrame): The source ball-by-ball data.
+        output_dir (str): Output directory. Receives `ipl.csv`,
+            `IPL_bowling_stats.csv` and a `manifest.json`.
+        scale (int): Multiple of the source data to generate.
+        seed (int): Seed of the random generator.
+        player_keep_fraction (float): Share of players keeping their real names.
+
+    Returns:
+        dict: The manifest describing the generated dataset.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    matches_path = os.path.join(output_dir, 'ipl.csv')
+    balls_path = os.path.join(output_dir, 'IPL_bowling_stats.csv')
+    total_matches = total_balls = 0
+    for league, (league_matches, league_balls) in enumerate(
+            generate(matches, balls, scale, seed, player_keep_fraction)):
+        mode = 'w' if league == 0 else 'a'
+        league_matches.to_csv(matches_path, mode=mode, header=league == 0, index=False)
+        league_balls.to_csv(balls_path, mode=mode, header=league == 0, index=False)
+        total_matches += len(league_matches)
+        total_balls += len(league_balls)
+        print(f'League {league + 1}/{scale}: {total_matches} matches, '
+              f'{total_balls} deliveries', flush=True)
+
+    manifest = {
+        'scale': scale,
+        'seed': seed,
+        'player_keep_fraction': player_keep_fraction,
+        'matches': total_matches,
+        'deliveries': total_balls,
+        'matches_path': matches_path,
+        'balls_path': balls_path
+    }
+    with open(os.path.join(output_dir, 'manifest.json'), 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=4)
+    return manifest
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a scaled synthetic IPL dataset')
+    parser.add_argument('-s', '--scale', type=int, default=10,
+                        help='Multiple of the real data to generate (e.g. 10, 100, 1000)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('-o', '--output-dir', default=None,
+                        help='Output directory (default: datasets/synthetic/x<scale>)')
+    parser.add_argument('--player-keep-fraction', type=float, default=0.3,
+                        help='Share of players keeping their real names in each league')
+    parser.add_argument('--matches', default=os.environ.get('IPL_MATCHES_PATH', 'datasets/ipl.csv'),
+                        help='Source matches CSV')
+    parser.add_argument('--balls', default=os.environ.get('IPL_BALLS_PATH',
+                                                          'datasets/IPL_bowling_stats.csv'),
+                        help='Source ball-by-ball CSV')
+    args = parser.parse_args()
+
+    source_matches, source_balls = read_source(args.matches, args.balls)
+    directory = args.output_dir or os.path.join('datasets', 'synthetic', f'x{args.scale}')
+    result = write_dataset(source_matches, source_balls, directory, args.scale,
+                           args.seed, args.player_keep_fraction)
+    print(json.dumps(result, indent=4))
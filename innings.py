@@ -0,0 +1,285 @@
+"""
+Innings Summary Module
+
+This module materializes one row per innings of the ball-by-ball data (super overs
+excluded): the match, season, batting and bowling teams, runs, wickets, legal balls,
+extras, fours and sixes, the target of a chase, the result for the batting team and
+whether the match was a league match.
+
+The table is built once at load with a single `np.add.reduceat` pass over the deliveries
+grouped by (match, innings), and stored as column arrays sorted by season, with an index
+on the season (CSR offsets) and on the batting and bowling teams (row permutations sorted
+by team, keeping the season order within a team). Team scoring records, chase analytics
+and the venue aggregates of `venues.py` read this table instead of regrouping the
+ball-by-ball data.
+
+Classes:
+    InningsTable: The innings summary table with its season and team indexes.
+
+Usage Example:
+
+    import ipl
+    from innings import InningsTable
+
+    table = InningsTable(ipl.matches, ipl.bowler_data)
+    print(table.team_scores('Chennai Super Kings'))
+    print(table.chases_by_target(band=20, seasons=(2018, None)))
+"""
+
+import numpy as np
+
+import kernels
+import match_search
+
+# Result of an innings for the batting team (a super over decides ties)
+RESULTS = ('won', 'lost', 'no result')
+WON, LOST, NO_RESULT = range(len(RESULTS))
+
+# Legal balls and wickets that complete an innings
+INNINGS_BALLS = 120
+ALL_OUT = 10
+
+
+class InningsTable:
+    """
+    One row per innings, stored column-wise sorted by season, with season and team indexes.
+    """
+
+    def __init__(self, match_df, ball_df):
+        """
+        Args:
+            match_df (pd.DataFrame): The matches data (with 'SeasonYear').
+            ball_df (pd.DataFrame): Ball-by-ball data with the bowling columns
+                (`ipl.bowler_data`).
+        """
+        balls = ball_df[ball_df.innings.isin([1, 2])]  # Excluding Super overs
+        order = np.lexsort((balls['innings'].to_numpy(), balls['ID'].to_numpy()))
+        match_id = balls['ID'].to_numpy()[order]
+        innings = balls['innings'].to_numpy()[order]
+        starts = kernels.run_starts(match_id * 2 + innings - 1)
+
+        def totals(values):
+            return kernels.run_sums(np.asarray(values)[order].astype(np.int64), starts)
+
+        extra_type = balls['extra_type'].astype(str).to_numpy()
+        boundary = balls['non_boundary'].to_numpy() == 0
+        runs = balls['batsman_run'].to_numpy()
+        columns = {
+            'ID': match_id[starts],
+            'innings': innings[starts],
+            'runs': totals(balls['total_run']),
+            'wickets': totals(balls['isWicketDelivery']),
+            'balls': totals(~np.isin(extra_type, ('wides', 'noballs'))),
+            'extras': totals(balls['extras_run']),
+            'fours': totals(boundary & (runs == 4)),
+            'sixes': totals(boundary & (runs == 6))
+        }
+        batting = balls['BattingTeam'].to_numpy()[order][starts]
+
+        # Match attributes: season, the other team and the result
+        match = match_df.set_index('ID').reindex(columns['ID'])
+        columns['season'] = match['SeasonYear'].to_numpy()
+        bowling = np.where(match['Team1'].to_numpy() == batting, match['Team2'].to_numpy(),
+                           match['Team1'].to_numpy())
+        winner = match['WinningTeam'].to_numpy()
+        columns['result'] = np.where(match['WinningTeam'].isna().to_numpy(), NO_RESULT,
+                                     np.where(winner == batting, WON, LOST))
+        columns['super_over'] = match['SuperOver'].to_numpy() == 'Y'
+        columns['league'] = (match['MatchNumber'].map(match_search.match_stage).to_numpy() ==
+                             match_search.LEAGUE_STAGE)
+
+        # Target of a chase: the first innings total of the same match plus one
+        first = columns['innings'] == 1
+        first_total = dict(zip(columns['ID'][first], columns['runs'][first]))
+        columns['target'] = np.array([first_total.get(match, -1) + 1 if number == 2 else 0
+                                      for match, number in zip(columns['ID'],
+                                                               columns['innings'])])
+
+        self.teams = np.unique(np.concatenate((batting, bowling)).astype(str))
+        columns['batting_team'] = kernels.encode(batting.astype(str), self.teams)[0]
+        columns['bowling_team'] = kernels.encode(bowling.astype(str), self.teams)[0]
+
+        # Rows sorted by season (then match and innings), with the season index
+        by_season = np.argsort(columns['season'], kind='stable')
+        self.columns = {name: values[by_season] for name, values in columns.items()}
+        season_codes, self.seasons = kernels.encode(self.columns['season'])
+        self.season_offsets = kernels.csr_offsets(season_codes, len(self.seasons))
+
+        # Team indexes: the rows of every batting and bowling team, in season order
+        rows = np.arange(len(by_season))
+        self.by_batting_team = kernels.SortedColumns(self.columns['batting_team'],
+                                                     {'row': rows}, len(self.teams))
+        self.by_bowling_team = kernels.SortedColumns(self.columns['bowling_team'],
+                                                     {'row': rows}, len(self.teams))
+
+        # (match, innings) keys in sorted order, for per-match lookups
+        keys = self.columns['ID'].astype(np.int64) * 2 + self.columns['innings'] - 1
+        self._key_order = np.argsort(keys, kind='stable')
+        self._keys = keys[self._key_order]
+
+    def __len__(self):
+        return len(self.columns['ID'])
+
+    def team_code(self, team):
+        """
+        Returns the code of a team, or -1 if the team never batted.
+
+        Args:
+            team (str): The team name.
+
+        Returns:
+            int: The team code.
+        """
+        if team is None:
+            return -1
+        return kernels.lookup(self.teams, team)
+
+    def rows(self, team=None, seasons=None, bowling=False):
+        """
+        Returns the rows of the innings of a team and/or a season range.
+
+        Args:
+            team (str): Only the innings batted (or bowled, see `bowling`) by this team.
+            seasons (tuple): Optional inclusive (first, last) season range.
+            bowling (bool): Select the innings the team bowled in instead.
+
+        Returns:
+            np.ndarray: The row numbers, in season order.
+        """
+        start, end = kernels.key_range(self.seasons, *(seasons or (None, None)))
+        first, last = int(self.season_offsets[start]), int(self.season_offsets[end])
+        if team is None:
+            return np.arange(first, last)
+        index = self.by_bowling_team if bowling else self.by_batting_team
+        rows = index.slice(self.team_code(team))['row']
+        return rows[np.searchsorted(rows, first):np.searchsorted(rows, last)]
+
+    def match_values(self, match_ids, innings, column):
+        """
+        Returns a column of one innings of every match.
+
+        Args:
+            match_ids (np.ndarray): The match IDs.
+            innings (int): The innings number (1 or 2).
+            column (str): The column name.
+
+        Returns:
+            np.ndarray: The values as floats, NaN for matches without the innings.
+        """
+        keys = np.asarray(match_ids, dtype=np.int64) * 2 + innings - 1
+        position = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        found = self._keys[position] == keys
+        values = np.full(len(keys), np.nan)
+        values[found] = self.columns[column][self._key_order[position[found]]]
+        return values
+
+    def _innings(self, row):
+        """
+        Returns the summary of one innings.
+        """
+        columns = self.columns
+        return {
+            'match_id': int(columns['ID'][row]),
+            'season': int(columns['season'][row]),
+            'innings': int(columns['innings'][row]),
+            'batting_team': str(self.teams[columns['batting_team'][row]]),
+            'bowling_team': str(self.teams[columns['bowling_team'][row]]),
+            'runs': int(columns['runs'][row]),
+            'wickets': int(columns['wickets'][row]),
+            'overs': f"{columns['balls'][row] // 6}.{columns['balls'][row] % 6}",
+            'result': RESULTS[columns['result'][row]]
+        }
+
+    def _extremes(self, rows):
+        """
+        Returns the highest total and the lowest completed total of a set of innings.
+        """
+        runs = self.columns['runs'][rows]
+        # Only innings that ended all out or after the full overs count as lowest totals
+        completed = rows[(self.columns['wickets'][rows] >= ALL_OUT) |
+                         (self.columns['balls'][rows] >= INNINGS_BALLS)]
+        return {
+            'highest': self._innings(rows[np.argmax(runs)]) if len(rows) else None,
+            'lowest': self._innings(completed[np.argmin(self.columns['runs'][completed])])
+            if len(completed) else None
+        }
+
+    def team_scores(self, team, seasons=None):
+        """
+        Returns the scoring record of a team: its totals batting first and second, its
+        highest and lowest totals and those it conceded.
+
+        Args:
+            team (str): The team name.
+            seasons (tuple): Optional inclusive (first, last) season range.
+
+        Returns:
+            dict: The team's scoring record, or None if the team is unknown.
+        """
+        if self.team_code(team) < 0:
+            return None
+        batted = self.rows(team, seasons)
+        bowled = self.rows(team, seasons, bowling=True)
+        columns = self.columns
+
+        def average(rows):
+            return float(columns['runs'][rows].mean()) if len(rows) else None
+
+        first = batted[columns['innings'][batted] == 1]
+        second = batted[columns['innings'][batted] == 2]
+        return {
+            'team': str(team),
+            'innings': len(batted),
+            'runs': int(columns['runs'][batted].sum()),
+            'avg_first_innings_score': average(first),
+            'avg_second_innings_score': average(second),
+            'avg_conceded': average(bowled),
+            'run_rate': float(columns['runs'][batted].sum() / columns['balls'][batted].sum() * 6)
+            if columns['balls'][batted].sum() else None,
+            'totals_200_plus': int(np.count_nonzero(columns['runs'][batted] >= 200)),
+            'fours': int(columns['fours'][batted].sum()),
+            'sixes': int(columns['sixes'][batted].sum()),
+            'extras_conceded': int(columns['extras'][bowled].sum()),
+            'batting': self._extremes(batted),
+            'conceded': self._extremes(bowled)
+        }
+
+    def chases_by_target(self, band=20, team=None, seasons=None):
+        """
+        Returns the chase success rate for every band of targets.
+
+        Args:
+            band (int): The width of the target bands in runs.
+            team (str): Only the chases of this team.
+            seasons (tuple): Optional inclusive (first, last) season range.
+
+        Returns:
+            dict: Per band of targets ('160-179'), the chases with a result, the chases
+                won and the success rate, or None if the team is unknown.
+
+        Raises:
+            ValueError: If the band width is not positive.
+        """
+        if band < 1:
+            raise ValueError(f"Invalid band '{band}', expected a positive number of runs")
+        if team is not None and self.team_code(team) < 0:
+            return None
+        rows = self.rows(team, seasons)
+        columns = self.columns
+        rows = rows[(columns['innings'][rows] == 2) & (columns['target'][rows] > 0) &
+                    (columns['result'][rows] != NO_RESULT)]
+        bands = columns['target'][rows] // band
+        first = int(bands.min()) if len(bands) else 0
+        chases = kernels.group_count(bands - first)
+        won = kernels.group_sum(bands - first, columns['result'][rows] == WON, len(chases))
+        return {
+            'team': team,
+            'band': band,
+            'chases': int(len(rows)),
+            'won': int(won.sum()),
+            'targets': [{'target': f'{(first + code) * band}-{(first + code + 1) * band - 1}',
+                         'chases': int(chases[code]),
+                         'won': int(won[code]),
+                         'win_pct': won[code] / chases[code] * 100}
+                        for code in range(len(chases)) if chases[code]]
+        }
@@ -6,17 +6,53 @@ It includes various functions to retrieve team records, player records, and head
 
 Classes:
     NpEncoder: Custom JSON encoder for handling NumPy data types.
+    PandasBackend: Answers the analytics queries with pandas over the in-memory frames.
+    NumpyBackend: Answers the player queries with NumPy kernels over player-sorted columns.
 
 Functions:
     teams_played_ipl: Returns information about the teams that have played in the IPL so far.
     team1_vs_team2: Returns the track record of Team 1 against Team 2 in IPL matches.
     all_record: Returns the record of a team against all other teams in IPL matches.
     team_api: Retrieves team statistics and records from the provided matches data.
+    batting_stats: Computes batting statistics from per-delivery arrays.
     batsman_record: Computes statistics for a given batsman based on the provided
         cricket match data.
     batsman_vs_team: Retrieves the record of a batsman against a specific team.
     batsman_api: Retrieves the API data for a batsman.
     bowler_run: Calculates the number of runs conceded by a bowler for a given delivery.
+    bowling_stats: Computes bowling statistics from per-delivery arrays.
+    batsman_phases: Computes the batting record of a batsman split by phase of the innings.
+    bowler_phases: Computes the bowling record of a bowler split by phase of the innings.
+    season_range: Returns the season range selected by a season or a from/to range.
+    team_scores_api: Returns the scoring record of a team from the innings table.
+    chase_api: Returns the chase success rate by band of targets.
+    points_table_api: Returns the league-stage points table of every season.
+    venues_played: Returns the venues that have hosted IPL matches.
+    venue_api: Returns the ground-level statistics of a venue.
+    city_api: Returns the ground-level statistics of all venues of a city.
+    toss_api: Returns the toss winners' results by venue, season, team and decision.
+    matchup_api: Returns the record of a batter against a bowler.
+    batter_matchups_api: Returns the bowlers a batter has scored fastest and slowest against.
+    bowler_bunnies_api: Returns the batters a bowler has dismissed most often.
+    partnership_api: Returns every partnership of two batters.
+    top_partnerships_api: Returns the highest partnerships for each wicket.
+    partners_api: Returns the batters a player has added the most partnership runs with.
+    appearances_api: Returns the matches a player appeared in and the teams represented.
+    teammates_api: Returns the players a player has shared the most XIs with.
+    fielding_api: Returns the catches, stumpings and run-outs of a player.
+    form_leaderboard_api: Returns the players in the best batting or bowling form.
+    peer_ranks: Returns the sorted peer statistics of a role, in a bounded cache.
+    match_api: Returns the full scorecard of a match.
+    progression_api: Returns the over-by-over progression (worm and manhattan) of a match.
+    match_search_api: Returns a page of the matches meeting a combination of criteria.
+    create_backend: Creates the analytics backend selected by name.
+
+Backends:
+    The team, batting and bowling queries are answered by `backend`, selected with the
+    IPL_BACKEND environment variable: 'numpy' (default) runs NumPy kernels over
+    player-sorted integer-coded columns, 'pandas' scans the in-memory frames, 'sqlite'
+    or 'duckdb' load the tables into an indexed, file-backed embedded SQL database
+    (IPL_SQL_PATH) and answer the same queries with SQL aggregates.
 
 Usage Example:
 
@@ -46,14 +82,72 @@ Usage Example:
 """
 
 
+import appearances
+import copy
+import fielding
+import form
+import functools
+import innings
+import hashlib
 import json
+import os
 import pandas as pd
 import numpy as np
 import math
+import kernels
+import match_search
+import matchups
+import partnerships
+import percentiles
+import phases
+import points
+import progression
+import scorecard
+import sql_backend
+import toss
+import venues
+
+# Dataset locations, overridable to point the analysis at other (e.g. synthetic) datasets
+MATCHES_PATH = os.environ.get('IPL_MATCHES_PATH', 'datasets/ipl.csv')
+BALLS_PATH = os.environ.get('IPL_BALLS_PATH', 'datasets/IPL_bowling_stats.csv')
+
+# Analytics backend: 'numpy', 'pandas', 'sqlite' or 'duckdb'
+BACKEND = os.environ.get('IPL_BACKEND', 'numpy')
+SQL_PATH = os.environ.get('IPL_SQL_PATH')
+
+# Precompute the over-by-over progression of every match at load ('0' computes on request)
+PRECOMPUTE_PROGRESSION = os.environ.get('IPL_PRECOMPUTE_PROGRESSION', '1') != '0'
+
+# Number of peer qualifications (role, seasons, minimum balls and innings) kept for
+# percentile ranks, least recently used first out
+PEER_RANKS_CACHE_SIZE = int(os.environ.get('IPL_PEER_RANKS_CACHE_SIZE', '64'))
+
+
+def dataset_version(*paths):
+    """
+    Returns a fingerprint of the dataset files, used to invalidate derived stores.
+
+    Args:
+        *paths (str): The dataset file paths.
+
+    Returns:
+        str: A short hash of each file's path, size and modification time.
+    """
+    digest = hashlib.sha1()
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f'{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+    return digest.hexdigest()[:16]
+
+
+DATASET_VERSION = dataset_version(MATCHES_PATH, BALLS_PATH)
 
 # Importing Datasets
-matches = pd.read_csv('datasets/ipl.csv')
-balls = pd.read_csv('datasets/IPL_bowling_stats.csv')
+matches = pd.read_csv(MATCHES_PATH)
+balls = pd.read_csv(BALLS_PATH)
+
+# Canonical season: the year the match was played ('Season' has values such as '2007/08')
+matches['SeasonYear'] = pd.to_datetime(matches['Date']).dt.year
 
 
 class NpEncoder(json.JSONEncoder):
@@ -99,12 +193,19 @@ class NpEncoder(json.JSONEncoder):
         return super(NpEncoder, self).default(o)
 
 
-ball_withmatch = balls.merge(matches, on='ID', how='inner').copy()
+# Playing XIs, parsed once into the appearance table; the raw lists are not merged into
+# the ball-by-ball rows
+appearance_index = appearances.AppearanceIndex(matches)
+
+ball_withmatch = balls.merge(matches.drop(columns=appearances.PLAYER_LIST_COLUMNS),
+                             on='ID', how='inner').copy()
 ball_withmatch['BowlingTeam'] = ball_withmatch.Team1 + ball_withmatch.Team2
 ball_withmatch['BowlingTeam'] = ball_withmatch[['BowlingTeam', 'BattingTeam']].apply(
     lambda x: x.values[0].replace(x.values[1], ''), axis=1)
+# Phase of the innings of every delivery: 0 powerplay, 1 middle overs, 2 death overs
+ball_withmatch['phase'] = phases.phase_codes(ball_withmatch['overs'])
 batter_data = ball_withmatch[np.append(
-    balls.columns.values, ['BowlingTeam', 'Player_of_Match'])]
+    balls.columns.values, ['BowlingTeam', 'Player_of_Match', 'phase'])]
 
 
 # Teams that have played IPL so far
@@ -124,66 +225,85 @@ def teams_played_ipl():
 
 
 teams = np.union1d(matches['Team1'], matches['Team2'])
+season_years = np.unique(matches['SeasonYear'])
+
+
+# Utils: Season filter
+def season_range(season=None, start=None, end=None):
+    """
+    Returns the season range selected by a single season or by a from/to range.
+
+    Args:
+        season (int or str): A single season (year). Takes precedence over start/end.
+        start (int or str): The first season of the range, or None for no lower bound.
+        end (int or str): The last season of the range, or None for no upper bound.
+
+    Returns:
+        tuple: The inclusive (first, last) seasons, either of which may be None,
+            or None when no filter is requested.
+
+    Raises:
+        ValueError: If a season is not a year, or no IPL season lies in the range.
+    """
+    def year(value, name):
+        if value is None or value == '':
+            return None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid {name} '{value}', expected a year such as 2016") from None
+
+    season = year(season, 'season')
+    if season is not None:
+        start = end = season
+    else:
+        start, end = year(start, 'from'), year(end, 'to')
+        if start is None and end is None:
+            return None
+    first, last = kernels.key_range(season_years, start, end)
+    if first == last:
+        raise ValueError(f'No IPL season between {start or "the first season"} '
+                         f'and {end or "the last season"}')
+    return start, end
+
+
 # Track record of each team against each other
 
 
-def team1_vs_team2(team1, team2):
+def team1_vs_team2(team1, team2, seasons=None):
     """
     Returns the track record of Team 1 against Team 2 in IPL matches.
 
     Args:
         team1 (str): Name of Team 1.
         team2 (str): Name of Team 2.
+        seasons (tuple): Optional (first, last) season range (see `season_range`).
 
     Returns:
         dict: Dictionary containing the total matches played, number of wins for Team 1,
               number of wins for Team 2, and the number of matches with no result.
     """
     if team1 in teams and team2 in teams:
-        temp_df = matches[((matches['Team1'] == team1) & (matches['Team2'] == team2))
-                          | ((matches['Team1'] == team2) & (matches['Team2'] == team1))]
-        total_matches_played = temp_df.shape[0]
-        team1_won = temp_df[temp_df['WinningTeam'] == team1].shape[0]
-        team2_won = temp_df[temp_df['WinningTeam'] == team2].shape[0]
-        no_result = total_matches_played - (team1_won + team2_won)
-
-        data = {
-            'total_matches_played': total_matches_played,
-            'team1_won': team1_won,
-            'team2_won': team2_won,
-            'no_result': no_result
-        }
-        return data
+        return backend.team1_vs_team2(team1, team2, seasons)
     return {'response': 'Invalid team name'}
 
 # Returns record of a team against all other teams
 
 
-def all_record(team):
+def all_record(team, seasons=None):
     """
     Returns the record of a team against all other teams in IPL matches.
 
     Args:
         team (str): Name of the team.
+        seasons (tuple): Optional (first, last) season range (see `season_range`).
 
     Returns:
         dict: Dictionary containing the number of matches played, number of wins, number of losses,
               number of matches with no result, and number of titles won by the team.
     """
     if team in teams:
-        df_matches = matches[(matches['Team1'] == team) | (
-            matches['Team2'] == team)].copy()
-        match_played = df_matches.shape[0]
-        won = df_matches[df_matches.WinningTeam == team].shape[0]
-        no_result = df_matches[df_matches.WinningTeam.isnull()].shape[0]
-        loss = match_played - won - no_result
-        no_of_title = df_matches[(df_matches.MatchNumber == 'Final') &
-                                 (df_matches.WinningTeam == team)].shape[0]
-        return {'matchesplayed': match_played,
-                'won': won,
-                'loss': loss,
-                'noResult': no_result,
-                'title': no_of_title}
+        return backend.all_record(team, seasons)
 
     return {
         'response': 'Invalid team name'
@@ -192,7 +312,7 @@ def all_record(team):
 # Utils: Complete team record
 
 
-def team_api(team, match=matches):
+def team_api(team, match=matches, seasons=None):
     """
     Retrieves team statistics and records from the provided matches data.
 
@@ -204,6 +324,7 @@ def team_api(team, match=matches):
         team (str): The name of the team for which statistics are to be generated.
         matches (DataFrame): The matches data containing information
         about the matches (default: matches).
+        seasons (tuple): Optional (first, last) season range (see `season_range`).
 
     Returns:
         str: A JSON string containing the team statistics and records.
@@ -229,18 +350,86 @@ def team_api(team, match=matches):
 
     """
     match[(match['Team1'] == team) | (match['Team2'] == team)].copy()
-    self_record = all_record(team)
+    self_record = all_record(team, seasons)
     unique_teams = match.Team1.unique()
-    against = {team2: team1_vs_team2(team, team2) for team2 in unique_teams}
+    against = {team2: team1_vs_team2(team, team2, seasons) for team2 in unique_teams}
     data = {team: {'overall': self_record,
                    'against': against}}
     return json.dumps(data, cls=NpEncoder, indent=4)
 
 
+# Utils: Batting statistics from per-delivery arrays
+def batting_stats(ids, runs, legal, dismissed, boundary, man_of_the_match):
+    """
+    Computes the batting statistics of a batsman from the deliveries they faced.
+
+    Args:
+        ids (np.ndarray): Match ID of every delivery.
+        runs (np.ndarray): Runs scored off the bat.
+        legal (np.ndarray): Whether the delivery counts as a ball faced (not a wide or no-ball).
+        dismissed (np.ndarray): Whether the batsman was dismissed on the delivery.
+        boundary (np.ndarray): Whether the runs were hit to the boundary.
+        man_of_the_match (np.ndarray): Whether the batsman was Man of the Match in that match.
+
+    Returns:
+        dict: The batting record (see `batsman_record`).
+    """
+    # Per-innings runs from the runs of equal match IDs
+    order = np.argsort(ids, kind='stable')
+    sorted_ids = ids[order]
+    innings_runs = kernels.run_sums(runs[order], kernels.run_starts(sorted_ids))
+    inngs = len(innings_runs)
+
+    total_runs = runs.sum()
+    balls = int(np.count_nonzero(legal))
+    dismissals = int(np.count_nonzero(dismissed))
+    avg = total_runs / dismissals if dismissals else None
+    strike_rate = (total_runs / balls) * 100 if balls else None
+
+    data = {
+        'innings': inngs,
+        'runs': total_runs,
+        'balls': balls,
+        'fours': int(np.count_nonzero(boundary & (runs == 4))),
+        'sixes': int(np.count_nonzero(boundary & (runs == 6))),
+        'avg': avg,
+        'strike_rate': strike_rate,
+        'fifties': int(np.count_nonzero((innings_runs >= 50) & (innings_runs < 100))),
+        'hundreds': int(np.count_nonzero(innings_runs >= 100)),
+        'highest_score': innings_runs.max() if inngs else 0,
+        'not_out': inngs - dismissals,
+        'man_of_the_match': kernels.count_unique(ids[man_of_the_match])
+    }
+    return data
+
+
 # Returns batsman record
 def batsman_record(batsman, data_frame):
     """
     Compute statistics for a given batsman based on the provided dataframe of cricket matches.
+
+    Only the batsman's rows are gathered into NumPy arrays; the statistics are computed
+    with the kernels of `kernels.py` (see `batsman_record_pandas` for the pandas version).
+    """
+    if data_frame.empty:
+        return pd.NaT
+
+    rows = np.flatnonzero(data_frame['batter'].to_numpy() == batsman)
+
+    def column(name):
+        return data_frame[name].to_numpy()[rows]
+
+    extra_type = column('extra_type')
+    return batting_stats(column('ID'), column('batsman_run'),
+                         (extra_type != 'wides') & (extra_type != 'noballs'),
+                         column('player_out') == batsman,
+                         column('non_boundary') == 0,
+                         column('Player_of_Match') == batsman)
+
+
+def batsman_record_pandas(batsman, data_frame):
+    """
+    Reference pandas implementation of `batsman_record`, kept for parity tests and benchmarks.
     """
     if data_frame.empty:
         return pd.NaT
@@ -352,8 +541,31 @@ def batsman_vs_team(batsman, team, input_df):
     return batsman_record(batsman, input_df)
 
 
+# Utils: Batting record split by phase of the innings
+def batsman_phases(batsman, data_frame):
+    """
+    Computes the per-phase (powerplay, middle, death) batting numbers of a batsman.
+
+    Args:
+        batsman (str): The name of the batsman.
+        data_frame (DataFrame): Ball-by-ball data with a 'phase' column.
+
+    Returns:
+        dict: Phase name mapped to the runs, balls, dismissals and strike rate.
+    """
+    rows = np.flatnonzero(data_frame['batter'].to_numpy() == batsman)
+
+    def column(name):
+        return data_frame[name].to_numpy()[rows]
+
+    extra_type = column('extra_type')
+    return phases.batting_phases(column('phase'), column('batsman_run'),
+                                 (extra_type != 'wides') & (extra_type != 'noballs'),
+                                 column('player_out') == batsman)
+
+
 # Complete batsman record
-def batsman_api(batsman, total_balls=batter_data):
+def batsman_api(batsman, total_balls=batter_data, seasons=None, phase=None, percentile=None):
     """
     Retrieves the API data for a batsman.
 
@@ -366,6 +578,12 @@ def batsman_api(batsman, total_balls=batter_data):
     Args:
         batsman (str): The name of the batsman for whom the API data is to be retrieved.
         balls (DataFrame): The DataFrame containing the ball data.
+        seasons (tuple): Optional (first, last) season range (see `season_range`).
+        phase (tuple): Optional phase names (see `phases.select_phases`). When given, a
+            'phases' block splits the record, overall and against each team, by phase.
+        percentile (dict): Optional peer qualification (`min_balls` and `min_innings`).
+            When given, a 'percentiles' block ranks the overall record among the
+            qualified batters.
 
     Returns:
         str: The API data for the batsman, serialized as a JSON string.
@@ -392,25 +610,59 @@ def batsman_api(batsman, total_balls=batter_data):
             to calculate the batsman's record and the record against each team, respectively.
 
     """
+    # The configured backend answers queries over the default data,
+    # any other frame is analysed with pandas
+    if total_balls is batter_data:
+        source = backend
+    else:
+        source = PandasBackend(matches, total_balls, total_balls)
+
     # Get the batsman's record.
-    ball_df = total_balls[total_balls.innings.isin([1, 2])]  # Excluding Super overs
-    self_record = batsman_record(batsman, data_frame=ball_df)
+    self_record = source.batsman_record(batsman, seasons=seasons)
 
     # Get the batsman's record against each team.
     team_unique = matches.Team1.unique()
-    against = {team: batsman_vs_team(batsman, team, ball_df)
+    against = {team: source.batsman_record(batsman, team, seasons)
                for team in team_unique}
 
+    # Matches played, from the playing XIs (including matches the batsman did not bat in)
+    played = appearance_index.matches_against(batsman, seasons)
+    self_record = dict(self_record, matches=sum(played.values()))
+    against = {team: dict(record, matches=played.get(team, 0))
+               for team, record in against.items()}
+
     # Return the JSON object.
     data = {
         batsman: {'all': self_record,
-                  'against': against}
+                  'against': against,
+                  'dismissals': fielding_index.batter_dismissals(batsman, seasons),
+                  'form': form_index.form_block(batsman, 'batting')}
     }
+
+    # Get the phase splits, overall and against each team.
+    if phase:
+        def selected(split):
+            return {name: split[name] for name in phase}
+
+        data[batsman]['phases'] = {
+            'all': selected(source.batsman_phases(batsman, seasons=seasons)),
+            'against': {team: selected(source.batsman_phases(batsman, team, seasons))
+                        for team in team_unique}
+        }
+
+    # Rank the overall record among the qualified batters
+    if percentile is not None:
+        data[batsman]['percentiles'] = peer_ranks('batting', seasons,
+                                                  **percentile).percentiles(self_record)
     return json.dumps(data, cls=NpEncoder, indent=4)
 
 
 bowler_data = batter_data.copy()
 
+# Extras that are not conceded by the bowler, and dismissals credited to the bowler
+NON_BOWLER_EXTRAS = ['penalty', 'legbyes', 'byes']
+BOWLER_WICKET_KINDS = ['caught', 'caught and bowled', 'bowled', 'stumped', 'lbw', 'hit wicket']
+
 #  Utils: Bowler run
 
 
@@ -430,7 +682,7 @@ def bowler_run(tup_x):
         bowler_run(('wides', 1))  # Returns 1
         bowler_run(('byes', 2))  # Returns 0
     """
-    if tup_x.iloc[0] in ['penalty', 'legbyes', 'byes']:
+    if tup_x.iloc[0] in NON_BOWLER_EXTRAS:
         return 0
     return tup_x.iloc[1]
 
@@ -456,7 +708,7 @@ def bowler_wicket(tup_x):
         bowler_wicket(('caught', 1))  # Returns 1
         bowler_wicket(('run out', 0))  # Returns 0
     """
-    if tup_x.iloc[0] in ['caught', 'caught and bowled', 'bowled', 'stumped', 'lbw', 'hit wicket']:
+    if tup_x.iloc[0] in BOWLER_WICKET_KINDS:
         return tup_x.iloc[1]
     return 0
 
@@ -464,11 +716,103 @@ def bowler_wicket(tup_x):
 bowler_data['isBowlerWicket'] = bowler_data[[
     'kind', 'isWicketDelivery']].apply(bowler_wicket, axis=1)
 
+# Dismissal kinds and fielding credits, indexed by batter, bowler and fielder
+fielding_index = fielding.FieldingIndex(matches, bowler_data)
+
+# Batting and bowling innings of every player in date order, with prefix sums for form
+form_index = form.FormIndex(matches, bowler_data)
+
+
+# Sorted peer statistics for percentile ranks, in a bounded cache keyed by dataset version
+@functools.lru_cache(maxsize=PEER_RANKS_CACHE_SIZE)
+def _peer_ranks(version, role, seasons, min_balls, min_innings):
+    """
+    Builds the peers of a qualification; `version` (the dataset version) only keys the cache.
+    """
+    return percentiles.PeerRanks(form_index, role, seasons, min_balls, min_innings)
+
+
+def peer_ranks(role, seasons=None, min_balls=None, min_innings=percentiles.MIN_INNINGS):
+    """
+    Returns the sorted statistics of the qualified players of a role.
+
+    The peers of a qualification are built on first use and kept in a bounded LRU cache
+    (`IPL_PEER_RANKS_CACHE_SIZE` qualifications) under the dataset version, since the
+    qualification comes from the query string. The peers come from the form index, which
+    live batches do not update, so live deliveries are not ranked until a reload.
+
+    Args:
+        role (str): 'batting' or 'bowling'.
+        seasons (tuple): Optional (first, last) season range (see `season_range`).
+        min_balls (int): Minimum balls faced or bowled to qualify (default per role).
+        min_innings (int): Minimum innings to qualify.
+
+    Returns:
+        percentiles.PeerRanks: The peers of the role.
+    """
+    return _peer_ranks(DATASET_VERSION, role, seasons, min_balls, min_innings)
+
+
 #  Utils: Complete bowler record against all teams
 
 
+#  Utils: Bowling statistics from per-delivery arrays
+def bowling_stats(ids, runs_conceded, legal, wickets, batsman_runs, boundary, man_of_the_match):
+    """
+    Computes the bowling statistics of a bowler from the deliveries they bowled.
+
+    Args:
+        ids (np.ndarray): Match ID of every delivery.
+        runs_conceded (np.ndarray): Runs conceded by the bowler (`bowler_run`).
+        legal (np.ndarray): Whether the delivery counts as a ball (not a wide or no-ball).
+        wickets (np.ndarray): Wickets credited to the bowler (`isBowlerWicket`).
+        batsman_runs (np.ndarray): Runs scored off the bat.
+        boundary (np.ndarray): Whether the runs were hit to the boundary.
+        man_of_the_match (np.ndarray): Whether the bowler was Man of the Match in that match.
+
+    Returns:
+        dict: The bowling record (see `bowler_record`).
+    """
+    # Per-match wickets and runs from the runs of equal match IDs
+    order = np.argsort(ids, kind='stable')
+    starts = kernels.run_starts(ids[order])
+    match_wickets = kernels.run_sums(wickets[order], starts)
+    match_runs = kernels.run_sums(runs_conceded[order], starts)
+
+    nballs = int(np.count_nonzero(legal))
+    runs = runs_conceded.sum()
+    wicket = wickets.sum()
+    eco = runs / nballs * 6 if nballs else 0
+    avg = runs / wicket if wicket else None
+    strike_rate = nballs / wicket * 100 if wicket else None
+
+    # Best figure: most wickets, then fewest runs
+    best_figure = None
+    if len(starts):
+        best = np.lexsort((match_runs, -match_wickets))[0]
+        best_figure = f'{match_wickets[best]}/{match_runs[best]}'
+
+    data = {
+        'innings': len(starts),
+        'wicket': wicket,
+        'economy': eco,
+        'average': avg,
+        'avg': avg,
+        'strike_rate': strike_rate,
+        'fours': int(np.count_nonzero(boundary & (batsman_runs == 4))),
+        'sixes': int(np.count_nonzero(boundary & (batsman_runs == 6))),
+        'best_figure': best_figure,
+        '3+W': int(np.count_nonzero(match_wickets >= 3)),
+        'man_of_the_match': kernels.count_unique(ids[man_of_the_match])
+    }
+    return data
+
+
 def bowler_record(bowler, match_df):
     """
+    Computes the bowling statistics of a bowler with the kernels of `kernels.py`
+    (see `bowler_record_pandas` for the pandas version).
+
     Args:
         - bowler_name (str): Name of the bowler for whom the statistics are to be calculated.
         - match_df (pd.DataFrame): Dataframe containing the cricket match data.
@@ -488,6 +832,23 @@ def bowler_record(bowler, match_df):
         - man_of_the_match (int): Total number of times the bowler
             was awarded the Man of the Match award.
     """
+    rows = np.flatnonzero(match_df['bowler'].to_numpy() == bowler)
+
+    def column(name):
+        return match_df[name].to_numpy()[rows]
+
+    extra_type = column('extra_type')
+    return bowling_stats(column('ID'), column('bowler_run'),
+                         (extra_type != 'wides') & (extra_type != 'noballs'),
+                         column('isBowlerWicket'), column('batsman_run'),
+                         column('non_boundary') == 0,
+                         column('Player_of_Match') == bowler)
+
+
+def bowler_record_pandas(bowler, match_df):
+    """
+    Reference pandas implementation of `bowler_record`, kept for parity tests and benchmarks.
+    """
 
     match_df = match_df[match_df['bowler'] == bowler]
     inngs = match_df.ID.unique().shape[0]
@@ -571,14 +932,43 @@ def bowler_vs_team(bowler, team, data_frame):
     return bowler_stats
 
 
+#  Utils: Bowling record split by phase of the innings
+def bowler_phases(bowler, match_df):
+    """
+    Computes the per-phase (powerplay, middle, death) bowling numbers of a bowler.
+
+    Args:
+        bowler (str): Name of the bowler.
+        match_df (pd.DataFrame): Ball-by-ball data with the bowling columns and 'phase'.
+
+    Returns:
+        dict: Phase name mapped to the runs conceded, balls, wickets and economy.
+    """
+    rows = np.flatnonzero(match_df['bowler'].to_numpy() == bowler)
+
+    def column(name):
+        return match_df[name].to_numpy()[rows]
+
+    extra_type = column('extra_type')
+    return phases.bowling_phases(column('phase'), column('bowler_run'),
+                                 (extra_type != 'wides') & (extra_type != 'noballs'),
+                                 column('isBowlerWicket'))
+
+
 # Complete bowler record all and against
-def bowler_api(bowler, total_balls=bowler_data):
+def bowler_api(bowler, total_balls=bowler_data, seasons=None, phase=None, percentile=None):
     """
     Generates an API response containing the performance statistics of a bowler.
 
     Parameters:
         bowler (str): Name of the bowler.
         balls (pd.DataFrame): DataFrame containing the ball-by-ball data. Defaults to `bowler_data`.
+        seasons (tuple): Optional (first, last) season range (see `season_range`).
+        phase (tuple): Optional phase names (see `phases.select_phases`). When given, a
+            'phases' block splits the record, overall and against each team, by phase.
+        percentile (dict): Optional peer qualification (`min_balls` and `min_innings`).
+            When given, a 'percentiles' block ranks the overall record among the
+            qualified bowlers.
 
     Returns:
         str: JSON-formatted API response containing the performance statistics of the bowler.
@@ -589,27 +979,888 @@ def bowler_api(bowler, total_balls=bowler_data):
 
     """
 
-    # Filter the DataFrame to exclude super overs
-    data_frame = total_balls[total_balls['innings'].isin([1, 2])]
+    # The configured backend answers queries over the default data,
+    # any other frame is analysed with pandas
+    if total_balls is bowler_data:
+        source = backend
+    else:
+        source = PandasBackend(matches, total_balls, total_balls)
 
     # Retrieve the performance statistics of the bowler against all teams
-    self_record = bowler_record(bowler, match_df=data_frame)
+    self_record = source.bowler_record(bowler, seasons=seasons)
 
     # Get the unique teams from the matches data
     unique_teams = matches['Team1'].unique()
 
     # Calculate the performance statistics of the bowler against each team
-    against = {team: bowler_vs_team(bowler, team, data_frame) for team in unique_teams}
+    against = {team: source.bowler_record(bowler, team, seasons) for team in unique_teams}
+
+    # Matches played, from the playing XIs (including matches the bowler did not bowl in)
+    played = appearance_index.matches_against(bowler, seasons)
+    self_record = dict(self_record, matches=sum(played.values()))
+    against = {team: dict(record, matches=played.get(team, 0))
+               for team, record in against.items()}
 
     # Create the response data in the required format
     data = {
         bowler: {
             'all': self_record,
-            'against': against
+            'against': against,
+            'dismissals': fielding_index.bowler_dismissals(bowler, seasons),
+            'form': form_index.form_block(bowler, 'bowling')
         }
     }
 
+    # Calculate the phase splits, overall and against each team
+    if phase:
+        def selected(split):
+            return {name: split[name] for name in phase}
+
+        data[bowler]['phases'] = {
+            'all': selected(source.bowler_phases(bowler, seasons=seasons)),
+            'against': {team: selected(source.bowler_phases(bowler, team, seasons))
+                        for team in unique_teams}
+        }
+
+    # Rank the overall record among the qualified bowlers
+    if percentile is not None:
+        data[bowler]['percentiles'] = peer_ranks('bowling', seasons,
+                                                 **percentile).percentiles(self_record)
+
     # Convert the data to JSON format
     response = json.dumps(data, cls=NpEncoder, indent=4)
 
     return response
+
+
+# Innings summaries (one row per innings), materialized once at load
+innings_table = innings.InningsTable(matches, bowler_data)
+
+
+def team_scores_api(team, seasons=None):
+    """
+    Returns the scoring record of a team.
+
+    Args:
+        team (str): Name of the team.
+        seasons (tuple): Optional (first, last) season range (see `season_range`).
+
+    Returns:
+        dict: The team's innings, runs, average first- and second-innings scores, run
+              rate, 200+ totals, and its highest and lowest totals made and conceded.
+    """
+    record = innings_table.team_scores(team, seasons)
+    if record is None:
+        return {'response': 'Invalid team name'}
+    return record
+
+
+def chase_api(band=20, team=None, seasons=None):
+    """
+    Returns the chase success rate by band of targets.
+
+    Args:
+        band (int): The width of the target bands in runs.
+        team (str): Optional name of the chasing team.
+        seasons (tuple): Optional (first, last) season range (see `season_range`).
+
+    Returns:
+        dict: For every band of targets, the chases with a result, the chases won and the
+              success rate.
+
+    Raises:
+        ValueError: If the band width is not positive.
+    """
+    record = innings_table.chases_by_target(band, team, seasons)
+    if record is None:
+        return {'response': 'Invalid team name'}
+    return record
+
+
+# League-stage points tables of all seasons, built once per dataset version
+_points_tables = {}
+
+
+def points_table_api(seasons=None):
+    """
+    Returns the league-stage points table of every season.
+
+    The tables of all seasons are built in one pass on first use and cached under the
+    dataset version; the tables of older versions are dropped. They are built from the
+    loaded innings table, which live batches do not update, so live matches are not
+    included until the dataset is reloaded.
+
+    Args:
+        seasons (tuple): Optional (first, last) season range (see `season_range`).
+
+    Returns:
+        dict: Season mapped to its points table: for every team, the matches played, won,
+              lost and without result, points and net run rate.
+    """
+    version = DATASET_VERSION
+    tables = _points_tables.get(version)
+    if tables is None:
+        tables = points.points_tables(matches, innings_table)
+        _points_tables.clear()
+        tables = _points_tables.setdefault(version, tables)
+    first, last = seasons or (None, None)
+    return {
+        'seasons': {season: table for season, table in tables.items()
+                    if (first is None or season >= first) and (last is None or season <= last)}
+    }
+
+
+# Venue partitions and per-venue aggregates, computed once at load
+venue_index = venues.VenueIndex(matches, bowler_data, innings_table=innings_table)
+
+
+def venues_played():
+    """
+    Returns the venues that have hosted IPL matches, under their canonical names.
+
+    Returns:
+        dict: Dictionary containing the total number of venues and, for each venue,
+              its city and number of matches.
+    """
+    venue_list = venue_index.venue_list()
+    return {
+        'total_number_of_venues': len(venue_list),
+        'venues': venue_list
+    }
+
+
+def venue_api(venue):
+    """
+    Returns the ground-level statistics of a venue.
+
+    Args:
+        venue (str): Name of the venue. Any variant of the name is accepted
+            (e.g. 'Wankhede Stadium' or 'Wankhede Stadium, Mumbai').
+
+    Returns:
+        dict: The average first- and second-innings scores, the chasing record, the toss
+              decision outcomes and the top batters and bowlers at the venue.
+    """
+    record = venue_index.venue_record(venue)
+    if record is None:
+        return {'response': 'Invalid venue name'}
+    return record
+
+
+def city_api(city):
+    """
+    Returns the ground-level statistics of all venues of a city.
+
+    Args:
+        city (str): Name of the city.
+
+    Returns:
+        dict: The statistics of `venue_api`, over every venue of the city.
+    """
+    record = venue_index.city_record(city)
+    if record is None:
+        return {'response': 'Invalid city name'}
+    return record
+
+
+# Toss crosstabs over (season, venue, team, toss outcome, decision, result)
+toss_index = toss.TossIndex(matches, venue_index)
+
+
+def toss_api(venue=None, team=None, seasons=None, by=None):
+    """
+    Returns how often winning the toss, and each toss decision, led to winning the match.
+
+    Args:
+        venue (str): Optional name of the venue (any variant).
+        team (str): Optional name of a team, whose results are given both when it won and
+            when it lost the toss.
+        seasons (tuple): Optional (first, last) season range (see `season_range`).
+        by (str): Optional breakdown by 'season', 'venue' or 'team'.
+
+    Returns:
+        dict: The matches won, lost and without result by the toss winners, overall and
+              per toss decision, with the breakdown if requested.
+
+    Raises:
+        ValueError: If the breakdown is not supported.
+    """
+    record = toss_index.toss_record(venue, team, seasons, by)
+    if record is None:
+        return {'response': 'Invalid venue or team name'}
+    return record
+
+
+matchup_index = matchups.MatchupIndex(bowler_data)
+
+
+def matchup_api(batter, bowler):
+    """
+    Returns the record of a batter against a bowler.
+
+    Args:
+        batter (str): Name of the batter.
+        bowler (str): Name of the bowler.
+
+    Returns:
+        dict: The balls, runs, dismissals, dots, fours, sixes, strike rate, average and
+              dot-ball percentage of the batter against the bowler.
+    """
+    record = matchup_index.pair_record(batter, bowler)
+    if record is None:
+        return {'response': 'Invalid player name'}
+    return record
+
+
+def batter_matchups_api(batter, n=5, min_balls=12):
+    """
+    Returns the bowlers a batter has scored fastest and slowest against.
+
+    Args:
+        batter (str): Name of the batter.
+        n (int): Number of matchups returned at each end.
+        min_balls (int): Minimum balls faced against a bowler for the matchup to be ranked.
+
+    Returns:
+        dict: The batter's `top` and `bottom` matchups by strike rate.
+    """
+    record = matchup_index.batter_matchups(batter, n, min_balls)
+    if record is None:
+        return {'response': 'Invalid batsman name'}
+    return record
+
+
+def bowler_bunnies_api(bowler, n=5):
+    """
+    Returns the batters a bowler has dismissed most often.
+
+    Args:
+        bowler (str): Name of the bowler.
+        n (int): Number of batters returned.
+
+    Returns:
+        dict: The bowler's `bunnies`, by dismissals and then fewest runs conceded.
+    """
+    record = matchup_index.bowler_bunnies(bowler, n)
+    if record is None:
+        return {'response': 'Invalid bowler name'}
+    return record
+
+
+partnership_index = partnerships.PartnershipIndex(batter_data)
+
+
+def partnership_api(player1, player2):
+    """
+    Returns every partnership of two batters.
+
+    Args:
+        player1 (str): Name of the first batter.
+        player2 (str): Name of the second batter.
+
+    Returns:
+        dict: The number of partnerships, their total runs and balls, the highest one,
+              and the history of the pair's partnerships in match order.
+    """
+    record = partnership_index.pair_history(player1, player2)
+    if record is None:
+        return {'response': 'Invalid batsman name'}
+    return record
+
+
+def top_partnerships_api(wicket=None, n=10):
+    """
+    Returns the highest partnerships for a wicket, or for every wicket.
+
+    Args:
+        wicket (int): The wicket (1 for opening partnerships), or None for every wicket.
+        n (int): Number of partnerships returned per wicket.
+
+    Returns:
+        dict: Wicket mapped to its highest partnerships.
+    """
+    return partnership_index.top_partnerships(wicket, n)
+
+
+def partners_api(player, n=5):
+    """
+    Returns the batters a player has added the most partnership runs with.
+
+    Args:
+        player (str): Name of the batter.
+        n (int): Number of partners returned.
+
+    Returns:
+        dict: The player's partners with their partnerships, runs and highest partnership.
+    """
+    record = partnership_index.top_partners(player, n)
+    if record is None:
+        return {'response': 'Invalid batsman name'}
+    return record
+
+
+def appearances_api(player, seasons=None):
+    """
+    Returns the matches a player appeared in and the teams the player represented.
+
+    Args:
+        player (str): Name of the player.
+        seasons (tuple): Optional (first, last) season range (see `season_range`).
+
+    Returns:
+        dict: The number of matches and seasons played and, per team represented, its
+              matches and first and last seasons.
+    """
+    record = appearance_index.player_record(player, seasons)
+    if record is None:
+        return {'response': 'Invalid player name'}
+    return record
+
+
+def teammates_api(player, n=10, seasons=None):
+    """
+    Returns the players a player has shared the most XIs with.
+
+    Args:
+        player (str): Name of the player.
+        n (int): Number of teammates returned.
+        seasons (tuple): Optional (first, last) season range (see `season_range`).
+
+    Returns:
+        dict: The teammates with the number of matches played together.
+    """
+    record = appearance_index.teammates(player, n, seasons)
+    if record is None:
+        return {'response': 'Invalid player name'}
+    return record
+
+
+def fielding_api(player, seasons=None):
+    """
+    Returns the catches, stumpings and run-outs of a player.
+
+    Args:
+        player (str): Name of the player.
+        seasons (tuple): Optional (first, last) season range (see `season_range`).
+
+    Returns:
+        dict: The player's catches (including caught and bowled), stumpings, run-outs
+              and total dismissals as a fielder.
+    """
+    record = fielding_index.fielding_record(player, seasons)
+    if record is None:
+        return {'response': 'Invalid player name'}
+    return record
+
+
+def form_leaderboard_api(role='batting', last=None, days=form.FORM_DAYS, n=10, sort=None,
+                         min_innings=1):
+    """
+    Returns the players in the best batting or bowling form.
+
+    Args:
+        role (str): 'batting' or 'bowling'.
+        last (int): Only every player's last `last` innings within the date window.
+        days (int): The window of days up to the latest match (None for all matches).
+        n (int): Number of players returned.
+        sort (str): The metric ranked (see `form.SORT_METRICS`).
+        min_innings (int): Minimum number of innings in the window.
+
+    Returns:
+        dict: The window and the top players with their form statistics.
+
+    Raises:
+        ValueError: If the role or metric is not supported.
+    """
+    return form_index.leaderboard(role, last, days, n, sort, min_innings)
+
+
+# Ball-by-ball data ordered by match, with a match ID -> row range index
+match_index = scorecard.MatchIndex(matches, bowler_data)
+
+
+def match_api(match_id):
+    """
+    Returns the full scorecard of a match.
+
+    Args:
+        match_id (int): The match ID.
+
+    Returns:
+        dict: The result of the match and, for every innings, the batting card, the
+              bowling figures, the fall of wickets and the extras.
+    """
+    card = match_index.scorecard(match_id)
+    if card is None:
+        return {'response': 'Invalid match id'}
+    return card
+
+
+# Over-by-over series of every match
+progression_store = progression.ProgressionStore(match_index, precompute=PRECOMPUTE_PROGRESSION)
+
+
+def progression_api(match_id):
+    """
+    Returns the over-by-over progression of a match, the series of its worm and manhattan
+    charts.
+
+    Args:
+        match_id (int): The match ID.
+
+    Returns:
+        dict: For every innings, the runs and wickets of each over, the cumulative runs and
+              wickets, the run rate and, for the chase, the target and required run rate.
+    """
+    series = progression_store.progression(match_id)
+    if series is None:
+        return {'response': 'Invalid match id'}
+    return series
+
+
+# Bitmap indexes of the searchable fields of the matches
+match_search_index = match_search.MatchSearchIndex(matches)
+
+
+def match_search_api(criteria, seasons=None, page=1, per_page=20):
+    """
+    Returns a page of the matches meeting a combination of criteria.
+
+    Args:
+        criteria (dict): Field name (see `match_search.CRITERIA`) mapped to the values
+            selected; a match meets a criterion when it holds any of its values, except
+            for 'opponent', whose teams must all have played.
+        seasons (tuple): Optional (first, last) season range (see `season_range`).
+        page (int): The page number, from 1.
+        per_page (int): The number of matches per page.
+
+    Returns:
+        dict: The number of matches found, the matches of the page (most recent first)
+              and the number of matches found for every value of every field.
+
+    Raises:
+        ValueError: If a criterion is not searchable or the paging is invalid.
+    """
+    return match_search_index.search(criteria, seasons, page, per_page)
+
+
+class PandasBackend:
+    """
+    Answers the analytics queries with pandas boolean masks over the in-memory frames.
+
+    The super-over filter (innings 1 and 2 only) is applied once at construction
+    instead of on every call. The frames are partitioned by season: their rows are
+    sorted by season with an offsets array, so a season-filtered query only scans the
+    rows of the selected seasons.
+    """
+
+    name = 'pandas'
+
+    def __init__(self, match_df, batting_df, bowling_df):
+        """
+        Args:
+            match_df (pd.DataFrame): The matches data (with 'SeasonYear').
+            batting_df (pd.DataFrame): Ball-by-ball data with the batting columns.
+            bowling_df (pd.DataFrame): Ball-by-ball data with the bowling columns.
+        """
+        self.seasons = np.unique(match_df['SeasonYear'])
+        self.match_ids = match_df['ID'].to_numpy()
+        self.match_seasons = kernels.encode(match_df['SeasonYear'].to_numpy(), self.seasons)[0]
+        self.matches, self.match_offsets = self._partition(match_df, self.match_seasons)
+        batting_df = batting_df[batting_df.innings.isin([1, 2])]  # Excluding Super overs
+        bowling_df = bowling_df[bowling_df.innings.isin([1, 2])]
+        self.batting, self.batting_offsets = self._partition(
+            batting_df, self._season_codes(batting_df['ID'].to_numpy()))
+        self.bowling, self.bowling_offsets = self._partition(
+            bowling_df, self._season_codes(bowling_df['ID'].to_numpy()))
+
+    def _season_codes(self, ids):
+        """
+        Returns the season code of the match of every delivery. Deliveries of unknown
+        matches get the code `len(self.seasons)`, which no season filter selects.
+        """
+        order = np.argsort(self.match_ids, kind='stable')
+        sorted_ids = self.match_ids[order]
+        position = np.minimum(np.searchsorted(sorted_ids, ids), len(sorted_ids) - 1)
+        known = sorted_ids[position] == ids
+        return np.where(known, self.match_seasons[order][position], len(self.seasons))
+
+    def _partition(self, frame, codes):
+        """
+        Sorts a frame by season code and returns it with the season offsets.
+        """
+        order = np.argsort(codes, kind='stable')
+        return frame.iloc[order], kernels.csr_offsets(codes, len(self.seasons) + 1)
+
+    def _select(self, frame, offsets, seasons):
+        """
+        Returns the rows of a season-partitioned frame within a season range.
+        """
+        if seasons is None:
+            return frame
+        start, end = kernels.key_range(self.seasons, *seasons)
+        return frame.iloc[offsets[start]:offsets[end]]
+
+    def team1_vs_team2(self, team1, team2, seasons=None):
+        """
+        Returns the head-to-head record of two teams (see `team1_vs_team2`).
+        """
+        match = self._select(self.matches, self.match_offsets, seasons)
+        temp_df = match[((match['Team1'] == team1) & (match['Team2'] == team2))
+                        | ((match['Team1'] == team2) & (match['Team2'] == team1))]
+        total_matches_played = temp_df.shape[0]
+        team1_won = temp_df[temp_df['WinningTeam'] == team1].shape[0]
+        team2_won = temp_df[temp_df['WinningTeam'] == team2].shape[0]
+        no_result = total_matches_played - (team1_won + team2_won)
+
+        data = {
+            'total_matches_played': total_matches_played,
+            'team1_won': team1_won,
+            'team2_won': team2_won,
+            'no_result': no_result
+        }
+        return data
+
+    def all_record(self, team, seasons=None):
+        """
+        Returns the overall record of a team (see `all_record`).
+        """
+        match = self._select(self.matches, self.match_offsets, seasons)
+        df_matches = match[(match['Team1'] == team) | (match['Team2'] == team)].copy()
+        match_played = df_matches.shape[0]
+        won = df_matches[df_matches.WinningTeam == team].shape[0]
+        no_result = df_matches[df_matches.WinningTeam.isnull()].shape[0]
+        loss = match_played - won - no_result
+        no_of_title = df_matches[(df_matches.MatchNumber == 'Final') &
+                                 (df_matches.WinningTeam == team)].shape[0]
+        return {'matchesplayed': match_played,
+                'won': won,
+                'loss': loss,
+                'noResult': no_result,
+                'title': no_of_title}
+
+    def batsman_record(self, batsman, team=None, seasons=None):
+        """
+        Returns the batting record of a batsman, optionally against one bowling team.
+        """
+        batting = self._select(self.batting, self.batting_offsets, seasons)
+        if team is None:
+            return batsman_record(batsman, batting)
+        return batsman_vs_team(batsman, team, batting)
+
+    def bowler_record(self, bowler, team=None, seasons=None):
+        """
+        Returns the bowling record of a bowler, optionally against one batting team.
+        """
+        bowling = self._select(self.bowling, self.bowling_offsets, seasons)
+        if team is None:
+            return bowler_record(bowler, bowling)
+        return bowler_vs_team(bowler, team, bowling)
+
+    def batsman_phases(self, batsman, team=None, seasons=None):
+        """
+        Returns the per-phase batting numbers of a batsman, optionally against one team.
+        """
+        batting = self._select(self.batting, self.batting_offsets, seasons)
+        if team is not None:
+            batting = batting[batting.BowlingTeam == team]
+        return batsman_phases(batsman, batting)
+
+    def bowler_phases(self, bowler, team=None, seasons=None):
+        """
+        Returns the per-phase bowling numbers of a bowler, optionally against one team.
+        """
+        bowling = self._select(self.bowling, self.bowling_offsets, seasons)
+        if team is not None:
+            bowling = bowling[bowling.BattingTeam == team]
+        return bowler_phases(bowler, bowling)
+
+
+class NumpyBackend(PandasBackend):
+    """
+    Answers the queries with NumPy kernels over integer-coded columns.
+
+    Players, teams and seasons are encoded once into sorted vocabularies. The deliveries
+    are stored twice, sorted by (batter, season) and by (bowler, season), each with a CSR
+    offset index, so a player's deliveries in a season range are an O(1) zero-copy slice
+    and the team filter only touches that slice. Team records are answered from
+    per-season aggregates, so their cost depends on the number of seasons selected.
+
+    Appended deliveries (see `append`) are added to the sorted layouts only, and names
+    not seen at load get the codes following the sorted vocabularies.
+    """
+
+    name = 'numpy'
+
+    def __init__(self, match_df, batting_df, bowling_df):
+        """
+        Args:
+            match_df (pd.DataFrame): The matches data (with 'SeasonYear').
+            batting_df (pd.DataFrame): Ball-by-ball data with the batting columns.
+            bowling_df (pd.DataFrame): Ball-by-ball data with the bowling columns
+                (a superset of the batting columns).
+        """
+        super().__init__(match_df, batting_df, bowling_df)
+        self._build(self.bowling)
+
+    @staticmethod
+    def _names(data):
+        """
+        Returns the player and team names of deliveries, with missing values as ''.
+        """
+        players = {column: data[column].fillna('').to_numpy()
+                   for column in ['batter', 'bowler', 'player_out', 'Player_of_Match']}
+        teams = {column: data[column].to_numpy() for column in ['BattingTeam', 'BowlingTeam']}
+        return players, teams
+
+    def _code(self, vocabulary, name):
+        """
+        Returns the code of a player or team name ('players' or 'teams' vocabulary), or -1
+        if the name is unknown.
+        """
+        code = kernels.lookup(getattr(self, vocabulary), name)
+        if code < 0 and isinstance(name, str):
+            code = self.added[vocabulary].get(name, -1)
+        return code
+
+    def _encode(self, vocabulary, values, grow=False):
+        """
+        Encodes names with a vocabulary ('players' or 'teams'), including the names added
+        since load. With `grow`, unknown names are added with the next free codes.
+        """
+        codes = kernels.encode(values, getattr(self, vocabulary))[0]
+        added = self.added[vocabulary]
+        for row in np.flatnonzero(codes < 0):
+            name = values[row]
+            if grow and name not in added:
+                added[name] = len(getattr(self, vocabulary)) + len(added)
+            codes[row] = added.get(name, -1)
+        return codes
+
+    def _columns(self, data, grow=False):
+        """
+        Encodes deliveries into the key codes and column arrays of the sorted layouts.
+        """
+        players, teams = self._names(data)
+        codes = {column: self._encode('players', values, grow)
+                 for column, values in players.items()}
+        codes.update({column: self._encode('teams', values, grow)
+                      for column, values in teams.items()})
+        # Composite (player, season) keys keep a player's seasons contiguous
+        season = self._season_codes(data['ID'].to_numpy())
+        shared = {
+            'ID': data['ID'].to_numpy(),
+            'batsman_run': data['batsman_run'].to_numpy(),
+            'legal': ~data['extra_type'].isin(['wides', 'noballs']).to_numpy(),
+            'boundary': data['non_boundary'].to_numpy() == 0,
+            'player_of_match': codes['Player_of_Match'],
+            'phase': data['phase'].to_numpy()
+        }
+        batting = dict(shared, player_out=codes['player_out'], team=codes['BowlingTeam'])
+        bowling = dict(shared, bowler_run=data['bowler_run'].to_numpy(),
+                       wicket=data['isBowlerWicket'].to_numpy(), team=codes['BattingTeam'])
+        stride = len(self.seasons) + 1
+        return (codes['batter'] * stride + season, batting,
+                codes['bowler'] * stride + season, bowling)
+
+    def _build(self, data):
+        """
+        Encodes the names and builds the sorted layouts and the team aggregates.
+        """
+        players, teams = self._names(data)
+        self.players = np.unique(np.concatenate(list(players.values())))
+        self.teams = np.unique(np.concatenate(
+            list(teams.values()) + [self.matches['Team1'].to_numpy(),
+                                    self.matches['Team2'].to_numpy()]))
+        self.added = {'players': {}, 'teams': {}}
+        size = len(self.players) * (len(self.seasons) + 1)
+        batters, batting, bowlers, bowling = self._columns(data)
+        self.by_batter = kernels.SortedColumns(batters, batting, size)
+        self.by_bowler = kernels.SortedColumns(bowlers, bowling, size)
+        self._build_team_aggregates()
+
+    def _build_team_aggregates(self):
+        """
+        Counts played, won, no-result and title matches per team and season, and
+        played and won matches per pair of teams and season.
+        """
+        match = self.matches
+        teams, seasons = len(self.teams), len(self.seasons) + 1
+        season = self._season_codes(match['ID'].to_numpy())
+        team1 = kernels.encode(match['Team1'].to_numpy(), self.teams)[0]
+        team2 = kernels.encode(match['Team2'].to_numpy(), self.teams)[0]
+        winner = kernels.encode(match['WinningTeam'].fillna('').to_numpy(), self.teams)[0]
+        has_winner = winner >= 0
+        final = has_winner & (match['MatchNumber'] == 'Final').to_numpy()
+        loser = np.where(winner == team1, team2, team1)
+
+        def count(*keys, mask=None, shape):
+            if mask is not None:
+                keys = [key[mask] for key in keys]
+            index = np.ravel_multi_index(keys, shape)
+            return kernels.group_count(index, int(np.prod(shape))).reshape(shape)
+
+        both = (np.concatenate([team1, team2]), np.concatenate([season, season]))
+        self.team_played = count(*both, shape=(teams, seasons))
+        self.team_won = count(winner, season, mask=has_winner, shape=(teams, seasons))
+        self.team_no_result = count(*both, mask=np.concatenate([~has_winner, ~has_winner]),
+                                    shape=(teams, seasons))
+        self.team_titles = count(winner, season, mask=final, shape=(teams, seasons))
+        self.pair_played = count(np.concatenate([team1, team2]), np.concatenate([team2, team1]),
+                                 both[1], shape=(teams, teams, seasons))
+        self.pair_won = count(winner, loser, season, mask=has_winner,
+                              shape=(teams, teams, seasons))
+
+    def _season_slice(self, seasons):
+        """
+        Returns the season codes `[start, end)` selected by a season range.
+        """
+        if seasons is None:
+            return 0, len(self.seasons) + 1
+        return kernels.key_range(self.seasons, *seasons)
+
+    def append(self, bowling_df):
+        """
+        Adds deliveries to the backend.
+
+        The new rows are added to the sorted layouts (see `kernels.SortedColumns.insert`),
+        and new player and team names get the next free codes, so the work is O(1) per
+        delivery amortized. The pandas frames inherited from `PandasBackend` keep the
+        deliveries loaded at construction: the NumPy queries only read the layouts.
+
+        Args:
+            bowling_df (pd.DataFrame): New ball-by-ball data with the bowling columns.
+        """
+        data = bowling_df[bowling_df.innings.isin([1, 2])]  # Excluding Super overs
+        batters, batting, bowlers, bowling = self._columns(data, grow=True)
+        self.by_batter.insert(batters, batting)
+        self.by_bowler.insert(bowlers, bowling)
+
+    def appended(self, bowling_df):
+        """
+        Returns a copy of the backend with deliveries added, leaving this backend untouched.
+
+        The copy shares the unchanged arrays with this backend. Readers of this backend
+        keep a consistent view while the copy is built, so a live feed can append and
+        then swap the module-level `backend` in one assignment.
+
+        Args:
+            bowling_df (pd.DataFrame): New ball-by-ball data with the bowling columns.
+
+        Returns:
+            NumpyBackend: The backend with the new deliveries.
+        """
+        updated = copy.copy(self)
+        updated.by_batter = copy.copy(self.by_batter)
+        updated.by_bowler = copy.copy(self.by_bowler)
+        updated.added = {vocabulary: dict(names) for vocabulary, names in self.added.items()}
+        updated.append(bowling_df)
+        return updated
+
+    def _slice(self, layout, player, team, seasons):
+        """
+        Returns the player's code and deliveries in a season range, optionally
+        restricted to one team.
+        """
+        code = self._code('players', player)
+        start, end = self._season_slice(seasons)
+        stride = len(self.seasons) + 1
+        # An unknown player (-1) gives a negative key range, which is empty
+        rows = layout.slice(code * stride + start, code * stride + end)
+        if team is not None:
+            mask = rows['team'] == self._code('teams', team)
+            rows = {name: values[mask] for name, values in rows.items()}
+        return code, rows
+
+    def team1_vs_team2(self, team1, team2, seasons=None):
+        """
+        Returns the head-to-head record of two teams from the per-season aggregates.
+        """
+        start, end = self._season_slice(seasons)
+        first, second = kernels.lookup(self.teams, team1), kernels.lookup(self.teams, team2)
+        if first < 0 or second < 0:
+            start = end = 0
+        played = int(self.pair_played[first, second, start:end].sum())
+        team1_won = int(self.pair_won[first, second, start:end].sum())
+        team2_won = int(self.pair_won[second, first, start:end].sum())
+        return {
+            'total_matches_played': played,
+            'team1_won': team1_won,
+            'team2_won': team2_won,
+            'no_result': played - team1_won - team2_won
+        }
+
+    def all_record(self, team, seasons=None):
+        """
+        Returns the overall record of a team from the per-season aggregates.
+        """
+        start, end = self._season_slice(seasons)
+        code = kernels.lookup(self.teams, team)
+        if code < 0:
+            start = end = 0
+        played = int(self.team_played[code, start:end].sum())
+        won = int(self.team_won[code, start:end].sum())
+        no_result = int(self.team_no_result[code, start:end].sum())
+        return {'matchesplayed': played,
+                'won': won,
+                'loss': played - won - no_result,
+                'noResult': no_result,
+                'title': int(self.team_titles[code, start:end].sum())}
+
+    def batsman_record(self, batsman, team=None, seasons=None):
+        """
+        Returns the batting record of a batsman, optionally against one bowling team.
+        """
+        code, rows = self._slice(self.by_batter, batsman, team, seasons)
+        return batting_stats(rows['ID'], rows['batsman_run'], rows['legal'],
+                             rows['player_out'] == code, rows['boundary'],
+                             rows['player_of_match'] == code)
+
+    def bowler_record(self, bowler, team=None, seasons=None):
+        """
+        Returns the bowling record of a bowler, optionally against one batting team.
+        """
+        code, rows = self._slice(self.by_bowler, bowler, team, seasons)
+        return bowling_stats(rows['ID'], rows['bowler_run'], rows['legal'], rows['wicket'],
+                             rows['batsman_run'], rows['boundary'],
+                             rows['player_of_match'] == code)
+
+    def batsman_phases(self, batsman, team=None, seasons=None):
+        """
+        Returns the per-phase batting numbers of a batsman, optionally against one team.
+        """
+        code, rows = self._slice(self.by_batter, batsman, team, seasons)
+        return phases.batting_phases(rows['phase'], rows['batsman_run'], rows['legal'],
+                                     rows['player_out'] == code)
+
+    def bowler_phases(self, bowler, team=None, seasons=None):
+        """
+        Returns the per-phase bowling numbers of a bowler, optionally against one team.
+        """
+        _, rows = self._slice(self.by_bowler, bowler, team, seasons)
+        return phases.bowling_phases(rows['phase'], rows['bowler_run'], rows['legal'],
+                                     rows['wicket'])
+
+
+def create_backend(name=BACKEND):
+    """
+    Creates the analytics backend selected by name.
+
+    Args:
+        name (str): 'numpy', 'pandas', 'sqlite' or 'duckdb'.
+
+    Returns:
+        PandasBackend, NumpyBackend or sql_backend.SQLBackend: The backend.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    if name == 'numpy':
+        return NumpyBackend(matches, batter_data, bowler_data)
+    if name == 'pandas':
+        return PandasBackend(matches, batter_data, bowler_data)
+    return sql_backend.SQLBackend(matches, bowler_data, engine=name,
+                                  path=SQL_PATH, version=DATASET_VERSION)
+
+
+backend = create_backend()
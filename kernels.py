@@ -0,0 +1,328 @@
+"""
+Aggregation Kernels Module
+
+This module provides small vectorized NumPy primitives for aggregating the ball-by-ball
+data over integer-coded columns. They replace pandas `groupby`, `drop_duplicates` and
+repeated boolean indexing on the hot paths of `ipl.py`, where the per-call overhead of
+pandas dominates for the few thousand deliveries of a single player.
+
+Classes:
+    SortedColumns: Column arrays stored sorted by an integer key with a CSR offset index.
+
+Functions:
+    encode: Encodes values as integer codes into a sorted vocabulary.
+    lookup: Returns the code of a single value in a vocabulary.
+    group_sum: Sums weights per integer key.
+    group_count: Counts occurrences per integer key.
+    run_starts: Returns the start offsets of the runs of equal keys in a sorted array.
+    run_sums: Sums values over runs given their start offsets.
+    count_unique: Counts the distinct values of an array.
+    key_range: Returns the codes of the values within a range of a sorted vocabulary.
+    csr_offsets: Returns the CSR offsets of integer keys.
+
+Usage Example:
+
+    import numpy as np
+    import kernels
+
+    codes, vocabulary = kernels.encode(np.array(['b', 'a', 'b']))
+    kernels.group_sum(codes, np.array([1, 2, 3]), len(vocabulary))  # array([2., 4.])
+
+    ids = np.array([7, 7, 9, 9, 9])
+    starts = kernels.run_starts(ids)                                 # array([0, 2])
+    kernels.run_sums(np.array([1, 4, 0, 6, 1]), starts)              # array([5, 7])
+
+    table = kernels.SortedColumns(codes, {'runs': np.array([1, 2, 3])}, len(vocabulary))
+    table.slice(1)['runs']                                           # array([1, 3])
+"""
+
+import numpy as np
+
+
+def encode(values, vocabulary=None):
+    """
+    Encodes values as integer codes into a sorted vocabulary.
+
+    Args:
+        values (np.ndarray): The values to encode. Must not contain NaN.
+        vocabulary (np.ndarray): Optional sorted vocabulary to encode into. Values
+            missing from it are encoded as -1.
+
+    Returns:
+        tuple: The int32 codes and the sorted vocabulary.
+    """
+    if vocabulary is None:
+        vocabulary, codes = np.unique(values, return_inverse=True)
+        return codes.astype(np.int32), vocabulary
+    if len(vocabulary) == 0:
+        return np.full(len(values), -1, dtype=np.int32), vocabulary
+    position = np.searchsorted(vocabulary, values)
+    position = np.minimum(position, len(vocabulary) - 1)
+    codes = np.where(vocabulary[position] == values, position, -1)
+    return codes.astype(np.int32), vocabulary
+
+
+def lookup(vocabulary, value):
+    """
+    Returns the code of a single value in a sorted vocabulary.
+
+    Args:
+        vocabulary (np.ndarray): The sorted vocabulary.
+        value: The value to look up.
+
+    Returns:
+        int: The code of the value, or -1 if it is not in the vocabulary (or is None, or
+            is not a string for a vocabulary of names).
+    """
+    if value is None or (vocabulary.dtype.kind in 'OUS' and not isinstance(value, str)):
+        return -1
+    position = int(np.searchsorted(vocabulary, value))
+    if position < len(vocabulary) and vocabulary[position] == value:
+        return position
+    return -1
+
+
+def group_sum(codes, weights, size=None):
+    """
+    Sums weights per integer key.
+
+    Args:
+        codes (np.ndarray): Non-negative integer keys.
+        weights (np.ndarray): The weights to sum, aligned with the codes.
+        size (int): Minimum length of the result (the number of keys).
+
+    Returns:
+        np.ndarray: The float sum of the weights of every key.
+    """
+    return np.bincount(codes, weights=weights, minlength=size or 0)
+
+
+def group_count(codes, size=None):
+    """
+    Counts occurrences per integer key.
+
+    Args:
+        codes (np.ndarray): Non-negative integer keys.
+        size (int): Minimum length of the result (the number of keys).
+
+    Returns:
+        np.ndarray: The number of occurrences of every key.
+    """
+    return np.bincount(codes, minlength=size or 0)
+
+
+def run_starts(keys):
+    """
+    Returns the start offsets of the runs of equal keys in a sorted array.
+
+    Args:
+        keys (np.ndarray): Keys sorted (or at least grouped) so that equal keys are adjacent.
+
+    Returns:
+        np.ndarray: The offset of the first element of every run.
+    """
+    if len(keys) == 0:
+        return np.empty(0, dtype=np.intp)
+    return np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+
+
+def run_sums(values, starts):
+    """
+    Sums values over runs given their start offsets.
+
+    Args:
+        values (np.ndarray): The values, grouped in runs.
+        starts (np.ndarray): The start offset of every run (see `run_starts`).
+
+    Returns:
+        np.ndarray: The sum of every run.
+    """
+    if len(starts) == 0:
+        return np.zeros(0, dtype=values.dtype)
+    return np.add.reduceat(values, starts)
+
+
+def count_unique(values, assume_sorted=False):
+    """
+    Counts the distinct values of an array by sorting and counting the changes.
+
+    Args:
+        values (np.ndarray): The values.
+        assume_sorted (bool): Skip the sort when the values are already sorted.
+
+    Returns:
+        int: The number of distinct values.
+    """
+    if len(values) == 0:
+        return 0
+    if not assume_sorted:
+        values = np.sort(values)
+    return int(np.count_nonzero(values[1:] != values[:-1])) + 1
+
+
+def key_range(vocabulary, first=None, last=None):
+    """
+    Returns the codes of the values between `first` and `last` in a sorted vocabulary.
+
+    Args:
+        vocabulary (np.ndarray): The sorted vocabulary.
+        first: The smallest value selected (inclusive), or None for no lower bound.
+        last: The largest value selected (inclusive), or None for no upper bound.
+
+    Returns:
+        tuple: The first code and the end code (exclusive) of the range.
+    """
+    start = 0 if first is None else int(np.searchsorted(vocabulary, first, side='left'))
+    end = len(vocabulary) if last is None else int(np.searchsorted(vocabulary, last, side='right'))
+    return start, max(start, end)
+
+
+def csr_offsets(keys, size):
+    """
+    Returns the CSR offsets of integer keys: the rows of key `k` in the keys sorted
+    ascending are `offsets[k]:offsets[k + 1]`.
+
+    Args:
+        keys (np.ndarray): Non-negative integer keys (in any order).
+        size (int): Number of keys.
+
+    Returns:
+        np.ndarray: The `size + 1` offsets.
+    """
+    counts = np.bincount(keys, minlength=size)
+    return np.concatenate(([0], np.cumsum(counts)))
+
+
+# Rows buffered by `SortedColumns.insert` before they are merged into the sorted columns
+MERGE_ROWS = 4096
+
+
+class SortedColumns:
+    """
+    Column arrays stored sorted by an integer key, with a CSR offset index.
+
+    The rows of one key are contiguous, so fetching them is an O(1) slice that returns
+    views of the columns instead of a scan and copy of the whole table. Rows with the
+    same key keep their original relative order.
+
+    Inserted rows are appended to a small unsorted buffer, which the slices of the keys
+    concerned also read, and merged into the sorted columns once it holds `merge_rows`
+    rows, so an insert costs O(1) per row amortized. `columns` and `offsets` only hold
+    the merged rows (see `compact`).
+    """
+
+    def __init__(self, keys, columns, size, merge_rows=MERGE_ROWS):
+        """
+        Args:
+            keys (np.ndarray): Non-negative integer key of every row.
+            columns (dict): Column name mapped to an array aligned with the keys.
+            size (int): Number of keys.
+            merge_rows (int): Buffered inserted rows that trigger a merge.
+        """
+        order = np.argsort(keys, kind='stable')
+        self.columns = {name: values[order] for name, values in columns.items()}
+        self.offsets = csr_offsets(keys, size)
+        self.merge_rows = merge_rows
+        self._pending_keys = np.empty(0, dtype=np.int64)
+        self._pending = {name: values[:0] for name, values in self.columns.items()}
+
+    @property
+    def size(self):
+        """
+        int: Number of keys.
+        """
+        return len(self.offsets) - 1
+
+    def __len__(self):
+        return int(self.offsets[-1]) + len(self._pending_keys)
+
+    def bounds(self, key, end_key=None):
+        """
+        Returns the `[start, end)` range of the merged rows of a key, or of the keys
+        `[key, end_key)` (empty for unknown keys).
+
+        Args:
+            key (int): The key, or the first key of a range.
+            end_key (int): Optional end (exclusive) of a range of keys.
+
+        Returns:
+            tuple: The start and end rows.
+        """
+        if end_key is None:
+            end_key = key + 1
+        end_key = min(end_key, self.size)
+        if 0 <= key < end_key:
+            return int(self.offsets[key]), int(self.offsets[end_key])
+        return 0, 0
+
+    def slice(self, key, end_key=None):
+        """
+        Returns the rows of a key, or of the keys `[key, end_key)`, in key order.
+
+        The rows are views of the columns, unless buffered inserted rows of the keys have
+        to be merged in.
+
+        Args:
+            key (int): The key, or the first key of a range.
+            end_key (int): Optional end (exclusive) of a range of keys.
+
+        Returns:
+            dict: Column name mapped to the keys' values.
+        """
+        if end_key is None:
+            end_key = key + 1
+        start, end = self.bounds(key, end_key)
+        rows = {name: values[start:end] for name, values in self.columns.items()}
+        if not len(self._pending_keys) or key < 0:
+            return rows
+        pending = np.flatnonzero((self._pending_keys >= key) & (self._pending_keys < end_key))
+        if not len(pending):
+            return rows
+        # Keys of the merged rows, then a stable sort keeps each key's buffered rows last
+        first, last = min(key, self.size), min(end_key, self.size)
+        merged_keys = np.repeat(np.arange(first, last),
+                                np.diff(self.offsets[first:last + 1]))
+        order = np.argsort(np.concatenate((merged_keys, self._pending_keys[pending])),
+                           kind='stable')
+        return {name: np.concatenate((values, self._pending[name][pending]))[order]
+                for name, values in rows.items()}
+
+    def insert(self, keys, columns):
+        """
+        Adds new rows to the layout, after the existing rows of their keys.
+
+        The rows are buffered and merged into the sorted columns in bulk (see `compact`).
+        The arrays are replaced, never modified in place, so a shallow copy of the layout
+        taken before an insert is left unchanged.
+
+        Args:
+            keys (np.ndarray): Non-negative integer key of every new row. Keys beyond the
+                current size grow the index.
+            columns (dict): Column name mapped to the new values (same names as the table).
+        """
+        if len(keys) == 0:
+            return
+        size = int(keys.max()) + 1
+        if size > self.size:
+            self.offsets = np.concatenate((self.offsets,
+                                           np.full(size - self.size, self.offsets[-1])))
+        self._pending_keys = np.concatenate((self._pending_keys, keys))
+        self._pending = {name: np.concatenate((values, columns[name]))
+                         for name, values in self._pending.items()}
+        if len(self._pending_keys) >= self.merge_rows:
+            self.compact()
+
+    def compact(self):
+        """
+        Merges the buffered inserted rows into the sorted columns.
+        """
+        if not len(self._pending_keys):
+            return
+        order = np.argsort(self._pending_keys, kind='stable')
+        keys = self._pending_keys[order]
+        positions = self.offsets[keys + 1]
+        self.columns = {name: np.insert(values, positions, self._pending[name][order])
+                        for name, values in self.columns.items()}
+        self.offsets = self.offsets + csr_offsets(keys, self.size)
+        self._pending_keys = keys[:0]
+        self._pending = {name: values[:0] for name, values in self._pending.items()}
@@ -0,0 +1,542 @@
+"""
+Live Feed Module
+
+This module ingests live ball-by-ball deliveries and pushes updates to subscribed
+dashboards over Server-Sent Events (SSE).
+
+Deliveries arrive as JSON objects with the columns of the ball-by-ball dataset, either
+POSTed to the application or appended to an NDJSON file that is tailed. Each delivery is
+applied in O(1) to the running scorecard of its match (innings totals, batter and bowler
+figures). After every batch, the deliveries are merged into the analytics tables, and the
+updated records of the players involved are published. The NumPy backend is updated
+copy-on-write (`NumpyBackend.appended`) and swapped in with one assignment, so queries
+served meanwhile see either the old tables or the new ones, never a mix. The updated
+backend is built before anything else of the batch is applied, so a batch that fails is
+not ingested at all.
+
+The scorecards and the backend's player layouts are updated in O(1) per delivery
+(amortized for the layouts, see `kernels.SortedColumns.insert`). The other indexes built
+at load (appearances, form, innings, matchups, partnerships, venues, points tables and
+percentile ranks) are not updated live: they reflect the live deliveries after a reload.
+
+Fan-out is bounded. Every subscriber has a fixed-size queue and the publisher never
+waits. When a slow client's queue is full, its backlog is replaced with a single `resync`
+event (the client should refetch the scorecard), so one slow client cannot stall the feed
+or grow memory without bound.
+
+Classes:
+    Scoreboard: Running scorecards of the live matches.
+    Subscription: A subscriber's bounded event queue.
+    Broadcaster: Bounded, non-blocking fan-out of events to subscribers.
+    LiveFeed: Applies deliveries to the scorecards and tables and publishes the updates.
+    NDJSONTail: Follows an append-only NDJSON delivery file.
+
+Functions:
+    parse_delivery: Validates a delivery and fills in its optional fields.
+    delivery_frame: Builds ball-by-ball rows with the bowling columns from deliveries.
+    format_event: Formats an event as a Server-Sent Events message.
+
+Usage Example:
+
+    import live
+
+    feed = live.LiveFeed()
+    subscription = feed.broadcaster.subscribe(match_id=1312200)
+    feed.ingest([{'ID': 1312200, 'innings': 1, 'overs': 0, 'ballnumber': 1,
+                  'batter': 'YBK Jaiswal', 'bowler': 'Mohammed Shami',
+                  'non-striker': 'JC Buttler', 'batsman_run': 4, 'extras_run': 0,
+                  'total_run': 4, 'non_boundary': 0, 'isWicketDelivery': 0,
+                  'BattingTeam': 'Rajasthan Royals'}])
+    print(subscription.get(timeout=1))
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+
+import numpy as np
+import pandas as pd
+
+import ipl
+import phases
+
+# Fields every delivery must carry, and the defaults of the optional ones
+REQUIRED_FIELDS = ('ID', 'innings', 'overs', 'ballnumber', 'batter', 'bowler', 'non-striker',
+                   'batsman_run', 'extras_run', 'total_run', 'isWicketDelivery', 'BattingTeam')
+OPTIONAL_FIELDS = {'extra_type': None, 'non_boundary': 0, 'player_out': None, 'kind': None,
+                   'fielders_involved': None, 'BowlingTeam': None}
+INTEGER_FIELDS = ('ID', 'innings', 'overs', 'ballnumber', 'batsman_run', 'extras_run',
+                  'total_run', 'non_boundary', 'isWicketDelivery')
+STRING_FIELDS = ('batter', 'bowler', 'non-striker', 'BattingTeam', 'extra_type', 'player_out',
+                 'kind', 'fielders_involved', 'BowlingTeam')
+
+logger = logging.getLogger(__name__)
+
+
+def parse_delivery(record):
+    """
+    Validates a delivery and fills in its optional fields.
+
+    Args:
+        record (dict): The delivery, with the columns of the ball-by-ball dataset.
+            `BowlingTeam` is only needed for matches missing from the matches data.
+
+    Returns:
+        dict: The delivery with integer counts and every optional field present.
+
+    Raises:
+        ValueError: If the delivery is not an object, misses a field, has a non-integer
+            count or a non-string name.
+    """
+    if not isinstance(record, dict):
+        raise ValueError('A delivery must be a JSON object')
+    missing = [field for field in REQUIRED_FIELDS if record.get(field) is None]
+    if missing:
+        raise ValueError(f"Delivery is missing {', '.join(missing)}")
+    delivery = dict(OPTIONAL_FIELDS)
+    delivery.update({key: value for key, value in record.items() if value is not None})
+    for field in INTEGER_FIELDS:
+        try:
+            delivery[field] = int(delivery[field])
+        except (TypeError, ValueError) as exception:
+            raise ValueError(f"Invalid {field} '{delivery[field]}'") from exception
+    for field in STRING_FIELDS:
+        if delivery[field] is not None and not isinstance(delivery[field], str):
+            raise ValueError(f"Invalid {field} '{delivery[field]}', expected a string")
+    return delivery
+
+
+def delivery_frame(deliveries, match_df):
+    """
+    Builds ball-by-ball rows with the bowling columns (those of `ipl.bowler_data`) from
+    parsed deliveries.
+
+    Args:
+        deliveries (list): Parsed deliveries (see `parse_delivery`).
+        match_df (pd.DataFrame): The matches data, for the bowling team and the
+            Player of the Match of known matches.
+
+    Returns:
+        pd.DataFrame: One row per delivery.
+    """
+    frame = pd.DataFrame(deliveries, columns=list(ipl.balls.columns) + ['BowlingTeam'])
+    known = match_df.set_index('ID').reindex(frame['ID'])
+    opponent = np.where(known['Team1'].to_numpy() == frame['BattingTeam'].to_numpy(),
+                        known['Team2'].to_numpy(), known['Team1'].to_numpy())
+    frame['BowlingTeam'] = np.where(known['Team1'].notna().to_numpy(), opponent,
+                                    frame['BowlingTeam'].to_numpy())
+    frame['Player_of_Match'] = known['Player_of_Match'].to_numpy()
+    frame['phase'] = phases.phase_codes(frame['overs'])
+    frame['bowler_run'] = np.where(frame['extra_type'].isin(ipl.NON_BOWLER_EXTRAS), 0,
+                                   frame['total_run'])
+    frame['isBowlerWicket'] = np.where(frame['kind'].isin(ipl.BOWLER_WICKET_KINDS),
+                                       frame['isWicketDelivery'], 0)
+    return frame
+
+
+def format_event(event, data):
+    """
+    Formats an event as a Server-Sent Events message.
+
+    Args:
+        event (str): The event name.
+        data: The JSON-serializable event payload.
+
+    Returns:
+        str: The SSE message.
+    """
+    return f'event: {event}\ndata: {json.dumps(data, cls=ipl.NpEncoder)}\n\n'
+
+
+class Scoreboard:
+    """
+    Running scorecards of the live matches, updated in O(1) per delivery.
+    """
+
+    def __init__(self):
+        self.matches = {}
+        self._seen = set()
+
+    @staticmethod
+    def key(delivery):
+        """
+        Returns the (match, innings, over, ball) key identifying a delivery.
+        """
+        return (delivery['ID'], delivery['innings'], delivery['overs'], delivery['ballnumber'])
+
+    def seen(self, delivery):
+        """
+        Returns whether a delivery was already applied.
+        """
+        return self.key(delivery) in self._seen
+
+    def apply(self, delivery):
+        """
+        Applies a delivery to the scorecard of its match.
+
+        Args:
+            delivery (dict): A parsed delivery (see `parse_delivery`).
+
+        Returns:
+            dict: The scorecard delta (the innings score and the figures of the batter and
+                bowler involved), or None if the delivery was already applied.
+        """
+        key = self.key(delivery)
+        if key in self._seen:
+            return None
+        self._seen.add(key)
+
+        match = self.matches.setdefault(delivery['ID'], {})
+        innings = match.setdefault(delivery['innings'], {
+            'team': delivery['BattingTeam'], 'runs': 0, 'wickets': 0, 'balls': 0,
+            'extras': 0, 'batters': {}, 'bowlers': {}})
+        extra_type = delivery['extra_type']
+        faced = extra_type not in ('wides', 'noballs')
+        runs = delivery['batsman_run']
+        boundary = delivery['non_boundary'] == 0
+
+        innings['runs'] += delivery['total_run']
+        innings['extras'] += delivery['extras_run']
+        innings['balls'] += faced
+        innings['wickets'] += delivery['isWicketDelivery']
+
+        batter = innings['batters'].setdefault(delivery['batter'], {
+            'runs': 0, 'balls': 0, 'fours': 0, 'sixes': 0, 'out': False})
+        batter['runs'] += runs
+        batter['balls'] += extra_type != 'wides'
+        batter['fours'] += boundary and runs == 4
+        batter['sixes'] += boundary and runs == 6
+        if delivery['isWicketDelivery'] and delivery['player_out'] in innings['batters']:
+            innings['batters'][delivery['player_out']]['out'] = True
+
+        bowler = innings['bowlers'].setdefault(delivery['bowler'], {
+            'balls': 0, 'runs': 0, 'wickets': 0})
+        bowler['balls'] += faced
+        if extra_type not in ipl.NON_BOWLER_EXTRAS:
+            bowler['runs'] += delivery['total_run']
+        if delivery['kind'] in ipl.BOWLER_WICKET_KINDS:
+            bowler['wickets'] += delivery['isWicketDelivery']
+
+        return {
+            'match_id': delivery['ID'],
+            'innings': delivery['innings'],
+            'team': innings['team'],
+            'score': f"{innings['runs']}/{innings['wickets']}",
+            'overs': f"{innings['balls'] // 6}.{innings['balls'] % 6}",
+            'ball': {key: delivery[key] for key in ('overs', 'ballnumber', 'total_run',
+                                                    'extra_type', 'isWicketDelivery', 'kind')},
+            'batter': dict(batter, name=delivery['batter']),
+            'bowler': dict(bowler, name=delivery['bowler'])
+        }
+
+    def scorecard(self, match_id):
+        """
+        Returns the scorecard of a live match.
+
+        Args:
+            match_id (int): The match ID.
+
+        Returns:
+            dict: The innings of the match with their totals, batters and bowlers,
+                or None if no delivery of the match was ingested.
+        """
+        match = self.matches.get(match_id)
+        if match is None:
+            return None
+        return {'match_id': match_id,
+                'innings': {number: dict(innings, overs=f"{innings['balls'] // 6}."
+                                                        f"{innings['balls'] % 6}")
+                            for number, innings in sorted(match.items())}}
+
+
+class Subscription:
+    """
+    A subscriber's bounded event queue, optionally restricted to one match.
+    """
+
+    def __init__(self, match_id=None, max_events=256):
+        """
+        Args:
+            match_id (int): Only receive the events of this match (None for all matches).
+            max_events (int): Capacity of the queue.
+        """
+        self.match_id = match_id
+        self.events = queue.Queue(maxsize=max_events)
+        self.resyncs = 0
+
+    def offer(self, message):
+        """
+        Queues a message without waiting. When the queue is full, the backlog is replaced
+        with a `resync` event.
+
+        Args:
+            message (str): The SSE message.
+        """
+        try:
+            self.events.put_nowait(message)
+        except queue.Full:
+            with self.events.mutex:
+                self.events.queue.clear()
+            self.resyncs += 1
+            self.events.put_nowait(format_event('resync', {'match_id': self.match_id}))
+
+    def get(self, timeout=None):
+        """
+        Returns the next message, or None if none arrived within the timeout.
+
+        Args:
+            timeout (float): Seconds to wait (None to wait forever).
+
+        Returns:
+            str: The SSE message.
+        """
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class Broadcaster:
+    """
+    Bounded, non-blocking fan-out of events to subscribers.
+    """
+
+    def __init__(self, max_events=256):
+        """
+        Args:
+            max_events (int): Capacity of every subscriber's queue.
+        """
+        self.max_events = max_events
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def subscribe(self, match_id=None):
+        """
+        Registers a subscriber.
+
+        Args:
+            match_id (int): Only receive the events of this match (None for all matches).
+
+        Returns:
+            Subscription: The subscriber's queue.
+        """
+        subscription = Subscription(match_id, self.max_events)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Removes a subscriber.
+
+        Args:
+            subscription (Subscription): The subscriber's queue.
+        """
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event, data, match_id=None):
+        """
+        Sends an event to every subscriber of its match, without waiting for any of them.
+
+        Args:
+            event (str): The event name.
+            data: The JSON-serializable event payload.
+            match_id (int): The match the event belongs to.
+        """
+        message = format_event(event, data)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            if subscription.match_id is None or subscription.match_id == match_id:
+                subscription.offer(message)
+
+
+class LiveFeed:
+    """
+    Applies live deliveries to the running scorecards and the analytics tables, and
+    publishes the scorecard and player-record updates.
+    """
+
+    def __init__(self, broadcaster=None):
+        """
+        Args:
+            broadcaster (Broadcaster): Where the updates are published.
+        """
+        self.broadcaster = broadcaster or Broadcaster()
+        self.scoreboard = Scoreboard()
+        self._known = set(ipl.matches['ID'])
+        self._lock = threading.Lock()
+
+    def parse(self, record):
+        """
+        Validates a delivery for this feed.
+
+        Args:
+            record (dict): The delivery (see `parse_delivery`).
+
+        Returns:
+            dict: The parsed delivery.
+
+        Raises:
+            ValueError: If the delivery is invalid, or belongs to a match missing from the
+                matches data and has no BowlingTeam.
+        """
+        delivery = parse_delivery(record)
+        if delivery['ID'] not in self._known and delivery['BowlingTeam'] is None:
+            raise ValueError(f"Delivery of unknown match {delivery['ID']} needs a BowlingTeam")
+        return delivery
+
+    def ingest(self, records):
+        """
+        Ingests a batch of deliveries.
+
+        The new deliveries are first merged into a copy of the analytics tables, when the
+        backend supports appends. Every new delivery then updates its match's scorecard and
+        publishes a `delivery` event, the updated tables are swapped in, and a `record`
+        event is published for every batter and bowler involved. Deliveries already
+        ingested (same match, innings, over and ball) are skipped.
+
+        Args:
+            records (list): The deliveries (see `parse_delivery`).
+
+        Returns:
+            dict: The number of deliveries ingested and skipped, and the matches updated.
+
+        Raises:
+            ValueError: If a delivery is invalid, or belongs to a match missing from the
+                matches data and has no BowlingTeam. Nothing of the batch is ingested.
+        """
+        deliveries = [self.parse(record) for record in records]
+        with self._lock:
+            new = {}
+            for delivery in deliveries:
+                if not self.scoreboard.seen(delivery):
+                    new.setdefault(Scoreboard.key(delivery), delivery)
+            applied = list(new.values())
+            # Build the updated tables first: if that fails, nothing has changed yet
+            backend = self._appended(applied)
+            for delivery in applied:
+                self.broadcaster.publish('delivery', self.scoreboard.apply(delivery),
+                                         delivery['ID'])
+            if backend is not None:
+                self._merge(backend, applied)
+        return {
+            'ingested': len(applied),
+            'duplicates': len(deliveries) - len(applied),
+            'matches': sorted({delivery['ID'] for delivery in applied})
+        }
+
+    def _appended(self, deliveries):
+        """
+        Returns a copy of the backend with the deliveries added, or None when there are no
+        deliveries or the backend does not support appends.
+        """
+        if not deliveries or not hasattr(ipl.backend, 'appended'):
+            return None
+        return ipl.backend.appended(delivery_frame(deliveries, ipl.matches))
+
+    def _merge(self, backend, deliveries):
+        """
+        Swaps in the updated backend and publishes the updated records.
+        """
+        ipl.backend = backend
+        for role, column, record in (('batter', 'batter', ipl.backend.batsman_record),
+                                     ('bowler', 'bowler', ipl.backend.bowler_record)):
+            players = {}
+            for delivery in deliveries:
+                players.setdefault(delivery[column], delivery['ID'])
+            for player, match_id in players.items():
+                self.broadcaster.publish('record', {'role': role, 'player': player,
+                                                    'record': record(player)}, match_id)
+
+
+class NDJSONTail:
+    """
+    Follows an append-only NDJSON delivery file and ingests every new line.
+    """
+
+    def __init__(self, path, feed, poll_interval=1.0):
+        """
+        Args:
+            path (str): The NDJSON file, one delivery per line.
+            feed (LiveFeed): The feed the deliveries are ingested into.
+            poll_interval (float): Seconds between checks for new lines.
+        """
+        self.path = path
+        self.feed = feed
+        self.poll_interval = poll_interval
+        self.offset = 0
+        self.errors = 0
+        self._stop = threading.Event()
+
+    def poll(self):
+        """
+        Ingests the complete lines appended since the last poll. A trailing partial line
+        is left for the next poll.
+
+        Returns:
+            int: The number of deliveries ingested.
+        """
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, 'rb') as file:
+            file.seek(self.offset)
+            chunk = file.read()
+        end = chunk.rfind(b'\n') + 1
+        if end == 0:
+            return 0
+        self.offset += end
+        records = []
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(self.feed.parse(json.loads(line)))
+            except ValueError as exception:
+                # Skip the malformed line and keep following the file
+                self.errors += 1
+                logger.warning('Live feed: skipping invalid line: %s', exception)
+        if not records:
+            return 0
+        try:
+            return self.feed.ingest(records)['ingested']
+        except Exception:
+            # A failed batch must not stop the tail
+            self.errors += 1
+            logger.exception('Live feed: failed to ingest %d deliveries', len(records))
+            return 0
+
+    def run(self):
+        """
+        Polls the file until `stop` is called.
+        """
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except OSError:
+                self.errors += 1
+                logger.exception('Live feed: failed to read %s', self.path)
+            self._stop.wait(self.poll_interval)
+
+    def start(self):
+        """
+        Starts following the file in a daemon thread.
+
+        Returns:
+            threading.Thread: The thread.
+        """
+        thread = threading.Thread(target=self.run, name='ipl-live-tail', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        """
+        Stops following the file.
+        """
+        self._stop.set()
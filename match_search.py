@@ -0,0 +1,303 @@
+"""
+Match Search Module
+
+This module answers multi-criteria match searches (season, team, opponent, venue, city,
+toss, result type, stage, super over, umpire and winner) with bitmap indexes over the
+matches data.
+
+Every distinct value of every searchable field has a precomputed bitset over the match
+rows, packed eight matches to a byte, and the bitsets of a field are stacked in one
+2-D array. A search ORs the bitsets of the values selected within a field and ANDs the
+fields together, so a query is a handful of vectorized byte operations instead of
+re-evaluating pandas masks. Venues and cities are indexed, returned and queried under
+their canonical names (see `venues.canonical_venue`), so every spelling of a ground or
+city selects the same matches. The number of matches of every value is precomputed, a
+result count is a popcount, and the facet counts of a result are one vectorized AND and
+popcount per field. Rows keep the order of the matches data (most recent first), and a
+page is located through the running popcount of the result, without unpacking it.
+
+Classes:
+    MatchSearchIndex: The bitmap indexes of the matches data.
+
+Functions:
+    match_stage: Returns the stage of a match from its `MatchNumber`.
+
+Usage Example:
+
+    import ipl
+    from match_search import MatchSearchIndex
+
+    index = MatchSearchIndex(ipl.matches)
+    print(index.search({'team': ['Chennai Super Kings'], 'stage': ['Final']}))
+    print(index.search({'venue': ['Wankhede Stadium']}, seasons=(2015, 2020), page=2))
+"""
+
+import numpy as np
+
+import kernels
+import venues
+
+# Searchable fields and the columns of the matches data they are indexed from; a match
+# is in the bitset of a value when any of the columns holds it
+FIELDS = {
+    'season': ('SeasonYear',),
+    'team': ('Team1', 'Team2'),
+    'venue': ('Venue',),
+    'city': ('City',),
+    'toss_winner': ('TossWinner',),
+    'toss_decision': ('TossDecision',),
+    'won_by': ('WonBy',),
+    'stage': ('Stage',),
+    'super_over': ('SuperOver',),
+    'umpire': ('Umpire1', 'Umpire2'),
+    'winner': ('WinningTeam',)
+}
+
+# Fields whose values have name variants, and the `venues.py` functions that canonicalize
+# them in the data and in the queries
+CANONICAL_NAMES = {'venue': 'canonical_venue', 'city': 'canonical_city'}
+
+# Criteria answered with the bitsets of another field: the opponent of a team is the
+# other team of the matches both played
+ALIASES = {'opponent': 'team'}
+
+# Stage of the league matches (numbered in `MatchNumber`)
+LEAGUE_STAGE = 'League'
+
+# Criteria accepted by a search (the season is selected with a season range)
+CRITERIA = tuple(field for field in FIELDS if field != 'season') + tuple(ALIASES)
+
+# Number of set bits of every byte value
+POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+# Columns of the matches data returned for every match found
+RESULT_COLUMNS = {
+    'id': 'ID', 'date': 'Date', 'season': 'SeasonYear', 'stage': 'Stage', 'team1': 'Team1',
+    'team2': 'Team2', 'venue': 'Venue', 'winner': 'WinningTeam', 'won_by': 'WonBy',
+    'margin': 'Margin'
+}
+
+
+def match_stage(match_number):
+    """
+    Returns the stage of a match from its `MatchNumber`.
+
+    Args:
+        match_number (str): The match number, e.g. '42' or 'Qualifier 1'.
+
+    Returns:
+        str: 'League' for numbered matches, otherwise the play-off name.
+    """
+    match_number = str(match_number)
+    return LEAGUE_STAGE if match_number.isdigit() else match_number
+
+
+def canonical_values(field, values):
+    """
+    Returns the canonical names of the values of a field (other fields are unchanged).
+
+    Args:
+        field (str): The indexed field name.
+        values (list): The values.
+
+    Returns:
+        list: The values, canonicalized for venues and cities.
+    """
+    if field not in CANONICAL_NAMES:
+        return list(values)
+    canonical = getattr(venues, CANONICAL_NAMES[field])
+    return [canonical(value) for value in values]
+
+
+def _value(value):
+    """
+    Returns a JSON-friendly value: None for missing values, Python scalars for NumPy ones.
+    """
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class MatchSearchIndex:
+    """
+    Packed bitsets of every distinct value of the searchable fields of the matches data,
+    with the number of matches of every value.
+    """
+
+    def __init__(self, match_df):
+        """
+        Args:
+            match_df (pd.DataFrame): The matches data (with 'SeasonYear').
+        """
+        match_df = match_df.assign(
+            Stage=match_df['MatchNumber'].map(match_stage),
+            Venue=match_df['Venue'].map(venues.canonical_venue, na_action='ignore'),
+            City=match_df['City'].map(venues.canonical_city, na_action='ignore'))
+        self.size = len(match_df)
+        self.values = {}
+        self.bitmaps = {}
+        self.counts = {}
+        rows = np.arange(self.size)
+        for field, columns in FIELDS.items():
+            value_columns = [match_df[column] for column in columns]
+            values = np.unique(np.concatenate([column.dropna().to_numpy()
+                                               for column in value_columns]))
+            bits = np.zeros((len(values), self.size), dtype=bool)
+            for column in value_columns:
+                present = column.notna().to_numpy()
+                codes = kernels.encode(column.to_numpy()[present], values)[0]
+                bits[codes, rows[present]] = True
+            self.values[field] = values
+            self.bitmaps[field] = np.packbits(bits, axis=1)
+            self.counts[field] = bits.sum(axis=1)
+        self.rows = [{field: _value(record[column]) for field, column in RESULT_COLUMNS.items()}
+                     for record in match_df[list(RESULT_COLUMNS.values())].to_dict('records')]
+        self.all = np.packbits(np.ones(self.size, dtype=bool))
+
+    def _field(self, name):
+        """
+        Returns the indexed field answering a criterion.
+        """
+        field = ALIASES.get(name, name)
+        if field not in FIELDS:
+            raise ValueError(f"Invalid search field '{name}'")
+        return field
+
+    def value_bitmap(self, name, values):
+        """
+        Returns the bitset of the matches holding any of the values of a field.
+
+        Args:
+            name (str): The field (or alias) name.
+            values (list): The values selected (any name variant of a venue or city);
+                unknown values match nothing.
+
+        Returns:
+            np.ndarray: The packed bitset.
+        """
+        field = self._field(name)
+        vocabulary = self.values[field]
+        if field == 'season':
+            values = [int(value) for value in values]
+        values = canonical_values(field, values)
+        codes = [kernels.lookup(vocabulary, value) for value in values]
+        selected = self.bitmaps[field][[code for code in codes if code >= 0]]
+        if not len(selected):
+            return np.zeros_like(self.all)
+        return np.bitwise_or.reduce(selected, axis=0)
+
+    def season_bitmap(self, seasons):
+        """
+        Returns the bitset of the matches of an inclusive (first, last) season range.
+        """
+        start, end = kernels.key_range(self.values['season'], *seasons)
+        return np.bitwise_or.reduce(self.bitmaps['season'][start:end], axis=0,
+                                    initial=0).astype(np.uint8)
+
+    def query(self, criteria, seasons=None):
+        """
+        Returns the bitset of the matches meeting every criterion.
+
+        Args:
+            criteria (dict): Field name mapped to the values selected (any of which
+                matches). Every criterion but 'opponent' ORs its values; 'opponent' names
+                teams all of which must have played.
+            seasons (tuple): Optional inclusive (first, last) season range.
+
+        Returns:
+            np.ndarray: The packed bitset.
+
+        Raises:
+            ValueError: If a field is not searchable.
+        """
+        result = self.all.copy()
+        for name, values in criteria.items():
+            if name in ALIASES:
+                for value in values:
+                    result &= self.value_bitmap(name, [value])
+            else:
+                result &= self.value_bitmap(name, values)
+        if seasons is not None:
+            result &= self.season_bitmap(seasons)
+        return result
+
+    def count(self, bitmap):
+        """
+        Returns the number of matches in a bitset.
+        """
+        return int(POPCOUNT[bitmap].sum(dtype=np.int64))
+
+    def facets(self, bitmap=None):
+        """
+        Returns the number of matches of every value of every field, within a bitset.
+
+        Args:
+            bitmap (np.ndarray): Optional packed bitset; the precomputed counts of all the
+                matches are returned without it.
+
+        Returns:
+            dict: Field name mapped to value -> number of matches (values with none omitted).
+        """
+        facets = {}
+        for field, values in self.values.items():
+            if bitmap is None:
+                counts = self.counts[field]
+            else:
+                counts = POPCOUNT[self.bitmaps[field] & bitmap].sum(axis=1, dtype=np.int64)
+            facets[field] = {str(value): int(count)
+                             for value, count in zip(values, counts) if count}
+        return facets
+
+    def rows_of(self, bitmap, offset=0, limit=None):
+        """
+        Returns the row numbers of a bitset, from the `offset`-th set bit on.
+
+        Args:
+            bitmap (np.ndarray): The packed bitset.
+            offset (int): Number of set rows skipped.
+            limit (int): Maximum number of rows returned.
+
+        Returns:
+            np.ndarray: The row numbers, in ascending order.
+        """
+        # Skip whole bytes up to the one holding the first row of the page
+        running = np.cumsum(POPCOUNT[bitmap], dtype=np.int64)
+        first = int(np.searchsorted(running, offset, side='right'))
+        skipped = int(running[first - 1]) if first else 0
+        rows = np.flatnonzero(np.unpackbits(bitmap[first:])) + first * 8
+        rows = rows[offset - skipped:]
+        return rows[:limit] if limit is not None else rows
+
+    def search(self, criteria, seasons=None, page=1, per_page=20, facets=True):
+        """
+        Returns a page of the matches meeting every criterion.
+
+        Args:
+            criteria (dict): Field name mapped to the values selected (see `query`).
+            seasons (tuple): Optional inclusive (first, last) season range.
+            page (int): The page number, from 1.
+            per_page (int): The number of matches per page.
+            facets (bool): Include the facet counts of the result.
+
+        Returns:
+            dict: The total number of matches, the page, the matches of the page (most
+                recent first) and the facet counts.
+
+        Raises:
+            ValueError: If a field is not searchable or the paging is invalid.
+        """
+        if page < 1 or per_page < 1:
+            raise ValueError('Invalid page, expected page and per_page of at least 1')
+        bitmap = self.query(criteria, seasons)
+        count = self.count(bitmap)
+        result = {
+            'count': count,
+            'page': page,
+            'per_page': per_page,
+            'pages': -(-count // per_page),
+            'matches': [self.rows[row]
+                        for row in self.rows_of(bitmap, (page - 1) * per_page, per_page)]
+        }
+        if facets:
+            result['facets'] = self.facets(bitmap)
+        return result
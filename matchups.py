@@ -0,0 +1,212 @@
+"""
+Batter vs Bowler Matchups Module
+
+This module answers "how has a batter fared against a bowler" from a precomputed sparse
+matchup matrix. Every (batter, bowler) pair that has met is one nonzero of a
+players x players matrix over integer player codes, stored in COO form (pair batter,
+pair bowler and the pair's balls, runs, dismissals, dots, fours and sixes) sorted by
+batter, so the CSR offsets over batter codes give the matchups of a batter as one slice.
+A second CSR index over the pairs ordered by bowler gives the matchups of a bowler.
+
+The matrix is built once from the ball-by-ball data with a single `np.unique` over the
+pair keys and one `np.bincount` per statistic; lookups never touch the deliveries.
+
+Classes:
+    MatchupIndex: Sparse batter x bowler matchup matrix.
+
+Usage Example:
+
+    import ipl
+    from matchups import MatchupIndex
+
+    index = MatchupIndex(ipl.bowler_data)
+    print(index.pair_record('V Kohli', 'JJ Bumrah'))
+    print(index.batter_matchups('V Kohli', n=3, min_balls=12))
+    print(index.bowler_bunnies('JJ Bumrah', n=3))
+"""
+
+import numpy as np
+
+import kernels
+
+# Statistics stored for every pair
+PAIR_COLUMNS = ('balls', 'runs', 'dismissals', 'dots', 'fours', 'sixes')
+
+
+class MatchupIndex:
+    """
+    Sparse batter x bowler matchup matrix in COO form with CSR indexes over the batter
+    and the bowler codes.
+    """
+
+    def __init__(self, ball_df):
+        """
+        Args:
+            ball_df (pd.DataFrame): Ball-by-ball data with the bowling columns
+                (`ipl.bowler_data`).
+        """
+        balls = ball_df[ball_df.innings.isin([1, 2])]  # Excluding Super overs
+        batters = balls['batter'].to_numpy()
+        bowlers = balls['bowler'].to_numpy()
+        self.players = np.union1d(batters, bowlers)
+        size = len(self.players)
+        batter_codes = kernels.encode(batters, self.players)[0].astype(np.int64)
+        bowler_codes = kernels.encode(bowlers, self.players)[0].astype(np.int64)
+
+        # One nonzero per pair that has met; the pair keys sort by batter, then bowler
+        keys, pair = np.unique(batter_codes * size + bowler_codes, return_inverse=True)
+        self.batter = (keys // size).astype(np.int32)
+        self.bowler = (keys % size).astype(np.int32)
+
+        runs = balls['batsman_run'].to_numpy()
+        legal = ~balls['extra_type'].isin(['wides', 'noballs']).to_numpy()
+        boundary = balls['non_boundary'].to_numpy() == 0
+        weights = {
+            'balls': legal,
+            'runs': runs,
+            'dismissals': balls['isBowlerWicket'].to_numpy(),
+            'dots': legal & (runs == 0),
+            'fours': boundary & (runs == 4),
+            'sixes': boundary & (runs == 6)
+        }
+        self.columns = {name: kernels.group_sum(pair, weights[name], len(keys)).astype(np.int64)
+                        for name in PAIR_COLUMNS}
+
+        # CSR over batter codes (the pairs are already sorted by batter) and over
+        # bowler codes through a bowler-ordered permutation of the pairs
+        self.batter_offsets = kernels.csr_offsets(self.batter, size)
+        self.by_bowler = np.argsort(self.bowler, kind='stable')
+        self.bowler_offsets = kernels.csr_offsets(self.bowler, size)
+
+    def __len__(self):
+        return len(self.batter)
+
+    def _record(self, pairs):
+        """
+        Returns the statistics of a set of pairs, one dictionary per pair.
+        """
+        records = []
+        for index in pairs:
+            balls, runs, dismissals, dots, fours, sixes = (
+                int(self.columns[name][index]) for name in PAIR_COLUMNS)
+            records.append({
+                'batter': str(self.players[self.batter[index]]),
+                'bowler': str(self.players[self.bowler[index]]),
+                'balls': balls,
+                'runs': runs,
+                'dismissals': dismissals,
+                'dots': dots,
+                'fours': fours,
+                'sixes': sixes,
+                'strike_rate': runs / balls * 100 if balls else None,
+                'average': runs / dismissals if dismissals else None,
+                'dot_pct': dots / balls * 100 if balls else None
+            })
+        return records
+
+    def _batter_pairs(self, code):
+        """
+        Returns the pair indexes of a batter code (a range of the batter-sorted pairs).
+        """
+        return np.arange(self.batter_offsets[code], self.batter_offsets[code + 1])
+
+    def _bowler_pairs(self, code):
+        """
+        Returns the pair indexes of a bowler code.
+        """
+        return self.by_bowler[self.bowler_offsets[code]:self.bowler_offsets[code + 1]]
+
+    def player_code(self, player):
+        """
+        Returns the code of a player, or -1 if the player is unknown.
+
+        Args:
+            player (str): The player name.
+
+        Returns:
+            int: The player code.
+        """
+        if player is None:
+            return -1
+        return kernels.lookup(self.players, player)
+
+    def pair_record(self, batter, bowler):
+        """
+        Returns the record of a batter against a bowler.
+
+        Args:
+            batter (str): The batter name.
+            bowler (str): The bowler name.
+
+        Returns:
+            dict: The pair's balls, runs, dismissals, dots, boundaries, strike rate,
+                average and dot-ball percentage (zero when the players never met), or
+                None if either player is unknown.
+        """
+        batter_code, bowler_code = self.player_code(batter), self.player_code(bowler)
+        if batter_code < 0 or bowler_code < 0:
+            return None
+        # The bowlers of a batter's pairs are sorted: binary search the row
+        start, end = self.batter_offsets[batter_code], self.batter_offsets[batter_code + 1]
+        index = start + int(np.searchsorted(self.bowler[start:end], bowler_code))
+        if index < end and self.bowler[index] == bowler_code:
+            return self._record([index])[0]
+        record = dict.fromkeys(PAIR_COLUMNS, 0)
+        record.update(batter=str(batter), bowler=str(bowler), strike_rate=None,
+                      average=None, dot_pct=None)
+        return record
+
+    def batter_matchups(self, batter, n=5, min_balls=12):
+        """
+        Returns the bowlers a batter has scored fastest and slowest against.
+
+        Args:
+            batter (str): The batter name.
+            n (int): Number of matchups returned at each end.
+            min_balls (int): Minimum balls faced for a matchup to be ranked.
+
+        Returns:
+            dict: The `top` and `bottom` matchups by strike rate, or None if the batter
+                is unknown.
+        """
+        code = self.player_code(batter)
+        if code < 0:
+            return None
+        pairs = self._batter_pairs(code)
+        pairs = pairs[self.columns['balls'][pairs] >= max(min_balls, 1)]
+        balls = self.columns['balls'][pairs]
+        strike_rate = self.columns['runs'][pairs] / balls
+        # Ties go to the larger sample
+        fastest = np.lexsort((-balls, -strike_rate))
+        slowest = np.lexsort((-balls, strike_rate))
+        return {
+            'batter': str(batter),
+            'min_balls': min_balls,
+            'matchups': len(pairs),
+            'top': self._record(pairs[fastest[:n]]),
+            'bottom': self._record(pairs[slowest[:n]])
+        }
+
+    def bowler_bunnies(self, bowler, n=5):
+        """
+        Returns the batters a bowler has dismissed most often (their "bunnies").
+
+        Args:
+            bowler (str): The bowler name.
+            n (int): Number of batters returned.
+
+        Returns:
+            dict: The batters by dismissals, then fewest runs conceded to them, or None
+                if the bowler is unknown.
+        """
+        code = self.player_code(bowler)
+        if code < 0:
+            return None
+        pairs = self._bowler_pairs(code)
+        dismissals = self.columns['dismissals'][pairs]
+        pairs = pairs[dismissals > 0]
+        order = np.lexsort((self.columns['runs'][pairs], -self.columns['dismissals'][pairs]))
+        return {
+            'bowler': str(bowler),
+            'bunnies': self._record(pairs[order[:n]])
+        }
@@ -0,0 +1,255 @@
+"""
+Partnerships Module
+
+This module segments every innings into partnerships and answers partnership queries
+from the resulting partnership table.
+
+The deliveries are sorted by `ID`, `innings`, `overs` and `ballnumber`, and a partnership
+starts at the first ball of an innings, after every wicket, and whenever the pair at the
+crease changes without a wicket (a batter retiring). The segmentation and the
+per-partnership sums are one vectorized pass: a boolean "starts a partnership" array and
+`np.add.reduceat` over its offsets. Partnerships are then indexed by batting pair, by
+wicket and by player, each ordered with CSR offsets, so queries are slices of the table.
+
+Classes:
+    PartnershipIndex: The partnership table with its pair, wicket and player indexes.
+
+Functions:
+    segment: Splits sorted deliveries into partnerships.
+
+Usage Example:
+
+    import ipl
+    from partnerships import PartnershipIndex
+
+    index = PartnershipIndex(ipl.batter_data)
+    print(index.pair_history('V Kohli', 'AB de Villiers'))
+    print(index.top_partnerships(wicket=1, n=3))
+    print(index.top_partners('V Kohli', n=3))
+"""
+
+import numpy as np
+
+import kernels
+
+
+def segment(match_ids, innings, wickets, first, second):
+    """
+    Splits deliveries sorted by match, innings and ball into partnerships.
+
+    Args:
+        match_ids (np.ndarray): Match ID of every delivery.
+        innings (np.ndarray): Innings of every delivery.
+        wickets (np.ndarray): Whether a wicket fell on the delivery.
+        first (np.ndarray): Code of the first batter of the pair at the crease.
+        second (np.ndarray): Code of the second batter of the pair at the crease.
+
+    Returns:
+        tuple: The start offset of every partnership and its wicket number (1 for the
+            opening partnership, 2 after the first wicket, ...).
+    """
+    if len(match_ids) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.int64)
+    new_innings = np.concatenate(([True], (match_ids[1:] != match_ids[:-1]) |
+                                  (innings[1:] != innings[:-1])))
+    after_wicket = np.concatenate(([False], wickets[:-1]))
+    new_pair = np.concatenate(([False], (first[1:] != first[:-1]) |
+                               (second[1:] != second[:-1])))
+    starts = np.flatnonzero(new_innings | after_wicket | new_pair)
+
+    # Wickets fallen in the innings before each partnership
+    fallen = np.concatenate(([0], np.cumsum(wickets)))
+    innings_start = np.flatnonzero(new_innings)[np.cumsum(new_innings) - 1]
+    return starts, fallen[starts] - fallen[innings_start[starts]] + 1
+
+
+class PartnershipIndex:
+    """
+    The partnership table (match, innings, team, wicket, pair, runs, balls and each
+    batter's share) with CSR indexes by pair, by wicket and by player.
+    """
+
+    def __init__(self, ball_df):
+        """
+        Args:
+            ball_df (pd.DataFrame): Ball-by-ball data (`ipl.batter_data`).
+        """
+        balls = ball_df[ball_df.innings.isin([1, 2])]  # Excluding Super overs
+        order = np.lexsort((balls['ballnumber'].to_numpy(), balls['overs'].to_numpy(),
+                            balls['innings'].to_numpy(), balls['ID'].to_numpy()))
+
+        def column(name):
+            return balls[name].to_numpy()[order]
+
+        batters, non_strikers = column('batter'), column('non-striker')
+        self.players = np.union1d(batters, non_strikers)
+        striker = kernels.encode(batters, self.players)[0]
+        partner = kernels.encode(non_strikers, self.players)[0]
+        first, second = np.minimum(striker, partner), np.maximum(striker, partner)
+        wickets = column('isWicketDelivery') == 1
+        match_ids, innings = column('ID'), column('innings')
+        starts, wicket = segment(match_ids, innings, wickets, first, second)
+        ends = np.append(starts[1:], len(match_ids)) - 1
+
+        extra_type = column('extra_type')
+        legal = (extra_type != 'wides') & (extra_type != 'noballs')
+        batsman_run = column('batsman_run')
+        self.table = {
+            'ID': match_ids[starts],
+            'innings': innings[starts],
+            'team': column('BattingTeam')[starts],
+            'wicket': wicket,
+            'first': first[starts],
+            'second': second[starts],
+            'runs': kernels.run_sums(column('total_run'), starts),
+            'balls': kernels.run_sums(legal.astype(np.int64), starts),
+            'first_runs': kernels.run_sums(np.where(striker == first, batsman_run, 0), starts),
+            'second_runs': kernels.run_sums(np.where(striker == second, batsman_run, 0), starts),
+            'unbroken': ~wickets[ends]
+        }
+        runs = self.table['runs']
+
+        # Pair index: partnerships grouped by pair, in match order
+        size = len(self.players)
+        keys = self.table['first'].astype(np.int64) * size + self.table['second']
+        self.pair_keys, pair = np.unique(keys, return_inverse=True)
+        self.by_pair = np.argsort(pair, kind='stable')
+        self.pair_offsets = kernels.csr_offsets(pair, len(self.pair_keys))
+
+        # Wicket index: partnerships grouped by wicket, highest first
+        self.by_wicket = np.lexsort((-runs, wicket))
+        self.wickets = np.unique(wicket)
+        self.wicket_offsets = np.searchsorted(wicket[self.by_wicket],
+                                              np.append(self.wickets, np.inf))
+
+        # Player index: every pair under both of its players, most runs together first
+        self.pair_runs = kernels.group_sum(pair, runs, len(self.pair_keys)).astype(np.int64)
+        self.pair_count = kernels.group_count(pair, len(self.pair_keys))
+        self.pair_best = np.zeros(len(self.pair_keys), dtype=runs.dtype)
+        np.maximum.at(self.pair_best, pair, runs)
+        pair_first, pair_second = self.pair_keys // size, self.pair_keys % size
+        pairs = np.arange(len(self.pair_keys))
+        player = np.concatenate((pair_first, pair_second))
+        self.partner = np.concatenate((pair_second, pair_first))
+        self.partner_pair = np.concatenate((pairs, pairs))
+        order = np.lexsort((-self.pair_runs[self.partner_pair], player))
+        self.partner, self.partner_pair = self.partner[order], self.partner_pair[order]
+        self.player_offsets = kernels.csr_offsets(player, size)
+
+    def __len__(self):
+        return len(self.table['ID'])
+
+    def _records(self, rows):
+        """
+        Returns the partnerships of a set of table rows, one dictionary per partnership.
+        """
+        records = []
+        for row in rows:
+            first = str(self.players[self.table['first'][row]])
+            second = str(self.players[self.table['second'][row]])
+            records.append({
+                'match_id': int(self.table['ID'][row]),
+                'innings': int(self.table['innings'][row]),
+                'team': str(self.table['team'][row]),
+                'wicket': int(self.table['wicket'][row]),
+                'batters': [first, second],
+                'runs': int(self.table['runs'][row]),
+                'balls': int(self.table['balls'][row]),
+                'contributions': {first: int(self.table['first_runs'][row]),
+                                  second: int(self.table['second_runs'][row])},
+                'unbroken': bool(self.table['unbroken'][row])
+            })
+        return records
+
+    def player_code(self, player):
+        """
+        Returns the code of a player, or -1 if the player never batted.
+
+        Args:
+            player (str): The player name.
+
+        Returns:
+            int: The player code.
+        """
+        if player is None:
+            return -1
+        return kernels.lookup(self.players, player)
+
+    def pair_history(self, player1, player2):
+        """
+        Returns every partnership of two batters.
+
+        Args:
+            player1 (str): The first batter.
+            player2 (str): The second batter.
+
+        Returns:
+            dict: The pair's partnerships (in match order) and their totals, or None if
+                either player is unknown.
+        """
+        codes = sorted((self.player_code(player1), self.player_code(player2)))
+        if codes[0] < 0:
+            return None
+        key = codes[0] * len(self.players) + codes[1]
+        pair = int(np.searchsorted(self.pair_keys, key))
+        rows = []
+        if pair < len(self.pair_keys) and self.pair_keys[pair] == key:
+            rows = self.by_pair[self.pair_offsets[pair]:self.pair_offsets[pair + 1]]
+        partnerships = self._records(rows)
+        return {
+            'batters': [str(self.players[code]) for code in codes],
+            'partnerships': len(partnerships),
+            'runs': sum(record['runs'] for record in partnerships),
+            'balls': sum(record['balls'] for record in partnerships),
+            'highest': max((record['runs'] for record in partnerships), default=None),
+            'history': partnerships
+        }
+
+    def top_partnerships(self, wicket=None, n=10):
+        """
+        Returns the highest partnerships for a wicket, or for every wicket.
+
+        Args:
+            wicket (int): The wicket (1 for opening partnerships), or None for all wickets.
+            n (int): Number of partnerships returned per wicket.
+
+        Returns:
+            dict: Wicket mapped to its highest partnerships.
+        """
+        wickets = self.wickets if wicket is None else [wicket]
+        result = {}
+        for value in wickets:
+            index = int(np.searchsorted(self.wickets, value))
+            rows = []
+            if index < len(self.wickets) and self.wickets[index] == value:
+                start = self.wicket_offsets[index]
+                rows = self.by_wicket[start:min(start + n, self.wicket_offsets[index + 1])]
+            result[int(value)] = self._records(rows)
+        return result
+
+    def top_partners(self, player, n=5):
+        """
+        Returns the batters a player has added the most partnership runs with.
+
+        Args:
+            player (str): The player name.
+            n (int): Number of partners returned.
+
+        Returns:
+            dict: The player's partners with their partnerships, runs together and
+                highest partnership, or None if the player is unknown.
+        """
+        code = self.player_code(player)
+        if code < 0:
+            return None
+        start = self.player_offsets[code]
+        end = min(start + n, self.player_offsets[code + 1])
+        return {
+            'player': str(player),
+            'partners': [{'partner': str(self.players[partner]),
+                          'partnerships': int(self.pair_count[pair]),
+                          'runs': int(self.pair_runs[pair]),
+                          'highest': int(self.pair_best[pair])}
+                         for partner, pair in zip(self.partner[start:end],
+                                                  self.partner_pair[start:end])]
+        }
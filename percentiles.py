@@ -0,0 +1,123 @@
+"""
+Percentile Ranks Module
+
+This module ranks a player's batting or bowling statistics among qualified peers: for
+every statistic, the percentage of qualified players the player is better than.
+
+The statistics of every player over a season range come from the form timelines of
+`form.FormIndex` in one vectorized pass. The values of the qualified players (a minimum
+number of balls and innings) are kept as one sorted array per statistic, so the rank of
+any value is an O(log n) `np.searchsorted`. Rates where lower is better (economy, bowling
+average and strike rate) are ranked in reverse.
+
+Classes:
+    PeerRanks: The sorted statistics of the qualified players of a role.
+
+Usage Example:
+
+    import ipl
+    from percentiles import PeerRanks
+
+    ranks = PeerRanks(ipl.form_index, 'batting', min_balls=500)
+    print(ranks.percentile('strike_rate', 138.0))
+    print(ranks.percentiles({'runs': 5000, 'avg': 36.2, 'strike_rate': 129.9}))
+"""
+
+import numpy as np
+
+# Default qualification of the peers of each role
+MIN_BALLS = {'batting': 100, 'bowling': 120}
+MIN_INNINGS = 1
+
+# Statistics of the player records ranked, mapped to the peer statistic they are ranked
+# against and whether higher is better
+METRICS = {
+    'batting': {
+        'innings': ('innings', True), 'runs': ('runs', True), 'balls': ('balls', True),
+        'fours': ('fours', True), 'sixes': ('sixes', True), 'avg': ('average', True),
+        'strike_rate': ('strike_rate', True), 'fifties': ('fifties', True),
+        'hundreds': ('hundreds', True), 'not_out': ('not_out', True)
+    },
+    'bowling': {
+        'innings': ('innings', True), 'wicket': ('wickets', True),
+        'economy': ('economy', False), 'average': ('average', False),
+        'avg': ('average', False), 'strike_rate': ('strike_rate', False),
+        '3+W': ('3+W', True)
+    }
+}
+
+# Scale of the record statistics relative to the peer statistics: the bowling records
+# report the strike rate as balls per wicket times 100
+RECORD_SCALE = {('bowling', 'strike_rate'): 100}
+
+
+class PeerRanks:
+    """
+    Sorted statistics of the players of a role who qualify over a season range.
+    """
+
+    def __init__(self, form_index, role, seasons=None, min_balls=None,
+                 min_innings=MIN_INNINGS):
+        """
+        Args:
+            form_index (form.FormIndex): The innings timelines of the players.
+            role (str): 'batting' or 'bowling'.
+            seasons (tuple): Optional inclusive (first, last) season range.
+            min_balls (int): Minimum balls faced or bowled to qualify (default per role).
+            min_innings (int): Minimum innings to qualify.
+
+        Raises:
+            ValueError: If the role is not supported.
+        """
+        if role not in METRICS:
+            raise ValueError(f"Invalid role '{role}', expected batting or bowling")
+        self.role = role
+        self.min_balls = MIN_BALLS[role] if min_balls is None else min_balls
+        self.min_innings = min_innings
+        stats = form_index.player_stats(role, seasons)
+        qualified = (stats['balls'] >= self.min_balls) & (stats['innings'] >= min_innings)
+        self.peers = int(np.count_nonzero(qualified))
+        self.sorted = {}
+        for name, _ in METRICS[role].values():
+            values = stats[name][qualified].astype(float) * RECORD_SCALE.get((role, name), 1)
+            self.sorted[name] = np.sort(values[~np.isnan(values)])
+
+    def percentile(self, metric, value):
+        """
+        Returns the percentage of qualified peers a value is better than.
+
+        Args:
+            metric (str): The statistic, as named in the player records.
+            value (float): The player's value.
+
+        Returns:
+            float: The percentile (0 to 100), or None for a missing value or no peers.
+        """
+        name, higher_is_better = METRICS[self.role][metric]
+        values = self.sorted[name]
+        if value is None or not len(values) or not np.isfinite(value):
+            return None
+        if higher_is_better:
+            better_than = np.searchsorted(values, value, side='left')
+        else:
+            better_than = len(values) - np.searchsorted(values, value, side='right')
+        return round(float(better_than) / len(values) * 100, 1)
+
+    def percentiles(self, record):
+        """
+        Returns the percentiles of the statistics of a player record.
+
+        Args:
+            record (dict): A batting or bowling record (see `ipl.batsman_api`).
+
+        Returns:
+            dict: The qualification, the number of qualified peers and, for every ranked
+                statistic of the record, its percentile.
+        """
+        return {
+            'min_balls': self.min_balls,
+            'min_innings': self.min_innings,
+            'peers': self.peers,
+            'metrics': {metric: self.percentile(metric, record[metric])
+                        for metric in METRICS[self.role] if metric in record}
+        }
@@ -0,0 +1,155 @@
+"""
+Innings Phases Module
+
+This module splits batting and bowling records by phase of the innings: the powerplay
+(overs 0-5), the middle overs (6-14) and the death overs (15-19). The phase of every
+delivery is derived once from its `overs` field as a small integer code, and the
+per-phase numbers are computed in a single grouped pass with `np.bincount` over those
+codes rather than by filtering the deliveries once per phase.
+
+Functions:
+    phase_codes: Returns the phase code of every delivery.
+    select_phases: Parses a requested phase selection.
+    batting_split: Builds the per-phase batting numbers from per-phase totals.
+    bowling_split: Builds the per-phase bowling numbers from per-phase totals.
+    batting_phases: Computes the per-phase batting numbers of a batsman's deliveries.
+    bowling_phases: Computes the per-phase bowling numbers of a bowler's deliveries.
+
+Usage Example:
+
+    import numpy as np
+    import phases
+
+    codes = phases.phase_codes(np.array([0, 5, 6, 14, 15, 19]))  # array([0, 0, 1, 1, 2, 2])
+    phases.batting_phases(codes, np.array([4, 1, 0, 6, 1, 2]),
+                          np.ones(6, dtype=bool), np.zeros(6, dtype=bool))
+"""
+
+import numpy as np
+
+import kernels
+
+PHASES = ('powerplay', 'middle', 'death')
+
+# First over (0-based) of each phase after the powerplay
+PHASE_STARTS = (6, 15)
+
+
+def phase_codes(overs):
+    """
+    Returns the phase code of every delivery: 0 powerplay, 1 middle, 2 death.
+
+    Args:
+        overs (array-like): The 0-based over of every delivery.
+
+    Returns:
+        np.ndarray: The int8 phase codes.
+    """
+    return np.searchsorted(PHASE_STARTS, np.asarray(overs), side='right').astype(np.int8)
+
+
+def select_phases(value):
+    """
+    Parses a requested phase selection.
+
+    Args:
+        value (str): 'all', one of the phase names, or None/'' for no phase split.
+
+    Returns:
+        tuple: The selected phase names, or None when no split is requested.
+
+    Raises:
+        ValueError: If the value is not a phase name.
+    """
+    if value is None or value == '':
+        return None
+    value = value.lower()
+    if value == 'all':
+        return PHASES
+    if value not in PHASES:
+        raise ValueError(f"Invalid phase '{value}', expected all, {', '.join(PHASES)}")
+    return (value,)
+
+
+def batting_split(runs, balls, dismissals):
+    """
+    Builds the per-phase batting numbers from per-phase totals.
+
+    Args:
+        runs (array-like): Runs scored in each phase.
+        balls (array-like): Balls faced in each phase.
+        dismissals (array-like): Dismissals in each phase.
+
+    Returns:
+        dict: Phase name mapped to its runs, balls, dismissals and strike rate.
+    """
+    return {
+        phase: {
+            'runs': int(runs[code]),
+            'balls': int(balls[code]),
+            'dismissals': int(dismissals[code]),
+            'strike_rate': runs[code] / balls[code] * 100 if balls[code] else None
+        }
+        for code, phase in enumerate(PHASES)
+    }
+
+
+def bowling_split(runs, balls, wickets):
+    """
+    Builds the per-phase bowling numbers from per-phase totals.
+
+    Args:
+        runs (array-like): Runs conceded in each phase.
+        balls (array-like): Balls bowled in each phase.
+        wickets (array-like): Wickets taken in each phase.
+
+    Returns:
+        dict: Phase name mapped to its runs, balls, wickets and economy.
+    """
+    return {
+        phase: {
+            'runs': int(runs[code]),
+            'balls': int(balls[code]),
+            'wickets': int(wickets[code]),
+            'economy': runs[code] / balls[code] * 6 if balls[code] else None
+        }
+        for code, phase in enumerate(PHASES)
+    }
+
+
+def batting_phases(phase, runs, legal, dismissed):
+    """
+    Computes the per-phase batting numbers of a batsman's deliveries.
+
+    Args:
+        phase (np.ndarray): Phase code of every delivery.
+        runs (np.ndarray): Runs scored off the bat.
+        legal (np.ndarray): Whether the delivery counts as a ball faced.
+        dismissed (np.ndarray): Whether the batsman was dismissed on the delivery.
+
+    Returns:
+        dict: The per-phase numbers (see `batting_split`).
+    """
+    size = len(PHASES)
+    return batting_split(kernels.group_sum(phase, runs, size),
+                         kernels.group_sum(phase, legal, size),
+                         kernels.group_sum(phase, dismissed, size))
+
+
+def bowling_phases(phase, runs_conceded, legal, wickets):
+    """
+    Computes the per-phase bowling numbers of a bowler's deliveries.
+
+    Args:
+        phase (np.ndarray): Phase code of every delivery.
+        runs_conceded (np.ndarray): Runs conceded by the bowler.
+        legal (np.ndarray): Whether the delivery counts as a ball.
+        wickets (np.ndarray): Wickets credited to the bowler.
+
+    Returns:
+        dict: The per-phase numbers (see `bowling_split`).
+    """
+    size = len(PHASES)
+    return bowling_split(kernels.group_sum(phase, runs_conceded, size),
+                         kernels.group_sum(phase, legal, size),
+                         kernels.group_sum(phase, wickets, size))
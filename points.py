@@ -0,0 +1,125 @@
+"""
+Points Table Module
+
+This module reconstructs the league-stage points table of every season from the matches
+data and the innings table: matches played, won, lost and without result, points and the
+net run rate (NRR).
+
+Play-off fixtures (a `MatchNumber` such as 'Final' or 'Qualifier 1') are excluded. A win,
+including one decided by a super over, is worth two points and a match without a result
+one point to each team. The net run rate is the run rate scored minus the run rate
+conceded over the matches with a result, where an all-out innings counts as having faced
+its full quota of overs. The data have no revised overs, so the quota in a rain-reduced
+(Duckworth-Lewis) match is the longest innings of the match, the closest bound the
+deliveries give on its allotted overs. All the seasons are computed in one pass: the
+results and innings totals are grouped by a (season, team) key with `np.bincount`.
+
+Functions:
+    points_tables: Returns the league-stage points table of every season.
+
+Usage Example:
+
+    import ipl
+    from points import points_tables
+
+    tables = points_tables(ipl.matches, ipl.innings_table)
+    print(tables[2022])
+"""
+
+import numpy as np
+
+import innings
+import kernels
+import match_search
+
+# Points for a win and for a match without a result
+WIN_POINTS = 2
+NO_RESULT_POINTS = 1
+
+# `method` of the matches decided by the Duckworth-Lewis method
+DUCKWORTH_LEWIS = 'D/L'
+
+
+def _overs(balls):
+    """
+    Formats a number of legal balls as overs ('123.4').
+    """
+    return f'{int(balls) // 6}.{int(balls) % 6}'
+
+
+def points_tables(match_df, innings_table):
+    """
+    Returns the league-stage points table of every season.
+
+    Args:
+        match_df (pd.DataFrame): The matches data (with 'SeasonYear' and 'method').
+        innings_table (innings.InningsTable): The innings summaries of the matches.
+
+    Returns:
+        dict: Season mapped to its table: one row per team with its position, matches
+            played, won, lost and without result, points, net run rate and the runs and
+            overs scored and conceded, ordered by points and then net run rate.
+    """
+    league = match_df[match_df['MatchNumber'].map(match_search.match_stage) ==
+                      match_search.LEAGUE_STAGE]
+    teams = np.unique(league[['Team1', 'Team2']].to_numpy().astype(str))
+    seasons = np.unique(league['SeasonYear'].to_numpy())
+    size = len(seasons) * len(teams)
+
+    def keys(season, team):
+        return (kernels.encode(np.asarray(season), seasons)[0] * len(teams) +
+                kernels.encode(np.asarray(team).astype(str), teams)[0])
+
+    # Results: both sides of every league match
+    season = np.tile(league['SeasonYear'].to_numpy(), 2)
+    team = np.concatenate((league['Team1'].to_numpy(), league['Team2'].to_numpy()))
+    winner = np.tile(league['WinningTeam'].to_numpy(), 2)
+    key = keys(season, team)
+    no_result = np.tile(league['WinningTeam'].isna().to_numpy(), 2)
+    played = kernels.group_count(key, size)
+    won = kernels.group_count(key[winner == team], size)
+    no_results = kernels.group_count(key[no_result], size)
+
+    # Net run rate: the league innings of the matches with a result, an all-out innings
+    # counting as its full quota of balls (the longest innings of a D/L match)
+    columns = innings_table.columns
+    rows = np.flatnonzero(columns['league'] & (columns['result'] != innings.NO_RESULT))
+    match_codes, match_ids = kernels.encode(columns['ID'][rows])
+    longest = np.zeros(len(match_ids), dtype=np.int64)
+    np.maximum.at(longest, match_codes, columns['balls'][rows])
+    reduced = np.isin(columns['ID'][rows],
+                      match_df.loc[match_df['method'] == DUCKWORTH_LEWIS, 'ID'].to_numpy())
+    quota = np.where(reduced, longest[match_codes], innings.INNINGS_BALLS)
+    balls = np.where(columns['wickets'][rows] >= innings.ALL_OUT, quota, columns['balls'][rows])
+    runs = columns['runs'][rows]
+    batting = keys(columns['season'][rows], innings_table.teams[columns['batting_team'][rows]])
+    bowling = keys(columns['season'][rows], innings_table.teams[columns['bowling_team'][rows]])
+    runs_for = kernels.group_sum(batting, runs, size)
+    balls_for = kernels.group_sum(batting, balls, size)
+    runs_against = kernels.group_sum(bowling, runs, size)
+    balls_against = kernels.group_sum(bowling, balls, size)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        nrr = runs_for / balls_for * 6 - runs_against / balls_against * 6
+    nrr = np.where((balls_for > 0) & (balls_against > 0), nrr, 0.0)
+    points = won * WIN_POINTS + no_results * NO_RESULT_POINTS
+
+    tables = {}
+    for code, year in enumerate(seasons):
+        keys_of_season = np.arange(code * len(teams), (code + 1) * len(teams))
+        keys_of_season = keys_of_season[played[keys_of_season] > 0]
+        order = keys_of_season[np.lexsort((-nrr[keys_of_season], -points[keys_of_season]))]
+        tables[int(year)] = [{
+            'position': position,
+            'team': str(teams[key % len(teams)]),
+            'played': int(played[key]),
+            'won': int(won[key]),
+            'lost': int(played[key] - won[key] - no_results[key]),
+            'no_result': int(no_results[key]),
+            'points': int(points[key]),
+            'nrr': round(float(nrr[key]), 3),
+            'runs_for': int(runs_for[key]),
+            'overs_for': _overs(balls_for[key]),
+            'runs_against': int(runs_against[key]),
+            'overs_against': _overs(balls_against[key])
+        } for position, key in enumerate(order, start=1)]
+    return tables
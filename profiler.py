@@ -0,0 +1,324 @@
+"""
+Request Profiling Module
+
+This module provides on-demand profiling for the analytics routes. A call is run under
+cProfile (or under pyinstrument's sampling profiler when it is installed) and the result
+is turned into a top-N cumulative-time report and a flamegraph-compatible collapsed-stack
+text ("frame;frame;frame <microseconds>" per line, as consumed by flamegraph.pl/speedscope).
+
+Classes:
+    SlowRequestRegistry: Thread-safe rolling registry of the N slowest requests, and of the
+        most recent profiled requests.
+
+Functions:
+    profile_call: Runs a callable under the profiler and returns its result and profile.
+    collapse_pstats: Builds collapsed stacks from cProfile statistics.
+    save_profile: Writes a profile report and its collapsed stacks to a directory.
+
+Usage Example:
+
+    import ipl
+    from profiler import profile_call
+
+    result, profile = profile_call(ipl.batsman_api, 'V Kohli', top_n=10)
+    print(profile['report'])
+    open('kohli.collapsed', 'w').write(profile['collapsed'])
+"""
+
+import collections
+import cProfile
+import heapq
+import io
+import itertools
+import os
+import pstats
+import threading
+import time
+
+try:
+    from pyinstrument import Profiler as SamplingProfiler
+except ImportError:  # pragma: no cover - optional dependency
+    SamplingProfiler = None
+
+
+def _frame_label(func_key):
+    """
+    Returns a readable, collapsed-stack safe label for a pstats function key.
+
+    Args:
+        func_key (tuple): A (filename, line number, function name) tuple from pstats.
+
+    Returns:
+        str: Label of the form 'function (file.py:line)'.
+    """
+    filename, line, name = func_key
+    if filename == '~':
+        label = name
+    else:
+        label = f'{name} ({os.path.basename(filename)}:{line})'
+    return label.replace(';', ':')
+
+
+def collapse_pstats(stats, max_depth=64):
+    """
+    Builds collapsed stacks from cProfile statistics.
+
+    cProfile only records caller/callee edges, not complete stacks, so each function's
+    own time is attributed to the chain formed by following its heaviest caller up to
+    the root. This is an approximation, but it is enough for finding hot paths in a
+    flamegraph.
+
+    Args:
+        stats (pstats.Stats): Statistics collected by cProfile.
+        max_depth (int): Maximum number of frames in a single stack.
+
+    Returns:
+        str: Collapsed stacks, one 'frame;frame;frame <microseconds>' entry per line.
+    """
+    raw = stats.stats
+    lines = {}
+    for func_key, (_, _, own_time, _, _) in raw.items():
+        value = int(own_time * 1e6)
+        if value <= 0:
+            continue
+        stack = [func_key]
+        seen = {func_key}
+        current = func_key
+        while len(stack) < max_depth:
+            callers = raw.get(current, (0, 0, 0, 0, {}))[4]
+            if not callers:
+                break
+            # Follow the caller that contributed the most cumulative time
+            parent = max(callers.items(), key=lambda item: item[1][3])[0]
+            if parent in seen:
+                break
+            stack.append(parent)
+            seen.add(parent)
+            current = parent
+        line = ';'.join(_frame_label(key) for key in reversed(stack))
+        lines[line] = lines.get(line, 0) + value
+    return '\n'.join(f'{line} {value}' for line, value in sorted(lines.items()))
+
+
+def _collapse_sampled(frame, prefix, lines):
+    """
+    Recursively collapses a pyinstrument frame tree into collapsed-stack lines.
+
+    Args:
+        frame: A pyinstrument Frame.
+        prefix (str): The collapsed stack of the frame's ancestors.
+        lines (dict): Accumulator mapping collapsed stacks to microseconds.
+    """
+    label = frame.function
+    if frame.file_path:
+        label = f'{label} ({os.path.basename(frame.file_path)}:{frame.line_no})'
+    stack = f'{prefix};{label.replace(";", ":")}' if prefix else label.replace(';', ':')
+    own_time = frame.time - sum(child.time for child in frame.children)
+    if own_time > 0:
+        lines[stack] = lines.get(stack, 0) + int(own_time * 1e6)
+    for child in frame.children:
+        _collapse_sampled(child, stack, lines)
+
+
+def _top_n_from_collapsed(collapsed, top_n):
+    """
+    Builds a top-N cumulative-time report from collapsed stacks.
+
+    Args:
+        collapsed (str): Collapsed stacks text.
+        top_n (int): Number of functions to report.
+
+    Returns:
+        str: A plain-text table of the functions with the highest cumulative time.
+    """
+    cumulative = {}
+    own = {}
+    for line in collapsed.splitlines():
+        stack, _, value = line.rpartition(' ')
+        frames = stack.split(';')
+        for name in set(frames):
+            cumulative[name] = cumulative.get(name, 0) + int(value)
+        own[frames[-1]] = own.get(frames[-1], 0) + int(value)
+    ranked = sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:top_n]
+    rows = [f'{"cumtime(s)":>12} {"tottime(s)":>12}  function']
+    for name, value in ranked:
+        rows.append(f'{value / 1e6:12.6f} {own.get(name, 0) / 1e6:12.6f}  {name}')
+    return '\n'.join(rows)
+
+
+def profile_call(function, *args, top_n=25, sampling=True, **kwargs):
+    """
+    Runs a callable under a profiler and returns its result together with the profile.
+
+    pyinstrument is used when it is installed and `sampling` is True, otherwise cProfile.
+
+    Args:
+        function (callable): The callable to profile.
+        *args: Positional arguments passed to the callable.
+        top_n (int): Number of functions to include in the cumulative-time report.
+        sampling (bool): Whether to prefer the sampling profiler when it is available.
+        **kwargs: Keyword arguments passed to the callable.
+
+    Returns:
+        tuple: The callable's result and a dictionary with the keys 'profiler',
+            'duration', 'report' (top-N cumulative-time text) and 'collapsed'
+            (collapsed-stack text).
+    """
+    start = time.perf_counter()
+    if sampling and SamplingProfiler is not None:
+        sampler = SamplingProfiler(interval=0.0005)
+        sampler.start()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            sampler.stop()
+        lines = {}
+        root = sampler.last_session.root_frame()
+        if root is not None:
+            _collapse_sampled(root, '', lines)
+        collapsed = '\n'.join(f'{line} {value}' for line, value in sorted(lines.items()))
+        report = _top_n_from_collapsed(collapsed, top_n)
+        profiler_name = 'pyinstrument'
+    else:
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            profile.disable()
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream)
+        stats.sort_stats('cumulative').print_stats(top_n)
+        report = stream.getvalue()
+        collapsed = collapse_pstats(stats)
+        profiler_name = 'cProfile'
+
+    data = {
+        'profiler': profiler_name,
+        'duration': time.perf_counter() - start,
+        'report': report,
+        'collapsed': collapsed
+    }
+    return result, data
+
+
+def save_profile(profile, directory, name):
+    """
+    Writes a profile's report and collapsed stacks to a directory.
+
+    Args:
+        profile (dict): A profile dictionary as returned by `profile_call`.
+        directory (str): Directory in which the files are written. Created if missing.
+        name (str): Base name of the files.
+
+    Returns:
+        dict: Paths of the written 'report' and 'collapsed' files.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = {
+        'report': os.path.join(directory, f'{name}.txt'),
+        'collapsed': os.path.join(directory, f'{name}.collapsed')
+    }
+    for key, path in paths.items():
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(profile[key])
+    return paths
+
+
+class SlowRequestRegistry:
+    """
+    Thread-safe rolling registry of the N slowest requests.
+
+    Every request is offered to the registry with its parameters, its duration and an
+    optional profile. Only the `size` slowest requests seen so far are kept, using a
+    min-heap so each offer costs O(log N). Profiled requests are also kept, whatever their
+    duration, in a separate store of the `profiled_size` most recent ones, so the profile
+    of an explicitly profiled request can always be fetched by its id.
+    """
+
+    def __init__(self, size=20, profiled_size=20):
+        """
+        Args:
+            size (int): Number of requests to keep.
+            profiled_size (int): Number of most recent profiled requests to keep.
+        """
+        self.size = size
+        self.profiled_size = profiled_size
+        self._heap = []
+        self._profiled = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def record(self, endpoint, params, duration, profile=None):
+        """
+        Offers a request to the registry.
+
+        Args:
+            endpoint (str): The request path.
+            params (dict): The request parameters.
+            duration (float): The request duration in seconds.
+            profile (dict): Optional profile as returned by `profile_call`.
+
+        Returns:
+            int: The id of the stored entry, or None if the request was neither profiled
+                nor slow enough to be kept.
+        """
+        with self._lock:
+            entry_id = next(self._ids)
+            entry = {
+                'id': entry_id,
+                'endpoint': endpoint,
+                'params': params,
+                'duration': duration,
+                'timestamp': time.time(),
+                'profile': profile
+            }
+            if profile is not None:
+                self._profiled[entry_id] = entry
+                while len(self._profiled) > self.profiled_size:
+                    self._profiled.popitem(last=False)
+            item = (duration, entry_id, entry)
+            if len(self._heap) < self.size:
+                heapq.heappush(self._heap, item)
+                return entry_id
+            if duration > self._heap[0][0]:
+                heapq.heapreplace(self._heap, item)
+                return entry_id
+            return entry_id if entry_id in self._profiled else None
+
+    def entries(self):
+        """
+        Returns the stored requests, slowest first.
+
+        Returns:
+            list: The stored entries.
+        """
+        with self._lock:
+            items = sorted(self._heap, reverse=True)
+        return [entry for _, _, entry in items]
+
+    def get(self, entry_id):
+        """
+        Returns a stored request by id.
+
+        Args:
+            entry_id (int): The entry id.
+
+        Returns:
+            dict: The entry, or None if it is not (or no longer) stored.
+        """
+        with self._lock:
+            if entry_id in self._profiled:
+                return self._profiled[entry_id]
+            for _, stored_id, entry in self._heap:
+                if stored_id == entry_id:
+                    return entry
+        return None
+
+    def clear(self):
+        """
+        Removes all stored requests.
+        """
+        with self._lock:
+            self._heap = []
+            self._profiled.clear()
@@ -0,0 +1,212 @@
+"""
+Match Progression Module
+
+This module computes the over-by-over progression of a match, the series behind the worm
+(cumulative runs) and manhattan (runs per over) charts: the runs, wickets and cumulative
+runs and wickets of every over, the run rate and, for the chasing side, the required run
+rate.
+
+The series are computed from the match-ordered ball-by-ball table of a
+`scorecard.MatchIndex`: the deliveries are reduced to overs with `np.add.reduceat` over
+the runs of equal (match, innings, over) keys, and the cumulative series are grouped
+cumulative sums (a running sum minus its value at the start of each innings). The same
+pass runs over one match's slice, or over the whole table in bulk mode, which keeps the
+series of every match in a compact array store (narrow integer and float32 columns with
+CSR offsets by match), so a chart is one slice.
+
+Classes:
+    ProgressionStore: The over-by-over series of the matches, computed per match or in bulk.
+
+Functions:
+    over_table: Reduces match-ordered deliveries to the over-by-over series.
+
+Usage Example:
+
+    import ipl
+    from progression import ProgressionStore
+
+    store = ProgressionStore(ipl.match_index, precompute=True)
+    print(store.progression(1312200))
+"""
+
+import numpy as np
+
+import kernels
+
+# Legal balls of an innings (a chase's required run rate assumes the full 20 overs)
+INNINGS_BALLS = 120
+
+# Column dtypes of the bulk store
+STORE_DTYPES = {
+    'innings': np.int8, 'team': np.int16, 'over': np.int8, 'runs': np.int16, 'wickets': np.int8,
+    'balls': np.int16, 'cumulative_runs': np.int16, 'cumulative_wickets': np.int8,
+    'cumulative_balls': np.int16, 'target': np.int16, 'required_run_rate': np.float32
+}
+
+
+def _grouped_cumsum(values, group_starts):
+    """
+    Returns the running sum of values restarted at the start of every group.
+    """
+    total = np.cumsum(values)
+    sizes = np.diff(np.append(group_starts, len(values)))
+    return total - np.repeat(total[group_starts] - values[group_starts], sizes)
+
+
+def over_table(match, columns):
+    """
+    Reduces match-ordered deliveries to the over-by-over series of their innings.
+
+    Args:
+        match (np.ndarray): The match code of every delivery, sorted.
+        columns (dict): The ball-by-ball columns of `scorecard.MatchIndex`, ordered by
+            match, innings, over and ball.
+
+    Returns:
+        dict: Column name mapped to an array with one value per over: 'match', 'innings',
+            'team', 'over' (1-based), 'runs', 'wickets', 'balls' (legal), the cumulative
+            runs, wickets and balls of the innings, and for second innings the 'target'
+            and 'required_run_rate' after the over (0 and NaN for first innings).
+    """
+    main = np.isin(columns['innings'], (1, 2))  # Excluding Super overs
+    match, innings = match[main], columns['innings'][main]
+    overs = columns['overs'][main]
+    extra_type = columns['extra_type'][main].astype(str)
+    legal = ~np.isin(extra_type, ('wides', 'noballs'))
+
+    # One run of deliveries per (match, innings, over)
+    innings_key = match.astype(np.int64) * 2 + innings - 1
+    starts = kernels.run_starts(innings_key * (int(overs.max(initial=0)) + 1) + overs)
+    table = {
+        'match': match[starts],
+        'innings': innings[starts],
+        'team': columns['BattingTeam'][main][starts],
+        'over': overs[starts] + 1,
+        'runs': kernels.run_sums(columns['total_run'][main], starts),
+        'wickets': kernels.run_sums(columns['isWicketDelivery'][main], starts),
+        'balls': kernels.run_sums(legal.astype(np.int64), starts)
+    }
+
+    # Cumulative series within every innings
+    innings_starts = kernels.run_starts(innings_key[starts])
+    for name in ('runs', 'wickets', 'balls'):
+        table[f'cumulative_{name}'] = _grouped_cumsum(table[name], innings_starts)
+
+    # Target of a chase: the first innings total of the same match plus one
+    totals = kernels.run_sums(table['runs'], innings_starts)
+    first = table['innings'][innings_starts] == 1
+    first_total = dict(zip(table['match'][innings_starts][first], totals[first]))
+    chasing = table['innings'] == 2
+    target = np.zeros(len(starts), dtype=np.int64)
+    target[chasing] = [first_total.get(code, -1) + 1 for code in table['match'][chasing]]
+    needed = target - table['cumulative_runs']
+    remaining = INNINGS_BALLS - table['cumulative_balls']
+    live = chasing & (target > 0) & (needed > 0) & (remaining > 0)
+    required = np.full(len(starts), np.nan)
+    required[live] = needed[live] / remaining[live] * 6
+    table['target'] = np.where(target > 0, target, 0)
+    table['required_run_rate'] = required
+    return table
+
+
+def _series(table, rows, teams):
+    """
+    Formats the over table rows of one match as per-innings chart series.
+    """
+    series = []
+    for start, end in zip(rows[:-1], rows[1:]):
+        overs = slice(start, end)
+        cumulative_balls = table['cumulative_balls'][overs]
+        innings = {
+            'innings': int(table['innings'][start]),
+            'team': str(teams[table['team'][start]]),
+            'overs': table['over'][overs].tolist(),
+            'runs': table['runs'][overs].tolist(),
+            'wickets': table['wickets'][overs].tolist(),
+            'cumulative_runs': table['cumulative_runs'][overs].tolist(),
+            'cumulative_wickets': table['cumulative_wickets'][overs].tolist(),
+            'run_rate': [round(runs / balls * 6, 2) if balls else None for runs, balls
+                         in zip(table['cumulative_runs'][overs].tolist(),
+                                cumulative_balls.tolist())]
+        }
+        if innings['innings'] == 2 and table['target'][start] > 0:
+            innings['target'] = int(table['target'][start])
+            innings['required_run_rate'] = [
+                None if np.isnan(rate) else round(float(rate), 2)
+                for rate in table['required_run_rate'][overs]]
+        series.append(innings)
+    return series
+
+
+class ProgressionStore:
+    """
+    The over-by-over progression of the matches of a `scorecard.MatchIndex`, computed from
+    a match's slice on request or precomputed for every match in bulk.
+    """
+
+    def __init__(self, index, precompute=False):
+        """
+        Args:
+            index (scorecard.MatchIndex): The match-ordered ball-by-ball table.
+            precompute (bool): Compute the series of every match up front into the store.
+        """
+        self.index = index
+        self.table = None
+        self.offsets = None
+        self.teams = None
+        if precompute:
+            self.precompute()
+
+    def precompute(self):
+        """
+        Computes the series of every match in one pass over the whole table and keeps them
+        as narrow columns sorted by match with CSR offsets.
+        """
+        offsets = self.index.table.offsets
+        match = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+        table = over_table(match, self.index.table.columns)
+        self.offsets = kernels.csr_offsets(table.pop('match'), len(offsets) - 1)
+        table['team'], self.teams = kernels.encode(table['team'].astype(str))
+        self.table = {name: values.astype(STORE_DTYPES.get(name, values.dtype))
+                      for name, values in table.items()}
+
+    @property
+    def nbytes(self):
+        """
+        int: Size of the bulk store's arrays in bytes (0 when not precomputed).
+        """
+        if self.table is None:
+            return 0
+        return sum(values.nbytes for values in self.table.values()) + self.offsets.nbytes
+
+    def progression(self, match_id):
+        """
+        Returns the over-by-over progression of a match.
+
+        Args:
+            match_id (int): The match ID.
+
+        Returns:
+            dict: For every innings, the per-over runs and wickets, the cumulative runs and
+                wickets, the run rate and, for the chase, the target and required run rate,
+                or None for unknown matches. A known match without deliveries (abandoned
+                without a ball bowled) has no innings.
+        """
+        code = kernels.lookup(self.index.match_ids, match_id)
+        if code < 0:
+            if match_id not in self.index.matches.index:
+                return None
+            return {'match_id': int(match_id), 'innings': []}
+        if self.table is not None:
+            table, teams = self.table, self.teams
+            start, end = int(self.offsets[code]), int(self.offsets[code + 1])
+        else:
+            rows = self.index.match_rows(match_id)
+            table = over_table(np.zeros(len(rows['innings']), dtype=np.intp), rows)
+            table['team'], teams = kernels.encode(table['team'].astype(str))
+            start, end = 0, len(table['match'])
+        innings_rows = start + kernels.run_starts(table['innings'][start:end])
+        return {
+            'match_id': int(match_id),
+            'innings': _series(table, np.append(innings_rows, end), teams)
+        }
@@ -0,0 +1,247 @@
+"""
+Match Scorecard Module
+
+This module assembles the full scorecard of a single match: the batting card, the bowling
+figures, the fall of wickets and the extras of every innings, and the result.
+
+The ball-by-ball data is stored physically ordered by match (and by innings, over and
+ball within a match) as column arrays, with a match ID -> row range index (CSR offsets
+over the sorted match IDs). A scorecard is computed from the match's contiguous slice in
+one vectorized pass per innings and cached, so a match is only assembled once.
+
+Classes:
+    MatchIndex: Ball-by-ball columns ordered by match with a per-match row-range index.
+
+Functions:
+    overs_notation: Formats a number of legal balls as overs ('3.4').
+
+Usage Example:
+
+    import ipl
+    from scorecard import MatchIndex
+
+    index = MatchIndex(ipl.matches, ipl.bowler_data)
+    print(index.scorecard(1312200))
+"""
+
+import threading
+
+import numpy as np
+
+import kernels
+
+# Columns of the ball-by-ball data kept in the match-ordered table
+COLUMNS = ('innings', 'overs', 'ballnumber', 'batter', 'bowler', 'non-striker', 'extra_type',
+           'batsman_run', 'extras_run', 'total_run', 'non_boundary', 'isWicketDelivery',
+           'player_out', 'kind', 'fielders_involved', 'BattingTeam', 'bowler_run',
+           'isBowlerWicket')
+
+# Result fields of a scorecard and the columns of the matches data they come from
+RESULT_COLUMNS = {
+    'season': 'Season', 'date': 'Date', 'match_number': 'MatchNumber', 'city': 'City',
+    'venue': 'Venue', 'team1': 'Team1', 'team2': 'Team2', 'toss_winner': 'TossWinner',
+    'toss_decision': 'TossDecision', 'winning_team': 'WinningTeam', 'won_by': 'WonBy',
+    'margin': 'Margin', 'method': 'method', 'super_over': 'SuperOver',
+    'player_of_match': 'Player_of_Match', 'umpire1': 'Umpire1', 'umpire2': 'Umpire2'
+}
+
+EXTRA_TYPES = ('wides', 'noballs', 'byes', 'legbyes', 'penalty')
+
+
+def overs_notation(balls):
+    """
+    Formats a number of legal balls as overs.
+
+    Args:
+        balls (int): The number of legal balls.
+
+    Returns:
+        str: The overs, e.g. '3.4' for 22 balls.
+    """
+    return f'{int(balls) // 6}.{int(balls) % 6}'
+
+
+def _value(value):
+    """
+    Returns a JSON-friendly value: None for missing values, Python scalars for NumPy ones.
+    """
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _first_seen(names):
+    """
+    Returns the distinct names in order of first appearance and the code of every name.
+    """
+    vocabulary, first, codes = np.unique(names, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind='stable')
+    rank = np.empty(len(order), dtype=np.intp)
+    rank[order] = np.arange(len(order))
+    return vocabulary[order], rank[codes]
+
+
+class MatchIndex:
+    """
+    Ball-by-ball columns ordered by match, innings, over and ball, with a match ID -> row
+    range index and a cache of the assembled scorecards.
+    """
+
+    def __init__(self, match_df, ball_df):
+        """
+        Args:
+            match_df (pd.DataFrame): The matches data.
+            ball_df (pd.DataFrame): Ball-by-ball data with the bowling columns
+                (`ipl.bowler_data`).
+        """
+        order = np.lexsort((ball_df['ballnumber'].to_numpy(), ball_df['overs'].to_numpy(),
+                            ball_df['innings'].to_numpy(), ball_df['ID'].to_numpy()))
+        codes, self.match_ids = kernels.encode(ball_df['ID'].to_numpy()[order])
+        self.table = kernels.SortedColumns(
+            codes, {name: ball_df[name].to_numpy()[order] for name in COLUMNS},
+            len(self.match_ids))
+        self.matches = match_df.set_index('ID')
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.match_ids)
+
+    def match_rows(self, match_id):
+        """
+        Returns the deliveries of a match, in order, as views of the table.
+
+        Args:
+            match_id (int): The match ID.
+
+        Returns:
+            dict: Column name mapped to the match's values (empty for unknown matches).
+        """
+        return self.table.slice(kernels.lookup(self.match_ids, match_id))
+
+    def scorecard(self, match_id):
+        """
+        Returns the scorecard of a match, assembled once and then served from the cache.
+
+        Args:
+            match_id (int): The match ID.
+
+        Returns:
+            dict: The match result and, for every innings, the batting card, the bowling
+                figures, the fall of wickets and the extras, or None for unknown matches.
+        """
+        card = self._cache.get(match_id)
+        if card is None:
+            if match_id not in self.matches.index:
+                return None
+            card = self._assemble(match_id)
+            with self._lock:
+                card = self._cache.setdefault(match_id, card)
+        return card
+
+    def _assemble(self, match_id):
+        """
+        Computes the scorecard of a known match from its slice of the table.
+        """
+        rows = self.match_rows(match_id)
+        match = self.matches.loc[match_id]
+        innings = rows['innings']
+        starts = kernels.run_starts(innings)
+        ends = np.append(starts[1:], len(innings))
+        return {
+            'match_id': int(match_id),
+            'result': {field: _value(match.get(column))
+                       for field, column in RESULT_COLUMNS.items()},
+            'innings': [self._innings({name: values[start:end]
+                                       for name, values in rows.items()})
+                        for start, end in zip(starts, ends)]
+        }
+
+    def _innings(self, rows):
+        """
+        Computes the batting card, bowling figures, fall of wickets and extras of an innings.
+        """
+        extra_type = rows['extra_type'].astype(str)
+        wide, noball = extra_type == 'wides', extra_type == 'noballs'
+        legal = ~(wide | noball)
+        runs = rows['batsman_run']
+        boundary = rows['non_boundary'] == 0
+        wicket = rows['isWicketDelivery'] == 1
+
+        # Batting card, in order of arrival at the crease
+        batters, codes = _first_seen(np.column_stack((rows['batter'],
+                                                      rows['non-striker'])).ravel())
+        striker = codes[0::2]
+        size = len(batters)
+        batting_runs = kernels.group_sum(striker, runs, size)
+        batting_balls = kernels.group_sum(striker, ~wide, size)
+        fours = kernels.group_sum(striker, boundary & (runs == 4), size)
+        sixes = kernels.group_sum(striker, boundary & (runs == 6), size)
+        dismissal = {}
+        for row in np.flatnonzero(wicket):
+            credited = rows['isBowlerWicket'][row] == 1
+            dismissal[rows['player_out'][row]] = {
+                'kind': rows['kind'][row],
+                'bowler': rows['bowler'][row] if credited else None,
+                'fielders': _value(rows['fielders_involved'][row])
+            }
+        batting = [{
+            'batter': str(name),
+            'runs': int(batting_runs[code]),
+            'balls': int(batting_balls[code]),
+            'fours': int(fours[code]),
+            'sixes': int(sixes[code]),
+            'strike_rate': batting_runs[code] / batting_balls[code] * 100
+            if batting_balls[code] else None,
+            'dismissal': dismissal.get(name, 'not out')
+        } for code, name in enumerate(batters)]
+
+        # Bowling figures, in order of first over
+        bowlers, bowler = _first_seen(rows['bowler'])
+        size = len(bowlers)
+        bowler_runs = kernels.group_sum(bowler, rows['bowler_run'], size)
+        bowler_balls = kernels.group_sum(bowler, legal, size)
+        wickets = kernels.group_sum(bowler, rows['isBowlerWicket'], size)
+        dots = kernels.group_sum(bowler, legal & (rows['total_run'] == 0), size)
+        # Maidens: complete overs of a bowler without a run conceded
+        over_starts = kernels.run_starts(rows['overs'] * size + bowler)
+        over_balls = kernels.run_sums(legal.astype(np.int64), over_starts)
+        over_runs = kernels.run_sums(rows['bowler_run'], over_starts)
+        maidens = kernels.group_sum(bowler[over_starts], (over_balls >= 6) & (over_runs == 0),
+                                    size)
+        bowling = [{
+            'bowler': str(name),
+            'overs': overs_notation(bowler_balls[code]),
+            'maidens': int(maidens[code]),
+            'runs': int(bowler_runs[code]),
+            'wickets': int(wickets[code]),
+            'economy': bowler_runs[code] / bowler_balls[code] * 6
+            if bowler_balls[code] else None,
+            'dots': int(dots[code]),
+            'wides': int(np.count_nonzero(wide & (bowler == code))),
+            'noballs': int(np.count_nonzero(noball & (bowler == code)))
+        } for code, name in enumerate(bowlers)]
+
+        # Fall of wickets: the score and over when each wicket fell
+        score = np.cumsum(rows['total_run'])
+        balls_bowled = np.cumsum(legal)
+        fall_of_wickets = [{
+            'wicket': number,
+            'score': int(score[row]),
+            'player_out': _value(rows['player_out'][row]),
+            'over': overs_notation(balls_bowled[row])
+        } for number, row in enumerate(np.flatnonzero(wicket), start=1)]
+
+        extras = {kind: int(rows['extras_run'][extra_type == kind].sum())
+                  for kind in EXTRA_TYPES}
+        return {
+            'innings': int(rows['innings'][0]),
+            'team': str(rows['BattingTeam'][0]),
+            'runs': int(score[-1]),
+            'wickets': int(np.count_nonzero(wicket)),
+            'overs': overs_notation(balls_bowled[-1]),
+            'extras': dict(extras, total=sum(extras.values())),
+            'batting': batting,
+            'bowling': bowling,
+            'fall_of_wickets': fall_of_wickets
+        }
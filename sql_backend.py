@@ -0,0 +1,392 @@
+"""
+SQL Analytics Backend Module
+
+This module provides an analytics backend that loads the match and ball-by-ball tables
+into an embedded, file-backed SQL database (SQLite from the standard library, or DuckDB
+when it is installed) and answers the team, batting and bowling queries of `ipl.py` with
+SQL aggregates over indexed columns, optionally restricted to a range of seasons. Its
+results have the same keys and values as the pandas implementation, so the backends are
+interchangeable.
+
+The database file is built once and reused across processes and restarts. It is rebuilt
+when the dataset version it was built from differs from the current one.
+
+Classes:
+    SQLBackend: Answers the analytics queries with SQL over an embedded database.
+
+Usage Example:
+
+    import ipl
+    from sql_backend import SQLBackend
+
+    backend = SQLBackend(ipl.matches, ipl.bowler_data, engine='sqlite',
+                         version=ipl.DATASET_VERSION)
+    print(backend.batsman_record('V Kohli'))
+    print(backend.bowler_record('JJ Bumrah', 'Chennai Super Kings'))
+"""
+
+import os
+import sqlite3
+import threading
+
+import phases
+
+try:
+    import duckdb
+except ImportError:  # pragma: no cover - optional dependency
+    duckdb = None
+
+ENGINES = ('sqlite', 'duckdb')
+
+# Part of the stored version, so database files with an older layout are rebuilt
+SCHEMA_VERSION = 3
+
+# Columns of the matches table (the stringified playing XIs are not needed for SQL queries)
+MATCH_COLUMNS = ['ID', 'City', 'Date', 'Season', 'MatchNumber', 'Team1', 'Team2', 'Venue',
+                 'TossWinner', 'TossDecision', 'SuperOver', 'WinningTeam', 'WonBy', 'Margin',
+                 'method', 'Player_of_Match', 'Umpire1', 'Umpire2', 'SeasonYear']
+
+# Columns of the deliveries table, renamed where the source name is not a valid identifier
+DELIVERY_COLUMNS = {'ID': 'ID', 'innings': 'innings', 'overs': 'overs',
+                    'ballnumber': 'ballnumber', 'batter': 'batter', 'bowler': 'bowler',
+                    'non-striker': 'non_striker', 'extra_type': 'extra_type',
+                    'batsman_run': 'batsman_run', 'extras_run': 'extras_run',
+                    'total_run': 'total_run', 'non_boundary': 'non_boundary',
+                    'isWicketDelivery': 'isWicketDelivery', 'player_out': 'player_out',
+                    'kind': 'kind', 'fielders_involved': 'fielders_involved',
+                    'BattingTeam': 'BattingTeam', 'BowlingTeam': 'BowlingTeam',
+                    'Player_of_Match': 'Player_of_Match', 'bowler_run': 'bowler_run',
+                    'isBowlerWicket': 'isBowlerWicket', 'phase': 'phase'}
+
+INDEXES = [
+    'CREATE INDEX idx_deliveries_batter ON deliveries (batter, SeasonYear)',
+    'CREATE INDEX idx_deliveries_bowler ON deliveries (bowler, SeasonYear)',
+    'CREATE INDEX idx_deliveries_id ON deliveries (ID)',
+    'CREATE INDEX idx_deliveries_batting_team ON deliveries (BattingTeam)',
+    'CREATE INDEX idx_deliveries_season ON deliveries (SeasonYear)',
+    'CREATE INDEX idx_matches_team1 ON matches (Team1, Team2)',
+    'CREATE INDEX idx_matches_team2 ON matches (Team2)',
+    'CREATE INDEX idx_matches_season ON matches (SeasonYear)',
+]
+
+# Legal deliveries exclude wides and no-balls; a missing extra_type is a legal ball
+LEGAL_BALL = "CASE WHEN extra_type IN ('wides', 'noballs') THEN 0 ELSE 1 END"
+FOUR = 'CASE WHEN batsman_run = 4 AND non_boundary = 0 THEN 1 ELSE 0 END'
+SIX = 'CASE WHEN batsman_run = 6 AND non_boundary = 0 THEN 1 ELSE 0 END'
+
+
+class SQLBackend:
+    """
+    Answers the analytics queries with SQL aggregates over an embedded database.
+
+    Each thread gets its own connection (SQLite connections and DuckDB cursors must not
+    be shared between threads), so the backend can serve concurrent requests.
+    """
+
+    def __init__(self, match_df, ball_df, engine='sqlite', path=None, version=None):
+        """
+        Args:
+            match_df (pd.DataFrame): The matches data.
+            ball_df (pd.DataFrame): Ball-by-ball data with the batting and bowling
+                columns (`ipl.bowler_data`).
+            engine (str): 'sqlite' or 'duckdb'.
+            path (str): Database file. Defaults to 'datasets/ipl_analytics.<engine>'.
+            version (str): Dataset version; the file is rebuilt when it differs.
+
+        Raises:
+            ValueError: If the engine is unknown.
+            ImportError: If DuckDB is requested but not installed.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown analytics backend '{engine}', expected one of "
+                             f"pandas, {', '.join(ENGINES)}")
+        if engine == 'duckdb' and duckdb is None:
+            raise ImportError("The 'duckdb' backend requires the duckdb package")
+        self.name = engine
+        self.engine = engine
+        self.path = path or os.path.join('datasets', f'ipl_analytics.{engine}')
+        self.version = f"{version or 'unversioned'}-{SCHEMA_VERSION}"
+        self._local = threading.local()
+        self._shared = None
+        if self._stored_version() != self.version:
+            self._build(match_df, ball_df)
+
+    # Connections
+
+    def _connect(self):
+        """
+        Opens a new connection to the database file.
+        """
+        if self.engine == 'duckdb':
+            # Read-only, so several worker processes can open the same file
+            return duckdb.connect(self.path, read_only=True)
+        return sqlite3.connect(self.path, check_same_thread=False)
+
+    def _connection(self):
+        """
+        Returns the calling thread's connection.
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            if self.engine == 'duckdb':
+                # A DuckDB database file can only be opened once per process;
+                # threads use cursors of the shared connection
+                if self._shared is None:
+                    self._shared = self._connect()
+                connection = self._shared.cursor()
+            else:
+                connection = self._connect()
+                connection.execute('PRAGMA query_only = 1')
+            self._local.connection = connection
+        return connection
+
+    def _query(self, sql, params=()):
+        """
+        Runs a query and returns all rows.
+        """
+        return self._connection().execute(sql, list(params)).fetchall()
+
+    def _stored_version(self):
+        """
+        Returns the dataset version the database file was built from, or None.
+        """
+        if not os.path.exists(self.path):
+            return None
+        try:
+            connection = self._connect()
+            try:
+                row = connection.execute(
+                    "SELECT value FROM meta WHERE key = 'version'").fetchone()
+            finally:
+                connection.close()
+        except Exception:
+            return None
+        return row[0] if row else None
+
+    def _build(self, match_df, ball_df):
+        """
+        Loads the tables into a fresh database file and indexes them.
+
+        The file is written under a temporary name and moved into place, so concurrent
+        workers never see a half-built database.
+        """
+        matches_table = match_df[[c for c in MATCH_COLUMNS if c in match_df.columns]]
+        deliveries = ball_df[list(DELIVERY_COLUMNS)].rename(columns=DELIVERY_COLUMNS)
+        deliveries = deliveries.merge(match_df[['ID', 'SeasonYear']], on='ID', how='left')
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        for stale in (temp_path, f'{temp_path}.wal'):
+            if os.path.exists(stale):
+                os.remove(stale)
+
+        if self.engine == 'duckdb':
+            connection = duckdb.connect(temp_path)
+            for name, frame in (('matches', matches_table), ('deliveries', deliveries)):
+                connection.register('source_frame', frame)
+                connection.execute(f'CREATE TABLE {name} AS SELECT * FROM source_frame')
+                connection.unregister('source_frame')
+        else:
+            connection = sqlite3.connect(temp_path)
+            matches_table.to_sql('matches', connection, index=False)
+            deliveries.to_sql('deliveries', connection, index=False, chunksize=50000)
+        for statement in INDEXES:
+            connection.execute(statement)
+        connection.execute('CREATE TABLE meta (key VARCHAR, value VARCHAR)')
+        connection.execute("INSERT INTO meta VALUES ('version', ?)", [self.version])
+        if self.engine == 'sqlite':
+            connection.commit()
+        connection.close()
+        os.replace(temp_path, self.path)
+
+    # Queries
+
+    @staticmethod
+    def _season_filter(seasons):
+        """
+        Returns the SQL condition and parameters of a (first, last) season range.
+        """
+        first, last = seasons or (None, None)
+        condition, params = '', []
+        if first is not None:
+            condition += ' AND SeasonYear >= ?'
+            params.append(int(first))
+        if last is not None:
+            condition += ' AND SeasonYear <= ?'
+            params.append(int(last))
+        return condition, params
+
+    def team1_vs_team2(self, team1, team2, seasons=None):
+        """
+        Returns the head-to-head record of two teams (see `ipl.team1_vs_team2`).
+        """
+        season_condition, season_params = self._season_filter(seasons)
+        total, team1_won, team2_won = self._query(
+            'SELECT COUNT(*), '
+            'COALESCE(SUM(CASE WHEN WinningTeam = ? THEN 1 ELSE 0 END), 0), '
+            'COALESCE(SUM(CASE WHEN WinningTeam = ? THEN 1 ELSE 0 END), 0) '
+            'FROM matches WHERE ((Team1 = ? AND Team2 = ?) OR (Team1 = ? AND Team2 = ?))'
+            f'{season_condition}',
+            [team1, team2, team1, team2, team2, team1] + season_params)[0]
+        return {
+            'total_matches_played': int(total),
+            'team1_won': int(team1_won),
+            'team2_won': int(team2_won),
+            'no_result': int(total - team1_won - team2_won)
+        }
+
+    def all_record(self, team, seasons=None):
+        """
+        Returns the overall record of a team (see `ipl.all_record`).
+        """
+        season_condition, season_params = self._season_filter(seasons)
+        played, won, no_result, titles = self._query(
+            'SELECT COUNT(*), '
+            'COALESCE(SUM(CASE WHEN WinningTeam = ? THEN 1 ELSE 0 END), 0), '
+            'COALESCE(SUM(CASE WHEN WinningTeam IS NULL THEN 1 ELSE 0 END), 0), '
+            "COALESCE(SUM(CASE WHEN MatchNumber = 'Final' AND WinningTeam = ? "
+            'THEN 1 ELSE 0 END), 0) '
+            f'FROM matches WHERE (Team1 = ? OR Team2 = ?){season_condition}',
+            [team, team, team, team] + season_params)[0]
+        return {'matchesplayed': int(played),
+                'won': int(won),
+                'loss': int(played - won - no_result),
+                'noResult': int(no_result),
+                'title': int(titles)}
+
+    def batsman_record(self, batsman, team=None, seasons=None):
+        """
+        Returns the batting record of a batsman, optionally against one bowling team
+        (see `ipl.batsman_record`). Super overs are excluded.
+        """
+        where = 'batter = ? AND innings IN (1, 2)'
+        params = [batsman]
+        if team is not None:
+            where += ' AND BowlingTeam = ?'
+            params.append(team)
+        season_condition, season_params = self._season_filter(seasons)
+        where += season_condition
+        params += season_params
+
+        innings, runs, balls, dismissals, fours, sixes, mom = self._query(
+            'SELECT COUNT(DISTINCT ID), COALESCE(SUM(batsman_run), 0), '
+            f'COALESCE(SUM({LEGAL_BALL}), 0), '
+            'COALESCE(SUM(CASE WHEN player_out = ? THEN 1 ELSE 0 END), 0), '
+            f'COALESCE(SUM({FOUR}), 0), COALESCE(SUM({SIX}), 0), '
+            'COUNT(DISTINCT CASE WHEN Player_of_Match = ? THEN ID END) '
+            f'FROM deliveries WHERE {where}',
+            [batsman, batsman] + params)[0]
+        fifties, hundreds, highest_score = self._query(
+            'SELECT COALESCE(SUM(CASE WHEN runs >= 50 AND runs < 100 THEN 1 ELSE 0 END), 0), '
+            'COALESCE(SUM(CASE WHEN runs >= 100 THEN 1 ELSE 0 END), 0), '
+            'COALESCE(MAX(runs), 0) '
+            f'FROM (SELECT SUM(batsman_run) AS runs FROM deliveries WHERE {where} GROUP BY ID) '
+            'AS innings_runs',
+            params)[0]
+
+        return {
+            'innings': int(innings),
+            'runs': int(runs),
+            'balls': int(balls),
+            'fours': int(fours),
+            'sixes': int(sixes),
+            'avg': runs / dismissals if dismissals else None,
+            'strike_rate': runs / balls * 100 if balls else None,
+            'fifties': int(fifties),
+            'hundreds': int(hundreds),
+            'highest_score': int(highest_score),
+            'not_out': int(innings - dismissals),
+            'man_of_the_match': int(mom)
+        }
+
+    def bowler_record(self, bowler, team=None, seasons=None):
+        """
+        Returns the bowling record of a bowler, optionally against one batting team
+        (see `ipl.bowler_record`). Super overs are excluded.
+        """
+        where = 'bowler = ? AND innings IN (1, 2)'
+        params = [bowler]
+        if team is not None:
+            where += ' AND BattingTeam = ?'
+            params.append(team)
+        season_condition, season_params = self._season_filter(seasons)
+        where += season_condition
+        params += season_params
+
+        innings, nballs, runs, fours, sixes, wicket, mom = self._query(
+            f'SELECT COUNT(DISTINCT ID), COALESCE(SUM({LEGAL_BALL}), 0), '
+            'COALESCE(SUM(bowler_run), 0), '
+            f'COALESCE(SUM({FOUR}), 0), COALESCE(SUM({SIX}), 0), '
+            'COALESCE(SUM(isBowlerWicket), 0), '
+            'COUNT(DISTINCT CASE WHEN Player_of_Match = ? THEN ID END) '
+            f'FROM deliveries WHERE {where}',
+            [bowler] + params)[0]
+        figures = self._query(
+            'SELECT SUM(isBowlerWicket) AS wickets, SUM(bowler_run) AS runs '
+            f'FROM deliveries WHERE {where} GROUP BY ID '
+            'ORDER BY wickets DESC, runs ASC, ID ASC',
+            params)
+        three_wicket_plus = sum(1 for wickets, _ in figures if wickets >= 3)
+        best_figure = f'{int(figures[0][0])}/{int(figures[0][1])}' if figures else None
+
+        avg = runs / wicket if wicket else None
+        return {
+            'innings': int(innings),
+            'wicket': int(wicket),
+            'economy': runs / nballs * 6 if nballs else 0,
+            'average': avg,
+            'avg': avg,
+            'strike_rate': nballs / wicket * 100 if wicket else None,
+            'fours': int(fours),
+            'sixes': int(sixes),
+            'best_figure': best_figure,
+            '3+W': int(three_wicket_plus),
+            'man_of_the_match': int(mom)
+        }
+
+    def _player_filter(self, column, player, team_column, team, seasons):
+        """
+        Returns the SQL condition and parameters selecting a player's deliveries.
+        """
+        where = f'{column} = ? AND innings IN (1, 2)'
+        params = [player]
+        if team is not None:
+            where += f' AND {team_column} = ?'
+            params.append(team)
+        season_condition, season_params = self._season_filter(seasons)
+        return where + season_condition, params + season_params
+
+    def _phase_totals(self, columns, where, params):
+        """
+        Returns per-phase sums of SQL expressions, one array per expression.
+        """
+        rows = self._query(
+            f"SELECT phase, {', '.join(f'COALESCE(SUM({column}), 0)' for column in columns)} "
+            f'FROM deliveries WHERE {where} GROUP BY phase', params)
+        totals = [[0] * len(phases.PHASES) for _ in columns]
+        for phase, *values in rows:
+            for total, value in zip(totals, values):
+                total[int(phase)] = value
+        return totals
+
+    def batsman_phases(self, batsman, team=None, seasons=None):
+        """
+        Returns the per-phase batting numbers of a batsman, optionally against one
+        bowling team (see `ipl.batsman_phases`).
+        """
+        where, params = self._player_filter('batter', batsman, 'BowlingTeam', team, seasons)
+        runs, balls, dismissals = self._phase_totals(
+            ['batsman_run', LEGAL_BALL, 'CASE WHEN player_out = ? THEN 1 ELSE 0 END'],
+            where, [batsman] + params)
+        return phases.batting_split(runs, balls, dismissals)
+
+    def bowler_phases(self, bowler, team=None, seasons=None):
+        """
+        Returns the per-phase bowling numbers of a bowler, optionally against one
+        batting team (see `ipl.bowler_phases`).
+        """
+        where, params = self._player_filter('bowler', bowler, 'BattingTeam', team, seasons)
+        runs, balls, wickets = self._phase_totals(
+            ['bowler_run', LEGAL_BALL, 'isBowlerWicket'], where, params)
+        return phases.bowling_split(runs, balls, wickets)
@@ -1,15 +1,47 @@
 """
 Load test script for IPL API
-This script conducts basic load testing on the API endpoints to ensure they remain responsive
+This script conducts load testing on the API endpoints to ensure they remain responsive
 under load.
+
+Two modes are available:
+- closed: a fixed pool of workers sends the next request as soon as the previous one
+  returns (the original behaviour). Simple, but it hides coordinated omission: when the
+  server stalls, fewer requests are sent and the stall barely shows in the statistics.
+- open: requests are sent on a fixed schedule (constant or stepped arrival rate) whether
+  or not earlier requests have returned. Latency is measured from the intended send time,
+  so queueing behind a slow server is counted.
+
+Either mode can run in-process (--in-process): instead of a live server on localhost:8080,
+`app.app` is driven directly through the Flask test client with a throwaway SQLite user
+database. The report has the same layout in both cases, so a regression can be attributed to
+the analytics layer (visible in-process) or to the server stack (visible only over HTTP).
+
+Both modes record latencies in HDR-style histograms and report p50/p90/p99/p99.9 per
+endpoint. They can write machine-readable JSON and compare a run against a saved one.
+
+Examples:
+    python test_api_load.py -n 100 -c 4
+    python test_api_load.py --mode open --rate 20 --duration 60 --warmup 10
+    python test_api_load.py --mode open --steps 10:30,20:30,40:30 --mix load_mix.json \\
+        --json-out run.json --compare baseline.json
+    python test_api_load.py --in-process -n 200 -c 4 --json-out in_process.json
 """
 
 import requests
 import time
 import concurrent.futures
 import argparse
+import json
+import math
+import os
+import random
 import sys
-import statistics
+import tempfile
+import threading
+from urllib.parse import urlsplit
+
+# Not a unit test module: keep pytest from collecting `test_endpoint` as a test
+__test__ = False
 
 BASE_URL = "http://localhost:8080"
 TEST_USER = {
@@ -27,6 +59,198 @@ ENDPOINTS = [
     ("/api/bowling-record", {"bowler": "RA Jadeja"})
 ]
 
+# Percentiles reported for every endpoint
+PERCENTILES = [50, 90, 99, 99.9]
+
+
+class LatencyHistogram:
+    """
+    HDR-style latency histogram.
+
+    Values are recorded in microseconds into logarithmic buckets whose width is a fixed
+    fraction (`precision`) of their value, so every percentile is reported with a bounded
+    relative error whatever the range. Recording is O(1) and the memory used depends on
+    the dynamic range, not on the number of samples.
+    """
+
+    def __init__(self, precision=0.01):
+        """
+        Args:
+            precision (float): Relative width of a bucket (0.01 = 1%).
+        """
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self.counts = {}
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.sum = 0.0
+
+    def record(self, seconds):
+        """
+        Records one latency.
+
+        Args:
+            seconds (float): The latency in seconds.
+        """
+        micros = max(seconds * 1e6, 1.0)
+        bucket = int(math.log(micros) / self._log_base)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+        self.sum += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def merge(self, other):
+        """
+        Adds the values of another histogram with the same precision.
+
+        Args:
+            other (LatencyHistogram): The histogram to merge.
+        """
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        if other.total:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, q):
+        """
+        Returns the q-th percentile.
+
+        Args:
+            q (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The percentile in seconds (upper edge of its bucket, capped at the
+                maximum), or 0 when the histogram is empty.
+        """
+        if not self.total:
+            return 0
+        target = max(1, math.ceil(self.total * q / 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return min(math.exp((bucket + 1) * self._log_base) / 1e6, self.max)
+        return self.max
+
+    def mean(self):
+        """
+        Returns the mean latency in seconds.
+        """
+        return self.sum / self.total if self.total else 0
+
+    def to_dict(self):
+        """
+        Returns the histogram as a JSON-serializable dictionary.
+        """
+        return {
+            'precision': self.precision,
+            'count': self.total,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.mean(),
+            'percentiles': {str(q): self.percentile(q) for q in PERCENTILES},
+            'buckets': {str(bucket): count for bucket, count in sorted(self.counts.items())}
+        }
+
+
+def load_mix(path):
+    """
+    Loads a weighted endpoint mix from a JSON config file.
+
+    The file holds a list of endpoints, each with a path, optional parameters and a
+    relative weight:
+
+        {"endpoints": [{"path": "/api/batsman-record",
+                        "params": {"batsman": "V Kohli"}, "weight": 3}, ...]}
+
+    Args:
+        path (str): The config file, or None for the default `ENDPOINTS` with equal weights.
+
+    Returns:
+        list: (path, params, weight) tuples.
+    """
+    if path is None:
+        return [(endpoint, params, 1) for endpoint, params in ENDPOINTS]
+    with open(path, encoding='utf-8') as file:
+        config = json.load(file)
+    return [(item['path'], item.get('params', {}), item.get('weight', 1))
+            for item in config['endpoints']]
+
+
+class InProcessSession:
+    """
+    Session-like adapter that sends requests to the Flask app in-process.
+
+    It exposes the `get(url, params, timeout)` subset of `requests.Session` used by
+    `test_endpoint` and routes each call through the Flask test client, so no socket or
+    server is involved. The user logs in once, when the session is created, so the password
+    hash check is not timed as part of any request. Each worker thread gets its own test
+    client, because a test client is not meant to be shared across threads, and every
+    request carries the session cookie of that login.
+    """
+
+    def __init__(self, flask_app, credentials):
+        """
+        Args:
+            flask_app (Flask): The application to drive.
+            credentials (dict): Email and password of an existing user.
+
+        Raises:
+            RuntimeError: If the login fails.
+        """
+        self.flask_app = flask_app
+        response = flask_app.test_client().post("/login", data=credentials)
+        if response.status_code != 302:
+            raise RuntimeError(f"In-process login failed with status code {response.status_code}")
+        self.cookie = "; ".join(header.split(";", 1)[0]
+                                for header in response.headers.getlist("Set-Cookie"))
+        self._local = threading.local()
+
+    def _client(self):
+        """Return the calling thread's test client"""
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.flask_app.test_client(use_cookies=False)
+        return client
+
+    def get(self, url, params=None, timeout=None):
+        """Send a GET request for the path of `url` with the session cookie"""
+        return self._client().get(urlsplit(url).path, query_string=params,
+                                  headers={"Cookie": self.cookie})
+
+def create_in_process_session(matches=None, balls=None):
+    """
+    Import the app against a throwaway SQLite database and return a logged-in session.
+
+    Args:
+        matches (str): Optional matches CSV for ipl.py to load instead of the bundled one.
+        balls (str): Optional ball-by-ball CSV for ipl.py to load instead of the bundled one.
+
+    Returns:
+        InProcessSession: A session driving `app.app` through its test client.
+    """
+    # app.py and ipl.py read these at import time
+    os.environ["IPL_SQLITE_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="ipl_load_"), "users.db")
+    if matches:
+        os.environ["IPL_MATCHES_PATH"] = matches
+    if balls:
+        os.environ["IPL_BALLS_PATH"] = balls
+
+    import app
+    from passlib.hash import sha256_crypt
+
+    with app.app.app_context():
+        app.db.create_all()
+        app.db.session.add(app.User(name="Load Test", email=TEST_USER["email"],
+                                    password=sha256_crypt.hash(TEST_USER["password"])))
+        app.db.session.commit()
+    return InProcessSession(app.app, TEST_USER)
+
 def login_and_get_session():
     """Log in and return the session with cookies"""
     session = requests.Session()
@@ -36,118 +260,343 @@ def login_and_get_session():
         sys.exit(1)
     return session
 
-def test_endpoint(session, endpoint, params, request_id=None):
-    """Test a single endpoint and return response time"""
-    start_time = time.time()
+def test_endpoint(session, endpoint, params, request_id=None, intended_start=None):
+    """
+    Test a single endpoint and return response time.
+
+    When `intended_start` is given (open-loop mode), the response time is measured from
+    that scheduled time rather than from when the request was actually sent, so time
+    spent waiting for a free worker is included.
+    """
+    start_time = time.perf_counter()
+    measured_from = intended_start if intended_start is not None else start_time
     url = f"{BASE_URL}{endpoint}"
     try:
         response = session.get(url, params=params, timeout=10)
-        elapsed = time.time() - start_time
+        end_time = time.perf_counter()
         status = response.status_code
         return {
             "request_id": request_id,
             "endpoint": endpoint,
             "status_code": status,
-            "response_time": elapsed,
+            "response_time": end_time - measured_from,
+            "service_time": end_time - start_time,
             "success": status == 200
         }
     except Exception as e:
-        elapsed = time.time() - start_time
+        end_time = time.perf_counter()
         return {
             "request_id": request_id,
             "endpoint": endpoint,
             "status_code": 0,
-            "response_time": elapsed,
+            "response_time": end_time - measured_from,
+            "service_time": end_time - start_time,
             "success": False,
             "error": str(e)
         }
 
-def run_load_test(num_requests, concurrency):
+def build_report(results, total_time, mode, settings):
+    """
+    Builds the machine-readable report of a run.
+
+    Args:
+        results (list): Per-request results from `test_endpoint`.
+        total_time (float): Wall-clock duration of the measured phase in seconds.
+        mode (str): 'closed' or 'open'.
+        settings (dict): The run settings, stored in the report.
+
+    Returns:
+        dict: The report with overall and per-endpoint statistics.
+    """
+    overall = LatencyHistogram()
+    endpoints = {}
+    for r in results:
+        stats = endpoints.setdefault(r["endpoint"], {
+            "total": 0, "success": 0, "histogram": LatencyHistogram(),
+            "service": LatencyHistogram()})
+        stats["total"] += 1
+        if r["success"]:
+            stats["success"] += 1
+            stats["histogram"].record(r["response_time"])
+            stats["service"].record(r["service_time"])
+            overall.record(r["response_time"])
+
+    success_count = sum(stats["success"] for stats in endpoints.values())
+    report = {
+        "mode": mode,
+        "settings": settings,
+        "total_requests": len(results),
+        "successful_requests": success_count,
+        "failed_requests": len(results) - success_count,
+        "total_time": total_time,
+        "throughput": len(results) / total_time if total_time else 0,
+        "latency": overall.to_dict(),
+        "endpoints": {}
+    }
+    for endpoint, stats in endpoints.items():
+        report["endpoints"][endpoint] = {
+            "total": stats["total"],
+            "success": stats["success"],
+            "error_rate": 1 - stats["success"] / stats["total"],
+            "latency": stats["histogram"].to_dict(),
+            "service_time": stats["service"].to_dict()
+        }
+    return report
+
+def print_report(report):
+    """Print a human-readable summary of a report"""
+    total = report["total_requests"]
+    success = report["successful_requests"]
+    print(f"\n===== Load Test Results ({report['mode']}-loop) =====")
+    print(f"Total requests: {total}")
+    print(f"Successful requests: {success} ({success / total * 100 if total else 0:.1f}%)")
+    print(f"Failed requests: {report['failed_requests']}")
+    print(f"Total test time: {report['total_time']:.2f}s")
+    print(f"Requests per second: {report['throughput']:.2f}")
+
+    latency = report["latency"]
+    print("\nResponse time (successful requests):")
+    print(f"  Average: {latency['mean']:.3f}s")
+    for q in PERCENTILES:
+        print(f"  p{q}: {latency['percentiles'][str(q)]:.3f}s")
+    print(f"  Min: {latency['min'] or 0:.3f}s")
+    print(f"  Max: {latency['max'] or 0:.3f}s")
+
+    print("\nEndpoint Performance:")
+    header = " ".join(f"{'p' + str(q):>8}" for q in PERCENTILES)
+    print(f"  {'endpoint':<32} {'success':>8} {header} {'max':>8}")
+    for endpoint, stats in report["endpoints"].items():
+        success_rate = (1 - stats["error_rate"]) * 100
+        values = " ".join(f"{stats['latency']['percentiles'][str(q)]:>8.3f}" for q in PERCENTILES)
+        print(f"  {endpoint:<32} {success_rate:>7.1f}% {values} {stats['latency']['max'] or 0:>8.3f}")
+
+def compare_reports(current, baseline, tolerance, error_tolerance=0.01):
+    """
+    Compares a report against a saved baseline report.
+
+    An endpoint regresses when one of its p50/p90/p99 latencies grows by more than
+    `tolerance` (a fraction) or its error rate grows by more than `error_tolerance`.
+
+    Args:
+        current (dict): The current report.
+        baseline (dict): The baseline report.
+        tolerance (float): Allowed relative latency growth.
+        error_tolerance (float): Allowed absolute error rate growth.
+
+    Returns:
+        list: Descriptions of the regressions found.
+    """
+    regressions = []
+    for endpoint, base in baseline["endpoints"].items():
+        stats = current["endpoints"].get(endpoint)
+        if stats is None:
+            continue
+        for q in PERCENTILES[:3]:
+            base_value = base["latency"]["percentiles"][str(q)]
+            value = stats["latency"]["percentiles"][str(q)]
+            if base_value and value > base_value * (1 + tolerance):
+                regressions.append(f"{endpoint} p{q}: {value:.3f}s vs baseline {base_value:.3f}s")
+        if stats["error_rate"] > base["error_rate"] + error_tolerance:
+            regressions.append(f"{endpoint} error rate: {stats['error_rate']:.2%} vs "
+                               f"baseline {base['error_rate']:.2%}")
+    return regressions
+
+def run_load_test(num_requests, concurrency, session=None, verbose=True):
     """Run load test with specified concurrency and number of requests"""
     print(f"Starting load test with {num_requests} total requests, {concurrency} concurrent requests")
-    
+
     # Login and get session with cookies
-    session = login_and_get_session()
-    
+    if session is None:
+        session = login_and_get_session()
+
     # Prepare the requests
     tasks = []
     for i in range(num_requests):
         # Cycle through endpoints
         endpoint, params = ENDPOINTS[i % len(ENDPOINTS)]
         tasks.append((session, endpoint, params, i+1))
-    
+
     # Execute requests with ThreadPoolExecutor for concurrency
-    start_time = time.time()
+    start_time = time.perf_counter()
     results = []
-    
+
     with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
         futures = [executor.submit(test_endpoint, *task) for task in tasks]
         for future in concurrent.futures.as_completed(futures):
             result = future.result()
             results.append(result)
+            if not verbose:
+                continue
             if result["success"]:
                 print(f"Request {result['request_id']} to {result['endpoint']} completed in {result['response_time']:.2f}s")
             else:
-                print(f"Request {result['request_id']} to {result['endpoint']} failed: {result.get('error', f'Status code {result['status_code']}')}")
-    
-    total_time = time.time() - start_time
-    
-    # Analyze results
-    success_count = sum(1 for r in results if r["success"])
-    response_times = [r["response_time"] for r in results if r["success"]]
-    
-    if response_times:
-        avg_response = statistics.mean(response_times)
-        median_response = statistics.median(response_times)
-        max_response = max(response_times)
-        min_response = min(response_times)
-    else:
-        avg_response = median_response = max_response = min_response = 0
-    
-    # Print summary
-    print("\n===== Load Test Results =====")
-    print(f"Total requests: {num_requests}")
-    print(f"Successful requests: {success_count} ({success_count/num_requests*100:.1f}%)")
-    print(f"Failed requests: {num_requests - success_count}")
-    print(f"Total test time: {total_time:.2f}s")
-    print(f"Requests per second: {num_requests/total_time:.2f}")
-    print("\nResponse time (successful requests):")
-    print(f"  Average: {avg_response:.2f}s")
-    print(f"  Median: {median_response:.2f}s")
-    print(f"  Min: {min_response:.2f}s")
-    print(f"  Max: {max_response:.2f}s")
-    
-    # Group results by endpoint
-    endpoint_stats = {}
-    for r in results:
-        ep = r["endpoint"]
-        if ep not in endpoint_stats:
-            endpoint_stats[ep] = {
-                "total": 0,
-                "success": 0,
-                "times": []
-            }
-        endpoint_stats[ep]["total"] += 1
-        if r["success"]:
-            endpoint_stats[ep]["success"] += 1
-            endpoint_stats[ep]["times"].append(r["response_time"])
-    
-    print("\nEndpoint Performance:")
-    for endpoint, stats in endpoint_stats.items():
-        success_rate = stats["success"] / stats["total"] * 100 if stats["total"] > 0 else 0
-        avg_time = statistics.mean(stats["times"]) if stats["times"] else 0
-        print(f"  {endpoint}: {success_rate:.1f}% success, avg {avg_time:.2f}s")
-    
-    return success_count == num_requests
+                failure = result.get('error', f"Status code {result['status_code']}")
+                print(f"Request {result['request_id']} to {result['endpoint']} failed: {failure}")
+
+    total_time = time.perf_counter() - start_time
+
+    settings = {"requests": num_requests, "concurrency": concurrency}
+    return build_report(results, total_time, "closed", settings)
+
+def arrival_schedule(steps, arrival="uniform", rng=None):
+    """
+    Computes the intended send offsets of an open-loop run.
+
+    Args:
+        steps (list): (rate in requests per second, duration in seconds) tuples,
+            run one after another.
+        arrival (str): 'uniform' for evenly spaced requests or 'poisson' for
+            exponentially distributed gaps with the same mean rate.
+        rng (random.Random): Random generator used for Poisson arrivals.
+
+    Returns:
+        list: Send offsets in seconds from the start of the run.
+    """
+    rng = rng or random.Random()
+    offsets = []
+    step_start = 0.0
+    for rate, duration in steps:
+        if rate > 0 and arrival == "poisson":
+            offset = rng.expovariate(rate)
+            while offset <= duration:
+                offsets.append(step_start + offset)
+                offset += rng.expovariate(rate)
+        elif rate > 0:
+            count = int(rate * duration + 1e-9)
+            offsets.extend(step_start + k / rate for k in range(1, count + 1))
+        step_start += duration
+    return offsets
+
+def run_open_loop(steps, mix, warmup=0, arrival="uniform", max_workers=256, seed=None,
+                  session=None):
+    """
+    Run an open-loop load test at a constant or stepped arrival rate.
+
+    Requests are dispatched at their scheduled time whether or not earlier requests have
+    returned, and their response time is measured from that scheduled time. A warm-up
+    phase at the first step's rate runs first and its results are discarded.
+
+    Args:
+        steps (list): (rate, duration) tuples describing the arrival rate over time.
+        mix (list): Weighted (path, params, weight) endpoint mix.
+        warmup (float): Warm-up duration in seconds.
+        arrival (str): 'uniform' or 'poisson' arrivals.
+        max_workers (int): Maximum number of requests in flight.
+        seed (int): Seed for the endpoint choice and Poisson arrivals.
+        session: Logged-in session; a new one is created when omitted.
+
+    Returns:
+        dict: The report of the measured phase.
+    """
+    if session is None:
+        session = login_and_get_session()
+    rng = random.Random(seed)
+    weights = [weight for _, _, weight in mix]
+
+    def dispatch(schedule):
+        """Send one request per scheduled offset and collect the results"""
+        results = []
+        lock = threading.Lock()
+        start = time.perf_counter()
+
+        def run(index, endpoint, params, intended):
+            result = test_endpoint(session, endpoint, params, index, intended)
+            with lock:
+                results.append(result)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for index, offset in enumerate(schedule):
+                endpoint, params, _ = rng.choices(mix, weights)[0]
+                intended = start + offset
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(run, index + 1, endpoint, params, intended)
+        return results, time.perf_counter() - start
+
+    if warmup > 0:
+        print(f"Warming up for {warmup}s at {steps[0][0]} req/s")
+        dispatch(arrival_schedule([(steps[0][0], warmup)], arrival, rng))
+
+    description = ", ".join(f"{rate} req/s for {duration}s" for rate, duration in steps)
+    print(f"Starting open-loop load test: {description}")
+    results, total_time = dispatch(arrival_schedule(steps, arrival, rng))
+
+    settings = {"steps": steps, "warmup": warmup, "arrival": arrival,
+                "max_workers": max_workers, "seed": seed,
+                "mix": [{"path": path, "params": params, "weight": weight}
+                        for path, params, weight in mix]}
+    return build_report(results, total_time, "open", settings)
+
+def parse_steps(value):
+    """Parse a 'rate:seconds,rate:seconds' step description"""
+    steps = []
+    for step in value.split(","):
+        rate, duration = step.split(":")
+        steps.append((float(rate), float(duration)))
+    return steps
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Load test the IPL API')
     parser.add_argument('-n', '--requests', type=int, default=10, help='Total number of requests')
     parser.add_argument('-c', '--concurrency', type=int, default=2, help='Number of concurrent requests')
+    parser.add_argument('--mode', choices=['closed', 'open'], default='closed',
+                        help='closed: fixed worker pool; open: fixed arrival rate')
+    parser.add_argument('--rate', type=float, default=10, help='Open loop: requests per second')
+    parser.add_argument('--duration', type=float, default=30, help='Open loop: seconds at --rate')
+    parser.add_argument('--steps', help='Open loop: stepped rates as rate:seconds,rate:seconds')
+    parser.add_argument('--warmup', type=float, default=0, help='Open loop: warm-up seconds')
+    parser.add_argument('--arrival', choices=['uniform', 'poisson'], default='uniform',
+                        help='Open loop: arrival process')
+    parser.add_argument('--max-workers', type=int, default=256,
+                        help='Open loop: maximum requests in flight')
+    parser.add_argument('--mix', help='JSON file with a weighted endpoint mix')
+    parser.add_argument('--seed', type=int, help='Random seed for the endpoint mix')
+    parser.add_argument('--base-url', default=BASE_URL, help='Server base URL')
+    parser.add_argument('--json-out', help='Write the report as JSON to this file')
+    parser.add_argument('--compare', help='Compare against a saved JSON report')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed relative latency growth when comparing')
+    parser.add_argument('-q', '--quiet', action='store_true', help='Do not print every request')
+    parser.add_argument('--in-process', action='store_true',
+                        help='Drive app.app through the Flask test client instead of HTTP')
+    parser.add_argument('--matches', help='In-process: matches CSV to load')
+    parser.add_argument('--balls', help='In-process: ball-by-ball CSV to load')
     args = parser.parse_args()
-    
+    BASE_URL = args.base_url
+
+    load_session = None
+    if args.in_process:
+        load_session = create_in_process_session(args.matches, args.balls)
+
     # Run load test
-    success = run_load_test(args.requests, args.concurrency)
-    
+    if args.mode == 'open':
+        rate_steps = parse_steps(args.steps) if args.steps else [(args.rate, args.duration)]
+        load_report = run_open_loop(rate_steps, load_mix(args.mix), args.warmup,
+                                    args.arrival, args.max_workers, args.seed,
+                                    session=load_session)
+    else:
+        load_report = run_load_test(args.requests, args.concurrency, session=load_session,
+                                    verbose=not args.quiet)
+    load_report["transport"] = "in-process" if args.in_process else "http"
+    print_report(load_report)
+
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as report_file:
+            json.dump(load_report, report_file, indent=4)
+        print(f"\nReport saved to {args.json_out}")
+
+    success = load_report["failed_requests"] == 0
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline_file:
+            regressions = compare_reports(load_report, json.load(baseline_file), args.tolerance)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for line in regressions:
+                print(f"  {line}")
+            success = False
+        else:
+            print("\nNo regressions against the saved run")
+
     # Exit with appropriate status code
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(0 if success else 1)
@@ -1,9 +1,12 @@
 import unittest
 import json
 import os
+import app as app_module
 from app import app, db, User
 from passlib.hash import sha256_crypt
 import config
+import ipl
+import profiler
 from unittest.mock import patch
 
 
@@ -88,6 +91,36 @@ class IPLAPITests(unittest.TestCase):
         user = User.query.filter_by(email='new@example.com').first()
         self.assertIsNotNone(user)
 
+    def test_email_case_insensitive(self):
+        """Test that login and registration ignore email case"""
+        response = self.login(email='  Test@Example.COM ')
+        self.assertIn(b'Dashboard', response.data)
+        self.logout()
+
+        # A differently-cased email is the same account
+        response = self.app.post('/register', data=dict(
+            name='Duplicate',
+            email='TEST@example.com',
+            password='another'
+        ), follow_redirects=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(User.query.filter(db.func.lower(User.email) == 'test@example.com').count(), 1)
+
+    def test_import_users(self):
+        """Test bulk importing users"""
+        from app import import_users
+        result = import_users([
+            {'name': 'Bulk One', 'email': 'Bulk1@Example.com', 'password': 'pw1'},
+            {'name': 'Bulk Two', 'email': 'bulk2@example.com', 'password': 'pw2'},
+            {'name': 'Duplicate', 'email': 'BULK1@example.com', 'password': 'pw'},
+            {'name': 'Existing', 'email': 'test@example.com', 'password': 'pw'},
+            {'name': 'Invalid', 'email': 'invalid-email', 'password': 'pw'},
+        ], hashed=False)
+        self.assertEqual(result, {'inserted': 2, 'skipped': 3})
+        self.assertIsNotNone(User.query.filter_by(email='bulk1@example.com').first())
+        response = self.login(email='bulk1@example.com', password='pw1')
+        self.assertIn(b'Dashboard', response.data)
+
     def test_invalid_email_registration(self):
         """Test registration with invalid email format"""
         response = self.app.post('/register', data=dict(
@@ -179,6 +212,319 @@ class IPLAPITests(unittest.TestCase):
         self.assertIn('RA Jadeja', result_data)
         self.assertIsNone(data['error'])
 
+    def test_missing_player_name(self):
+        """Test the player record endpoints without a player name"""
+        self.login()
+        for route in ('/api/batsman-record', '/api/bowling-record'):
+            response = self.app.get(route)
+            self.assertEqual(response.status_code, 200)
+            self.assertIsNone(json.loads(response.data)['error'])
+
+    def test_season_filters(self):
+        """Test the season and from/to parameters of the API endpoints"""
+        self.login()
+        response = self.app.get('/api/record-against-all-teams?team=Chennai%20Super%20Kings')
+        overall = json.loads(response.data)['result']
+        response = self.app.get('/api/record-against-all-teams?team=Chennai%20Super%20Kings'
+                                '&season=2010')
+        season = json.loads(response.data)['result']
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(season['matchesplayed'], overall['matchesplayed'])
+
+        response = self.app.get('/api/team1-vs-team2?team1=Mumbai%20Indians'
+                                '&team2=Chennai%20Super%20Kings&from=2018&to=2020')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('total_matches_played', json.loads(response.data)['result'])
+
+        response = self.app.get('/api/batsman-record?batsman=MS%20Dhoni&from=2018')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('MS Dhoni', json.loads(json.loads(response.data)['result']))
+
+        response = self.app.get('/api/bowling-record?bowler=RA%20Jadeja&season=abc')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Invalid season', json.loads(response.data)['error'])
+
+        response = self.app.get('/api/batsman-record?batsman=MS%20Dhoni&season=1990')
+        self.assertEqual(response.status_code, 400)
+
+    def test_phase_splits(self):
+        """Test the phase parameter of the batting and bowling endpoints"""
+        self.login()
+        response = self.app.get('/api/batsman-record?batsman=V%20Kohli&phase=all')
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(json.loads(response.data)['result'])['V Kohli']
+        self.assertEqual(set(result['phases']['all']), {'powerplay', 'middle', 'death'})
+
+        response = self.app.get('/api/bowling-record?bowler=JJ%20Bumrah&phase=death')
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(json.loads(response.data)['result'])['JJ Bumrah']
+        self.assertEqual(list(result['phases']['all']), ['death'])
+        self.assertIn('economy', result['phases']['all']['death'])
+
+        response = self.app.get('/api/batsman-record?batsman=V%20Kohli')
+        self.assertNotIn('phases', json.loads(json.loads(response.data)['result'])['V Kohli'])
+
+        response = self.app.get('/api/batsman-record?batsman=V%20Kohli&phase=slog')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Invalid phase', json.loads(response.data)['error'])
+
+    def test_venue_endpoints(self):
+        """Test the venue and city API endpoints"""
+        self.login()
+        response = self.app.get('/api/venues')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('venues', json.loads(response.data)['result'])
+
+        response = self.app.get('/api/venue-record?venue=Wankhede%20Stadium,%20Mumbai')
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data)['result']
+        self.assertEqual(result['venue'], 'Wankhede Stadium')
+        self.assertIn('avg_first_innings_score', result)
+        self.assertIn('chasing', result)
+
+        response = self.app.get('/api/city-record?city=Chennai')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('top_batters', json.loads(response.data)['result'])
+
+        response = self.app.get('/api/venue-record?venue=Nowhere')
+        self.assertEqual(json.loads(response.data)['result'], {'response': 'Invalid venue name'})
+
+    def test_matchup_endpoints(self):
+        """Test the batter vs bowler matchup endpoints"""
+        self.login()
+        response = self.app.get('/api/matchup?batter=V%20Kohli&bowler=JJ%20Bumrah')
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data)['result']
+        self.assertEqual((result['batter'], result['bowler']), ('V Kohli', 'JJ Bumrah'))
+        self.assertIn('dismissals', result)
+
+        response = self.app.get('/api/batter-matchups?batter=V%20Kohli&n=2&min_balls=20')
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data)['result']
+        self.assertEqual(len(result['top']), 2)
+        self.assertEqual(result['min_balls'], 20)
+
+        response = self.app.get('/api/bowler-bunnies?bowler=JJ%20Bumrah')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('bunnies', json.loads(response.data)['result'])
+
+        response = self.app.get('/api/bowler-bunnies?bowler=JJ%20Bumrah&n=-1')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.app.get('/api/matchup?batter=Nobody&bowler=JJ%20Bumrah')
+        self.assertEqual(json.loads(response.data)['result'], {'response': 'Invalid player name'})
+
+    def test_partnership_endpoints(self):
+        """Test the partnership endpoints"""
+        self.login()
+        response = self.app.get('/api/partnership?player1=V%20Kohli&player2=AB%20de%20Villiers')
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data)['result']
+        self.assertEqual(result['batters'], ['AB de Villiers', 'V Kohli'])
+        self.assertEqual(len(result['history']), result['partnerships'])
+
+        response = self.app.get('/api/top-partnerships?wicket=1&n=3')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)['result']['1']), 3)
+
+        response = self.app.get('/api/partners?player=V%20Kohli&n=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)['result']['partners']), 2)
+
+        response = self.app.get('/api/top-partnerships?wicket=first')
+        self.assertEqual(response.status_code, 400)
+
+    def test_live_feed(self):
+        """Test live ingestion, the live scorecard and the live stream"""
+        self.login()
+        backend = ipl.backend
+        record = {'ID': 990002, 'innings': 1, 'overs': 0, 'ballnumber': 1, 'batter': 'MS Dhoni',
+                  'bowler': 'JJ Bumrah', 'non-striker': 'RA Jadeja', 'batsman_run': 6,
+                  'extras_run': 0, 'total_run': 6, 'non_boundary': 0, 'isWicketDelivery': 0,
+                  'BattingTeam': 'Chennai Super Kings', 'BowlingTeam': 'Mumbai Indians'}
+        try:
+            stream = self.app.get('/api/live/stream?match_id=990002', buffered=False)
+            self.assertEqual(stream.mimetype, 'text/event-stream')
+            chunks = iter(stream.response)
+            self.assertIn(b'event: subscribed', next(chunks))
+
+            with patch.object(config, 'ADMIN_EMAILS', [], create=True):
+                response = self.app.post('/api/live/deliveries', json=record)
+                self.assertEqual(response.status_code, 403)
+            with patch.object(config, 'ADMIN_EMAILS', ['test@example.com'], create=True):
+                response = self.app.post('/api/live/deliveries', json=[record])
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(json.loads(response.data)['result']['ingested'], 1)
+                response = self.app.post('/api/live/deliveries', data=json.dumps(
+                    dict(record, ballnumber=2)) + '\n', content_type='application/x-ndjson')
+                self.assertEqual(json.loads(response.data)['result']['ingested'], 1)
+                response = self.app.post('/api/live/deliveries', json={'ID': 990002})
+                self.assertEqual(response.status_code, 400)
+
+            self.assertIn(b'event: delivery', next(chunks))
+            stream.close()
+
+            response = self.app.get('/api/live/scorecard?match_id=990002')
+            self.assertEqual(json.loads(response.data)['result']['innings']['1']['runs'], 12)
+            response = self.app.get('/api/live/scorecard?match_id=1')
+            self.assertEqual(json.loads(response.data)['result'],
+                             {'response': 'No live data for this match'})
+        finally:
+            ipl.backend = backend
+
+    def test_appearance_endpoints(self):
+        """Test the player appearance endpoints"""
+        self.login()
+        response = self.app.get('/api/player-appearances?player=MS%20Dhoni')
+        self.assertEqual(response.status_code, 200)
+        overall = json.loads(response.data)['result']
+        self.assertIn('teams', overall)
+
+        response = self.app.get('/api/player-appearances?player=MS%20Dhoni&season=2016')
+        self.assertLess(json.loads(response.data)['result']['matches'], overall['matches'])
+
+        response = self.app.get('/api/teammates?player=MS%20Dhoni&n=3')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)['result']['teammates']), 3)
+
+        response = self.app.get('/api/teammates?player=Nobody')
+        self.assertEqual(json.loads(response.data)['result'], {'response': 'Invalid player name'})
+
+    def test_fielding_record(self):
+        """Test the fielding endpoint and the dismissals block of the records"""
+        self.login()
+        response = self.app.get('/api/fielding-record?player=MS%20Dhoni')
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data)['result']
+        self.assertIn('stumpings', result)
+        self.assertGreater(result['catches'], 0)
+
+        response = self.app.get('/api/fielding-record?player=Nobody')
+        self.assertEqual(json.loads(response.data)['result'], {'response': 'Invalid player name'})
+
+        response = self.app.get('/api/bowling-record?bowler=JJ%20Bumrah')
+        result = json.loads(json.loads(response.data)['result'])['JJ Bumrah']
+        self.assertEqual(sum(result['dismissals'].values()), result['all']['wicket'])
+
+    def test_match_scorecard(self):
+        """Test the match scorecard endpoint"""
+        self.login()
+        match_id = int(ipl.matches.ID.iloc[0])
+        response = self.app.get(f'/api/match/{match_id}')
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data)['result']
+        self.assertEqual(result['match_id'], match_id)
+        self.assertIn('fall_of_wickets', result['innings'][0])
+
+        response = self.app.get('/api/match/1')
+        self.assertEqual(json.loads(response.data)['result'], {'response': 'Invalid match id'})
+
+    def test_form(self):
+        """Test the form block and the form leaderboard endpoint"""
+        self.login()
+        response = self.app.get('/api/batsman-record?batsman=V%20Kohli')
+        result = json.loads(json.loads(response.data)['result'])['V Kohli']
+        self.assertEqual(set(result['form']), {'last_5', 'last_10', 'last_12_months'})
+        self.assertEqual(result['form']['last_5']['innings'], 5)
+
+        response = self.app.get('/api/form-leaderboard?role=bowling&last=5&n=3')
+        self.assertEqual(response.status_code, 200)
+        players = json.loads(response.data)['result']['players']
+        self.assertEqual(len(players), 3)
+        wickets = [player['wickets'] for player in players]
+        self.assertEqual(wickets, sorted(wickets, reverse=True))
+
+        response = self.app.get('/api/form-leaderboard?role=fielding')
+        self.assertEqual(response.status_code, 400)
+
+    def test_percentiles(self):
+        """Test the percentile ranks of the player record endpoints"""
+        self.login()
+        response = self.app.get('/api/batsman-record?batsman=V%20Kohli&percentiles=1'
+                                '&min_balls=500')
+        result = json.loads(json.loads(response.data)['result'])['V Kohli']
+        self.assertEqual(result['percentiles']['min_balls'], 500)
+        self.assertIn('strike_rate', result['percentiles']['metrics'])
+
+        response = self.app.get('/api/bowling-record?bowler=RA%20Jadeja&percentiles=true'
+                                '&season=2020')
+        result = json.loads(json.loads(response.data)['result'])['RA Jadeja']
+        self.assertIn('economy', result['percentiles']['metrics'])
+
+        response = self.app.get('/api/bowling-record?bowler=RA%20Jadeja&percentiles=1'
+                                '&min_innings=x')
+        self.assertEqual(response.status_code, 400)
+
+    def test_toss_impact(self):
+        """Test the toss impact endpoint"""
+        self.login()
+        response = self.app.get('/api/toss-impact?team=Mumbai%20Indians&by=season&from=2020')
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data)['result']
+        self.assertEqual([row['season'] for row in result['by_season']], [2020, 2021, 2022])
+        self.assertIn('toss_lost', result)
+
+        response = self.app.get('/api/toss-impact?by=umpire')
+        self.assertEqual(response.status_code, 400)
+        response = self.app.get('/api/toss-impact?venue=Unknown')
+        self.assertEqual(json.loads(response.data)['result'],
+                         {'response': 'Invalid venue or team name'})
+
+    def test_innings_endpoints(self):
+        """Test the team scores and chase endpoints"""
+        self.login()
+        response = self.app.get('/api/team-scores?team=Chennai%20Super%20Kings&season=2018')
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data)['result']
+        self.assertEqual(result['batting']['highest']['batting_team'], 'Chennai Super Kings')
+        response = self.app.get('/api/team-scores?team=Unknown')
+        self.assertEqual(json.loads(response.data)['result'], {'response': 'Invalid team name'})
+
+        response = self.app.get('/api/chase-by-target?band=30')
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data)['result']
+        self.assertEqual(sum(band['chases'] for band in result['targets']), result['chases'])
+        response = self.app.get('/api/chase-by-target?band=0')
+        self.assertEqual(response.status_code, 400)
+
+    def test_points_table(self):
+        """Test the points table endpoint"""
+        self.login()
+        response = self.app.get('/api/points-table?season=2022')
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data)['result']
+        self.assertEqual(list(result['seasons']), ['2022'])
+        table = result['seasons']['2022']
+        self.assertEqual(table[0]['team'], 'Gujarat Titans')
+        self.assertEqual(table[0]['points'], 20)
+
+    def test_match_search(self):
+        """Test the match search endpoint"""
+        self.login()
+        response = self.app.get('/api/match-search?team=Mumbai%20Indians&opponent=Chennai%20Super%20Kings'
+                                '&stage=Final&per_page=2')
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data)['result']
+        self.assertEqual(result['count'], 4)
+        self.assertEqual(len(result['matches']), 2)
+        self.assertEqual(result['pages'], 2)
+        self.assertEqual(result['facets']['winner'], {'Chennai Super Kings': 1, 'Mumbai Indians': 3})
+
+        response = self.app.get('/api/match-search?season=2016&page=0')
+        self.assertEqual(response.status_code, 400)
+
+    def test_match_progression(self):
+        """Test the match progression endpoint"""
+        self.login()
+        match_id = int(ipl.matches.ID.iloc[0])
+        response = self.app.get(f'/api/match/{match_id}/progression')
+        self.assertEqual(response.status_code, 200)
+        chase = json.loads(response.data)['result']['innings'][1]
+        self.assertEqual(len(chase['overs']), len(chase['required_run_rate']))
+
+        response = self.app.get('/api/match/1/progression')
+        self.assertEqual(json.loads(response.data)['result'], {'response': 'Invalid match id'})
+
     def test_player_suggestions(self):
         """Test the player suggestions API endpoint"""
         self.login()
@@ -263,6 +609,51 @@ class IPLAPITests(unittest.TestCase):
         self.assertIsInstance(player_stats['3+W'], (int, float))
         self.assertGreaterEqual(player_stats['3+W'], 0)
 
+    def test_profile_flag_admin(self):
+        """Test that admins get a profile block when requesting profiling"""
+        self.login()
+        with patch.object(config, 'ADMIN_EMAILS', ['test@example.com'], create=True):
+            response = self.app.get('/api/team1-vs-team2?team1=Mumbai%20Indians'
+                                    '&team2=Chennai%20Super%20Kings&profile=1')
+            self.assertEqual(response.status_code, 200)
+            data = json.loads(response.data)
+            self.assertIn('profile', data)
+            self.assertIn('report', data['profile'])
+
+            response = self.app.get('/api/admin/slow-requests')
+            self.assertEqual(response.status_code, 200)
+            entries = json.loads(response.data)['result']
+            self.assertTrue(any(entry['endpoint'] == '/api/team1-vs-team2' for entry in entries))
+
+            response = self.app.get(f"/api/admin/slow-requests/{data['profile']['id']}/collapsed")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, 'text/plain')
+
+    def test_profile_kept_when_not_slow(self):
+        """Test that an explicitly profiled request can be fetched even if it is not slow"""
+        self.login()
+        registry = profiler.SlowRequestRegistry(size=1)
+        registry.record('/api/slow', {}, 3600.0)
+        with patch.object(config, 'ADMIN_EMAILS', ['test@example.com'], create=True), \
+                patch.object(app_module, 'slow_requests', registry):
+            response = self.app.get('/api/team1-vs-team2?team1=Mumbai%20Indians'
+                                    '&team2=Chennai%20Super%20Kings&profile=1')
+            entry_id = json.loads(response.data)['profile']['id']
+            self.assertIsNotNone(entry_id)
+            response = self.app.get(f'/api/admin/slow-requests/{entry_id}/collapsed')
+            self.assertEqual(response.status_code, 200)
+
+    def test_profile_flag_non_admin(self):
+        """Test that non-admins cannot profile or read the slow request registry"""
+        self.login()
+        with patch.object(config, 'ADMIN_EMAILS', [], create=True):
+            response = self.app.get('/api/teams-played-ipl?profile=1')
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('profile', json.loads(response.data))
+
+            response = self.app.get('/api/admin/slow-requests')
+            self.assertEqual(response.status_code, 403)
+
     # Dashboard Routes Tests
     def test_dashboard_authenticated(self):
         """Test access to dashboard when authenticated"""
@@ -0,0 +1,93 @@
+import unittest
+import pandas as pd
+import ipl
+from appearances import AppearanceIndex, parse_players
+
+
+class ParsePlayersTests(unittest.TestCase):
+    """Test cases for parsing the stringified XIs"""
+
+    def test_parse_players(self):
+        """Test lists, quoted apostrophes and malformed values"""
+        self.assertEqual(parse_players("['YBK Jaiswal', 'JC Buttler']"),
+                         ['YBK Jaiswal', 'JC Buttler'])
+        self.assertEqual(parse_players('["KJ O\'Brien"]'), ["KJ O'Brien"])
+        self.assertEqual(parse_players(float('nan')), [])
+        self.assertEqual(parse_players('[unquoted'), [])
+        self.assertEqual(parse_players("'not a list'"), [])
+
+
+class AppearanceIndexTests(unittest.TestCase):
+    """Test cases for the appearance table"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.index = ipl.appearance_index
+        cls.dhoni = ipl.matches[ipl.matches.Team1Players.str.contains("'MS Dhoni'") |
+                                ipl.matches.Team2Players.str.contains("'MS Dhoni'")]
+
+    def test_table_size(self):
+        """Test one row per player of every XI"""
+        sizes = sum(ipl.matches[column].map(lambda value: len(parse_players(value))).sum()
+                    for column in ['Team1Players', 'Team2Players'])
+        self.assertEqual(len(self.index), sizes)
+
+    def test_matches_played(self):
+        """Test matches played against a scan of the XIs"""
+        self.assertEqual(self.index.matches_played('MS Dhoni'), len(self.dhoni))
+        in_2016 = self.dhoni[self.dhoni.SeasonYear == 2016]
+        self.assertEqual(self.index.matches_played('MS Dhoni', seasons=(2016, 2016)),
+                         len(in_2016))
+        against = self.index.matches_against('MS Dhoni')
+        self.assertEqual(sum(against.values()), len(self.dhoni))
+        self.assertEqual(against['Mumbai Indians'],
+                         self.index.matches_played('MS Dhoni', 'Mumbai Indians'))
+        self.assertEqual(self.index.matches_played('Not A Player'), 0)
+
+    def test_matches_cover_innings(self):
+        """Test that players appear in at least the matches they batted in"""
+        for player in ['V Kohli', 'MS Dhoni', 'RA Jadeja']:
+            self.assertGreaterEqual(self.index.matches_played(player),
+                                    ipl.backend.batsman_record(player)['innings'])
+
+    def test_player_record(self):
+        """Test the teams a player represented"""
+        record = self.index.player_record('MS Dhoni')
+        self.assertEqual(record['matches'], len(self.dhoni))
+        self.assertEqual(sum(team['matches'] for team in record['teams']), len(self.dhoni))
+        self.assertIn('Chennai Super Kings', [team['team'] for team in record['teams']])
+        self.assertIsNone(self.index.player_record('Not A Player'))
+
+    def test_teammates(self):
+        """Test the players sharing the most XIs"""
+        mates = self.index.teammates('MS Dhoni', n=3)['teammates']
+        self.assertEqual(len(mates), 3)
+        counts = [mate['matches'] for mate in mates]
+        self.assertEqual(counts, sorted(counts, reverse=True))
+        self.assertNotIn('MS Dhoni', [mate['player'] for mate in mates])
+        both = self.dhoni[
+            (self.dhoni.Team1Players.str.contains("'MS Dhoni'") &
+             self.dhoni.Team1Players.str.contains(f"'{mates[0]['player']}'")) |
+            (self.dhoni.Team2Players.str.contains("'MS Dhoni'") &
+             self.dhoni.Team2Players.str.contains(f"'{mates[0]['player']}'"))]
+        self.assertEqual(mates[0]['matches'], len(both))
+
+    def test_small_frame(self):
+        """Test the table of hand-built matches"""
+        frame = pd.DataFrame({
+            'ID': [1, 2], 'SeasonYear': [2020, 2021],
+            'Team1': ['X', 'Y'], 'Team2': ['Y', 'Z'],
+            'Team1Players': ["['A', 'B']", "['C']"], 'Team2Players': ["['C']", "['A', 'D']"]
+        })
+        index = AppearanceIndex(frame)
+        self.assertEqual(len(index), 6)
+        self.assertEqual(index.player_record('A')['teams'],
+                         [{'team': 'X', 'matches': 1, 'first_season': 2020, 'last_season': 2020},
+                          {'team': 'Z', 'matches': 1, 'first_season': 2021, 'last_season': 2021}])
+        self.assertEqual(index.matches_against('C'), {'X': 1, 'Y': 0, 'Z': 1})
+        self.assertEqual(index.teammates('A')['teammates'],
+                         [{'player': 'B', 'matches': 1}, {'player': 'D', 'matches': 1}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import unittest
+import os
+import tempfile
+import ipl
+import sql_backend
+
+
+class PandasBackendTests(unittest.TestCase):
+    """Test cases run against every analytics backend; this class covers pandas"""
+
+    players = ['V Kohli', 'MS Dhoni', 'RA Jadeja', 'JJ Bumrah', 'Not A Player']
+    teams = ['Mumbai Indians', 'Chennai Super Kings', 'Kochi Tuskers Kerala']
+
+    @classmethod
+    def create_backend(cls, directory):
+        """Return the backend under test"""
+        return ipl.PandasBackend(ipl.matches, ipl.batter_data, ipl.bowler_data)
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.backend = cls.create_backend(cls.directory.name)
+        cls.reference = ipl.PandasBackend(ipl.matches, ipl.batter_data, ipl.bowler_data)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.backend = None
+        cls.directory.cleanup()
+
+    def assertRecordEqual(self, record, expected):
+        """Compare two records key by key, allowing float rounding"""
+        self.assertEqual(set(record), set(expected))
+        for key, value in expected.items():
+            if isinstance(value, float):
+                self.assertAlmostEqual(record[key], value, places=9, msg=key)
+            else:
+                self.assertEqual(record[key], value, msg=key)
+
+    def test_team1_vs_team2(self):
+        """Test head-to-head records"""
+        for team1 in self.teams:
+            for team2 in self.teams:
+                self.assertRecordEqual(self.backend.team1_vs_team2(team1, team2),
+                                       self.reference.team1_vs_team2(team1, team2))
+
+    def test_all_record(self):
+        """Test overall team records"""
+        for team in self.teams:
+            record = self.backend.all_record(team)
+            self.assertRecordEqual(record, self.reference.all_record(team))
+            self.assertEqual(record['matchesplayed'],
+                             record['won'] + record['loss'] + record['noResult'])
+
+    def test_batsman_record(self):
+        """Test batting records overall and against a team"""
+        for player in self.players:
+            self.assertRecordEqual(self.backend.batsman_record(player),
+                                   self.reference.batsman_record(player))
+            for team in self.teams:
+                self.assertRecordEqual(self.backend.batsman_record(player, team),
+                                       self.reference.batsman_record(player, team))
+
+    def test_bowler_record(self):
+        """Test bowling records overall and against a team"""
+        for player in self.players:
+            self.assertRecordEqual(self.backend.bowler_record(player),
+                                   self.reference.bowler_record(player))
+            for team in self.teams:
+                self.assertRecordEqual(self.backend.bowler_record(player, team),
+                                       self.reference.bowler_record(player, team))
+
+    def test_missing_player(self):
+        """Test that a missing player name gives an empty record"""
+        self.assertRecordEqual(self.backend.batsman_record(None),
+                               self.reference.batsman_record(None))
+        self.assertRecordEqual(self.backend.bowler_record(None),
+                               self.reference.bowler_record(None))
+
+    def test_season_filters(self):
+        """Test that every query honours a season range"""
+        for seasons in [(2016, 2016), (2018, None), (None, 2010)]:
+            for team in self.teams:
+                self.assertRecordEqual(self.backend.all_record(team, seasons),
+                                       self.reference.all_record(team, seasons))
+                self.assertRecordEqual(self.backend.team1_vs_team2(team, self.teams[0], seasons),
+                                       self.reference.team1_vs_team2(team, self.teams[0], seasons))
+            for player in self.players[:3]:
+                self.assertRecordEqual(self.backend.batsman_record(player, None, seasons),
+                                       self.reference.batsman_record(player, None, seasons))
+                self.assertRecordEqual(self.backend.bowler_record(player, self.teams[0], seasons),
+                                       self.reference.bowler_record(player, self.teams[0], seasons))
+
+    def test_season_partitions(self):
+        """Test that the seasons of a partitioned record add up to the whole record"""
+        total = self.backend.batsman_record('V Kohli')['runs']
+        by_season = sum(self.backend.batsman_record('V Kohli', None, (season, season))['runs']
+                        for season in ipl.season_years)
+        self.assertEqual(by_season, total)
+
+    def test_phases(self):
+        """Test the phase splits of batting and bowling records"""
+        for player in self.players:
+            for team, seasons in [(None, None), (self.teams[0], None), (None, (2016, 2018))]:
+                self.assertEqual(self.backend.batsman_phases(player, team, seasons),
+                                 self.reference.batsman_phases(player, team, seasons))
+                self.assertEqual(self.backend.bowler_phases(player, team, seasons),
+                                 self.reference.bowler_phases(player, team, seasons))
+
+
+class NumpyBackendTests(PandasBackendTests):
+    """The backend tests against the NumPy kernel backend"""
+
+    @classmethod
+    def create_backend(cls, directory):
+        return ipl.NumpyBackend(ipl.matches, ipl.batter_data, ipl.bowler_data)
+
+
+class SQLiteBackendTests(PandasBackendTests):
+    """The backend tests against the SQLite backend"""
+
+    @classmethod
+    def create_backend(cls, directory):
+        return sql_backend.SQLBackend(ipl.matches, ipl.bowler_data, engine='sqlite',
+                                      path=os.path.join(directory, 'ipl.sqlite'),
+                                      version=ipl.DATASET_VERSION)
+
+    def test_reuses_built_database(self):
+        """Test that a database built for the same dataset version is reused"""
+        path = self.backend.path
+        modified = os.path.getmtime(path)
+        sql_backend.SQLBackend(ipl.matches, ipl.bowler_data, engine='sqlite', path=path,
+                               version=ipl.DATASET_VERSION)
+        self.assertEqual(os.path.getmtime(path), modified)
+
+    def test_unknown_engine(self):
+        """Test that an unknown backend name is rejected"""
+        with self.assertRaises(ValueError):
+            sql_backend.SQLBackend(ipl.matches, ipl.bowler_data, engine='oracle')
+
+
+@unittest.skipIf(sql_backend.duckdb is None, 'duckdb is not installed')
+class DuckDBBackendTests(PandasBackendTests):
+    """The backend tests against the DuckDB backend"""
+
+    @classmethod
+    def create_backend(cls, directory):
+        return sql_backend.SQLBackend(ipl.matches, ipl.bowler_data, engine='duckdb',
+                                      path=os.path.join(directory, 'ipl.duckdb'),
+                                      version=ipl.DATASET_VERSION)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import numpy as np
+import pandas as pd
+import ipl
+from fielding import FieldingIndex, split_fielders
+
+
+class SplitFieldersTests(unittest.TestCase):
+    """Test cases for splitting the fielders involved"""
+
+    def test_split_fielders(self):
+        """Test single, several, substitute and missing fielders"""
+        self.assertEqual(split_fielders('MS Dhoni'), ['MS Dhoni'])
+        self.assertEqual(split_fielders('RA Jadeja, MS Dhoni'), ['RA Jadeja', 'MS Dhoni'])
+        self.assertEqual(split_fielders('KH Pandya (sub)'), ['KH Pandya'])
+        self.assertEqual(split_fielders(np.nan), [])
+
+
+class FieldingIndexTests(unittest.TestCase):
+    """Test cases for the dismissal and fielding tables"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.index = ipl.fielding_index
+        data = ipl.bowler_data
+        cls.wickets = data[data.innings.isin([1, 2]) & (data.isWicketDelivery == 1)]
+
+    def test_fielding_record(self):
+        """Test fielding credits against a scan of the wickets"""
+        record = self.index.fielding_record('MS Dhoni')
+        fielded = self.wickets[self.wickets.fielders_involved.fillna('').str.contains('MS Dhoni')]
+        self.assertEqual(record['catches'], (fielded.kind == 'caught').sum() +
+                         ((self.wickets.kind == 'caught and bowled') &
+                          (self.wickets.bowler == 'MS Dhoni')).sum())
+        self.assertEqual(record['stumpings'], (fielded.kind == 'stumped').sum())
+        self.assertEqual(record['run_outs'], (fielded.kind == 'run out').sum())
+        self.assertEqual(record['dismissals'],
+                         record['catches'] + record['stumpings'] + record['run_outs'])
+        self.assertIsNone(self.index.fielding_record('Not A Player'))
+
+    def test_batter_dismissals(self):
+        """Test a batter's dismissal breakdown"""
+        breakdown = self.index.batter_dismissals('V Kohli')
+        out = self.wickets[self.wickets.player_out == 'V Kohli']
+        self.assertEqual(breakdown, {kind: int((out.kind == kind).sum())
+                                     for kind in self.index.kinds})
+
+    def test_bowler_dismissals(self):
+        """Test that a bowler's breakdown adds up to the bowling record"""
+        breakdown = self.index.bowler_dismissals('JJ Bumrah')
+        self.assertNotIn('run out', breakdown)
+        self.assertEqual(sum(breakdown.values()), ipl.backend.bowler_record('JJ Bumrah')['wicket'])
+        in_2018 = self.index.bowler_dismissals('JJ Bumrah', seasons=(2018, 2018))
+        self.assertEqual(sum(in_2018.values()),
+                         ipl.backend.bowler_record('JJ Bumrah', seasons=(2018, 2018))['wicket'])
+
+    def test_unknown_player(self):
+        """Test the breakdowns of a player in no dismissal"""
+        self.assertEqual(sum(self.index.batter_dismissals('Not A Player').values()), 0)
+        self.assertEqual(sum(self.index.bowler_dismissals(None).values()), 0)
+
+    def test_small_frame(self):
+        """Test run-outs by two fielders and caught and bowled"""
+        frame = pd.DataFrame({
+            'ID': [1, 1, 1], 'innings': [1, 1, 2],
+            'batter': ['A', 'B', 'C'], 'bowler': ['X', 'X', 'Y'],
+            'player_out': ['A', 'B', 'C'], 'isWicketDelivery': [1, 1, 1],
+            'kind': ['run out', 'caught and bowled', 'caught'],
+            'fielders_involved': ['Y, Z', np.nan, 'Z'], 'isBowlerWicket': [0, 1, 1]
+        })
+        index = FieldingIndex(pd.DataFrame({'ID': [1], 'SeasonYear': [2020]}), frame)
+        self.assertEqual(index.fielding_record('Z')['run_outs'], 1)
+        self.assertEqual(index.fielding_record('Z')['catches'], 1)
+        self.assertEqual(index.fielding_record('Y')['run_outs'], 1)
+        self.assertEqual(index.fielding_record('X')['caught_and_bowled'], 1)
+        self.assertEqual(index.bowler_dismissals('X'), {'caught': 0, 'caught and bowled': 1})
+        self.assertEqual(index.fielding_record('Z', seasons=(2021, None))['dismissals'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
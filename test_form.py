@@ -0,0 +1,80 @@
+import unittest
+import pandas as pd
+import ipl
+from form import FormIndex
+
+
+class FormIndexTests(unittest.TestCase):
+    """Test cases for the player form windows"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.index = FormIndex(ipl.matches, ipl.bowler_data)
+        balls = ipl.bowler_data.merge(ipl.matches[['ID', 'Date']], on='ID')
+        cls.batting = (balls.groupby(['batter', 'Date', 'ID'])['batsman_run'].sum()
+                       .reset_index().sort_values(['Date', 'ID']))
+        cls.bowling = (balls.groupby(['bowler', 'Date', 'ID'])
+                       [['isBowlerWicket', 'bowler_run']].sum()
+                       .reset_index().sort_values(['Date', 'ID']))
+
+    def test_last_innings(self):
+        """Test a last-N window against the innings in date order"""
+        form = self.index.form('V Kohli', 'batting', last=10)
+        innings = self.batting[self.batting.batter == 'V Kohli'].tail(10)
+        self.assertEqual(form['innings'], 10)
+        self.assertEqual(form['runs'], innings.batsman_run.sum())
+        self.assertEqual([int(score.rstrip('*')) for score in form['scores']],
+                         innings.batsman_run.tolist()[::-1])
+        self.assertEqual(form['to'], innings.Date.iloc[-1])
+        self.assertEqual(form['from'], innings.Date.iloc[0])
+
+    def test_date_window(self):
+        """Test a window of days ending on a given date"""
+        form = self.index.form('JJ Bumrah', 'bowling', days=365, as_of='2020-12-31')
+        innings = self.bowling[(self.bowling.bowler == 'JJ Bumrah') &
+                               (pd.to_datetime(self.bowling.Date) > '2019-12-31') &
+                               (pd.to_datetime(self.bowling.Date) <= '2020-12-31')]
+        self.assertEqual(form['innings'], len(innings))
+        self.assertEqual(form['wickets'], innings.isBowlerWicket.sum())
+        self.assertEqual(form['runs'], innings.bowler_run.sum())
+        self.assertEqual(form['figures'][0], '{}/{}'.format(*innings[
+            ['isBowlerWicket', 'bowler_run']].iloc[-1]))
+
+    def test_career_window(self):
+        """Test that an unbounded window is the career record"""
+        form = self.index.form('V Kohli', 'batting')
+        record = ipl.batsman_record('V Kohli', ipl.batter_data)
+        for name in ('innings', 'runs', 'balls', 'fifties', 'hundreds'):
+            self.assertEqual(form[name], record[name])
+        # Dismissals include run-outs at the non-striker's end
+        dismissed = ipl.bowler_data[ipl.bowler_data.player_out == 'V Kohli'].ID.nunique()
+        self.assertEqual(form['not_out'], form['innings'] - dismissed)
+
+    def test_form_block(self):
+        """Test the default form windows"""
+        block = self.index.form_block('V Kohli', 'batting')
+        self.assertEqual(set(block), {'last_5', 'last_10', 'last_12_months'})
+        self.assertEqual(block['last_5']['scores'], block['last_10']['scores'][:5])
+        self.assertIsNone(self.index.form_block('Unknown', 'batting'))
+        with self.assertRaises(ValueError):
+            self.index.form('V Kohli', 'fielding')
+
+    def test_leaderboard(self):
+        """Test that the leaderboard ranks the windows of every player"""
+        board = self.index.leaderboard('batting', last=5, n=5)
+        runs = [player['runs'] for player in board['players']]
+        self.assertEqual(runs, sorted(runs, reverse=True))
+        for player in board['players']:
+            form = self.index.form(player['player'], 'batting', last=5, days=365)
+            self.assertEqual(player['runs'], form['runs'])
+        board = self.index.leaderboard('bowling', days=None, n=3, sort='economy',
+                                       min_innings=20)
+        self.assertTrue(all(player['innings'] >= 20 for player in board['players']))
+        economies = [player['economy'] for player in board['players']]
+        self.assertEqual(economies, sorted(economies))
+        with self.assertRaises(ValueError):
+            self.index.leaderboard('batting', sort='wickets')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import ast
+import pandas as pd
+from generate_dataset import generate
+
+
+def _sample_data():
+    """Builds a two-match source dataset with the real column schemas"""
+    matches = pd.DataFrame({
+        'ID': ['2', '1'],
+        'Team1': ['Team A', 'Team B'],
+        'Team2': ['Team B', 'Team A'],
+        'TossWinner': ['Team A', 'Team A'],
+        'WinningTeam': ['Team B', 'NA'],
+        'Player_of_Match': ['P3', 'NA'],
+        'Team1Players': ["['P1', 'P2']", "['P3', 'P4']"],
+        'Team2Players': ["['P3', 'P4']", "['P1', 'P2']"],
+    })
+    balls = pd.DataFrame({
+        'ID': ['1', '2', '2', '1', '2'],
+        'batter': ['P3', 'P1', 'P2', 'P4', 'P1'],
+        'bowler': ['P1', 'P3', 'P4', 'P2', 'P3'],
+        'non-striker': ['P4', 'P2', 'P1', 'P3', 'P2'],
+        'player_out': ['NA', 'NA', 'P2', 'NA', 'NA'],
+        'fielders_involved': ['NA', 'NA', 'P3, P4', 'NA', 'NA'],
+        'BattingTeam': ['Team B', 'Team A', 'Team A', 'Team B', 'Team A'],
+    })
+    return matches, balls
+
+
+class GenerateDatasetTests(unittest.TestCase):
+    """Test cases for the synthetic dataset generator"""
+
+    def test_scale_and_unique_ids(self):
+        """Test that the output has `scale` leagues with unique match IDs"""
+        matches, balls = _sample_data()
+        leagues = list(generate(matches, balls, scale=4, seed=1))
+        self.assertEqual(len(leagues), 4)
+        all_matches = pd.concat([league[0] for league in leagues])
+        all_balls = pd.concat([league[1] for league in leagues])
+        self.assertEqual(len(all_matches), 8)
+        self.assertEqual(len(all_balls), 20)
+        self.assertTrue(all_matches['ID'].is_unique)
+        self.assertTrue(set(all_balls['ID']) <= set(all_matches['ID']))
+
+    def test_referential_integrity(self):
+        """Test that renamed teams and players stay consistent between the tables"""
+        matches, balls = _sample_data()
+        for league_matches, league_balls in generate(matches, balls, scale=3, seed=5,
+                                                     player_keep_fraction=0.5):
+            merged = league_balls.merge(league_matches, on='ID')
+            self.assertEqual(len(merged), len(league_balls))
+            self.assertTrue((merged['BattingTeam'].eq(merged['Team1']) |
+                             merged['BattingTeam'].eq(merged['Team2'])).all())
+            for row in merged.itertuples():
+                squad = ast.literal_eval(row.Team1Players) + ast.literal_eval(row.Team2Players)
+                self.assertIn(row.batter, squad)
+                self.assertIn(row.bowler, squad)
+
+    def test_seed_reproducibility(self):
+        """Test that the same seed produces the same data"""
+        matches, balls = _sample_data()
+        first = list(generate(matches, balls, scale=3, seed=11))
+        second = list(generate(matches, balls, scale=3, seed=11))
+        for (matches_a, balls_a), (matches_b, balls_b) in zip(first, second):
+            pd.testing.assert_frame_equal(matches_a, matches_b)
+            pd.testing.assert_frame_equal(balls_a, balls_b)
+
+
+if __name__ == '__main__':
+    unittest.main()
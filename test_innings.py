@@ -0,0 +1,75 @@
+import unittest
+import numpy as np
+import ipl
+from innings import InningsTable
+
+
+class InningsTableTests(unittest.TestCase):
+    """Test cases for the innings summary table"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = InningsTable(ipl.matches, ipl.bowler_data)
+        balls = ipl.bowler_data[ipl.bowler_data.innings.isin([1, 2])]
+        cls.totals = balls.groupby(['ID', 'innings']).agg(
+            runs=('total_run', 'sum'), wickets=('isWicketDelivery', 'sum'),
+            extras=('extras_run', 'sum'), team=('BattingTeam', 'first'))
+
+    def test_totals(self):
+        """Test the innings totals against a groupby of the deliveries"""
+        self.assertEqual(len(self.table), len(self.totals))
+        columns = self.table.columns
+        order = np.lexsort((columns['innings'], columns['ID']))
+        for name in ('runs', 'wickets', 'extras'):
+            self.assertEqual(columns[name][order].tolist(), self.totals[name].tolist())
+        self.assertEqual(self.table.teams[columns['batting_team'][order]].tolist(),
+                         self.totals['team'].tolist())
+
+    def test_rows(self):
+        """Test the team and season indexes"""
+        columns = self.table.columns
+        rows = self.table.rows('Mumbai Indians', (2015, 2017))
+        self.assertTrue((columns['season'][rows] >= 2015).all())
+        self.assertTrue((columns['season'][rows] <= 2017).all())
+        team = self.table.team_code('Mumbai Indians')
+        expected = np.flatnonzero((columns['batting_team'] == team) &
+                                  (columns['season'] >= 2015) & (columns['season'] <= 2017))
+        self.assertEqual(rows.tolist(), expected.tolist())
+        self.assertEqual(len(self.table.rows()), len(self.table))
+
+    def test_match_values(self):
+        """Test the per-match lookup of an innings column"""
+        first = self.totals.xs(1, level='innings')['runs']
+        values = self.table.match_values(np.append(first.index, 1), 1, 'runs')
+        self.assertEqual(values[:-1].tolist(), first.tolist())
+        self.assertTrue(np.isnan(values[-1]))
+
+    def test_team_scores(self):
+        """Test the scoring record of a team"""
+        record = self.table.team_scores('Chennai Super Kings')
+        batted = self.totals[self.totals.team == 'Chennai Super Kings']
+        self.assertEqual(record['innings'], len(batted))
+        self.assertEqual(record['runs'], batted.runs.sum())
+        self.assertEqual(record['batting']['highest']['runs'], batted.runs.max())
+        self.assertLessEqual(record['batting']['lowest']['runs'], batted.runs.median())
+        self.assertIsNone(self.table.team_scores('Unknown'))
+
+    def test_chases_by_target(self):
+        """Test the chase success rate by band of targets"""
+        m = ipl.matches.set_index('ID')
+        chases = self.totals.xs(2, level='innings')
+        chases = chases[m.WinningTeam.reindex(chases.index).notna().to_numpy()]
+        result = self.table.chases_by_target(band=25)
+        self.assertEqual(result['chases'], len(chases))
+        self.assertEqual(result['won'], (m.WinningTeam.reindex(chases.index) ==
+                                         chases.team).sum())
+        self.assertEqual(sum(band['won'] for band in result['targets']), result['won'])
+        self.assertTrue(all(band['target'].split('-')[0].isdigit() and
+                            int(band['target'].split('-')[0]) % 25 == 0
+                            for band in result['targets']))
+        with self.assertRaises(ValueError):
+            self.table.chases_by_target(band=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
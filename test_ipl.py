@@ -100,6 +100,7 @@ class IPLFunctionsTests(unittest.TestCase):
         self.assertIn(batsman, data)
         self.assertIn('all', data[batsman])
         self.assertIn('against', data[batsman])
+        self.assertGreaterEqual(data[batsman]['all']['matches'], data[batsman]['all']['innings'])
         
     def test_bowler_record(self):
         """Test bowler_record function"""
@@ -202,5 +203,18 @@ class IPLFunctionsTests(unittest.TestCase):
             self.assertGreaterEqual(bowling_stats['innings'], 0)
 
 
+    def test_season_range(self):
+        """Test parsing of the season filters"""
+        self.assertIsNone(ipl.season_range())
+        self.assertEqual(ipl.season_range('2016'), (2016, 2016))
+        self.assertEqual(ipl.season_range(2016, 2010, 2012), (2016, 2016))
+        self.assertEqual(ipl.season_range(None, '2018', None), (2018, None))
+        self.assertEqual(ipl.season_range(None, None, '2010'), (None, 2010))
+        with self.assertRaises(ValueError):
+            ipl.season_range('abc')
+        with self.assertRaises(ValueError):
+            ipl.season_range(None, 2030, 2040)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,161 @@
+import unittest
+import copy
+import numpy as np
+import ipl
+import kernels
+
+
+class KernelTests(unittest.TestCase):
+    """Test cases for the NumPy aggregation kernels"""
+
+    def test_encode(self):
+        """Test encoding into a new and into an existing vocabulary"""
+        codes, vocabulary = kernels.encode(np.array(['b', 'a', 'b', 'c'], dtype=object))
+        self.assertEqual(list(vocabulary), ['a', 'b', 'c'])
+        self.assertEqual(list(codes), [1, 0, 1, 2])
+        codes, _ = kernels.encode(np.array(['c', 'z', 'a'], dtype=object), vocabulary)
+        self.assertEqual(list(codes), [2, -1, 0])
+        self.assertEqual(kernels.lookup(vocabulary, 'b'), 1)
+        self.assertEqual(kernels.lookup(vocabulary, 'zz'), -1)
+        self.assertEqual(kernels.lookup(vocabulary, None), -1)
+        self.assertEqual(kernels.lookup(vocabulary, 123), -1)
+        self.assertEqual(kernels.lookup(np.array([2008, 2009]), 2009), 1)
+
+    def test_group_sum_and_count(self):
+        """Test per-key sums and counts"""
+        codes = np.array([0, 2, 2, 0, 2])
+        self.assertEqual(list(kernels.group_sum(codes, np.array([1, 2, 3, 4, 5]), 4)),
+                         [5, 0, 10, 0])
+        self.assertEqual(list(kernels.group_count(codes, 4)), [2, 0, 3, 0])
+
+    def test_runs(self):
+        """Test run offsets and run sums"""
+        keys = np.array([7, 7, 9, 9, 9, 12])
+        starts = kernels.run_starts(keys)
+        self.assertEqual(list(starts), [0, 2, 5])
+        self.assertEqual(list(kernels.run_sums(np.array([1, 4, 0, 6, 1, 3]), starts)), [5, 7, 3])
+        empty = kernels.run_starts(np.array([], dtype=np.int64))
+        self.assertEqual(len(kernels.run_sums(np.array([], dtype=np.int64), empty)), 0)
+
+    def test_count_unique(self):
+        """Test counting distinct values"""
+        self.assertEqual(kernels.count_unique(np.array([3, 1, 3, 2, 1])), 3)
+        self.assertEqual(kernels.count_unique(np.array([1, 1, 2]), assume_sorted=True), 2)
+        self.assertEqual(kernels.count_unique(np.array([])), 0)
+
+    def test_sorted_columns(self):
+        """Test player slices of the sorted layout and merging new rows into it"""
+        table = kernels.SortedColumns(np.array([2, 0, 2, 1]),
+                                      {'value': np.array([10, 11, 12, 13])}, 3)
+        self.assertEqual(list(table.offsets), [0, 1, 2, 4])
+        self.assertEqual(list(table.slice(2)['value']), [10, 12])
+        self.assertTrue(np.shares_memory(table.slice(2)['value'], table.columns['value']))
+        self.assertEqual(len(table.slice(-1)['value']), 0)
+
+        table.insert(np.array([0, 4, 2]), {'value': np.array([20, 21, 22])})
+        self.assertEqual(table.size, 5)
+        self.assertEqual(len(table), 7)
+        self.assertEqual(list(table.slice(0)['value']), [11, 20])
+        self.assertEqual(list(table.slice(2)['value']), [10, 12, 22])
+        self.assertEqual(len(table.slice(3)['value']), 0)
+        self.assertEqual(list(table.slice(4)['value']), [21])
+        self.assertEqual(list(table.slice(0, 5)['value']), [11, 20, 13, 10, 12, 22, 21])
+        # Buffered rows are merged into the sorted columns in bulk
+        self.assertEqual(len(table.columns['value']), 4)
+        table.compact()
+        self.assertEqual(list(table.offsets), [0, 2, 3, 6, 6, 7])
+        self.assertEqual(list(table.columns['value']), [11, 20, 13, 10, 12, 22, 21])
+        self.assertEqual(list(table.slice(2)['value']), [10, 12, 22])
+
+    def test_sorted_columns_merge_threshold(self):
+        """Test that inserts leave earlier copies intact and merge at the threshold"""
+        table = kernels.SortedColumns(np.array([1, 0]), {'value': np.array([10, 11])}, 2,
+                                      merge_rows=3)
+        before = copy.copy(table)
+        table.insert(np.array([1, 0]), {'value': np.array([20, 21])})
+        self.assertEqual(list(before.slice(0, 2)['value']), [11, 10])
+        self.assertEqual(list(table.slice(0, 2)['value']), [11, 21, 10, 20])
+        table.insert(np.array([1]), {'value': np.array([30])})
+        self.assertEqual(list(table.columns['value']), [11, 21, 10, 20, 30])
+        self.assertEqual(len(table), 5)
+        self.assertEqual(list(before.slice(0, 2)['value']), [11, 10])
+
+
+class KernelRecordTests(unittest.TestCase):
+    """Test that the kernel record functions match their pandas versions"""
+
+    players = ['V Kohli', 'MS Dhoni', 'SP Narine', 'JJ Bumrah', 'Not A Player']
+
+    def assertRecordEqual(self, record, expected):
+        """Compare two records key by key, allowing float rounding"""
+        self.assertEqual(set(record), set(expected))
+        for key, value in expected.items():
+            if isinstance(value, float):
+                self.assertAlmostEqual(record[key], value, places=9, msg=key)
+            else:
+                self.assertEqual(record[key], value, msg=key)
+
+    def test_batsman_record(self):
+        """Test batsman_record against batsman_record_pandas"""
+        for player in self.players:
+            self.assertRecordEqual(ipl.batsman_record(player, ipl.batter_data),
+                                   ipl.batsman_record_pandas(player, ipl.batter_data))
+
+    def test_bowler_record(self):
+        """Test bowler_record against bowler_record_pandas"""
+        for player in self.players:
+            self.assertRecordEqual(ipl.bowler_record(player, ipl.bowler_data),
+                                   ipl.bowler_record_pandas(player, ipl.bowler_data))
+
+
+class NumpyBackendAppendTests(unittest.TestCase):
+    """Test that appending deliveries keeps the sorted layouts in sync"""
+
+    players = ['V Kohli', 'MS Dhoni', 'SP Narine', 'JJ Bumrah']
+    teams = [None, 'Mumbai Indians', 'Chennai Super Kings']
+
+    def assertSameRecords(self, backend):
+        """Compare every record with the backend built over the whole data"""
+        for player in self.players:
+            for team in self.teams:
+                self.assertEqual(str(backend.batsman_record(player, team)),
+                                 str(ipl.backend.batsman_record(player, team)))
+                self.assertEqual(str(backend.bowler_record(player, team)),
+                                 str(ipl.backend.bowler_record(player, team)))
+
+    def test_append_known_players(self):
+        """Test that deliveries of known players and teams are merged in place"""
+        data = ipl.bowler_data
+        ids = data.ID.unique()[:3]
+        backend = ipl.NumpyBackend(ipl.matches, data[~data.ID.isin(ids)], data[~data.ID.isin(ids)])
+        layout = backend.by_batter
+        backend.append(data[data.ID.isin(ids)])
+        self.assertIs(backend.by_batter, layout)
+        self.assertSameRecords(backend)
+
+    def test_append_new_players(self):
+        """Test that deliveries with new players grow the vocabulary without a rebuild"""
+        data = ipl.bowler_data
+        involved = ((data.batter == 'V Kohli') | (data.bowler == 'V Kohli') |
+                    (data.player_out == 'V Kohli') | (data.Player_of_Match == 'V Kohli'))
+        backend = ipl.NumpyBackend(ipl.matches, data[~involved], data[~involved])
+        layout, players = backend.by_batter, backend.players
+        backend.append(data[involved])
+        self.assertIs(backend.by_batter, layout)
+        self.assertIs(backend.players, players)
+        self.assertIn('V Kohli', backend.added['players'])
+        self.assertSameRecords(backend)
+
+    def test_appended_copy(self):
+        """Test that a copy with a new player leaves the original backend untouched"""
+        data = ipl.bowler_data
+        rows = data[data.ID == data.ID.iloc[0]].assign(batter='New Batter')
+        updated = ipl.backend.appended(rows)
+        self.assertEqual(updated.batsman_record('New Batter')['runs'],
+                         rows.loc[rows.innings.isin([1, 2]), 'batsman_run'].sum())
+        self.assertEqual(ipl.backend.batsman_record('New Batter')['innings'], 0)
+        self.assertNotIn('New Batter', ipl.backend.added['players'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+import unittest
+import copy
+import json
+import os
+import tempfile
+import time
+import ipl
+import live
+
+
+def delivery(**fields):
+    """Return a valid delivery of an unknown match, with some fields overridden"""
+    record = {'ID': 990001, 'innings': 1, 'overs': 0, 'ballnumber': 1, 'batter': 'V Kohli',
+              'bowler': 'JJ Bumrah', 'non-striker': 'AB de Villiers', 'batsman_run': 4,
+              'extras_run': 0, 'total_run': 4, 'non_boundary': 0, 'isWicketDelivery': 0,
+              'BattingTeam': 'Royal Challengers Bangalore', 'BowlingTeam': 'Mumbai Indians'}
+    record.update(fields)
+    return record
+
+
+class ParseDeliveryTests(unittest.TestCase):
+    """Test cases for delivery validation"""
+
+    def test_parse_delivery(self):
+        """Test that optional fields are filled in and counts are integers"""
+        parsed = live.parse_delivery(delivery(batsman_run='4'))
+        self.assertEqual(parsed['batsman_run'], 4)
+        self.assertIsNone(parsed['extra_type'])
+        self.assertEqual(parsed['non_boundary'], 0)
+
+    def test_invalid_delivery(self):
+        """Test missing fields, bad counts and non-objects"""
+        record = delivery()
+        del record['bowler']
+        with self.assertRaises(ValueError):
+            live.parse_delivery(record)
+        with self.assertRaises(ValueError):
+            live.parse_delivery(delivery(total_run='four'))
+        with self.assertRaises(ValueError):
+            live.parse_delivery([1, 2])
+        with self.assertRaises(ValueError):
+            live.parse_delivery(delivery(batter=123))
+
+    def test_delivery_frame(self):
+        """Test the derived bowling columns"""
+        frame = live.delivery_frame([
+            live.parse_delivery(delivery(extra_type='legbyes', batsman_run=0, extras_run=1,
+                                         total_run=1)),
+            live.parse_delivery(delivery(ID=int(ipl.matches.ID.iloc[0]), ballnumber=2,
+                                         BattingTeam=ipl.matches.Team1.iloc[0],
+                                         isWicketDelivery=1, kind='caught', BowlingTeam=None))
+        ], ipl.matches)
+        self.assertEqual(list(frame.bowler_run), [0, 4])
+        self.assertEqual(list(frame.isBowlerWicket), [0, 1])
+        self.assertEqual(frame.BowlingTeam.iloc[0], 'Mumbai Indians')
+        self.assertEqual(frame.BowlingTeam.iloc[1], ipl.matches.Team2.iloc[0])
+        self.assertEqual(list(frame.phase), [0, 0])
+
+
+class ScoreboardTests(unittest.TestCase):
+    """Test cases for the running scorecards"""
+
+    def test_apply(self):
+        """Test scorecard totals, batter and bowler figures and duplicates"""
+        scoreboard = live.Scoreboard()
+        scoreboard.apply(live.parse_delivery(delivery()))
+        scoreboard.apply(live.parse_delivery(delivery(ballnumber=2, extra_type='wides',
+                                                      batsman_run=0, extras_run=1, total_run=1)))
+        delta = scoreboard.apply(live.parse_delivery(delivery(
+            ballnumber=3, batsman_run=0, total_run=0, isWicketDelivery=1, kind='bowled',
+            player_out='V Kohli')))
+        self.assertEqual(delta['score'], '5/1')
+        self.assertEqual(delta['overs'], '0.2')
+        self.assertEqual(delta['batter']['balls'], 2)
+        self.assertTrue(delta['batter']['out'])
+        self.assertEqual(delta['bowler'], {'name': 'JJ Bumrah', 'balls': 2, 'runs': 5,
+                                           'wickets': 1})
+        self.assertIsNone(scoreboard.apply(live.parse_delivery(delivery())))
+        self.assertEqual(scoreboard.scorecard(990001)['innings'][1]['extras'], 1)
+        self.assertIsNone(scoreboard.scorecard(1))
+
+
+class BroadcasterTests(unittest.TestCase):
+    """Test cases for the bounded fan-out"""
+
+    def test_match_filter(self):
+        """Test that subscribers only receive the events of their match"""
+        broadcaster = live.Broadcaster()
+        everything, one_match = broadcaster.subscribe(), broadcaster.subscribe(match_id=2)
+        broadcaster.publish('delivery', {'n': 1}, match_id=1)
+        self.assertIn('"n": 1', everything.get(timeout=0))
+        self.assertIsNone(one_match.get(timeout=0))
+        broadcaster.unsubscribe(everything)
+        self.assertEqual(len(broadcaster), 1)
+
+    def test_slow_subscriber(self):
+        """Test that a full queue is replaced by a resync event without blocking"""
+        broadcaster = live.Broadcaster(max_events=3)
+        slow, fast = broadcaster.subscribe(), broadcaster.subscribe()
+        for number in range(5):
+            broadcaster.publish('delivery', {'n': number})
+            self.assertIn(f'"n": {number}', fast.get(timeout=0))
+        self.assertEqual(slow.resyncs, 1)
+        self.assertTrue(slow.get(timeout=0).startswith('event: resync'))
+        self.assertIn('"n": 4', slow.get(timeout=0))
+        self.assertIsNone(slow.get(timeout=0))
+
+
+class LiveFeedTests(unittest.TestCase):
+    """Test cases for ingesting deliveries into the tables"""
+
+    def setUp(self):
+        self.backend = ipl.backend
+
+    def tearDown(self):
+        ipl.backend = self.backend
+
+    def test_ingest(self):
+        """Test that a batch updates the backend and publishes deltas and records"""
+        feed = live.LiveFeed()
+        subscription = feed.broadcaster.subscribe(match_id=990001)
+        runs = ipl.backend.batsman_record('V Kohli')['runs']
+        backend = ipl.backend
+        result = feed.ingest([delivery(), delivery(ballnumber=2, batsman_run=6, total_run=6),
+                              delivery()])
+        self.assertEqual(result, {'ingested': 2, 'duplicates': 1, 'matches': [990001]})
+        self.assertEqual(ipl.backend.batsman_record('V Kohli')['runs'], runs + 10)
+        # The previous backend is left untouched for the queries still using it
+        self.assertEqual(backend.batsman_record('V Kohli')['runs'], runs)
+        events = []
+        while (message := subscription.get(timeout=0)) is not None:
+            events.append(message.split('\n')[0])
+        self.assertEqual(events, ['event: delivery'] * 2 + ['event: record'] * 2)
+
+    def test_unknown_match_needs_bowling_team(self):
+        """Test that a batch with an unknown match and no bowling team is rejected"""
+        feed = live.LiveFeed()
+        with self.assertRaises(ValueError):
+            feed.ingest([delivery(), delivery(ballnumber=2, BowlingTeam=None)])
+        self.assertIsNone(feed.scoreboard.scorecard(990001))
+
+    def test_failed_batch_is_not_ingested(self):
+        """Test that nothing of a batch is applied when the tables cannot be updated"""
+        feed = live.LiveFeed()
+        subscription = feed.broadcaster.subscribe()
+        with self.assertRaises(ValueError):
+            feed.ingest([delivery(), delivery(ballnumber=2, batter=123)])
+
+        def fail(frame):
+            raise RuntimeError('append failed')
+
+        ipl.backend = copy.copy(self.backend)
+        ipl.backend.appended = fail
+        with self.assertRaises(RuntimeError):
+            feed.ingest([delivery()])
+        self.assertIsNone(feed.scoreboard.scorecard(990001))
+        self.assertIsNone(subscription.get(timeout=0))
+        # A retry is not reported as a duplicate
+        ipl.backend = self.backend
+        self.assertEqual(feed.ingest([delivery()])['ingested'], 1)
+
+    def test_tail(self):
+        """Test following an NDJSON file with a partial last line"""
+        feed = live.LiveFeed()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'feed.ndjson')
+            tail = live.NDJSONTail(path, feed)
+            self.assertEqual(tail.poll(), 0)
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(json.dumps(delivery()) + '\nnot json\n')
+                file.write(json.dumps(delivery(ballnumber=2))[:20])
+            self.assertEqual(tail.poll(), 1)
+            self.assertEqual(tail.errors, 1)
+            with open(path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(delivery(ballnumber=2))[20:] + '\n')
+            self.assertEqual(tail.poll(), 1)
+        self.assertEqual(feed.scoreboard.scorecard(990001)['innings'][1]['runs'], 8)
+
+    def test_tail_survives_failed_batch(self):
+        """Test that the tail thread keeps following the file after a bad delivery"""
+        feed = live.LiveFeed()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'feed.ndjson')
+            tail = live.NDJSONTail(path, feed, poll_interval=0.01)
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(json.dumps(delivery(BowlingTeam=None)) + '\n')
+            with self.assertLogs('live', level='WARNING'):
+                thread = tail.start()
+                for _ in range(200):
+                    if tail.errors:
+                        break
+                    time.sleep(0.01)
+            with open(path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(delivery()) + '\n')
+            for _ in range(200):
+                if feed.scoreboard.scorecard(990001):
+                    break
+                time.sleep(0.01)
+            tail.stop()
+            thread.join(timeout=1)
+        self.assertEqual(tail.errors, 1)
+        self.assertEqual(feed.scoreboard.scorecard(990001)['innings'][1]['runs'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import random
+from test_api_load import LatencyHistogram, arrival_schedule, compare_reports, build_report
+
+
+class LoadToolsTests(unittest.TestCase):
+    """Test cases for the load test helpers"""
+
+    def test_histogram_percentiles(self):
+        """Test that histogram percentiles stay within the bucket precision"""
+        histogram = LatencyHistogram(precision=0.01)
+        for millis in range(1, 1001):
+            histogram.record(millis / 1000)
+        self.assertEqual(histogram.total, 1000)
+        self.assertAlmostEqual(histogram.percentile(50), 0.5, delta=0.5 * 0.02)
+        self.assertAlmostEqual(histogram.percentile(99), 0.99, delta=0.99 * 0.02)
+        self.assertEqual(histogram.percentile(100), 1.0)
+        self.assertAlmostEqual(histogram.mean(), 0.5005)
+
+    def test_histogram_merge(self):
+        """Test merging two histograms"""
+        first = LatencyHistogram()
+        second = LatencyHistogram()
+        first.record(0.01)
+        second.record(0.2)
+        first.merge(second)
+        self.assertEqual(first.total, 2)
+        self.assertEqual(first.min, 0.01)
+        self.assertEqual(first.max, 0.2)
+
+    def test_arrival_schedule(self):
+        """Test constant, stepped and Poisson schedules"""
+        self.assertEqual(len(arrival_schedule([(10, 2)])), 20)
+        stepped = arrival_schedule([(1, 3), (2, 3)])
+        self.assertEqual(len(stepped), 9)
+        self.assertTrue(all(a < b for a, b in zip(stepped, stepped[1:])))
+        poisson = arrival_schedule([(100, 10)], 'poisson', random.Random(3))
+        self.assertAlmostEqual(len(poisson), 1000, delta=150)
+
+    def test_compare_reports(self):
+        """Test that latency and error rate regressions are flagged"""
+        def results(latency, failures=0):
+            return [{'endpoint': '/api/x', 'success': i >= failures,
+                     'response_time': latency, 'service_time': latency}
+                    for i in range(100)]
+        baseline = build_report(results(0.1), 1, 'open', {})
+        self.assertEqual(compare_reports(build_report(results(0.105), 1, 'open', {}),
+                                         baseline, 0.2), [])
+        self.assertTrue(compare_reports(build_report(results(0.2), 1, 'open', {}),
+                                        baseline, 0.2))
+        self.assertTrue(compare_reports(build_report(results(0.1, 10), 1, 'open', {}),
+                                        baseline, 0.2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import ipl
+from match_search import MatchSearchIndex, match_stage
+
+
+class MatchSearchTests(unittest.TestCase):
+    """Test cases for the bitmap match search"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.index = MatchSearchIndex(ipl.matches)
+        cls.matches = ipl.matches
+
+    def ids(self, **kwargs):
+        result = self.index.search(per_page=len(self.matches), facets=False, **kwargs)
+        return [match['id'] for match in result['matches']]
+
+    def test_match_stage(self):
+        """Test the stage of numbered and play-off matches"""
+        self.assertEqual(match_stage('42'), 'League')
+        self.assertEqual(match_stage('Qualifier 1'), 'Qualifier 1')
+
+    def test_criteria(self):
+        """Test that ANDed fields and ORed values select the same matches as pandas masks"""
+        m = self.matches
+        plays = (m.Team1 == 'Mumbai Indians') | (m.Team2 == 'Mumbai Indians')
+        mask = plays & m.TossDecision.eq('field') & m.City.isin(['Mumbai', 'Pune'])
+        self.assertEqual(self.ids(criteria={'team': ['Mumbai Indians'], 'toss_decision': ['field'],
+                                            'city': ['Mumbai', 'Pune']}),
+                         m.ID[mask].tolist())
+        self.assertEqual(len(self.ids(criteria={'team': ['Mumbai Indians']}, seasons=(2015, 2017))),
+                         (plays & m.SeasonYear.between(2015, 2017)).sum())
+
+    def test_opponent(self):
+        """Test that the opponent selects the matches both teams played"""
+        m = self.matches
+        teams = {'Mumbai Indians', 'Chennai Super Kings'}
+        expected = m.ID[m.Team1.isin(teams) & m.Team2.isin(teams)].tolist()
+        self.assertEqual(self.ids(criteria={'team': ['Mumbai Indians'],
+                                            'opponent': ['Chennai Super Kings']}), expected)
+
+    def test_canonical_names(self):
+        """Test that every spelling of a venue or city selects the same matches"""
+        m = self.matches
+        wankhede = m.ID[m.Venue.str.startswith('Wankhede Stadium')].tolist()
+        self.assertEqual(self.ids(criteria={'venue': ['Wankhede Stadium']}), wankhede)
+        self.assertEqual(self.ids(criteria={'venue': ['Wankhede Stadium, Mumbai']}), wankhede)
+        bangalore = m.ID[m.City.isin(['Bangalore', 'Bengaluru'])].tolist()
+        self.assertEqual(self.ids(criteria={'city': ['Bengaluru']}), bangalore)
+        facets = self.index.facets()
+        self.assertNotIn('Bengaluru', facets['city'])
+        self.assertNotIn('Wankhede Stadium, Mumbai', facets['venue'])
+
+    def test_unknown_values(self):
+        """Test that unknown values match nothing and unknown fields are rejected"""
+        self.assertEqual(self.ids(criteria={'venue': ['Lord\'s']}), [])
+        with self.assertRaises(ValueError):
+            self.index.search({'captain': ['MS Dhoni']})
+        with self.assertRaises(ValueError):
+            self.index.search({}, page=0)
+
+    def test_paging(self):
+        """Test that the pages partition the matches found, most recent first"""
+        criteria = {'won_by': ['Wickets']}
+        expected = self.ids(criteria=criteria)
+        pages = [self.index.search(criteria, page=page, per_page=37, facets=False)
+                 for page in range(1, 16)]
+        self.assertEqual(pages[0]['pages'], -(-len(expected) // 37))
+        self.assertEqual([match['id'] for page in pages for match in page['matches']], expected)
+        dates = [match['date'] for page in pages for match in page['matches']]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+    def test_facets(self):
+        """Test the facet counts of all matches and of a result"""
+        facets = self.index.facets()
+        self.assertEqual(sum(facets['season'].values()), len(self.matches))
+        self.assertEqual(facets['super_over']['Y'], (self.matches.SuperOver == 'Y').sum())
+        result = self.index.search({'stage': ['Final']})
+        self.assertEqual(result['count'], (self.matches.MatchNumber == 'Final').sum())
+        self.assertEqual(sum(result['facets']['winner'].values()), result['count'])
+        self.assertEqual(result['facets']['stage'], {'Final': result['count']})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import numpy as np
+import pandas as pd
+import ipl
+from matchups import MatchupIndex
+
+
+class MatchupIndexTests(unittest.TestCase):
+    """Test cases for the sparse batter x bowler matchup matrix"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.index = ipl.matchup_index
+        data = ipl.bowler_data
+        cls.balls = data[data.innings.isin([1, 2])]
+
+    def pair_scan(self, batter, bowler):
+        """Compute a pair's record by scanning the deliveries"""
+        rows = self.balls[(self.balls.batter == batter) & (self.balls.bowler == bowler)]
+        legal = ~rows.extra_type.isin(['wides', 'noballs'])
+        return {
+            'balls': int(legal.sum()),
+            'runs': int(rows.batsman_run.sum()),
+            'dismissals': int(rows.isBowlerWicket.sum()),
+            'dots': int((legal & (rows.batsman_run == 0)).sum()),
+            'fours': int(((rows.non_boundary == 0) & (rows.batsman_run == 4)).sum()),
+            'sixes': int(((rows.non_boundary == 0) & (rows.batsman_run == 6)).sum())
+        }
+
+    def test_pair_record(self):
+        """Test that pair records match a scan of the deliveries"""
+        for batter, bowler in [('V Kohli', 'JJ Bumrah'), ('MS Dhoni', 'RA Jadeja'),
+                               ('RA Jadeja', 'V Kohli')]:
+            record = self.index.pair_record(batter, bowler)
+            expected = self.pair_scan(batter, bowler)
+            self.assertEqual({key: record[key] for key in expected}, expected)
+
+    def test_unknown_players(self):
+        """Test pairs that never met and unknown players"""
+        record = self.index.pair_record('V Kohli', 'V Kohli')
+        self.assertEqual(record['balls'], 0)
+        self.assertIsNone(record['strike_rate'])
+        self.assertIsNone(self.index.pair_record('Not A Player', 'JJ Bumrah'))
+        self.assertIsNone(self.index.batter_matchups('Not A Player'))
+        self.assertIsNone(self.index.bowler_bunnies(None))
+
+    def test_matrix_totals(self):
+        """Test that a batter's matchups add up to the batter's deliveries"""
+        batter = self.balls[self.balls.batter == 'V Kohli']
+        code = self.index.player_code('V Kohli')
+        pairs = self.index._batter_pairs(code)
+        self.assertEqual(self.index.columns['runs'][pairs].sum(), batter.batsman_run.sum())
+        self.assertEqual(len(pairs), batter.bowler.nunique())
+        self.assertTrue(np.all(np.diff(self.index.bowler[pairs]) > 0))
+
+    def test_batter_matchups(self):
+        """Test the ranking of a batter's matchups"""
+        record = self.index.batter_matchups('V Kohli', n=3, min_balls=12)
+        self.assertEqual(len(record['top']), 3)
+        rates = [matchup['strike_rate'] for matchup in record['top']]
+        self.assertEqual(rates, sorted(rates, reverse=True))
+        rates = [matchup['strike_rate'] for matchup in record['bottom']]
+        self.assertEqual(rates, sorted(rates))
+        self.assertGreaterEqual(record['top'][-1]['strike_rate'],
+                                record['bottom'][-1]['strike_rate'])
+        for matchup in record['top'] + record['bottom']:
+            self.assertGreaterEqual(matchup['balls'], 12)
+
+    def test_bowler_bunnies(self):
+        """Test the batters a bowler has dismissed most often"""
+        bunnies = self.index.bowler_bunnies('JJ Bumrah', n=5)['bunnies']
+        dismissals = self.balls[self.balls.bowler == 'JJ Bumrah'].groupby(
+            'batter').isBowlerWicket.sum()
+        self.assertEqual(bunnies[0]['dismissals'], dismissals.max())
+        counts = [bunny['dismissals'] for bunny in bunnies]
+        self.assertEqual(counts, sorted(counts, reverse=True))
+        for bunny in bunnies:
+            self.assertEqual(bunny['bowler'], 'JJ Bumrah')
+
+    def test_small_frame(self):
+        """Test the matrix of a hand-built frame"""
+        frame = pd.DataFrame({
+            'innings': [1, 1, 1, 2, 3],
+            'batter': ['A', 'A', 'B', 'A', 'A'],
+            'bowler': ['X', 'Y', 'X', 'X', 'X'],
+            'batsman_run': [4, 1, 0, 6, 6],
+            'extra_type': [np.nan, np.nan, 'wides', np.nan, np.nan],
+            'non_boundary': [0, 0, 0, 0, 0],
+            'isBowlerWicket': [0, 0, 0, 1, 0]
+        })
+        index = MatchupIndex(frame)
+        self.assertEqual(len(index), 3)
+        record = index.pair_record('A', 'X')
+        self.assertEqual((record['balls'], record['runs'], record['dismissals'],
+                          record['fours'], record['sixes']), (2, 10, 1, 1, 1))
+        self.assertEqual(index.pair_record('B', 'X')['balls'], 0)
+        self.assertEqual(index.bowler_bunnies('X')['bunnies'][0]['batter'], 'A')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import numpy as np
+import pandas as pd
+import ipl
+from partnerships import PartnershipIndex, segment
+
+
+class SegmentTests(unittest.TestCase):
+    """Test cases for splitting deliveries into partnerships"""
+
+    def test_segment(self):
+        """Test splits at innings, wickets and pair changes"""
+        match_ids = np.array([1, 1, 1, 1, 1, 1, 2])
+        innings = np.array([1, 1, 1, 1, 2, 2, 1])
+        wickets = np.array([False, True, False, False, False, False, False])
+        first = np.array([0, 0, 0, 0, 3, 3, 0])
+        second = np.array([1, 1, 2, 4, 5, 5, 1])
+        starts, wicket = segment(match_ids, innings, wickets, first, second)
+        self.assertEqual(list(starts), [0, 2, 3, 4, 6])
+        self.assertEqual(list(wicket), [1, 2, 2, 1, 1])
+
+    def test_empty(self):
+        """Test segmenting no deliveries"""
+        starts, wicket = segment(*[np.array([])] * 5)
+        self.assertEqual(len(starts), 0)
+        self.assertEqual(len(wicket), 0)
+
+
+class PartnershipIndexTests(unittest.TestCase):
+    """Test cases for the partnership table and its indexes"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.index = ipl.partnership_index
+        data = ipl.batter_data
+        cls.balls = data[data.innings.isin([1, 2])]
+
+    def test_table_totals(self):
+        """Test that the partnerships add up to the innings totals"""
+        table = self.index.table
+        self.assertEqual(table['runs'].sum(), self.balls.total_run.sum())
+        np.testing.assert_array_equal(table['first_runs'] + table['second_runs'] <= table['runs'],
+                                      True)
+        wickets = self.balls.groupby(['ID', 'innings']).isWicketDelivery.sum()
+        highest = pd.Series(table['wicket'], index=pd.MultiIndex.from_arrays(
+            [table['ID'], table['innings']])).groupby(level=[0, 1]).max()
+        self.assertTrue((highest <= wickets.reindex(highest.index) + 1).all())
+
+    def test_pair_history(self):
+        """Test a pair's history against a scan of the deliveries"""
+        partner = self.index.top_partners('V Kohli', n=1)['partners'][0]
+        history = self.index.pair_history(partner['partner'], 'V Kohli')
+        self.assertEqual(history, self.index.pair_history('V Kohli', partner['partner']))
+        self.assertEqual(history['partnerships'], partner['partnerships'])
+        self.assertEqual(history['runs'], partner['runs'])
+        self.assertEqual(history['highest'], partner['highest'])
+        together = self.balls[((self.balls.batter == 'V Kohli') &
+                               (self.balls['non-striker'] == partner['partner'])) |
+                              ((self.balls.batter == partner['partner']) &
+                               (self.balls['non-striker'] == 'V Kohli'))]
+        self.assertEqual(history['runs'], together.total_run.sum())
+        self.assertIsNone(self.index.pair_history('V Kohli', 'Not A Player'))
+
+    def test_top_partnerships(self):
+        """Test the highest partnerships of a wicket"""
+        top = self.index.top_partnerships(wicket=1, n=5)[1]
+        self.assertEqual(len(top), 5)
+        runs = [record['runs'] for record in top]
+        self.assertEqual(runs, sorted(runs, reverse=True))
+        self.assertEqual(runs[0], self.index.table['runs'][self.index.table['wicket'] == 1].max())
+        self.assertEqual(set(self.index.top_partnerships(n=1)), set(self.index.wickets.tolist()))
+        self.assertEqual(self.index.top_partnerships(wicket=99), {99: []})
+
+    def test_top_partners(self):
+        """Test a player's most productive partners"""
+        partners = self.index.top_partners('V Kohli', n=4)['partners']
+        self.assertEqual(len(partners), 4)
+        runs = [partner['runs'] for partner in partners]
+        self.assertEqual(runs, sorted(runs, reverse=True))
+        self.assertIsNone(self.index.top_partners('Not A Player'))
+
+    def test_small_frame(self):
+        """Test the partnerships of a hand-built innings"""
+        frame = pd.DataFrame({
+            'ID': [1, 1, 1, 1], 'innings': [1, 1, 1, 1], 'overs': [0, 0, 0, 0],
+            'ballnumber': [4, 1, 2, 3],
+            'batter': ['A', 'A', 'B', 'C'], 'non-striker': ['C', 'B', 'A', 'A'],
+            'isWicketDelivery': [0, 0, 1, 0], 'extra_type': [np.nan, np.nan, np.nan, 'wides'],
+            'batsman_run': [6, 4, 1, 0], 'total_run': [6, 4, 1, 1],
+            'BattingTeam': ['X'] * 4
+        })
+        index = PartnershipIndex(frame)
+        self.assertEqual(len(index), 2)
+        first, second = index.top_partnerships(n=1)[1][0], index.top_partnerships(n=1)[2][0]
+        self.assertEqual((first['batters'], first['runs'], first['balls']), (['A', 'B'], 5, 2))
+        self.assertFalse(first['unbroken'])
+        self.assertEqual((second['batters'], second['runs'], second['balls']), (['A', 'C'], 7, 1))
+        self.assertEqual(second['contributions'], {'A': 6, 'C': 0})
+        self.assertTrue(second['unbroken'])
+
+
+if __name__ == '__main__':
+    unittest.main()
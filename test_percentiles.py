@@ -0,0 +1,129 @@
+import json
+import unittest
+import numpy as np
+import ipl
+import live
+from percentiles import METRICS, RECORD_SCALE, PeerRanks
+
+
+# A delivery of an unknown match, for the tests that merge a live batch
+LIVE_DELIVERY = {'ID': 990001, 'innings': 1, 'overs': 0, 'ballnumber': 1, 'batter': 'V Kohli',
+                 'bowler': 'JJ Bumrah', 'non-striker': 'AB de Villiers', 'batsman_run': 4,
+                 'extras_run': 0, 'total_run': 4, 'non_boundary': 0, 'isWicketDelivery': 0,
+                 'BattingTeam': 'Royal Challengers Bangalore', 'BowlingTeam': 'Mumbai Indians'}
+
+
+class PeerRanksTests(unittest.TestCase):
+    """Test cases for the percentile ranks among qualified peers"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.batting = PeerRanks(ipl.form_index, 'batting')
+        cls.bowling = PeerRanks(ipl.form_index, 'bowling')
+
+    def test_player_stats(self):
+        """Test the season totals of every player against the ball-by-ball data"""
+        stats = ipl.form_index.player_stats('batting', (2018, 2018))
+        balls = ipl.bowler_data[ipl.bowler_data.ID.isin(
+            ipl.matches[ipl.matches.SeasonYear == 2018].ID)]
+        runs = balls.groupby('batter')['batsman_run'].sum()
+        players = list(ipl.form_index.players)
+        for player in ('V Kohli', 'MS Dhoni', 'JC Buttler'):
+            self.assertEqual(stats['runs'][players.index(player)], runs.get(player, 0))
+
+    def test_peers_match_records(self):
+        """Test that a qualified player's own peer entry equals their record"""
+        players = list(ipl.form_index.players)
+        for role, record, names in (('batting', ipl.backend.batsman_record,
+                                     ['V Kohli', 'MS Dhoni', 'AB de Villiers', 'SP Narine']),
+                                    ('bowling', ipl.backend.bowler_record,
+                                     ['RA Jadeja', 'Rashid Khan', 'SP Narine'])):
+            for seasons in (None, (2018, 2019)):
+                stats = ipl.form_index.player_stats(role, seasons)
+                for player in names:
+                    expected = record(player, seasons=seasons)
+                    for metric, (name, _) in METRICS[role].items():
+                        value = stats[name][players.index(player)]
+                        value *= RECORD_SCALE.get((role, name), 1)
+                        if expected[metric] is None:
+                            self.assertTrue(np.isnan(value), (player, metric))
+                        else:
+                            self.assertAlmostEqual(value, expected[metric], places=6,
+                                                   msg=(player, metric))
+
+    def test_bounds(self):
+        """Test the percentiles of values below and above every peer"""
+        values = self.batting.sorted['runs']
+        self.assertEqual(self.batting.percentile('runs', values[0] - 1), 0)
+        self.assertEqual(self.batting.percentile('runs', values[-1] + 1), 100)
+        # Lower is better for the economy rate
+        values = self.bowling.sorted['economy']
+        self.assertEqual(self.bowling.percentile('economy', values[0] - 1), 100)
+        self.assertEqual(self.bowling.percentile('economy', values[-1] + 1), 0)
+        self.assertIsNone(self.batting.percentile('avg', None))
+
+    def test_monotonic(self):
+        """Test that better values never rank lower"""
+        strike_rates = [self.batting.percentile('strike_rate', rate)
+                        for rate in range(80, 200, 5)]
+        self.assertEqual(strike_rates, sorted(strike_rates))
+        economies = [self.bowling.percentile('economy', rate / 2) for rate in range(10, 24)]
+        self.assertEqual(economies, sorted(economies, reverse=True))
+
+    def test_rank(self):
+        """Test a percentile against a count over the qualified peers"""
+        values = self.batting.sorted['sixes']
+        value = values[len(values) // 2]
+        expected = np.count_nonzero(values < value) / len(values) * 100
+        self.assertAlmostEqual(self.batting.percentile('sixes', value), expected, places=1)
+
+    def test_qualification(self):
+        """Test that a stricter qualification leaves fewer peers"""
+        strict = PeerRanks(ipl.form_index, 'batting', min_balls=1000, min_innings=50)
+        self.assertLess(strict.peers, self.batting.peers)
+        self.assertEqual(len(strict.sorted['runs']), strict.peers)
+        self.assertTrue((strict.sorted['balls'] >= 1000).all())
+        with self.assertRaises(ValueError):
+            PeerRanks(ipl.form_index, 'fielding')
+
+    def test_record(self):
+        """Test the percentiles block of the player records"""
+        data = json.loads(ipl.batsman_api('V Kohli', percentile={}))['V Kohli']
+        block = data['percentiles']
+        self.assertEqual(block['peers'], self.batting.peers)
+        self.assertGreater(block['metrics']['runs'], 90)
+        self.assertTrue(all(0 <= value <= 100 for value in block['metrics'].values()
+                            if value is not None))
+
+        data = json.loads(ipl.bowler_api('JJ Bumrah', percentile={'min_balls': 300}))
+        block = data['JJ Bumrah']['percentiles']
+        self.assertEqual(block['min_balls'], 300)
+        self.assertIn('economy', block['metrics'])
+        self.assertNotIn('percentiles', json.loads(ipl.bowler_api('JJ Bumrah'))['JJ Bumrah'])
+
+    def test_cache(self):
+        """Test that the peers are built once per dataset version and qualification"""
+        ranks = ipl.peer_ranks('batting', (2016, 2020), min_balls=200)
+        self.assertIs(ipl.peer_ranks('batting', (2016, 2020), min_balls=200), ranks)
+        self.assertIsNot(ipl.peer_ranks('batting', (2016, 2020), min_balls=300), ranks)
+        self.assertLessEqual(ipl._peer_ranks.cache_info().currsize, ipl.PEER_RANKS_CACHE_SIZE)
+
+    def test_cache_bounded(self):
+        """Test that varying the qualification cannot grow the cache without bound"""
+        for min_balls in range(ipl.PEER_RANKS_CACHE_SIZE + 5):
+            ipl.peer_ranks('bowling', (2022, 2022), min_balls=min_balls)
+        self.assertEqual(ipl._peer_ranks.cache_info().currsize, ipl.PEER_RANKS_CACHE_SIZE)
+
+    def test_cache_kept_across_live_batches(self):
+        """Test that merging a live batch keeps the peers built from the loaded data"""
+        ranks = ipl.peer_ranks('batting')
+        backend = ipl.backend
+        try:
+            live.LiveFeed().ingest([LIVE_DELIVERY])
+            self.assertIs(ipl.peer_ranks('batting'), ranks)
+        finally:
+            ipl.backend = backend
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import numpy as np
+import ipl
+import phases
+
+
+class PhasesTests(unittest.TestCase):
+    """Test cases for the innings phase splits"""
+
+    def test_phase_codes(self):
+        """Test the phase of every over"""
+        codes = phases.phase_codes(np.arange(20))
+        self.assertEqual(list(codes), [0] * 6 + [1] * 9 + [2] * 5)
+
+    def test_select_phases(self):
+        """Test parsing a phase selection"""
+        self.assertIsNone(phases.select_phases(None))
+        self.assertIsNone(phases.select_phases(''))
+        self.assertEqual(phases.select_phases('all'), phases.PHASES)
+        self.assertEqual(phases.select_phases('Death'), ('death',))
+        with self.assertRaises(ValueError):
+            phases.select_phases('slog')
+
+    def test_batting_phases(self):
+        """Test that the batting phases add up to the batting record"""
+        record = ipl.backend.batsman_record('V Kohli')
+        split = ipl.backend.batsman_phases('V Kohli')
+        self.assertEqual(sum(phase['runs'] for phase in split.values()), record['runs'])
+        self.assertEqual(sum(phase['balls'] for phase in split.values()), record['balls'])
+        self.assertEqual(sum(phase['dismissals'] for phase in split.values()),
+                         record['innings'] - record['not_out'])
+
+    def test_bowling_phases(self):
+        """Test that the bowling phases add up to the bowling record"""
+        record = ipl.backend.bowler_record('JJ Bumrah')
+        split = ipl.backend.bowler_phases('JJ Bumrah')
+        self.assertEqual(sum(phase['wickets'] for phase in split.values()), record['wicket'])
+
+    def test_empty_phases(self):
+        """Test the split of a player without deliveries"""
+        split = ipl.backend.batsman_phases('Not A Player')
+        self.assertEqual(split['powerplay'], {'runs': 0, 'balls': 0, 'dismissals': 0,
+                                              'strike_rate': None})
+
+
+if __name__ == '__main__':
+    unittest.main()
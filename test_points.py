@@ -0,0 +1,100 @@
+import unittest
+import numpy as np
+import ipl
+import live
+from innings import NO_RESULT
+from points import points_tables
+
+
+# A delivery of an unknown match, for the tests that merge a live batch
+LIVE_DELIVERY = {'ID': 990001, 'innings': 1, 'overs': 0, 'ballnumber': 1, 'batter': 'V Kohli',
+                 'bowler': 'JJ Bumrah', 'non-striker': 'AB de Villiers', 'batsman_run': 4,
+                 'extras_run': 0, 'total_run': 4, 'non_boundary': 0, 'isWicketDelivery': 0,
+                 'BattingTeam': 'Royal Challengers Bangalore', 'BowlingTeam': 'Mumbai Indians'}
+
+
+class PointsTableTests(unittest.TestCase):
+    """Test cases for the season points tables"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tables = points_tables(ipl.matches, ipl.innings_table)
+
+    def test_seasons(self):
+        """Test that every season has a table of its league matches"""
+        self.assertEqual(sorted(self.tables), sorted(ipl.matches.SeasonYear.unique()))
+        league = ipl.matches[ipl.matches.MatchNumber.str.isdigit()]
+        for season, table in self.tables.items():
+            matches = league[league.SeasonYear == season]
+            self.assertEqual(sum(row['played'] for row in table), len(matches) * 2)
+            self.assertEqual(sum(row['won'] for row in table), matches.WinningTeam.notna().sum())
+            self.assertEqual(sum(row['won'] for row in table), sum(row['lost'] for row in table))
+            self.assertEqual(sum(row['runs_for'] for row in table),
+                             sum(row['runs_against'] for row in table))
+
+    def test_rows(self):
+        """Test the points, ordering and net run rate of a season"""
+        table = self.tables[2022]
+        self.assertEqual([row['position'] for row in table], list(range(1, len(table) + 1)))
+        for row in table:
+            self.assertEqual(row['points'], row['won'] * 2 + row['no_result'])
+            self.assertEqual(row['played'], row['won'] + row['lost'] + row['no_result'])
+        ranking = [(-row['points'], -row['nrr']) for row in table]
+        self.assertEqual(ranking, sorted(ranking))
+        self.assertEqual([row['team'] for row in table[:2]],
+                         ['Gujarat Titans', 'Rajasthan Royals'])
+
+    def test_all_out_counts_full_overs(self):
+        """Test that an all-out innings counts as its full quota of overs"""
+        columns = ipl.innings_table.columns
+        row = next(row for row in ipl.innings_table.rows('Mumbai Indians', (2022, 2022))
+                   if columns['wickets'][row] == 10 and columns['league'][row])
+        self.assertLess(columns['balls'][row], 120)
+        team = next(team for team in self.tables[2022] if team['team'] == 'Mumbai Indians')
+        overs, balls = map(int, team['overs_for'].split('.'))
+        faced = ipl.innings_table.rows('Mumbai Indians', (2022, 2022))
+        faced = faced[columns['league'][faced]]
+        expected = sum(120 if columns['wickets'][row] == 10 else columns['balls'][row]
+                       for row in faced)
+        self.assertEqual(overs * 6 + balls, expected)
+
+    def test_duckworth_lewis_quota(self):
+        """Test that an all-out innings of a D/L match counts as the match's longest innings"""
+        columns = ipl.innings_table.columns
+        match = ipl.matches[ipl.matches.ID == 980989].iloc[0]
+        rows = np.flatnonzero(columns['ID'] == 980989)
+        all_out = rows[columns['wickets'][rows] == 10][0]
+        self.assertEqual(match['method'], 'D/L')
+        self.assertLess(columns['balls'][rows].max(), 120)
+        team = str(ipl.innings_table.teams[columns['batting_team'][all_out]])
+        faced = ipl.innings_table.rows(team, (match['SeasonYear'],) * 2)
+        faced = faced[columns['league'][faced] & (columns['result'][faced] != NO_RESULT)]
+        quota = {row: 120 for row in faced}
+        quota[all_out] = columns['balls'][rows].max()
+        expected = sum(quota[row] if columns['wickets'][row] == 10 else columns['balls'][row]
+                       for row in faced)
+        row = next(row for row in self.tables[match['SeasonYear']] if row['team'] == team)
+        overs, balls = map(int, row['overs_for'].split('.'))
+        self.assertEqual(overs * 6 + balls, expected)
+
+    def test_cached_api(self):
+        """Test that the API builds the tables once per dataset version"""
+        first = ipl.points_table_api()['seasons'][2022]
+        self.assertIs(ipl.points_table_api()['seasons'][2022], first)
+        self.assertIn(ipl.DATASET_VERSION, ipl._points_tables)
+        self.assertEqual(list(ipl.points_table_api((2020, 2021))['seasons']), [2020, 2021])
+
+    def test_cache_kept_across_live_batches(self):
+        """Test that merging a live batch keeps the tables built from the loaded data"""
+        first = ipl.points_table_api()['seasons'][2022]
+        backend = ipl.backend
+        try:
+            live.LiveFeed().ingest([LIVE_DELIVERY])
+            self.assertIs(ipl.points_table_api()['seasons'][2022], first)
+            self.assertEqual(list(ipl._points_tables), [ipl.DATASET_VERSION])
+        finally:
+            ipl.backend = backend
+
+
+if __name__ == '__main__':
+    unittest.main()
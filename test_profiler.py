@@ -0,0 +1,81 @@
+import unittest
+import profiler
+from profiler import SlowRequestRegistry, profile_call
+
+
+def _work(size):
+    """Small CPU-bound function used as a profiling target"""
+    return sum(i * i for i in range(size))
+
+
+class ProfilerTests(unittest.TestCase):
+    """Test cases for the request profiling module"""
+
+    def test_profile_call_cprofile(self):
+        """Test profiling a call with cProfile"""
+        result, profile = profile_call(_work, 10000, top_n=5, sampling=False)
+        self.assertEqual(result, _work(10000))
+        self.assertEqual(profile['profiler'], 'cProfile')
+        self.assertIn('cumulative', profile['report'])
+        self.assertGreater(profile['duration'], 0)
+        # Every collapsed line is 'frame;frame <microseconds>'
+        for line in profile['collapsed'].splitlines():
+            stack, _, value = line.rpartition(' ')
+            self.assertTrue(stack)
+            self.assertTrue(value.isdigit())
+        self.assertIn('_work', profile['collapsed'])
+
+    def test_profile_call_propagates_exceptions(self):
+        """Test that exceptions raised by the profiled call are not swallowed"""
+        with self.assertRaises(ZeroDivisionError):
+            profile_call(lambda: 1 / 0, sampling=False)
+
+    def test_registry_keeps_slowest(self):
+        """Test that the registry keeps only the N slowest requests"""
+        registry = SlowRequestRegistry(size=3)
+        for duration in [0.5, 0.1, 0.9, 0.3, 0.7]:
+            registry.record('/api/test', {'d': duration}, duration)
+        durations = [entry['duration'] for entry in registry.entries()]
+        self.assertEqual(durations, [0.9, 0.7, 0.5])
+        self.assertIsNone(registry.record('/api/test', {}, 0.2))
+
+    def test_registry_get(self):
+        """Test retrieving a stored request by id"""
+        registry = SlowRequestRegistry(size=2)
+        entry_id = registry.record('/api/test', {'team': 'A'}, 1.0, {'collapsed': 'a;b 1'})
+        entry = registry.get(entry_id)
+        self.assertEqual(entry['params'], {'team': 'A'})
+        self.assertEqual(entry['profile']['collapsed'], 'a;b 1')
+        self.assertIsNone(registry.get(entry_id + 100))
+        registry.clear()
+        self.assertEqual(registry.entries(), [])
+
+    def test_registry_keeps_profiled(self):
+        """Test that profiled requests are kept even when they are not slow enough"""
+        registry = SlowRequestRegistry(size=1, profiled_size=2)
+        registry.record('/api/test', {}, 1.0)
+        fast = registry.record('/api/test', {}, 0.1, {'collapsed': 'a;b 1'})
+        self.assertIsNotNone(fast)
+        self.assertEqual(registry.get(fast)['profile']['collapsed'], 'a;b 1')
+        self.assertEqual([entry['duration'] for entry in registry.entries()], [1.0])
+        # Only the most recent profiled requests are kept
+        registry.record('/api/test', {}, 0.1, {'collapsed': 'c 1'})
+        registry.record('/api/test', {}, 0.1, {'collapsed': 'd 1'})
+        self.assertIsNone(registry.get(fast))
+        registry.clear()
+        self.assertIsNone(registry.get(fast + 2))
+
+    def test_save_profile(self):
+        """Test writing a profile to disk"""
+        import tempfile
+        import os
+        _, profile = profile_call(_work, 100, sampling=False)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = profiler.save_profile(profile, directory, 'run')
+            self.assertTrue(os.path.exists(paths['report']))
+            with open(paths['collapsed'], encoding='utf-8') as file:
+                self.assertEqual(file.read(), profile['collapsed'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+import ipl
+from progression import ProgressionStore
+
+
+class ProgressionTests(unittest.TestCase):
+    """Test cases for the match progression series"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.bulk = ProgressionStore(ipl.match_index, precompute=True)
+        cls.lazy = ProgressionStore(ipl.match_index)
+        cls.match_id = int(ipl.matches.ID.iloc[0])
+        cls.balls = ipl.bowler_data[ipl.bowler_data.ID == cls.match_id]
+
+    def test_overs(self):
+        """Test the per-over runs and wickets against the deliveries"""
+        series = self.bulk.progression(self.match_id)
+        for innings in series['innings']:
+            balls = self.balls[self.balls.innings == innings['innings']]
+            by_over = balls.groupby('overs')
+            self.assertEqual(innings['overs'], [over + 1 for over in by_over.groups])
+            self.assertEqual(innings['runs'], by_over.total_run.sum().tolist())
+            self.assertEqual(innings['wickets'], by_over.isWicketDelivery.sum().tolist())
+            self.assertEqual(innings['cumulative_runs'], np.cumsum(innings['runs']).tolist())
+            self.assertEqual(innings['cumulative_wickets'][-1], balls.isWicketDelivery.sum())
+
+    def test_chase(self):
+        """Test the target and required run rate of the chase"""
+        first, chase = self.bulk.progression(self.match_id)['innings']
+        self.assertEqual(chase['target'], first['cumulative_runs'][-1] + 1)
+        self.assertNotIn('target', first)
+        balls = self.balls[(self.balls.innings == 2) & (self.balls.overs == 0)]
+        legal = (~balls.extra_type.isin(['wides', 'noballs'])).sum()
+        expected = (chase['target'] - chase['runs'][0]) / (120 - legal) * 6
+        self.assertAlmostEqual(chase['required_run_rate'][0], expected, places=2)
+
+    def test_bulk_matches_lazy(self):
+        """Test that the bulk store returns the series computed from a match's slice"""
+        for match_id in ipl.matches.ID[:50]:
+            self.assertEqual(self.bulk.progression(int(match_id)),
+                             self.lazy.progression(int(match_id)))
+        self.assertGreater(self.bulk.nbytes, 0)
+        self.assertEqual(self.lazy.nbytes, 0)
+
+    def test_unknown_match(self):
+        """Test that an unknown match has no progression"""
+        self.assertIsNone(self.bulk.progression(1))
+        self.assertIsNone(self.lazy.progression(1))
+
+    def test_match_without_deliveries(self):
+        """Test that a known match without deliveries has no innings, as in its scorecard"""
+        for match_id in (1178424, 829813, 829763, 501265):
+            self.assertEqual(ipl.match_index.scorecard(match_id)['innings'], [])
+            for store in (self.bulk, self.lazy):
+                self.assertEqual(store.progression(match_id),
+                                 {'match_id': match_id, 'innings': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
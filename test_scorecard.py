@@ -0,0 +1,63 @@
+import unittest
+import ipl
+from scorecard import overs_notation
+
+
+class ScorecardTests(unittest.TestCase):
+    """Test cases for the match scorecards"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.index = ipl.match_index
+        cls.match_id = int(ipl.matches.ID.iloc[0])
+        cls.balls = ipl.bowler_data[ipl.bowler_data.ID == cls.match_id]
+
+    def test_overs_notation(self):
+        """Test formatting legal balls as overs"""
+        self.assertEqual(overs_notation(0), '0.0')
+        self.assertEqual(overs_notation(22), '3.4')
+        self.assertEqual(overs_notation(120), '20.0')
+
+    def test_match_rows(self):
+        """Test that a match's rows are its contiguous, ordered deliveries"""
+        rows = self.index.match_rows(self.match_id)
+        self.assertEqual(len(rows['innings']), len(self.balls))
+        self.assertEqual(list(rows['innings']), sorted(rows['innings']))
+        self.assertEqual(len(self.index.match_rows(1)['innings']), 0)
+
+    def test_innings_totals(self):
+        """Test that the cards add up to the innings totals"""
+        card = self.index.scorecard(self.match_id)
+        self.assertEqual(card['result']['winning_team'],
+                         ipl.matches.WinningTeam.iloc[0])
+        for innings in card['innings']:
+            balls = self.balls[self.balls.innings == innings['innings']]
+            self.assertEqual(innings['runs'], balls.total_run.sum())
+            self.assertEqual(innings['wickets'], balls.isWicketDelivery.sum())
+            self.assertEqual(sum(batter['runs'] for batter in innings['batting']) +
+                             innings['extras']['total'], innings['runs'])
+            self.assertEqual(sum(bowler['wickets'] for bowler in innings['bowling']),
+                             balls.isBowlerWicket.sum())
+            self.assertEqual(sum(bowler['runs'] for bowler in innings['bowling']),
+                             balls.bowler_run.sum())
+            self.assertEqual(len(innings['fall_of_wickets']), innings['wickets'])
+            scores = [wicket['score'] for wicket in innings['fall_of_wickets']]
+            self.assertEqual(scores, sorted(scores))
+            out = [batter for batter in innings['batting'] if batter['dismissal'] != 'not out']
+            self.assertEqual(len(out), innings['wickets'])
+
+    def test_batting_order(self):
+        """Test that the openers come first in the batting card"""
+        card = self.index.scorecard(self.match_id)
+        first = self.balls[self.balls.innings == 1].sort_values(['overs', 'ballnumber']).iloc[0]
+        openers = {batter['batter'] for batter in card['innings'][0]['batting'][:2]}
+        self.assertEqual(openers, {first['batter'], first['non-striker']})
+
+    def test_cache(self):
+        """Test that a scorecard is assembled once"""
+        self.assertIs(self.index.scorecard(self.match_id), self.index.scorecard(self.match_id))
+        self.assertIsNone(self.index.scorecard(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import ipl
+from toss import TossIndex
+
+
+class TossIndexTests(unittest.TestCase):
+    """Test cases for the toss crosstabs"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.index = TossIndex(ipl.matches, ipl.venue_index)
+        cls.matches = ipl.matches
+
+    def test_overall(self):
+        """Test the toss winners' results against pandas masks"""
+        m = self.matches
+        record = self.index.toss_record()['toss_won']
+        self.assertEqual(record['matches'], len(m))
+        self.assertEqual(record['won'], (m.TossWinner == m.WinningTeam).sum())
+        self.assertEqual(record['no_result'], m.WinningTeam.isna().sum())
+        bat = record['decisions']['bat']
+        chose_bat = m[m.TossDecision == 'bat']
+        self.assertEqual(bat['matches'], len(chose_bat))
+        self.assertEqual(bat['won'], (chose_bat.TossWinner == chose_bat.WinningTeam).sum())
+
+    def test_team(self):
+        """Test a team's results when it won and lost the toss"""
+        m = self.matches[self.matches.SeasonYear >= 2018]
+        team = 'Chennai Super Kings'
+        record = self.index.toss_record(team=team, seasons=(2018, None))
+        played = m[(m.Team1 == team) | (m.Team2 == team)]
+        lost_toss = played[played.TossWinner != team]
+        self.assertEqual(record['toss_won']['matches'] + record['toss_lost']['matches'],
+                         len(played))
+        self.assertEqual(record['toss_lost']['won'], (lost_toss.WinningTeam == team).sum())
+        self.assertEqual(record['toss_lost']['decisions']['field']['matches'],
+                         (lost_toss.TossDecision == 'field').sum())
+
+    def test_venue(self):
+        """Test that a venue slice agrees with the venue aggregates"""
+        record = self.index.toss_record(venue='Wankhede Stadium, Mumbai')
+        self.assertEqual(record['venue'], 'Wankhede Stadium')
+        toss = ipl.venue_index.venue_record('Wankhede Stadium')['toss']
+        for decision, counts in record['toss_won']['decisions'].items():
+            self.assertEqual(counts['matches'], toss[decision]['chosen'])
+            self.assertEqual(counts['won'], toss[decision]['toss_winner_won'])
+
+    def test_breakdowns(self):
+        """Test that the breakdowns partition the slice"""
+        record = self.index.toss_record(by='season', seasons=(2019, 2021))
+        self.assertEqual([row['season'] for row in record['by_season']], [2019, 2020, 2021])
+        self.assertEqual(sum(row['toss_won']['matches'] for row in record['by_season']),
+                         record['toss_won']['matches'])
+        record = self.index.toss_record(by='team')
+        self.assertEqual(sum(row['toss_won']['matches'] for row in record['by_team']),
+                         len(self.matches))
+        self.assertIn('toss_lost', record['by_team'][0])
+        with self.assertRaises(ValueError):
+            self.index.toss_record(by='umpire')
+        self.assertIsNone(self.index.toss_record(team='Unknown'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import numpy as np
+import ipl
+import venues
+
+
+class CanonicalNameTests(unittest.TestCase):
+    """Test cases for venue and city name canonicalization"""
+
+    def test_canonical_venue(self):
+        """Test that venue name variants map to one name"""
+        self.assertEqual(venues.canonical_venue('Wankhede Stadium, Mumbai'), 'Wankhede Stadium')
+        self.assertEqual(venues.canonical_venue('MA Chidambaram Stadium, Chepauk, Chennai'),
+                         'MA Chidambaram Stadium')
+        self.assertEqual(venues.canonical_venue('M.Chinnaswamy Stadium'), 'M Chinnaswamy Stadium')
+        self.assertEqual(venues.canonical_venue('Feroz Shah Kotla'), 'Arun Jaitley Stadium')
+        self.assertEqual(venues.canonical_venue('Eden Gardens'), 'Eden Gardens')
+
+    def test_canonical_city(self):
+        """Test that city name variants map to one name"""
+        self.assertEqual(venues.canonical_city('Bengaluru'), 'Bangalore')
+        self.assertEqual(venues.canonical_city(' Mumbai '), 'Mumbai')
+
+
+class VenueIndexTests(unittest.TestCase):
+    """Test cases for the venue partitions and aggregates"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.index = ipl.venue_index
+        cls.wankhede = ipl.matches[ipl.matches.Venue.str.startswith('Wankhede Stadium')]
+
+    def test_variants_hit_one_partition(self):
+        """Test that every name variant returns the same venue"""
+        record = self.index.venue_record('Wankhede Stadium')
+        self.assertIs(self.index.venue_record('wankhede stadium, mumbai'), record)
+        self.assertEqual(record['matches'], len(self.wankhede))
+        self.assertEqual(sorted(self.index.venue_matches('Wankhede Stadium, Mumbai')),
+                         sorted(self.wankhede.ID))
+        self.assertIsNone(self.index.venue_record('Lord\'s'))
+
+    def test_venue_aggregates(self):
+        """Test the per-venue aggregates against a direct computation"""
+        record = self.index.venue_record('Wankhede Stadium')
+        balls = ipl.bowler_data[ipl.bowler_data.ID.isin(self.wankhede.ID)]
+        first = balls[balls.innings == 1].groupby('ID').total_run.sum()
+        self.assertAlmostEqual(record['avg_first_innings_score'], first.mean())
+
+        chasers = balls[balls.innings == 2].groupby('ID').BattingTeam.first()
+        winners = self.wankhede.set_index('ID').WinningTeam.reindex(chasers.index)
+        self.assertEqual(record['chasing']['won'], int((winners == chasers).sum()))
+        self.assertEqual(record['chasing']['results'], int(winners.notna().sum()))
+
+        toss = record['toss']
+        self.assertEqual(toss['bat']['chosen'] + toss['field']['chosen'], len(self.wankhede))
+        runs = balls[balls.innings.isin([1, 2])].groupby('batter').batsman_run.sum()
+        self.assertEqual(record['top_batters'][0]['runs'], runs.max())
+
+    def test_city_record(self):
+        """Test that a city combines its venues"""
+        record = self.index.city_record('Bengaluru')
+        self.assertEqual(record['city'], 'Bangalore')
+        self.assertEqual(record['matches'],
+                         sum(self.index.venue_record(venue)['matches'] for venue in record['venues']))
+        self.assertIsNone(self.index.city_record('Atlantis'))
+
+    def test_venue_list(self):
+        """Test that every match belongs to exactly one listed venue"""
+        venue_list = self.index.venue_list()
+        self.assertEqual(sum(venue['matches'] for venue in venue_list), len(ipl.matches))
+        self.assertEqual(len(np.unique([venue['venue'] for venue in venue_list])), len(venue_list))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+"""
+Toss Impact Module
+
+This module answers whether winning the toss matters, by venue, season, team and toss
+decision, from the `TossWinner` and `TossDecision` columns of the matches data.
+
+Every match is seen from both teams: whether the team won or lost the toss, the decision
+taken by the toss winner, and the match result for the team. The outcomes are counted at
+load into one crosstab cube over (season, venue, team, toss outcome, decision, result)
+with a single `np.bincount` over the combined integer key, so any slice of the analytics
+is an array lookup and a sum over the axes not selected.
+
+Classes:
+    TossIndex: The toss crosstab cube with its season, venue and team vocabularies.
+
+Usage Example:
+
+    import ipl
+    from toss import TossIndex
+
+    index = TossIndex(ipl.matches, ipl.venue_index)
+    print(index.toss_record())
+    print(index.toss_record(venue='Eden Gardens', seasons=(2015, None)))
+    print(index.toss_record(team='Mumbai Indians', by='season'))
+"""
+
+import numpy as np
+
+import innings
+import kernels
+import venues
+
+# Toss outcomes of a team and the breakdowns available
+TOSS_OUTCOMES = ('toss_won', 'toss_lost')
+BREAKDOWNS = ('season', 'venue', 'team')
+
+
+class TossIndex:
+    """
+    Crosstab cube of the matches over (season, venue, team, toss outcome, toss decision,
+    result), counted with `np.bincount` over a combined key.
+    """
+
+    def __init__(self, match_df, venue_index):
+        """
+        Args:
+            match_df (pd.DataFrame): The matches data (with 'SeasonYear').
+            venue_index (venues.VenueIndex): The venue partitions, whose canonical venues
+                and name lookup are shared.
+        """
+        self.venue_index = venue_index
+        season_codes, self.seasons = kernels.encode(match_df['SeasonYear'].to_numpy())
+        venue_codes = kernels.encode(match_df['Venue'].map(venues.canonical_venue).to_numpy(),
+                                     venue_index.venues)[0]
+        self.teams = np.unique(match_df[['Team1', 'Team2']].to_numpy().astype(str))
+        decision = kernels.encode(match_df['TossDecision'].to_numpy(),
+                                  np.array(venues.TOSS_DECISIONS, dtype=object))[0]
+        toss_winner = match_df['TossWinner'].to_numpy()
+        winner = match_df['WinningTeam'].to_numpy()
+        no_result = match_df['WinningTeam'].isna().to_numpy()
+
+        # Both sides of every match, each with its toss outcome and result
+        team = np.concatenate((match_df['Team1'].to_numpy(), match_df['Team2'].to_numpy()))
+        toss_winner, winner, no_result = (np.tile(values, 2)
+                                          for values in (toss_winner, winner, no_result))
+        outcome = np.where(toss_winner == team, 0, 1)
+        result = np.where(no_result, innings.NO_RESULT,
+                          np.where(winner == team, innings.WON, innings.LOST))
+
+        self.shape = (len(self.seasons), len(venue_index.venues), len(self.teams),
+                      len(TOSS_OUTCOMES), len(venues.TOSS_DECISIONS), len(innings.RESULTS))
+        key = np.ravel_multi_index(
+            (np.tile(season_codes, 2), np.tile(venue_codes, 2),
+             kernels.encode(team.astype(str), self.teams)[0], outcome, np.tile(decision, 2),
+             result), self.shape)
+        self.cube = kernels.group_count(key, int(np.prod(self.shape))).reshape(self.shape)
+
+    def _slice(self, venue=None, team=None, seasons=None):
+        """
+        Returns the cube restricted to a venue, a team and a season range, with the labels
+        of its season, venue and team axes (None when a venue or team is unknown).
+        """
+        start, end = kernels.key_range(self.seasons, *(seasons or (None, None)))
+        cube = self.cube[start:end]
+        labels = [self.seasons[start:end], self.venue_index.venues, self.teams]
+        selected = {}
+        if venue is not None:
+            selected[1] = self.venue_index.venue_code(venue)
+        if team is not None:
+            selected[2] = kernels.lookup(self.teams, team)
+        for axis, code in selected.items():
+            if code < 0:
+                return None, None
+            cube = np.take(cube, [code], axis=axis)
+            labels[axis] = labels[axis][code:code + 1]
+        return cube, labels
+
+    @staticmethod
+    def _block(cells):
+        """
+        Summarizes (decision, result) counts: the results overall and per decision.
+        """
+        def results(counts):
+            played = int(counts.sum())
+            decided = int(counts[innings.WON] + counts[innings.LOST])
+            return {'matches': played,
+                    'won': int(counts[innings.WON]),
+                    'lost': int(counts[innings.LOST]),
+                    'no_result': int(counts[innings.NO_RESULT]),
+                    'win_pct': counts[innings.WON] / decided * 100 if decided else None}
+
+        block = results(cells.sum(axis=0))
+        block['decisions'] = {decision: results(cells[code])
+                              for code, decision in enumerate(venues.TOSS_DECISIONS)}
+        return block
+
+    def _summary(self, cube, both):
+        """
+        Summarizes a slice of the cube from the toss winner's perspective, and from the
+        toss loser's as well when `both` is set.
+        """
+        cells = cube.reshape(-1, *cube.shape[-3:]).sum(axis=0)
+        summary = {'toss_won': self._block(cells[0])}
+        if both:
+            summary['toss_lost'] = self._block(cells[1])
+        return summary
+
+    def toss_record(self, venue=None, team=None, seasons=None, by=None):
+        """
+        Returns how often winning the toss, and each toss decision, led to winning the match.
+
+        Args:
+            venue (str): Only the matches at this venue (any name variant).
+            team (str): Only the matches of this team, from its perspective: when it won the
+                toss and when it lost it.
+            seasons (tuple): Optional inclusive (first, last) season range.
+            by (str): Optional breakdown by 'season', 'venue' or 'team'.
+
+        Returns:
+            dict: The results of the toss winners ('toss_won') overall and per decision
+                (and of the teams when they lost the toss, 'toss_lost', for a team or a
+                breakdown by team), with the breakdown if requested, or None if the venue
+                or team is unknown.
+
+        Raises:
+            ValueError: If the breakdown is not supported.
+        """
+        if by is not None and by not in BREAKDOWNS:
+            raise ValueError(f"Invalid breakdown '{by}', expected one of "
+                             f"{', '.join(BREAKDOWNS)}")
+        cube, labels = self._slice(venue, team, seasons)
+        if cube is None:
+            return None
+        both = team is not None or by == 'team'
+        record = {'venue': None if venue is None else str(labels[1][0]), 'team': team,
+                  **self._summary(cube, team is not None)}
+        if by is not None:
+            axis = BREAKDOWNS.index(by)
+            record[f'by_{by}'] = [{by: _label(label), **self._summary(part, both)}
+                                  for label, part in zip(labels[axis],
+                                                         np.moveaxis(cube, axis, 0))
+                                  if part.any()]
+        return record
+
+
+def _label(value):
+    """
+    Returns a JSON-friendly breakdown label.
+    """
+    return value.item() if isinstance(value, np.generic) else str(value)
@@ -6,6 +6,8 @@ This module provides functionality to validate email addresses using regular exp
 The module includes a function `check_correct_email_format` which
 takes an email address as input and checks if it
 matches the expected format. It uses a regular expression pattern to perform the validation.
+The function `normalize_email` returns the canonical form under which emails are stored
+and looked up.
 
 Example Usage:
 --------------
@@ -48,3 +50,19 @@ def check_correct_email_format(email):
         return True
     else:
         return False
+
+
+def normalize_email(email):
+    """
+    Return the canonical form of an email address.
+
+    Emails are stored and looked up stripped of surrounding whitespace and lower-cased,
+    so 'User@Example.com ' and 'user@example.com' refer to the same account.
+
+    Args:
+        email (str): The email address to normalize.
+
+    Returns:
+        str: The normalized email address.
+    """
+    return email.strip().lower()
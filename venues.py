@@ -0,0 +1,286 @@
+"""
+Venue Analytics Module
+
+This module provides ground-level statistics for IPL venues and cities: average innings
+scores, the chasing win rate, toss-decision outcomes, and the top batters and bowlers.
+
+Venue names appear in several variants in the data (for example "Wankhede Stadium" and
+"Wankhede Stadium, Mumbai", or grounds that were renamed), so every name is canonicalized
+first. The matches are then partitioned by canonical venue: a venue -> match ID index
+(matches sorted by venue with CSR offsets) plus per-venue aggregates computed once at load,
+so a venue or city lookup does not scan the match or ball-by-ball data.
+
+Classes:
+    VenueIndex: Venue partitions and per-venue aggregates of the matches.
+
+Functions:
+    canonical_venue: Returns the canonical name of a venue.
+    canonical_city: Returns the canonical name of a city.
+
+Usage Example:
+
+    import ipl
+    from venues import VenueIndex
+
+    index = VenueIndex(ipl.matches, ipl.bowler_data)
+    print(index.venue_record('Wankhede Stadium, Mumbai'))
+    print(index.city_record('Chennai'))
+"""
+
+import numpy as np
+import pandas as pd
+
+import innings
+import kernels
+
+# Grounds that were renamed or are spelled differently, by name without the city suffix
+VENUE_ALIASES = {
+    'Feroz Shah Kotla': 'Arun Jaitley Stadium',
+    'M.Chinnaswamy Stadium': 'M Chinnaswamy Stadium',
+    'Punjab Cricket Association Stadium': 'Punjab Cricket Association IS Bindra Stadium',
+    'Sardar Patel Stadium': 'Narendra Modi Stadium',
+    'Sheikh Zayed Stadium': 'Zayed Cricket Stadium',
+}
+
+CITY_ALIASES = {
+    'Bengaluru': 'Bangalore',
+}
+
+TOSS_DECISIONS = ('bat', 'field')
+
+
+def canonical_venue(name):
+    """
+    Returns the canonical name of a venue.
+
+    The city or locality suffix (", Mumbai", ", Chepauk, Chennai") is dropped and
+    renamed or differently spelled grounds are mapped to one name.
+
+    Args:
+        name (str): The venue name as found in the data or in a request.
+
+    Returns:
+        str: The canonical venue name.
+    """
+    base = str(name).split(',')[0].strip()
+    return VENUE_ALIASES.get(base, base)
+
+
+def canonical_city(name):
+    """
+    Returns the canonical name of a city ('Bengaluru' and 'Bangalore' are one city).
+
+    Args:
+        name (str): The city name.
+
+    Returns:
+        str: The canonical city name.
+    """
+    name = str(name).strip()
+    return CITY_ALIASES.get(name, name)
+
+
+class VenueIndex:
+    """
+    Venue partitions and per-venue aggregates of the matches.
+
+    The summaries of every venue and city are computed at construction, so lookups
+    are dictionary reads.
+    """
+
+    def __init__(self, match_df, ball_df, top_n=5, innings_table=None):
+        """
+        Args:
+            match_df (pd.DataFrame): The matches data.
+            ball_df (pd.DataFrame): Ball-by-ball data with the bowling columns
+                (`ipl.bowler_data`).
+            top_n (int): Number of top batters and bowlers kept per venue and city.
+            innings_table (innings.InningsTable): The innings summaries of the matches
+                (built from the data when not given).
+        """
+        self.top_n = top_n
+        names = match_df['Venue'].map(canonical_venue).to_numpy()
+        codes, self.venues = kernels.encode(names)
+
+        # Venue -> match ID index: matches sorted by venue with CSR offsets
+        order = np.argsort(codes, kind='stable')
+        self.offsets = kernels.csr_offsets(codes, len(self.venues))
+        self.match_ids = match_df['ID'].to_numpy()[order]
+        matches = match_df.iloc[order]
+
+        # City of each venue: its most frequent known city
+        cities = matches['City'].dropna().map(canonical_city)
+        venue_of = pd.Series(self.venues[codes[order]], index=matches.index)[cities.index]
+        most_common = cities.groupby(venue_of).agg(lambda x: x.value_counts().index[0])
+        self.venue_city = {venue: most_common.get(venue) for venue in self.venues}
+
+        # Per-match innings totals and results, aligned with the venue-sorted matches
+        if innings_table is None:
+            innings_table = innings.InningsTable(match_df, ball_df)
+        self.first_innings = innings_table.match_values(self.match_ids, 1, 'runs')
+        self.second_innings = innings_table.match_values(self.match_ids, 2, 'runs')
+        chase_result = innings_table.match_values(self.match_ids, 2, 'result')
+        winner = matches['WinningTeam']
+        self.has_result = winner.notna().to_numpy() & ~np.isnan(chase_result)
+        self.chase_won = chase_result == innings.WON
+        self.toss_decision = matches['TossDecision'].to_numpy()
+        self.toss_winner_won = winner.notna().to_numpy() & (
+            matches['TossWinner'].to_numpy() == winner.to_numpy())
+
+        # Runs and wickets per (venue, player)
+        balls = ball_df[ball_df.innings.isin([1, 2])]  # Excluding Super overs
+        venue_code = pd.Series(np.repeat(np.arange(len(self.venues)), np.diff(self.offsets)),
+                               index=self.match_ids)
+        ball_venue = venue_code.reindex(balls['ID']).to_numpy()
+        known = ~np.isnan(ball_venue)
+        ball_venue = ball_venue[known].astype(np.int64)
+        batter_codes, self.batters = kernels.encode(balls['batter'].to_numpy()[known])
+        bowler_codes, self.bowlers = kernels.encode(balls['bowler'].to_numpy()[known])
+        self.batter_runs = kernels.group_sum(
+            ball_venue * len(self.batters) + batter_codes, balls['batsman_run'].to_numpy()[known],
+            len(self.venues) * len(self.batters)).reshape(len(self.venues), len(self.batters))
+        self.bowler_wickets = kernels.group_sum(
+            ball_venue * len(self.bowlers) + bowler_codes,
+            balls['isBowlerWicket'].to_numpy()[known],
+            len(self.venues) * len(self.bowlers)).reshape(len(self.venues), len(self.bowlers))
+
+        self._venue_lookup = {venue.lower(): code for code, venue in enumerate(self.venues)}
+        for alias, venue in VENUE_ALIASES.items():
+            if venue.lower() in self._venue_lookup:
+                self._venue_lookup[alias.lower()] = self._venue_lookup[venue.lower()]
+        self.cities = {}
+        for code, venue in enumerate(self.venues):
+            city = self.venue_city[venue]
+            if city is not None:
+                self.cities.setdefault(city, []).append(code)
+        self._city_lookup = {city.lower(): city for city in self.cities}
+        for alias, city in CITY_ALIASES.items():
+            if city in self.cities:
+                self._city_lookup[alias.lower()] = city
+
+        self.venue_summaries = {venue: dict(venue=str(venue), city=self.venue_city[venue],
+                                            **self._summarize([code]))
+                                for code, venue in enumerate(self.venues)}
+        self.city_summaries = {city: dict(city=city,
+                                          venues=[str(self.venues[code]) for code in codes],
+                                          **self._summarize(codes))
+                               for city, codes in self.cities.items()}
+
+    def _rows(self, codes):
+        """
+        Returns the venue-sorted match rows of a set of venues.
+        """
+        return np.concatenate([np.arange(self.offsets[code], self.offsets[code + 1])
+                               for code in codes])
+
+    def _top(self, matrix, names, codes, label):
+        """
+        Returns the top players of a (venue, player) matrix over a set of venues.
+        """
+        totals = matrix[codes].sum(axis=0)
+        best = np.argsort(-totals, kind='stable')[:self.top_n]
+        return [{'player': str(names[i]), label: int(totals[i])} for i in best if totals[i] > 0]
+
+    def _summarize(self, codes):
+        """
+        Computes the statistics of a set of venues from their match partitions.
+        """
+        rows = self._rows(codes)
+
+        def average(values):
+            values = values[~np.isnan(values)]
+            return float(values.mean()) if len(values) else None
+
+        toss = {}
+        for decision in TOSS_DECISIONS:
+            chosen = self.toss_decision[rows] == decision
+            won = int(np.count_nonzero(chosen & self.toss_winner_won[rows]))
+            toss[decision] = {'chosen': int(np.count_nonzero(chosen)), 'toss_winner_won': won,
+                              'win_pct': won / np.count_nonzero(chosen) * 100
+                              if chosen.any() else None}
+        results = int(np.count_nonzero(self.has_result[rows]))
+        chases_won = int(np.count_nonzero(self.chase_won[rows]))
+
+        return {
+            'matches': len(rows),
+            'avg_first_innings_score': average(self.first_innings[rows]),
+            'avg_second_innings_score': average(self.second_innings[rows]),
+            'chasing': {'results': results,
+                        'won': chases_won,
+                        'win_pct': chases_won / results * 100 if results else None},
+            'toss': toss,
+            'top_batters': self._top(self.batter_runs, self.batters, codes, 'runs'),
+            'top_bowlers': self._top(self.bowler_wickets, self.bowlers, codes, 'wickets')
+        }
+
+    def venue_code(self, venue):
+        """
+        Returns the code of a venue given any of its name variants, or -1.
+
+        Args:
+            venue (str): The venue name.
+
+        Returns:
+            int: The venue code.
+        """
+        if venue is None:
+            return -1
+        return self._venue_lookup.get(canonical_venue(venue).lower(), -1)
+
+    def venue_matches(self, venue):
+        """
+        Returns the IDs of the matches played at a venue.
+
+        Args:
+            venue (str): The venue name (any variant).
+
+        Returns:
+            np.ndarray: The match IDs (a view of the index).
+        """
+        code = self.venue_code(venue)
+        if code < 0:
+            return self.match_ids[:0]
+        return self.match_ids[self.offsets[code]:self.offsets[code + 1]]
+
+    def venue_list(self):
+        """
+        Returns the canonical venues with their city and number of matches.
+
+        Returns:
+            list: One dictionary per venue.
+        """
+        return [{'venue': str(venue), 'city': self.venue_city[venue],
+                 'matches': int(self.offsets[code + 1] - self.offsets[code])}
+                for code, venue in enumerate(self.venues)]
+
+    def venue_record(self, venue):
+        """
+        Returns the statistics of a venue.
+
+        Args:
+            venue (str): The venue name (any variant, case-insensitive).
+
+        Returns:
+            dict: The venue statistics, or None if the venue is unknown.
+        """
+        code = self.venue_code(venue)
+        if code < 0:
+            return None
+        return self.venue_summaries[self.venues[code]]
+
+    def city_record(self, city):
+        """
+        Returns the statistics of all venues of a city.
+
+        Args:
+            city (str): The city name (case-insensitive).
+
+        Returns:
+            dict: The city statistics, or None if the city is unknown.
+        """
+        if city is None:
+            return None
+        name = self._city_lookup.get(canonical_city(city).lower())
+        if name is None:
+            return None
+        return self.city_summaries[name]